@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Benchmarks of the hot paths of K8sh against a synthetic cluster with simulated latency.
+Run them with python -m pytest benchmarks; they are not part of the tests.
+
+K8SH_BENCHMARK_CLUSTER sets the synthetic cluster, e.g. synthetic:ns=500,pods=50000,latency=0.02
+"""
+import os
+from typing import Callable
+
+import pytest
+
+# The Kubernetes client is created when the commands are imported, so this comes first
+DEFAULT_CLUSTER = "synthetic:ns=50,pods=5000,latency=0.001"
+os.environ["K8SH_MOCK"] = os.environ.get("K8SH_BENCHMARK_CLUSTER", DEFAULT_CLUSTER)
+
+from k8s_client import get_cluster_index, get_kubernetes_client  # noqa: E402
+from k8s_client.client import KubernetesClient  # noqa: E402
+from utils import stats  # noqa: E402
+from utils.render import clear_render_cache  # noqa: E402
+from utils.stats import CommandStats  # noqa: E402
+
+
+def clear_caches() -> None:
+    """Forget everything cached, so the next call pays for its requests"""
+    get_cluster_index().invalidate()
+    clear_render_cache()
+
+
+def count_requests(func: Callable[[], object]) -> CommandStats:
+    """Call a function once with cold caches, recording the requests it makes into the client"""
+    clear_caches()
+    with stats.measure_command("benchmark") as command_stats:
+        func()
+    return command_stats
+
+
+@pytest.fixture
+def k8s_client() -> KubernetesClient:
+    """The synthetic client shared with the commands, counting the requests made into it"""
+    return get_kubernetes_client()
+
+
+@pytest.fixture
+def namespace(k8s_client: KubernetesClient) -> str:
+    """A namespace of the synthetic cluster"""
+    return sorted(k8s_client.get_namespaces())[1]
+
+
+@pytest.fixture
+def deployment(k8s_client: KubernetesClient, namespace: str) -> str:
+    """A deployment of the namespace"""
+    return sorted(k8s_client.get_resources(namespace, "deployments"))[0]
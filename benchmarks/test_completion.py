@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Benchmarks of Tab completion and path resolution
+"""
+import pytest
+from prompt_toolkit.document import Document
+
+from benchmarks.conftest import count_requests
+from command.registry import CommandRegistry
+from shell import register_commands
+from state.path_manager import Manager
+from state.state import State
+from utils.completer import K8shCompleter
+
+
+@pytest.fixture(scope="module")
+def completer() -> K8shCompleter:
+    """A completer with all commands, from the root"""
+    registry = CommandRegistry()
+    register_commands(registry)
+    return K8shCompleter(registry, State())
+
+
+# Fuzzy paths of one to three segments, and the most requests completing one may make with cold caches.
+# A completion making more requests than before fails, so lower these when it makes fewer
+COMPLETIONS = [
+    ("cat /ns1", 1),
+    ("cat /{namespace}/dpl", 2),
+    ("cat /{namespace}/deployments/{deployment_prefix}", 4),
+]
+
+
+@pytest.mark.parametrize("template,max_requests", COMPLETIONS, ids=[template for template, _ in COMPLETIONS])
+def test_completion(benchmark, completer, namespace, deployment, template, max_requests):
+    """Complete a path, like pressing Tab after the text"""
+    text = template.format(namespace=namespace, deployment_prefix=deployment.replace("-", "")[:-1])
+
+    def complete():
+        return list(completer.get_completions(Document(text)))
+
+    command_stats = count_requests(complete)
+    assert command_stats.get_request_count() <= max_requests, command_stats.summary()
+
+    assert benchmark(complete)
+
+
+def test_set_path_deep(benchmark, k8s_client, namespace, deployment):
+    """Resolve the deepest path of the virtual filesystem, a container of a pod of a deployment"""
+    pod = k8s_client.get_pods_for_resource(namespace, "deployments", deployment)[0]
+    path = f"/{namespace}/deployments/{deployment}/{pod}/main"
+
+    def set_path():
+        manager = Manager()
+        manager.set_path(path)
+        return manager
+
+    command_stats = count_requests(set_path)
+    assert command_stats.get_request_count() <= 4, command_stats.summary()
+
+    assert benchmark(set_path).get_full_path() == path[1:]
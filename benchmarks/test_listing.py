@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Benchmarks of listing and rendering resources
+"""
+import io
+from contextlib import redirect_stdout
+
+from benchmarks.conftest import count_requests
+from command.cat import CatCommand
+from state.state import State
+from utils.render import clear_render_cache
+from utils.terminal import format_long_listing
+
+# Size of the big object rendered by cat, in bytes
+BIG_OBJECT_SIZE = 1024 * 1024
+
+
+def test_format_long_listing(benchmark):
+    """Format a long listing of 10,000 items"""
+    items = [f"app-{i}-7f5569bb7f-{i:05d}" for i in range(10000)]
+
+    text = benchmark(format_long_listing, items, lambda item: True)
+    assert text.count("\n") == len(items) - 1
+
+
+def test_get_pods_for_resource(benchmark, k8s_client, namespace, deployment):
+    """Get the pods of a deployment"""
+    command_stats = count_requests(lambda: k8s_client.get_pods_for_resource(namespace, "deployments", deployment))
+    assert command_stats.get_request_count() == 1, command_stats.summary()
+
+    assert benchmark(k8s_client.get_pods_for_resource, namespace, "deployments", deployment)
+
+
+def test_cat_big_object(benchmark, k8s_client, namespace):
+    """Render a 1 MB configmap with cat, without the render cache"""
+    configmap = sorted(k8s_client.get_resources(namespace, "configmaps"))[0]
+    lines = "\n".join(f"line {i}: " + "x" * 70 for i in range(BIG_OBJECT_SIZE // 80))
+    k8s_client.patch_resource(namespace, "configmaps", configmap, {"data": {"big.txt": lines}})
+    state = State()
+
+    def cat():
+        with redirect_stdout(io.StringIO()) as stdout:
+            CatCommand().execute(state, [f"/{namespace}/configmaps/{configmap}"])
+        return stdout.getvalue()
+
+    command_stats = count_requests(cat)
+    assert command_stats.get_request_count() == 1, command_stats.summary()
+
+    text = benchmark.pedantic(cat, setup=clear_render_cache, rounds=10)
+    assert len(text) > BIG_OBJECT_SIZE
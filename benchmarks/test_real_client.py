@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Benchmarks of the real client over HTTP, against a fake API server holding the synthetic cluster
+"""
+import math
+import os
+
+import pytest
+from kubernetes import client
+
+from k8s_client.real_client import FIND_PAGE_SIZE, RealKubernetesClient
+from k8s_client.synthetic_client import SyntheticKubernetesClient, SyntheticSpec
+from tests.common.fake_api_server import FakeApiServer
+
+# The synthetic cluster of the benchmarks, set by the conftest
+SPEC = SyntheticSpec.parse(os.environ["K8SH_MOCK"])
+
+
+@pytest.fixture(scope="module")
+def fake_api_server(tmp_path_factory):
+    """Serve the synthetic cluster, with its simulated latency added to every request instead of every call"""
+    spec = SyntheticSpec.parse(os.environ["K8SH_MOCK"])
+    spec.latency = 0.0
+    configuration = client.Configuration.get_default_copy()
+
+    with FakeApiServer.from_client(SyntheticKubernetesClient(spec), latency=SPEC.latency) as server:
+        server.write_kubeconfig(str(tmp_path_factory.mktemp("fake-api-server") / "kubeconfig"))
+        yield server
+
+    client.Configuration.set_default(configuration)
+
+
+@pytest.fixture(scope="module")
+def real_client(fake_api_server):
+    """A real client connected to the fake API server"""
+    return RealKubernetesClient(fake_api_server.kubeconfig)
+
+
+def count_server_requests(server, func):
+    """Call a function once, counting the requests the server received meanwhile"""
+    before = len(server.requests)
+    func()
+    return len(server.requests) - before
+
+
+def test_find_all_pods(benchmark, fake_api_server, real_client):
+    """Find the pods of all namespaces, page by page"""
+    def find():
+        return sum(1 for _ in real_client.find_resources("pods"))
+
+    requests = count_server_requests(fake_api_server, find)
+    assert requests == math.ceil(SPEC.pods / FIND_PAGE_SIZE)
+
+    assert benchmark(find) == SPEC.pods
+
+
+def test_get_pods_for_resource_over_http(benchmark, fake_api_server, real_client):
+    """Get the pods of a deployment, from a LIST of pods and one of replicasets"""
+    namespace = sorted(real_client.get_namespaces())[1]
+    deployment = sorted(real_client.get_resources(namespace, "deployments"))[0]
+
+    requests = count_server_requests(fake_api_server,
+                                     lambda: real_client.get_pods_for_resource(namespace, "deployments", deployment))
+    assert requests == 2
+
+    assert benchmark(real_client.get_pods_for_resource, namespace, "deployments", deployment)
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
 from state.state import State
 from utils.terminal import Color, colorize
@@ -19,6 +19,22 @@ class Command(ABC):
     def has_path_completion(self) -> bool:
         return False
 
+    def has_structured_output(self) -> bool:
+        """Check if the command emits records with --output json, ndjson or names"""
+        return False
+
+    def is_read_only(self, args: List[str]) -> bool:
+        """Check if the command only reads, so scripts can run it concurrently with other read-only commands"""
+        return False
+
+    def accepts_several_paths(self, args: List[str]) -> bool:
+        """Check if the command takes several paths, so xargs passes them to one call instead of one call per path"""
+        return False
+
+    def is_interactive(self, args: List[str]) -> bool:
+        """Check if the command needs the terminal, e.g. for an editor or a shell in a pod"""
+        return False
+
     def get_aliases(self) -> List[str]:
         """Get the aliases for the command"""
         return []
@@ -70,6 +86,12 @@ class FileCommand(Command):
         if filename is None:
             raise Exception()
 
+        namespace, resource_type, resource_name = self._parse_path(state, filename)
+
+        self._do_execute(state, namespace, resource_type, resource_name)
+
+    def _parse_path(self, state: State, filename: str) -> Tuple[str, str, str]:
+        """Split a file path into (namespace, resource_type, resource_name)"""
         current_path = state.get_current_path()
 
         if not filename.startswith('/'):
@@ -102,7 +124,7 @@ class FileCommand(Command):
         else:
             raise Exception(f"Error: Invalid path format: {filename}")
 
-        self._do_execute(state, namespace, resource_type, resource_name)
+        return namespace, resource_type, resource_name
 
     def has_path_completion(self) -> bool:
         return True
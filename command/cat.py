@@ -1,12 +1,15 @@
-from typing import List, Optional
+import itertools
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
 
-from pygments import highlight
-from pygments.formatters import TerminalFormatter
-from pygments.lexers import YamlLexer
+from utils import output
+from utils.concurrency import map_concurrently
+from utils.pager import page
+from utils.render import stream_resource
 from utils.terminal import Color, colorize
 
 from command.base import FileCommand
 from k8s_client import get_kubernetes_client
+from state.path_manager import has_wildcards
 from state.state import State
 
 k8s_client = get_kubernetes_client()
@@ -27,6 +30,15 @@ class CatCommand(FileCommand):
         """Get the help text for the command"""
         return "Display the YAML definition of a resource"
 
+    def has_structured_output(self) -> bool:
+        return True
+
+    def is_read_only(self, args: List[str]) -> bool:
+        return True
+
+    def accepts_several_paths(self, args: List[str]) -> bool:
+        return True
+
     def get_usage(self) -> str:
         """Get the extended usage information for the command"""
         cmd = colorize("cat", Color.BRIGHT_YELLOW)
@@ -48,7 +60,7 @@ class CatCommand(FileCommand):
             return '/'.join(colored_parts)
 
         usage = [
-            f"{colorize('Usage:', Color.BRIGHT_GREEN)} {cmd} {resource_path}",
+            f"{colorize('Usage:', Color.BRIGHT_GREEN)} {cmd} {resource_path} [{resource_path}...]",
             f"       {view_cmd} {resource_path}",
             f"       {show_cmd} {resource_path}",
             "",
@@ -65,18 +77,100 @@ class CatCommand(FileCommand):
             f"  {colorize('#', Color.BRIGHT_BLACK)} Display the YAML definition of a specific pod in a deployment",
             f"  {cmd} {colorize_path('default/deployments/example-deployment/example-deployment-7f5569bb7f-vsmbx')}",
             "",
+            f"  {colorize('#', Color.BRIGHT_BLACK)} Display all configmaps of a namespace as a multi-document YAML stream",
+            f"  {cmd} {colorize_path('default/configmaps/*')}",
+            "",
+            f"  {colorize('#', Color.BRIGHT_BLACK)} Display a deployment in every namespace",
+            f"  {cmd} {colorize_path('*/deployments/api')}",
+            "",
             f"{colorize('Notes:', Color.BRIGHT_GREEN)}",
             f"  - The resource must be a {colorize('file', Color.BRIGHT_CYAN)}, not a {colorize('directory', Color.BRIGHT_BLUE)}",
             f"  - Supports both {colorize('absolute paths', Color.BRIGHT_CYAN)} (starting with /) and {colorize('relative paths', Color.BRIGHT_CYAN)}",
-            f"  - The output is {colorize('syntax-highlighted YAML', Color.BRIGHT_MAGENTA)}",
+            f"  - Paths can contain wildcards ({colorize('*', Color.BRIGHT_MAGENTA)}, {colorize('?', Color.BRIGHT_MAGENTA)}, {colorize('[...]', Color.BRIGHT_MAGENTA)}); multiple resources are fetched concurrently",
+            "    and shown in the order of the arguments, the matches of a wildcard sorted by path",
+            f"  - The output is {colorize('syntax-highlighted YAML', Color.BRIGHT_MAGENTA)}, shown through the {colorize('PAGER', Color.BRIGHT_MAGENTA)} (default 'less -FRX') as it is rendered",
             f"  - You can access specific pods of a deployment using the path format: {colorize('/namespace/deployments/deployment-name/pod-name', Color.BRIGHT_CYAN)}",
         ]
         return "\n".join(usage)
 
+    def execute(self, state: State, args: List[str]) -> None:
+        """Execute the cat command"""
+        if len(args) <= 1 and not (args and has_wildcards(args[0])):
+            super().execute(state, args)
+            return
+
+        # Expand wildcards and collect every resource to show, in the order of the arguments
+        targets: List[Tuple[str, str, str]] = []
+        # Resources matched by each wildcard, which are left out silently if they don't exist, unlike the named ones
+        matches: Dict[str, List[Tuple[str, str, str]]] = {}
+        named: Set[Tuple[str, str, str]] = set()
+        for resource_path in args:
+            wildcard = has_wildcards(resource_path)
+            paths = state.expand_path(resource_path) if wildcard else [resource_path]
+            if wildcard:
+                matches[resource_path] = []
+
+            for path in paths:
+                try:
+                    target = self._get_target(*self._parse_path(state, path))
+                except Exception as e:
+                    # Segments without wildcards are not checked by the expansion
+                    if not wildcard:
+                        output.error(str(e))
+                    continue
+
+                if target is None:
+                    output.error(f"Error: Cannot use 'cat' on a directory: {path}")
+                    continue
+
+                if wildcard:
+                    matches[resource_path].append(target)
+                else:
+                    named.add(target)
+                if target not in targets:
+                    targets.append(target)
+
+        # Fetch all resources concurrently
+        resources = dict(zip(targets, map_concurrently(lambda target: k8s_client.get_resource(*target), targets)))
+
+        for pattern, pattern_targets in matches.items():
+            if not any(resources[target] for target in pattern_targets):
+                output.error(f"Error: No resources match {pattern}")
+
+        found = []
+        for (namespace, resource_type, resource_name), resource in resources.items():
+            if resource and output.is_structured():
+                path = f"/{namespace}/{resource_type}/{resource_name}"
+                output.emit({"path": path, "resource": resource}, path)
+            elif resource:
+                found.append(resource)
+            elif (namespace, resource_type, resource_name) in named:
+                output.error(f"Error: Could not get YAML definition for {resource_type}/{resource_name}")
+
+        if found:
+            page(self._stream_documents(found))
+
+    def _get_target(self, namespace: str, resource_type: str, resource_name: str) -> Optional[Tuple[str, str, str]]:
+        """Get the resource a path refers to, or None for directories"""
+        if not resource_name:
+            return None
+
+        # A pod of a workload controller is shown as a plain pod
+        if resource_type in ["deployments", "statefulsets", "daemonsets", "replicasets"] and '/' in resource_name:
+            return namespace, "pods", resource_name.split('/')[1]
+
+        return namespace, resource_type, resource_name
+
+    def _stream_documents(self, resources: List[Dict[str, Any]]) -> Iterator[str]:
+        """Render resources as a multi-document YAML stream"""
+        for resource in resources:
+            yield "---\n"
+            yield from stream_resource(resource)
+
     def _get_filename(self, args: List[str]) -> Optional[str]:
         """Parse filename from args"""
         if not args:
-            print(colorize("Error: No filename provided", Color.BRIGHT_RED))
+            output.error("Error: No filename provided")
             return None
 
         return args[0]
@@ -88,19 +182,18 @@ class CatCommand(FileCommand):
             # This is a namespace
             if namespace:
                 # We can cat a namespace as it's a resource
-                yaml_content = k8s_client.get_resource_yaml("", "namespaces", namespace)
-                if yaml_content:
-                    highlighted_yaml = highlight(yaml_content, YamlLexer(), TerminalFormatter())
-                    print(highlighted_yaml)
+                resource = k8s_client.get_resource("", "namespace", namespace)
+                if resource:
+                    self._show_resource(resource, f"/{namespace}")
                     return
             else:
                 # This is the root directory
-                print(colorize("Error: Cannot use 'cat' on a directory. Use 'ls' to view directory contents.", Color.BRIGHT_RED))
+                output.error("Error: Cannot use 'cat' on a directory. Use 'ls' to view directory contents.")
                 return
 
         # Prevent using cat on resource type directories
         if resource_type and not resource_name:
-            print(colorize("Error: Cannot use 'cat' on a directory. Use 'ls' to view directory contents.", Color.BRIGHT_RED))
+            output.error("Error: Cannot use 'cat' on a directory. Use 'ls' to view directory contents.")
             return
 
         # Check if we're trying to access a pod that belongs to a deployment
@@ -113,22 +206,27 @@ class CatCommand(FileCommand):
             if len(parts) == 2:
                 pod_name = parts[1]
                 # Now we want to cat the pod, not the deployment
-                yaml_content = k8s_client.get_resource_yaml(namespace, "pods", pod_name)
+                resource = k8s_client.get_resource(namespace, "pods", pod_name)
 
-                if yaml_content:
-                    # Apply syntax highlighting
-                    highlighted_yaml = highlight(yaml_content, YamlLexer(), TerminalFormatter())
-                    print(highlighted_yaml)
+                if resource:
+                    self._show_resource(resource, f"/{namespace}/pods/{pod_name}")
                 else:
-                    print(colorize(f"Error: Could not get YAML definition for pod {pod_name}", Color.BRIGHT_RED))
+                    output.error(f"Error: Could not get YAML definition for pod {pod_name}")
                 return
 
         # Regular case - get the YAML definition of the resource
-        yaml_content = k8s_client.get_resource_yaml(namespace, resource_type, resource_name)
+        resource = k8s_client.get_resource(namespace, resource_type, resource_name)
 
-        if yaml_content:
-            # Apply syntax highlighting
-            highlighted_yaml = highlight(yaml_content, YamlLexer(), TerminalFormatter())
-            print(highlighted_yaml)
+        if resource:
+            self._show_resource(resource, f"/{namespace}/{resource_type}/{resource_name}")
         else:
-            print(colorize(f"Error: Could not get YAML definition for {resource_type}/{resource_name}", Color.BRIGHT_RED))
+            output.error(f"Error: Could not get YAML definition for {resource_type}/{resource_name}")
+
+    def _show_resource(self, resource: Dict[str, Any], path: str) -> None:
+        """Stream the YAML of a resource to the terminal, through a pager"""
+        if output.is_structured():
+            output.emit({"path": path, "resource": resource}, path)
+            return
+
+        # Render as YAML, with syntax highlighting on terminals, followed by an empty line
+        page(itertools.chain(stream_resource(resource), ["\n"]))
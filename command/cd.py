@@ -2,6 +2,7 @@ from typing import List, Optional
 
 from command.base import DirectoryCommand
 from state.state import State
+from utils import output
 from utils.terminal import Color, colorize
 
 
@@ -67,7 +68,7 @@ class CdCommand(DirectoryCommand):
         if directory == "-":
             previous_path = state.get_previous_path()
             if previous_path is None or previous_path == "":
-                print(colorize("Error: No previous directory", Color.BRIGHT_RED))
+                output.error("Error: No previous directory")
                 return
 
             # Store the current path temporarily to swap with previous path
@@ -95,7 +96,7 @@ class CdCommand(DirectoryCommand):
                     # We use proper path management API instead of directly manipulating _path
                     state.path_manager.set_path(temp_previous)
             except Exception as e:
-                print(colorize(f"Error navigating to previous directory: {str(e)}", Color.BRIGHT_RED))
+                output.error(f"Error navigating to previous directory: {str(e)}")
                 # Restore the previous state if there was an error
                 state.previous_path = previous_path
             return
@@ -132,10 +133,10 @@ class CdCommand(DirectoryCommand):
             else:
                 # Check if the directory exists
                 if not state.is_directory(directory):
-                    print(colorize(f"Error: Cannot cd to '{directory}': Not a directory", Color.BRIGHT_RED))
+                    output.error(f"Error: Cannot cd to '{directory}': Not a directory")
                     return
 
                 # Add the segment to the path
                 state.add_path_segment(directory)
         except Exception as e:
-            print(colorize(f"Error executing command: {str(e)}", Color.BRIGHT_RED))
+            output.error(f"Error executing command: {str(e)}")
@@ -0,0 +1,141 @@
+from typing import List, Optional, Tuple
+
+from command.base import GenericCommand
+from k8s_client import get_cluster_index, get_kubernetes_client
+from state.state import State
+from utils import output
+from utils.concurrency import map_concurrently
+from utils.terminal import Color, colorize
+
+k8s_client = get_kubernetes_client()
+
+
+class DuCommand(GenericCommand):
+    """Command to count the resources under a directory"""
+
+    def get_name(self) -> str:
+        """Get the name of the command"""
+        return "du"
+
+    def get_aliases(self) -> List[str]:
+        """Get the aliases for the command"""
+        return ["count"]
+
+    def get_help(self) -> str:
+        """Get the help text for the command"""
+        return "Count the resources of each type under a directory"
+
+    def has_path_completion(self) -> bool:
+        return True
+
+    def has_structured_output(self) -> bool:
+        return True
+
+    def is_read_only(self, args: List[str]) -> bool:
+        return True
+
+    def get_usage(self) -> str:
+        """Get the extended usage information for the command"""
+        cmd = colorize("du", Color.BRIGHT_YELLOW)
+        directory = colorize("[directory]", Color.BRIGHT_CYAN)
+        summarize = colorize("-s", Color.BRIGHT_MAGENTA)
+
+        usage = [
+            f"{colorize('Usage:', Color.BRIGHT_GREEN)} {cmd} [{summarize}] {directory}",
+            "",
+            f"{colorize('Examples:', Color.BRIGHT_GREEN)}",
+            f"  {colorize('#', Color.BRIGHT_BLACK)} Count the resources of each type in every namespace",
+            f"  {cmd} {colorize('/', Color.BRIGHT_BLUE)}",
+            "",
+            f"  {colorize('#', Color.BRIGHT_BLACK)} Show only the total number of resources in a namespace",
+            f"  {cmd} {summarize} {colorize('default', Color.BRIGHT_BLUE)}",
+            "",
+            f"  {colorize('#', Color.BRIGHT_BLACK)} Count the replicasets of a namespace",
+            f"  {colorize('count', Color.BRIGHT_YELLOW)} {colorize('default', Color.BRIGHT_BLUE)}/{colorize('replicasets', Color.BRIGHT_GREEN)}",
+            "",
+            f"{colorize('Notes:', Color.BRIGHT_GREEN)}",
+            f"  - If no directory is specified, counts the {colorize('current directory', Color.BRIGHT_BLUE)}",
+            "  - Works on the root, a namespace or a resource type directory",
+            f"  - {summarize} shows only the total for the directory instead of every directory below it",
+            "  - Counts in a namespace come from single-item LISTs of object metadata, so no resource",
+            "    definitions are downloaded however many resources there are",
+            "  - The root is counted from one LIST for all namespaces per type instead of one per namespace,",
+            f"    shared with {colorize('ls -l /', Color.BRIGHT_YELLOW)}",
+        ]
+        return "\n".join(usage)
+
+    def _parse_args(self, args: List[str]) -> Optional[Tuple[str, bool]]:
+        """Parse command arguments
+
+        Returns:
+            Optional[Tuple[str, bool]]: path and whether to show only its total, or None on error
+        """
+        summarize = False
+        paths = []
+
+        for arg in args:
+            if arg == "-s":
+                summarize = True
+            elif arg.startswith("-") and len(arg) > 1:
+                output.error(f"Error: Unknown option {arg}")
+                return None
+            else:
+                paths.append(arg)
+
+        if len(paths) > 1:
+            output.error("Error: du takes at most one directory")
+            return None
+
+        return (paths[0] if paths else ""), summarize
+
+    def execute(self, state: State, args: List[str]) -> None:
+        """Execute the du command"""
+        parsed = self._parse_args(args)
+        if parsed is None:
+            return
+
+        path, summarize = parsed
+        try:
+            segments = state.resolve_path(path)
+        except Exception as e:
+            output.error(f"Error: {str(e)}")
+            return
+
+        if len(segments) > 2:
+            output.error("Error: du works on the root, a namespace or a resource type directory")
+            return
+
+        namespaces = segments[:1] or sorted(k8s_client.get_namespaces())
+        resource_types = segments[1:2] or k8s_client.get_resource_types()
+
+        pairs = [(namespace, resource_type) for namespace in namespaces for resource_type in resource_types]
+        if len(namespaces) > 1:
+            # Several namespaces are counted from one LIST for all namespaces per type, shared with ls -l /
+            cluster_index = get_cluster_index()
+            resources = dict(zip(resource_types, map_concurrently(cluster_index.get_resources_by_namespace, resource_types)))
+            counts = {(namespace, resource_type): len(resources[resource_type].get(namespace, [])) for namespace, resource_type in pairs}
+        else:
+            # One cheap count per type, all at once
+            counts = dict(zip(pairs, map_concurrently(self._count, pairs)))
+
+        # Like du, print every directory below the path after its contents, and the path itself last
+        lines: List[Tuple[int, List[str]]] = []
+        for namespace in namespaces:
+            for resource_type in resource_types:
+                lines.append((counts[(namespace, resource_type)], [namespace, resource_type]))
+            lines.append((sum(counts[(namespace, resource_type)] for resource_type in resource_types), [namespace]))
+        lines.append((sum(counts.values()), []))
+
+        for count, directory in lines:
+            if len(directory) < len(segments) or (summarize and len(directory) > len(segments)):
+                continue
+            path = "/" + "/".join(directory)
+            if output.is_structured():
+                output.emit({"path": path, "count": count}, path)
+            else:
+                print(f"{count}\t{colorize(path, Color.BRIGHT_BLUE)}")
+
+    def _count(self, pair: Tuple[str, str]) -> int:
+        """Count the resources of a type in a namespace"""
+        namespace, resource_type = pair
+        return k8s_client.count_resources(namespace, resource_type)
@@ -2,33 +2,58 @@
 """
 Edit command for K8sh
 """
+import difflib
 import os
+import shlex
 import subprocess
-from typing import List, Optional
+import tempfile
+from typing import Any, Dict, List, Optional
+
+import yaml
 
 from command.base import FileCommand
-from k8s_client import get_kubernetes_client
+from k8s_client import ResourceConflictError, get_cluster_index, get_kubernetes_client, uses_mock_client
 from state.state import State
+from utils import output
+from utils.manifest import apply_merge_patch, clean_manifest, create_merge_patch, patches_overlap
+from utils.render import dump_yaml
 from utils.terminal import Color, colorize
 
 k8s_client = get_kubernetes_client()
 
 
+# Header of the temporary file opened in the editor
+EDIT_HEADER = """# Please edit the object below. Lines beginning with a '#' will be ignored,
+# and an empty file will abort the edit. Only the changed fields are sent
+# to the server, as a JSON merge patch.
+#
+"""
+
+CONTROLLER_TYPES = ["deployments", "statefulsets", "daemonsets", "replicasets"]
+
+
 class EditCommand(FileCommand):
     """Edit command for K8sh"""
 
+    def __init__(self) -> None:
+        super().__init__()
+        self.dry_run = False
+
     def get_name(self) -> str:
         """Get the name of the command"""
         return "edit"
 
     def get_help(self) -> str:
         """Get the help text for the command"""
-        return "Edit a resource using kubectl edit"
+        return "Edit a resource in your editor"
 
     def get_aliases(self) -> List[str]:
         """Get the aliases for the command"""
         return ["vim", "nano"]
 
+    def is_interactive(self, args: List[str]) -> bool:
+        return True
+
     def get_usage(self) -> str:
         """Get the extended usage information for the command"""
         edit_cmd = colorize("edit", Color.BRIGHT_YELLOW)
@@ -50,7 +75,7 @@ class EditCommand(FileCommand):
             return '/'.join(colored_parts)
 
         usage = [
-            f"{colorize('Usage:', Color.BRIGHT_GREEN)} {edit_cmd} {resource_path}",
+            f"{colorize('Usage:', Color.BRIGHT_GREEN)} {edit_cmd} [{colorize('--dry-run', Color.BRIGHT_MAGENTA)}] {resource_path}",
             f"       {vim_cmd} {resource_path}  {colorize('# Use vim as editor', Color.BRIGHT_BLACK)}",
             f"       {nano_cmd} {resource_path}  {colorize('# Use nano as editor', Color.BRIGHT_BLACK)}",
             "",
@@ -64,17 +89,28 @@ class EditCommand(FileCommand):
             f"  {colorize('#', Color.BRIGHT_BLACK)} Edit a resource using nano",
             f"  {nano_cmd} {colorize_path('namespace/configmaps/my-config')}",
             "",
+            f"  {colorize('#', Color.BRIGHT_BLACK)} Show the changes without applying them",
+            f"  {edit_cmd} {colorize('--dry-run', Color.BRIGHT_MAGENTA)} {colorize_path('namespace/configmaps/my-config')}",
+            "",
             f"{colorize('Notes:', Color.BRIGHT_GREEN)}",
             f"  - The editor used depends on the command name or {colorize('EDITOR', Color.BRIGHT_MAGENTA)} environment variable",
             f"  - If using {colorize('edit', Color.BRIGHT_YELLOW)}, the {colorize('EDITOR', Color.BRIGHT_MAGENTA)} environment variable is used (defaults to {colorize('vi', Color.BRIGHT_YELLOW)})",
             f"  - If using {colorize('vim', Color.BRIGHT_YELLOW)} or {colorize('nano', Color.BRIGHT_YELLOW)}, that specific editor is used",
+            "  - Only the changed fields are sent to the server, as a JSON merge patch, and a diff is shown first",
+            "  - The resource version is checked when patching: if the resource was changed in the meantime,",
+            "    the edit is retried when the changes don't overlap and aborted otherwise",
         ]
         return "\n".join(usage)
 
+    def execute(self, state: State, args: List[str]) -> None:
+        """Execute the edit command"""
+        self.dry_run = "--dry-run" in args
+        super().execute(state, [arg for arg in args if arg != "--dry-run"])
+
     def _get_filename(self, args: List[str]) -> Optional[str]:
         """Parse filename from args"""
         if not args:
-            print("Error: No resource specified")
+            output.error("Error: No resource specified")
             return None
 
         return args[0]
@@ -84,12 +120,12 @@ class EditCommand(FileCommand):
         # Handle special cases for directories
         if resource_type == "" and resource_name == "" and not namespace:
             # This is the root directory
-            print(colorize("Error: Cannot use 'edit' on a directory. Use 'ls' to view directory contents.", Color.BRIGHT_RED))
+            output.error("Error: Cannot use 'edit' on a directory. Use 'ls' to view directory contents.")
             return
 
         # Prevent using edit on resource type directories
         if resource_type and not resource_name:
-            print(colorize("Error: Cannot use 'edit' on a directory. Use 'ls' to view directory contents.", Color.BRIGHT_RED))
+            output.error("Error: Cannot use 'edit' on a directory. Use 'ls' to view directory contents.")
             return
 
         # Get the editor from environment variables or use vi as default
@@ -108,22 +144,142 @@ class EditCommand(FileCommand):
             # For specific resource types with names
             cmd = ["kubectl", "edit", resource_type, resource_name, "-n", namespace]
 
-        # In test mode (DEBUG=1 or K8SH_MOCK=1), just print the command that would be run
-        if os.environ.get("DEBUG") == "1" or os.environ.get("K8SH_MOCK") == "1":
+        # In test mode (DEBUG=1 or a mock client), just print the command that would be run
+        if os.environ.get("DEBUG") == "1" or uses_mock_client():
             # Format the output exactly as the tests expect
             # Always use 'mock-editor' in test mode to avoid dependency on external editors
             mock_editor = "mock-editor"
             print(f"Would run: EDITOR={mock_editor} {' '.join(cmd)}")
             return
 
+        self._edit_resource(namespace, resource_type, resource_name, editor)
+
+    def _edit_resource(self, namespace: str, resource_type: str, resource_name: str, editor: str) -> None:
+        """Edit a resource in the editor and send the changes as a merge patch"""
+        # A pod of a controller is edited as a plain pod
+        if resource_type in CONTROLLER_TYPES and "/" in resource_name:
+            resource_type, resource_name = "pods", resource_name.split("/")[1]
+
+        path = f"{namespace}/{resource_type}/{resource_name}" if namespace else resource_name
+
+        # Reuse the resource fetched by a previous cat if possible
+        resource = k8s_client.get_resource(namespace, resource_type, resource_name, cached=True)
+        if resource is None:
+            output.error(f"Error: Could not get resource {path}")
+            return
+
+        original = clean_manifest(resource)
+        modified = self._run_editor(original, editor)
+        if modified is None:
+            return
+
+        patch = create_merge_patch(original, modified)
+        if not patch:
+            print("Edit cancelled, no changes made.")
+            return
+
+        self._print_diff(original, modified)
+        if self.dry_run:
+            print(f"{path} not edited (dry run)")
+            return
+
+        resource_version = resource.get("metadata", {}).get("resourceVersion")
         try:
-            # Set the EDITOR environment variable for the subprocess
-            env = os.environ.copy()
-            env["EDITOR"] = editor
-
-            # Execute the kubectl command
-            subprocess.run(cmd, check=True, env=env)
-        except subprocess.CalledProcessError as e:
-            print(f"Error: Failed to edit resource: {e}")
-        except FileNotFoundError:
-            print("Error: kubectl command not found. Please ensure kubectl is installed and in your PATH.")
+            self._patch(namespace, resource_type, resource_name, patch, resource_version)
+        except ResourceConflictError:
+            # Someone else changed the resource since it was fetched: retry on the
+            # latest version unless both changes touch the same fields
+            latest = k8s_client.get_resource(namespace, resource_type, resource_name)
+            if latest is None:
+                output.error(f"Error: Could not get resource {path}")
+                return
+
+            concurrent_patch = create_merge_patch(original, clean_manifest(latest))
+            if patches_overlap(patch, concurrent_patch):
+                output.error(f"Error: {path} was modified on the server and the changes conflict with yours")
+                print(f"Your version was saved to {self._save_edit(modified)}")
+                return
+
+            try:
+                self._patch(namespace, resource_type, resource_name, patch, latest.get("metadata", {}).get("resourceVersion"))
+            except Exception as e:
+                output.error(f"Error: Failed to edit resource: {e}")
+                return
+        except Exception as e:
+            output.error(f"Error: Failed to edit resource: {e}")
+            return
+
+        print(f"{path} edited")
+
+    def _patch(self, namespace: str, resource_type: str, resource_name: str,
+               patch: Dict[str, Any], resource_version: Optional[str]) -> None:
+        """Send a merge patch, with the resource version as a precondition"""
+        if resource_version:
+            patch = apply_merge_patch(patch, {"metadata": {"resourceVersion": resource_version}})
+
+        k8s_client.patch_resource(namespace, resource_type, resource_name, patch)
+        get_cluster_index().invalidate(resource_type)
+
+    def _run_editor(self, original: Dict[str, Any], editor: str) -> Optional[Dict[str, Any]]:
+        """Open the resource in the editor and return the edited version, or None if the edit was aborted"""
+        with tempfile.NamedTemporaryFile("w", suffix=".yaml", prefix="k8sh-edit-", delete=False) as f:
+            f.write(EDIT_HEADER)
+            f.write(dump_yaml(original))
+            filename = f.name
+
+        try:
+            try:
+                subprocess.run(shlex.split(editor) + [filename], check=True)
+            except subprocess.CalledProcessError as e:
+                output.error(f"Error: Editor exited with status {e.returncode}, edit cancelled")
+                return None
+            except FileNotFoundError:
+                output.error(f"Error: Editor '{editor}' not found. Please set the EDITOR environment variable.")
+                return None
+
+            with open(filename) as f:
+                content = f.read()
+        finally:
+            os.unlink(filename)
+
+        try:
+            modified = yaml.safe_load(content)
+        except yaml.YAMLError as e:
+            output.error(f"Error: Invalid YAML, edit cancelled: {e}")
+            print(f"Your version was saved to {self._save_text(content)}")
+            return None
+
+        if modified is None:
+            print("Edit cancelled, empty file.")
+            return None
+
+        if not isinstance(modified, dict):
+            output.error("Error: The edited document is not an object, edit cancelled")
+            return None
+
+        return modified
+
+    def _print_diff(self, original: Dict[str, Any], modified: Dict[str, Any]) -> None:
+        """Print a unified diff between the original and the edited resource"""
+        before = dump_yaml(original).splitlines()
+        after = dump_yaml(modified).splitlines()
+
+        for line in difflib.unified_diff(before, after, "original", "edited", lineterm=""):
+            if line.startswith("+") and not line.startswith("+++"):
+                print(colorize(line, Color.BRIGHT_GREEN))
+            elif line.startswith("-") and not line.startswith("---"):
+                print(colorize(line, Color.BRIGHT_RED))
+            elif line.startswith("@@"):
+                print(colorize(line, Color.BRIGHT_CYAN))
+            else:
+                print(line)
+
+    def _save_edit(self, modified: Dict[str, Any]) -> str:
+        """Save an edited resource that couldn't be applied, so it isn't lost"""
+        return self._save_text(EDIT_HEADER + dump_yaml(modified))
+
+    def _save_text(self, content: str) -> str:
+        """Save the content of an edit to a temporary file and return its name"""
+        with tempfile.NamedTemporaryFile("w", suffix=".yaml", prefix="k8sh-edit-", delete=False) as f:
+            f.write(content)
+            return f.name
@@ -2,14 +2,34 @@
 """
 Exec command for K8sh
 """
+import math
 import os
 import shlex
-import subprocess
-from typing import List, Tuple
+import tempfile
+import time
+from typing import List, Optional, Tuple
 
 from command.base import GenericCommand
+from k8s_client import get_kubernetes_client
 from state.state import State
-from utils.terminal import Color, colorize
+from utils import output
+from utils.concurrency import DEFAULT_WORKERS, map_concurrently
+from utils.terminal import Color, colorize, format_table
+
+k8s_client = get_kubernetes_client()
+
+# Resource types whose pods can be targeted by exec
+CONTROLLER_TYPES = ["deployments", "daemonsets", "statefulsets", "replicasets"]
+
+# Default per-pod timeout in seconds for exec --all
+DEFAULT_POD_TIMEOUT = 60.0
+
+# A pod to run a command in: (namespace, pod_name, container_name)
+PodTarget = Tuple[str, str, Optional[str]]
+
+# Result of running a command in a pod: (exit_code, stdout, stderr, duration)
+# The exit code is None if the command timed out
+PodResult = Tuple[Optional[int], str, str, float]
 
 
 class ExecCommand(GenericCommand):
@@ -27,12 +47,25 @@ class ExecCommand(GenericCommand):
         """Get the help text for the command"""
         return "Execute a shell in a Kubernetes resource (deployment, pod, or container)"
 
+    def accepts_several_paths(self, args: List[str]) -> bool:
+        return self._is_fanout(args)
+
+    def is_interactive(self, args: List[str]) -> bool:
+        return not self._is_fanout(args)
+
+    def _is_fanout(self, args: List[str]) -> bool:
+        """Check if the command runs in several pods with --batch or --all, capturing their output"""
+        return bool(args) and args[0] in ["--batch", "--all"]
+
     def get_usage(self) -> str:
         """Get the extended usage information for the command"""
         cmd = colorize("exec", Color.BRIGHT_YELLOW)
         ssh_cmd = colorize("ssh", Color.BRIGHT_YELLOW)
         resource_path = colorize("<resource_path>", Color.BRIGHT_CYAN)
         command = colorize("[-- command]", Color.BRIGHT_MAGENTA)
+        batch_flag = colorize("--batch", Color.BRIGHT_MAGENTA)
+        all_flag = colorize("--all", Color.BRIGHT_MAGENTA)
+        fanout_options = colorize("[-P <workers>] [--timeout <seconds>] [--output-dir <dir>]", Color.BRIGHT_MAGENTA)
 
         # Colorize resource paths in examples
         def colorize_path(path):
@@ -50,6 +83,8 @@ class ExecCommand(GenericCommand):
         usage = [
             f"{colorize('Usage:', Color.BRIGHT_GREEN)} {cmd} {resource_path} {command}",
             f"       {ssh_cmd} {resource_path} {command}",
+            f"       {cmd} {batch_flag} {resource_path}... {fanout_options} {command}",
+            f"       {cmd} {all_flag} {colorize('<controller_path>', Color.BRIGHT_CYAN)} {fanout_options} {command}",
             "",
             f"{colorize('Examples:', Color.BRIGHT_GREEN)}",
             f"  {colorize('#', Color.BRIGHT_BLACK)} Execute bash in a deployment",
@@ -69,6 +104,19 @@ class ExecCommand(GenericCommand):
             "",
             f"  {colorize('#', Color.BRIGHT_BLACK)} Execute sh in a specific container within a pod within a deployment",
             f"  {cmd} {colorize_path('namespace/deployments/nginx-deployment/pods/nginx-pod-1234/nginx')} {colorize('-- sh', Color.BRIGHT_MAGENTA)}",
+            "",
+            f"  {colorize('#', Color.BRIGHT_BLACK)} Run a command in every pod of a deployment and in another pod at once",
+            f"  {cmd} {batch_flag} {colorize_path('namespace/deployments/nginx-deployment')} {colorize_path('namespace/pods/web-pod-1234')} {colorize('-- cat /etc/hostname', Color.BRIGHT_MAGENTA)}",
+            "",
+            f"  {colorize('#', Color.BRIGHT_BLACK)} Run a command in every pod of a daemonset, 32 pods at a time, and show a summary table",
+            f"  {cmd} {all_flag} {colorize_path('namespace/daemonsets/node-exporter')} {colorize('-P 32 --timeout 10 -- uptime', Color.BRIGHT_MAGENTA)}",
+            "",
+            f"{colorize('Notes:', Color.BRIGHT_GREEN)}",
+            "  - The session is opened directly through the Kubernetes API, kubectl is not required",
+            f"  - With {batch_flag} the command runs without a terminal in all target pods concurrently and the output is collected per pod",
+            f"  - With {all_flag} the results are summarized in a table and the full output of every pod is saved to a directory",
+            f"  - {colorize('-P', Color.BRIGHT_MAGENTA)} limits the number of pods running the command at once (default: {DEFAULT_WORKERS})",
+            f"  - {colorize('--timeout', Color.BRIGHT_MAGENTA)} limits the time the command may run in each pod (default for {all_flag}: {int(DEFAULT_POD_TIMEOUT)}s)",
         ]
         return "\n".join(usage)
 
@@ -87,17 +135,11 @@ class ExecCommand(GenericCommand):
 
         return resource_args, command_args
 
-    def execute(self, state: State, args: List[str]) -> None:
-        """Execute the exec command"""
-        if not args:
-            print(colorize("Error: No resource specified", Color.BRIGHT_RED))
-            print(f"{colorize('Usage:', Color.BRIGHT_GREEN)} {colorize('exec', Color.BRIGHT_YELLOW)} {colorize('<resource>', Color.BRIGHT_CYAN)} {colorize('[-- command]', Color.BRIGHT_MAGENTA)}")
-            return
-
-        resource_args, command_args = self._parse_args(args)
-        resource_path = resource_args[0]
-
-        # Parse the resource path
+    def _resolve_path(self, state: State, resource_path: str) -> Optional[Tuple[str, str, str]]:
+        """
+        Resolve a resource path against the current directory
+        Returns a tuple of (namespace, resource_type, resource_name) or None if the path is invalid
+        """
         if resource_path.startswith('/'):
             # Absolute path
             path_components = resource_path.strip('/').split('/')
@@ -114,18 +156,71 @@ class ExecCommand(GenericCommand):
 
         # Determine the resource type and name based on the path
         if len(path_components) < 2:
-            print(colorize(f"Error: Invalid resource path: {resource_path}", Color.BRIGHT_RED))
-            return
+            output.error(f"Error: Invalid resource path: {resource_path}")
+            return None
 
         namespace = path_components[0]
         resource_type = path_components[1]
 
         if len(path_components) < 3:
-            print(f"Error: No resource name specified in path: {resource_path}")
-            return
+            output.error(f"Error: No resource name specified in path: {resource_path}")
+            return None
 
         resource_name = '/'.join(path_components[2:])
 
+        return namespace, resource_type, resource_name
+
+    def _get_pod_targets(self, namespace: str, resource_type: str, resource_name: str) -> List[Tuple[str, Optional[str]]]:
+        """
+        Get the pods a resource path refers to
+        Returns a list of (pod_name, container_name) tuples
+        """
+        path_components = resource_name.split('/')
+
+        if resource_type == "pods":
+            # Format: pod-name[/container-name]
+            container = path_components[1] if len(path_components) > 1 else None
+            return [(path_components[0], container)]
+
+        if len(path_components) > 2 and path_components[1] == "pods":
+            # Format: controller-name/pods/pod-name[/container-name]
+            container = path_components[3] if len(path_components) > 3 else None
+            return [(path_components[2], container)]
+
+        if len(path_components) > 1:
+            # Format: controller-name/pod-name[/container-name]
+            container = path_components[2] if len(path_components) > 2 else None
+            return [(path_components[1], container)]
+
+        # The whole controller - all of its pods
+        pods = k8s_client.get_pods_for_resource(namespace, resource_type, resource_name)
+        return [(pod, None) for pod in pods]
+
+    def execute(self, state: State, args: List[str]) -> None:
+        """Execute the exec command"""
+        if not args:
+            output.error("Error: No resource specified")
+            print(f"{colorize('Usage:', Color.BRIGHT_GREEN)} {colorize('exec', Color.BRIGHT_YELLOW)} {colorize('<resource>', Color.BRIGHT_CYAN)} {colorize('[-- command]', Color.BRIGHT_MAGENTA)}")
+            return
+
+        resource_args, command_args = self._parse_args(args)
+
+        if resource_args and resource_args[0] in ["--batch", "--all"]:
+            self._execute_fanout(state, resource_args[0], resource_args[1:], command_args)
+            return
+
+        if not resource_args:
+            output.error("Error: No resource specified")
+            return
+
+        resource_path = resource_args[0]
+
+        resolved = self._resolve_path(state, resource_path)
+        if resolved is None:
+            return
+
+        namespace, resource_type, resource_name = resolved
+
         # Determine the resource type and construct the kubectl command
         if resource_type == "pods":
             # Direct pod execution
@@ -140,7 +235,7 @@ class ExecCommand(GenericCommand):
                 container_name = path_components[1]
                 kubectl_resource = pod_name
                 container_option = f"-c {container_name}"
-        elif resource_type in ["deployments", "daemonsets", "statefulsets", "replicasets"]:
+        elif resource_type in CONTROLLER_TYPES:
             # For workload controllers, we need to use the resource type/name format
             # Remove the 's' at the end of the resource type for kubectl
             kubectl_resource_type = resource_type[:-1]
@@ -161,36 +256,216 @@ class ExecCommand(GenericCommand):
                     container_name = path_components[3]
                     container_option = f"-c {container_name}"
         else:
-            print(f"Error: Cannot exec into resource type '{resource_type}'")
+            output.error(f"Error: Cannot exec into resource type '{resource_type}'")
             return
 
-        # Construct the kubectl command
-        cmd_parts = ["kubectl", "exec", "-it"]
+        # In test mode (DEBUG=1), just print the equivalent kubectl command
+        if os.environ.get("DEBUG") == "1":
+            # Construct the kubectl command
+            cmd_parts = ["kubectl", "exec", "-it"]
 
-        # Add namespace if provided
-        if namespace:
-            cmd_parts.extend(["-n", namespace])
+            # Add namespace if provided
+            if namespace:
+                cmd_parts.extend(["-n", namespace])
 
-        # Add resource
-        cmd_parts.append(kubectl_resource)
+            # Add resource
+            cmd_parts.append(kubectl_resource)
 
-        # Add container option if specified
-        if container_option:
-            cmd_parts.extend(shlex.split(container_option))
+            # Add container option if specified
+            if container_option:
+                cmd_parts.extend(shlex.split(container_option))
 
-        # Add command separator and command
-        cmd_parts.append("--")
-        cmd_parts.extend(command_args)
+            # Add command separator and command
+            cmd_parts.append("--")
+            cmd_parts.extend(command_args)
 
-        # In test mode (DEBUG=1), just print the command that would be run
-        if os.environ.get("DEBUG") == "1":
             print(f"Would run: {' '.join(cmd_parts)}")
             return
 
+        targets = self._get_pod_targets(namespace, resource_type, resource_name)
+        if not targets:
+            output.error(f"Error: No pods found for {resource_type}/{resource_name}")
+            return
+
+        # Like kubectl, use the first pod of a controller
+        pod_name, container = targets[0]
+
         try:
-            # Execute the kubectl command
-            subprocess.run(cmd_parts, check=True)
-        except subprocess.CalledProcessError as e:
-            print(f"Error: Failed to exec into resource: {e}")
-        except FileNotFoundError:
-            print("Error: kubectl command not found")
+            exit_code = k8s_client.exec_interactive(namespace, pod_name, container, command_args)
+        except Exception as e:
+            output.error(f"Error: Failed to exec into resource: {e}")
+            state.set_last_exit_code(1)
+            return
+
+        state.set_last_exit_code(exit_code)
+        if exit_code != 0:
+            print(colorize(f"Command exited with code {exit_code}", Color.BRIGHT_YELLOW))
+
+    def _parse_fanout_options(self, args: List[str]) -> Optional[Tuple[List[str], int, Optional[float], Optional[str]]]:
+        """
+        Parse the options of the batch modes
+        Returns a tuple of (resource_paths, workers, timeout, output_dir) or None if the options are invalid
+        """
+        resource_paths = []
+        workers = DEFAULT_WORKERS
+        timeout = None
+        output_dir = None
+
+        i = 0
+        while i < len(args):
+            if args[i] in ["-P", "--timeout", "--output-dir"]:
+                if i + 1 >= len(args):
+                    output.error(f"Error: {args[i]} requires a value")
+                    return None
+
+                value = args[i + 1]
+                try:
+                    if args[i] == "-P":
+                        workers = int(value)
+                        if workers < 1:
+                            raise ValueError()
+                    elif args[i] == "--timeout":
+                        timeout = float(value)
+                        if not math.isfinite(timeout) or timeout <= 0:
+                            raise ValueError()
+                    else:
+                        output_dir = value
+                except ValueError:
+                    output.error(f"Error: Invalid value for {args[i]}: {value}")
+                    return None
+                i += 2
+            else:
+                resource_paths.append(args[i])
+                i += 1
+
+        return resource_paths, workers, timeout, output_dir
+
+    def _collect_targets(self, state: State, resource_paths: List[str]) -> Optional[List[PodTarget]]:
+        """Expand resource paths into the pods they refer to, keeping the order in which they were given"""
+        targets: List[PodTarget] = []
+        for resource_path in resource_paths:
+            resolved = self._resolve_path(state, resource_path)
+            if resolved is None:
+                return None
+
+            namespace, resource_type, resource_name = resolved
+            if resource_type != "pods" and resource_type not in CONTROLLER_TYPES:
+                output.error(f"Error: Cannot exec into resource type '{resource_type}'")
+                return None
+
+            pod_targets = self._get_pod_targets(namespace, resource_type, resource_name)
+            if not pod_targets:
+                print(colorize(f"Warning: No pods found for {resource_path}", Color.BRIGHT_YELLOW))
+
+            for pod_name, container in pod_targets:
+                if (namespace, pod_name, container) not in targets:
+                    targets.append((namespace, pod_name, container))
+
+        return targets
+
+    def _run_in_pods(self, targets: List[PodTarget], command_args: List[str], workers: int,
+                     timeout: Optional[float]) -> List[PodResult]:
+        """Run a command in all target pods using a bounded worker pool"""
+
+        def run(target: PodTarget) -> PodResult:
+            namespace, pod_name, container = target
+            started = time.monotonic()
+            try:
+                exit_code, stdout, stderr = k8s_client.exec_command(namespace, pod_name, container, command_args, timeout)
+                return exit_code, stdout, stderr, time.monotonic() - started
+            except TimeoutError:
+                return None, "", f"Timed out after {timeout:g}s\n", time.monotonic() - started
+            except Exception as e:
+                return -1, "", f"Error: {e}\n", time.monotonic() - started
+
+        return map_concurrently(run, targets, workers)
+
+    def _execute_fanout(self, state: State, mode: str, args: List[str], command_args: List[str]) -> None:
+        """Run a command without a terminal in many pods concurrently"""
+        options = self._parse_fanout_options(args)
+        if options is None:
+            return
+
+        resource_paths, workers, timeout, output_dir = options
+        if not resource_paths:
+            output.error("Error: No resource specified")
+            return
+
+        if mode == "--all":
+            if len(resource_paths) != 1:
+                output.error("Error: --all takes exactly one controller")
+                return
+
+            resolved = self._resolve_path(state, resource_paths[0])
+            if resolved is None:
+                return
+
+            _, resource_type, resource_name = resolved
+            if resource_type not in CONTROLLER_TYPES or '/' in resource_name:
+                output.error(f"Error: --all can only be used with {', '.join(CONTROLLER_TYPES)}")
+                return
+
+            if timeout is None:
+                timeout = DEFAULT_POD_TIMEOUT
+
+        targets = self._collect_targets(state, resource_paths)
+        if targets is None:
+            return
+
+        if not targets:
+            output.error("Error: No pods to run the command in")
+            return
+
+        results = self._run_in_pods(targets, command_args, workers, timeout)
+
+        if mode == "--all":
+            self._print_summary(targets, results, output_dir)
+        else:
+            self._print_outputs(targets, results)
+
+        failed = len([result for result in results if result[0] != 0])
+        state.set_last_exit_code(1 if failed else 0)
+        if failed:
+            print(colorize(f"Command failed in {failed} of {len(targets)} pods", Color.BRIGHT_YELLOW))
+
+    def _print_outputs(self, targets: List[PodTarget], results: List[PodResult]) -> None:
+        """Print the full output of every pod"""
+        for (namespace, pod_name, container), (exit_code, stdout, stderr, _) in zip(targets, results):
+            title = f"{namespace}/{pod_name}" + (f"/{container}" if container else "")
+            print(colorize(f"==> {title} <==", Color.BRIGHT_CYAN))
+            if stdout:
+                print(stdout, end="" if stdout.endswith("\n") else "\n")
+            if stderr:
+                print(colorize(stderr.rstrip("\n"), Color.BRIGHT_RED))
+            if exit_code is not None and exit_code != 0:
+                print(colorize(f"Command exited with code {exit_code}", Color.BRIGHT_YELLOW))
+
+    def _print_summary(self, targets: List[PodTarget], results: List[PodResult], output_dir: Optional[str]) -> None:
+        """Print a table with one line per pod and save the full output of every pod to a directory"""
+        if output_dir is None:
+            output_dir = tempfile.mkdtemp(prefix="k8sh-exec-")
+        else:
+            os.makedirs(output_dir, exist_ok=True)
+
+        rows = []
+        for (_, pod_name, container), (exit_code, stdout, stderr, duration) in zip(targets, results):
+            output = stdout + stderr
+            filename = pod_name + (f".{container}" if container else "") + ".log"
+            with open(os.path.join(output_dir, filename), "w") as f:
+                f.write(output)
+
+            if exit_code is None:
+                status = colorize("timeout", Color.BRIGHT_RED)
+            elif exit_code == 0:
+                status = colorize("0", Color.BRIGHT_GREEN)
+            else:
+                status = colorize(str(exit_code), Color.BRIGHT_RED)
+
+            first_line = output.strip().split("\n")[0] if output.strip() else ""
+            if len(first_line) > 60:
+                first_line = first_line[:57] + "..."
+
+            rows.append([pod_name, status, f"{duration:.2f}s", first_line])
+
+        print(format_table(["POD", "EXIT", "DURATION", "OUTPUT"], rows))
+        print(f"Full output of every pod saved to {colorize(output_dir, Color.BRIGHT_CYAN)}")
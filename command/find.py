@@ -0,0 +1,206 @@
+import fnmatch
+from typing import Any, Dict, List, Optional
+
+from command.base import GenericCommand
+from k8s_client import get_kubernetes_client
+from state.path_manager import has_wildcards
+from state.state import State
+from utils import output
+from utils.status import get_status_row
+from utils.terminal import Color, colorize
+
+k8s_client = get_kubernetes_client()
+
+# Pod phases, which the API server can filter on with the status.phase field selector
+POD_PHASES = ["Pending", "Running", "Succeeded", "Failed", "Unknown"]
+
+
+class FindOptions:
+    """Criteria of a find command"""
+
+    def __init__(self) -> None:
+        self.path = ""
+        self.types: List[str] = []
+        self.name: Optional[str] = None
+        self.labels: List[str] = []
+        self.fields: List[str] = []
+        self.status: Optional[str] = None
+
+
+class FindCommand(GenericCommand):
+    """Command to search resources across namespaces"""
+
+    def get_name(self) -> str:
+        """Get the name of the command"""
+        return "find"
+
+    def get_aliases(self) -> List[str]:
+        """Get the aliases for the command"""
+        return []
+
+    def get_help(self) -> str:
+        """Get the help text for the command"""
+        return "Find resources by type, name, labels, fields or status"
+
+    def has_path_completion(self) -> bool:
+        return True
+
+    def has_structured_output(self) -> bool:
+        return True
+
+    def is_read_only(self, args: List[str]) -> bool:
+        return True
+
+    def get_usage(self) -> str:
+        """Get the extended usage information for the command"""
+        cmd = colorize("find", Color.BRIGHT_YELLOW)
+        directory = colorize("[directory]", Color.BRIGHT_CYAN)
+
+        def option(name: str) -> str:
+            return colorize(name, Color.BRIGHT_MAGENTA)
+
+        usage = [
+            f"{colorize('Usage:', Color.BRIGHT_GREEN)} {cmd} {directory} [{option('-type')} TYPE] [{option('-name')} PATTERN] "
+            f"[{option('-label')} SELECTOR] [{option('-field')} SELECTOR] [{option('-status')} STATUS]",
+            "",
+            f"{colorize('Examples:', Color.BRIGHT_GREEN)}",
+            f"  {colorize('#', Color.BRIGHT_BLACK)} Find the crashing web pods in all namespaces",
+            f"  {cmd} {colorize('/', Color.BRIGHT_BLUE)} {option('-type')} pods {option('-name')} 'api-*' {option('-label')} tier=web {option('-status')} CrashLoopBackOff",
+            "",
+            f"  {colorize('#', Color.BRIGHT_BLACK)} Find the configmaps and secrets of an application in a namespace",
+            f"  {cmd} {colorize('default', Color.BRIGHT_BLUE)} {option('-type')} configmaps,secrets {option('-label')} app=web",
+            "",
+            f"  {colorize('#', Color.BRIGHT_BLACK)} Find the pods running on a node",
+            f"  {cmd} {colorize('/', Color.BRIGHT_BLUE)} {option('-type')} pods {option('-field')} spec.nodeName=node-1",
+            "",
+            f"{colorize('Notes:', Color.BRIGHT_GREEN)}",
+            f"  - The directory is the root, a namespace or a resource type; defaults to the {colorize('current directory', Color.BRIGHT_BLUE)}",
+            f"  - Without {option('-type')}, all resource types are searched; {option('-type')} accepts a comma separated list",
+            f"  - {option('-label')} and {option('-field')} take Kubernetes selectors and can be repeated; they are evaluated by the API server",
+            f"  - {option('-name')} accepts wildcards; an exact name is sent to the API server as a field selector",
+            f"  - {option('-status')} applies to pods: phases are filtered by the API server, other states such as",
+            "    CrashLoopBackOff are matched on the returned pods",
+            "  - Searching the root uses a single LIST for all namespaces per resource type, and results are",
+            "    printed as the pages of the LIST arrive",
+        ]
+        return "\n".join(usage)
+
+    def _parse_args(self, args: List[str]) -> Optional[FindOptions]:
+        """Parse command arguments, or return None on error"""
+        options = FindOptions()
+        paths = []
+
+        i = 0
+        while i < len(args):
+            arg = args[i]
+            if arg in ["-type", "-name", "-label", "-field", "-status"]:
+                if i + 1 >= len(args):
+                    output.error(f"Error: {arg} requires a value")
+                    return None
+                value = args[i + 1]
+                i += 1
+
+                if arg == "-type":
+                    options.types.extend(value for value in value.split(",") if value)
+                elif arg == "-name":
+                    options.name = value
+                elif arg == "-label":
+                    options.labels.append(value)
+                elif arg == "-field":
+                    options.fields.append(value)
+                else:
+                    options.status = value
+            elif arg.startswith("-"):
+                output.error(f"Error: Unknown option {arg}")
+                return None
+            else:
+                paths.append(arg)
+            i += 1
+
+        if len(paths) > 1:
+            output.error("Error: find takes a single directory")
+            return None
+
+        options.path = paths[0] if paths else ""
+        return options
+
+    def execute(self, state: State, args: List[str]) -> None:
+        """Execute the find command"""
+        options = self._parse_args(args)
+        if options is None:
+            return
+
+        try:
+            segments = state.resolve_path(options.path)
+        except Exception as e:
+            output.error(f"Error: {str(e)}")
+            return
+
+        if len(segments) > 2:
+            output.error("Error: find searches the root, a namespace or a resource type directory")
+            return
+
+        namespace = segments[0] if segments else None
+        resource_types = self._get_resource_types(options, segments)
+        if resource_types is None:
+            return
+
+        for resource_type in resource_types:
+            self._find(resource_type, namespace, options)
+
+    def _get_resource_types(self, options: FindOptions, segments: List[str]) -> Optional[List[str]]:
+        """Get the resource types to search, or None on error"""
+        available_types = k8s_client.get_resource_types()
+
+        for resource_type in options.types:
+            if resource_type not in available_types:
+                output.error(f"Error: Unknown resource type {resource_type}")
+                return None
+
+        if options.status is not None:
+            if any(resource_type != "pods" for resource_type in options.types):
+                output.error("Error: -status only applies to pods")
+                return None
+            resource_types = ["pods"]
+        else:
+            resource_types = options.types or available_types
+
+        # A resource type directory restricts the search to that type
+        if len(segments) == 2:
+            resource_types = [resource_type for resource_type in resource_types if resource_type == segments[1]]
+
+        return resource_types
+
+    def _find(self, resource_type: str, namespace: Optional[str], options: FindOptions) -> None:
+        """Print the paths of the resources of a type matching the options, as they arrive"""
+        label_selector = ",".join(options.labels) or None
+        fields = list(options.fields)
+
+        # Push down what the API server can filter on
+        if options.name and not has_wildcards(options.name):
+            fields.append(f"metadata.name={options.name}")
+        if options.status in POD_PHASES:
+            fields.append(f"status.phase={options.status}")
+        field_selector = ",".join(fields) or None
+
+        for resource in k8s_client.find_resources(resource_type, namespace, label_selector, field_selector):
+            if self._matches(resource_type, resource, options):
+                metadata = resource["metadata"]
+                path = f"/{metadata.get('namespace') or namespace}/{resource_type}/{metadata['name']}"
+                if output.is_structured():
+                    output.emit({"name": metadata["name"], "namespace": metadata.get("namespace") or namespace,
+                                 "type": resource_type, "path": path}, path)
+                else:
+                    print(path, flush=True)
+
+    def _matches(self, resource_type: str, resource: Dict[str, Any], options: FindOptions) -> bool:
+        """Check the criteria which can't be evaluated by the API server"""
+        if options.name and not fnmatch.fnmatchcase(resource["metadata"]["name"], options.name):
+            return False
+
+        if options.status is not None and options.status not in POD_PHASES:
+            # Like the STATUS column of ls -l, e.g. CrashLoopBackOff or Terminating
+            if get_status_row(resource_type, resource)[1].lower() != options.status.lower():
+                return False
+
+        return True
@@ -0,0 +1,290 @@
+import functools
+import re
+from typing import Any, Callable, Dict, List, Optional, Pattern, Set, Tuple
+
+from command.base import GenericCommand
+from k8s_client import get_kubernetes_client
+from state.path_manager import has_wildcards
+from state.state import State
+from utils import output
+from utils.concurrency import map_concurrently
+from utils.content_index import ContentIndex, DirectoryKey, Document
+from utils.manifest import clean_manifest, flatten_manifest
+from utils.terminal import Color, colorize
+
+k8s_client = get_kubernetes_client()
+
+# Characters which make a pattern a regular expression rather than a literal
+REGEX_CHARACTERS = set(".^$*+?{}[]\\|()")
+
+CONTROLLER_TYPES = ["deployments", "statefulsets", "daemonsets", "replicasets"]
+
+# Index of the directories searched with --index, kept for the whole session
+content_index = ContentIndex()
+
+
+class GrepOptions:
+    """Options of a grep command"""
+
+    def __init__(self) -> None:
+        self.ignore_case = False
+        self.files_only = False
+        self.fixed_strings = False
+        self.use_index = False
+        self.pattern = ""
+        self.paths: List[str] = []
+
+
+class GrepCommand(GenericCommand):
+    """Command to search the content of resources"""
+
+    def get_name(self) -> str:
+        """Get the name of the command"""
+        return "grep"
+
+    def get_aliases(self) -> List[str]:
+        """Get the aliases for the command"""
+        return []
+
+    def get_help(self) -> str:
+        """Get the help text for the command"""
+        return "Search the content of resources, e.g. configmap data, env vars or images"
+
+    def has_path_completion(self) -> bool:
+        return True
+
+    def has_structured_output(self) -> bool:
+        return True
+
+    def is_read_only(self, args: List[str]) -> bool:
+        return True
+
+    def accepts_several_paths(self, args: List[str]) -> bool:
+        return True
+
+    def get_usage(self) -> str:
+        """Get the extended usage information for the command"""
+        cmd = colorize("grep", Color.BRIGHT_YELLOW)
+        pattern = colorize("<pattern>", Color.BRIGHT_CYAN)
+        path = colorize("[path...]", Color.BRIGHT_CYAN)
+
+        def option(name: str) -> str:
+            return colorize(name, Color.BRIGHT_MAGENTA)
+
+        def colorize_path(path: str) -> str:
+            return colorize(path, Color.BRIGHT_BLUE)
+
+        usage = [
+            f"{colorize('Usage:', Color.BRIGHT_GREEN)} {cmd} [{option('-i')}] [{option('-l')}] [{option('-F')}] [{option('--index')}] {pattern} {path}",
+            "",
+            f"{colorize('Examples:', Color.BRIGHT_GREEN)}",
+            f"  {colorize('#', Color.BRIGHT_BLACK)} Which deployments use an image, in all namespaces",
+            f"  {cmd} {option('-l')} nginx:1.25 {colorize_path('/*/deployments')}",
+            "",
+            f"  {colorize('#', Color.BRIGHT_BLACK)} Search the data of the configmaps of a namespace, ignoring case",
+            f"  {cmd} {option('-i')} 'database_url' {colorize_path('default/configmaps/*')}",
+            "",
+            f"  {colorize('#', Color.BRIGHT_BLACK)} Search everything, keeping the fetched resources for the next searches",
+            f"  {cmd} {option('--index')} LOG_LEVEL {colorize_path('/')}",
+            "",
+            f"{colorize('Notes:', Color.BRIGHT_GREEN)}",
+            "  - The pattern is a regular expression, matched on lines like 'spec.template.spec.containers[0].image: nginx:1.25'",
+            "  - Paths can be resources, resource types, namespaces or the root, and can contain wildcards;",
+            f"    defaults to the {colorize('current directory', Color.BRIGHT_BLUE)}",
+            "  - Directories are fetched with one LIST per resource type (for all namespaces at the root), resources",
+            "    with concurrent GETs",
+            f"  - {option('-i')} ignores case, {option('-l')} only prints the paths of matching resources, "
+            f"{option('-F')} takes the pattern as a fixed string",
+            f"  - With {option('--index')}, fetched directories are indexed and reused by the next searches for a few minutes",
+        ]
+        return "\n".join(usage)
+
+    def _parse_args(self, args: List[str]) -> Optional[GrepOptions]:
+        """Parse command arguments, or return None on error"""
+        options = GrepOptions()
+        positional: List[str] = []
+
+        for arg in args:
+            if arg == "-i":
+                options.ignore_case = True
+            elif arg == "-l":
+                options.files_only = True
+            elif arg == "-F":
+                options.fixed_strings = True
+            elif arg == "--index":
+                options.use_index = True
+            elif arg.startswith("-") and len(arg) > 1 and not positional:
+                output.error(f"Error: Unknown option {arg}")
+                return None
+            else:
+                positional.append(arg)
+
+        if not positional:
+            output.error("Error: No pattern specified")
+            return None
+
+        options.pattern = positional[0]
+        options.paths = positional[1:] or [""]
+        return options
+
+    def execute(self, state: State, args: List[str]) -> None:
+        """Execute the grep command"""
+        options = self._parse_args(args)
+        if options is None:
+            return
+
+        try:
+            flags = re.MULTILINE | (re.IGNORECASE if options.ignore_case else 0)
+            regex = re.compile(re.escape(options.pattern) if options.fixed_strings else options.pattern, flags)
+        except re.error as e:
+            output.error(f"Error: Invalid pattern: {e}")
+            return
+
+        directories, resources = self._get_targets(state, options.paths)
+        documents = self._fetch(directories, resources, options.use_index)
+
+        # Literal patterns can use the index to skip resources without their tokens
+        literal = None
+        if options.use_index and (options.fixed_strings or not REGEX_CHARACTERS & set(options.pattern)):
+            literal = options.pattern
+        candidates = self._get_candidates(directories, resources, literal) if literal else None
+
+        for path in sorted(documents):
+            if candidates is not None and path not in candidates:
+                continue
+            self._search(path, documents[path][1], regex, options.files_only)
+
+    def _get_targets(self, state: State, paths: List[str]) -> Tuple[List[DirectoryKey], List[Tuple[str, str, str]]]:
+        """Get the directories, as (namespace or None for all, resource type), and resources to search"""
+        directories: List[DirectoryKey] = []
+        resources: List[Tuple[str, str, str]] = []
+        resource_types = k8s_client.get_resource_types()
+
+        for path in paths:
+            if has_wildcards(path):
+                expanded = state.expand_path(path)
+                if not expanded:
+                    output.error(f"Error: No resources match {path}")
+                segments_list = [expanded_path.strip("/").split("/") for expanded_path in expanded]
+            else:
+                try:
+                    segments_list = [state.resolve_path(path)]
+                except Exception as e:
+                    output.error(f"Error: {str(e)}")
+                    continue
+
+            for segments in segments_list:
+                if not segments:
+                    # The root: one LIST for all namespaces per resource type
+                    targets: List[DirectoryKey] = [(None, resource_type) for resource_type in resource_types]
+                    directories.extend(target for target in targets if target not in directories)
+                elif len(segments) == 1:
+                    targets = [(segments[0], resource_type) for resource_type in resource_types]
+                    directories.extend(target for target in targets if target not in directories)
+                elif len(segments) == 2:
+                    if (segments[0], segments[1]) not in directories:
+                        directories.append((segments[0], segments[1]))
+                else:
+                    # Pods of controllers and containers are searched as their pod
+                    if segments[1] in CONTROLLER_TYPES and len(segments) > 3:
+                        resource = (segments[0], "pods", segments[3])
+                    else:
+                        resource = (segments[0], segments[1], segments[2])
+                    if resource not in resources:
+                        resources.append(resource)
+
+        return directories, resources
+
+    def _fetch(self, directories: List[DirectoryKey], resources: List[Tuple[str, str, str]],
+               use_index: bool) -> Dict[str, Document]:
+        """Fetch the documents to search concurrently"""
+        jobs: List[Callable[[], Dict[str, Document]]] = []
+
+        for directory in directories:
+            jobs.append(functools.partial(self._fetch_directory, directory, use_index))
+
+        if use_index:
+            # Resources come from the index of their directory, fetched once
+            by_directory: Dict[DirectoryKey, List[str]] = {}
+            for namespace, resource_type, resource_name in resources:
+                by_directory.setdefault((namespace, resource_type), []).append(f"/{namespace}/{resource_type}/{resource_name}")
+            for directory, resource_paths in by_directory.items():
+                jobs.append(functools.partial(self._fetch_indexed_resources, directory, resource_paths))
+        else:
+            for resource in resources:
+                jobs.append(functools.partial(self._fetch_resource, *resource))
+
+        documents: Dict[str, Document] = {}
+        for result in map_concurrently(lambda job: job(), jobs):
+            documents.update(result)
+        return documents
+
+    def _fetch_directory(self, directory: DirectoryKey, use_index: bool) -> Dict[str, Document]:
+        """Fetch the documents of a directory with a single LIST, or from the index"""
+        if use_index:
+            documents = content_index.get(directory)
+            if documents is not None:
+                return documents
+
+        namespace, resource_type = directory
+        documents = {}
+        for resource in k8s_client.find_resources(resource_type, namespace):
+            metadata = resource["metadata"]
+            path = f"/{metadata.get('namespace') or namespace}/{resource_type}/{metadata['name']}"
+            documents[path] = self._make_document(resource)
+
+        if use_index:
+            content_index.put(directory, documents)
+        return documents
+
+    def _fetch_indexed_resources(self, directory: DirectoryKey, resource_paths: List[str]) -> Dict[str, Document]:
+        """Get the documents of some resources of a directory from the index"""
+        documents = self._fetch_directory(directory, True)
+        return {path: documents[path] for path in resource_paths if path in documents}
+
+    def _fetch_resource(self, namespace: str, resource_type: str, resource_name: str) -> Dict[str, Document]:
+        """Fetch the document of a single resource"""
+        resource = k8s_client.get_resource(namespace, resource_type, resource_name)
+        if resource is None:
+            output.error(f"Error: Could not get {namespace}/{resource_type}/{resource_name}")
+            return {}
+        return {f"/{namespace}/{resource_type}/{resource_name}": self._make_document(resource)}
+
+    def _make_document(self, resource: Dict[str, Any]) -> Document:
+        """Build the searched text of a resource: its flattened fields, without the server-managed ones"""
+        manifest = clean_manifest(resource)
+        return manifest, "\n".join(flatten_manifest(manifest))
+
+    def _get_candidates(self, directories: List[DirectoryKey], resources: List[Tuple[str, str, str]],
+                        literal: str) -> Set[str]:
+        """Get the paths of the indexed documents which may contain a literal"""
+        keys = set(directories) | {(namespace, resource_type) for namespace, resource_type, _ in resources}
+        candidates: Set[str] = set()
+        for key in keys:
+            candidates.update(content_index.find_candidates(key, literal))
+        return candidates
+
+    def _search(self, path: str, text: str, regex: Pattern[str], files_only: bool) -> None:
+        """Print the matching lines of a document"""
+        # Search the whole text first, so most documents are skipped without looking at their lines
+        if not regex.search(text):
+            return
+
+        matches = [line for line in text.split("\n") if regex.search(line)]
+        if not matches:
+            return
+
+        if output.is_structured():
+            if files_only:
+                output.emit({"path": path}, path)
+            for line in [] if files_only else matches:
+                output.emit({"path": path, "line": line}, path)
+            return
+
+        if files_only:
+            print(path)
+            return
+
+        for line in matches:
+            highlighted = regex.sub(lambda match: colorize(match.group(), Color.BRIGHT_RED), line)
+            print(f"{colorize(path, Color.BRIGHT_MAGENTA)}: {highlighted}")
@@ -6,6 +6,7 @@ from typing import List
 
 from command.base import GenericCommand
 from state.state import State
+from utils import output
 from utils.terminal import Color, colorize
 
 
@@ -71,4 +72,4 @@ class HistoryCommand(GenericCommand):
                 print(f"{colorize(entry, Color.BRIGHT_BLUE)}")
 
         except Exception as e:
-            print(colorize(f"Error reading history: {str(e)}", Color.BRIGHT_RED))
+            output.error(f"Error reading history: {str(e)}")
@@ -6,10 +6,12 @@ import os
 import shlex
 import subprocess
 import json
-from typing import List, Tuple, Optional
+from typing import List, Tuple, Optional, Union
 
 from command.base import GenericCommand
+from k8s_client import uses_mock_client
 from state.state import State
+from utils import output
 from utils.terminal import Color, colorize
 
 
@@ -32,6 +34,10 @@ class LogsCommand(GenericCommand):
         """Enable path completion for this command"""
         return True
 
+    def is_read_only(self, args: List[str]) -> bool:
+        """Logs can run concurrently with other commands, unless they are followed"""
+        return "-f" not in args
+
     def get_usage(self) -> str:
         """Get the extended usage information for the command"""
         cmd = colorize("logs", Color.BRIGHT_YELLOW)
@@ -127,7 +133,7 @@ class LogsCommand(GenericCommand):
             namespace = "default"
 
         # In test/mock mode, just return a fake pod
-        if os.environ.get("DEBUG") == "1" or os.environ.get("K8SH_MOCK") == "1":
+        if os.environ.get("DEBUG") == "1" or uses_mock_client():
             fake_pod_name = f"{deployment_name}-7f5569bb7f-vsmbx"
             print(f"Found 3 pods, using pod/{fake_pod_name}")
             return fake_pod_name, namespace
@@ -155,7 +161,7 @@ class LogsCommand(GenericCommand):
             return None
 
         except (subprocess.CalledProcessError, json.JSONDecodeError, KeyError) as e:
-            print(f"Error getting pods for deployment {deployment_name}: {e}")
+            output.error(f"Error getting pods for deployment {deployment_name}: {e}")
             return None
 
     def _parse_args(self, args: List[str]) -> Tuple[List[str], bool, int]:
@@ -178,10 +184,10 @@ class LogsCommand(GenericCommand):
                         tail_lines = int(args[i + 1])
                         i += 2
                     except ValueError:
-                        print(colorize(f"Error: Invalid number of lines: {args[i + 1]}", Color.BRIGHT_RED))
+                        output.error(f"Error: Invalid number of lines: {args[i + 1]}")
                         i += 2
                 else:
-                    print(colorize("Error: -n flag requires a number", Color.BRIGHT_RED))
+                    output.error("Error: -n flag requires a number")
                     i += 1
             else:
                 resource_args.append(args[i])
@@ -192,14 +198,14 @@ class LogsCommand(GenericCommand):
     def execute(self, state: State, args: List[str]) -> None:
         """Execute the logs command"""
         if not args:
-            print(colorize("Error: No resource specified", Color.BRIGHT_RED))
+            output.error("Error: No resource specified")
             print(f"{colorize('Usage:', Color.BRIGHT_GREEN)} {colorize('logs', Color.BRIGHT_YELLOW)} {colorize('[-f] [-n <lines>]', Color.BRIGHT_MAGENTA)} {colorize('<resource>', Color.BRIGHT_CYAN)}")
             return
 
         resource_args, follow, tail_lines = self._parse_args(args)
 
         if not resource_args:
-            print(colorize("Error: No resource specified", Color.BRIGHT_RED))
+            output.error("Error: No resource specified")
             return
 
         resource_path = resource_args[0]
@@ -215,12 +221,12 @@ class LogsCommand(GenericCommand):
 
             cmd = f"{kubectl_cmd} {follow_flag} {tail_flag} -n {namespace} {pod_name}".strip()
 
-            if os.environ.get("DEBUG") == "1" or os.environ.get("K8SH_MOCK") == "1":
+            if os.environ.get("DEBUG") == "1" or uses_mock_client():
                 print(f"Would run: {cmd}")
                 return
             else:
                 # Run the actual command
-                subprocess.run(cmd, shell=True)
+                self._run_kubectl(cmd)
                 return
 
         # Special case for pod names: if in a controller directory and arg looks like a pod
@@ -258,12 +264,12 @@ class LogsCommand(GenericCommand):
 
                 cmd = f"{kubectl_cmd} {follow_flag} {tail_flag} -n {namespace} {pod_part} {container_flag}".strip()
 
-                if os.environ.get("DEBUG") == "1" or os.environ.get("K8SH_MOCK") == "1":
+                if os.environ.get("DEBUG") == "1" or uses_mock_client():
                     print(f"Would run: {cmd}")
                     return
                 else:
                     # Run the actual command
-                    subprocess.run(cmd, shell=True)
+                    self._run_kubectl(cmd)
                     return
 
         # Regular processing for standard paths
@@ -283,14 +289,14 @@ class LogsCommand(GenericCommand):
 
         # Determine the resource type and name based on the path
         if len(path_components) < 2:
-            print(colorize(f"Error: Invalid resource path: {resource_path}", Color.BRIGHT_RED))
+            output.error(f"Error: Invalid resource path: {resource_path}")
             return
 
         namespace = path_components[0]
         resource_type = path_components[1]
 
         if len(path_components) < 3:
-            print(colorize(f"Error: No resource name specified in path: {resource_path}", Color.BRIGHT_RED))
+            output.error(f"Error: No resource name specified in path: {resource_path}")
             return
 
         resource_name = '/'.join(path_components[2:])
@@ -345,7 +351,7 @@ class LogsCommand(GenericCommand):
                 kubectl_resource = f"{kubectl_resource_type}/{controller_name}"
                 container_option = ""
         else:
-            print(colorize(f"Error: Cannot get logs from resource type '{resource_type}'", Color.BRIGHT_RED))
+            output.error(f"Error: Cannot get logs from resource type '{resource_type}'")
             print(colorize("Supported resource types: pods, deployments, daemonsets, statefulsets, replicasets", Color.BRIGHT_YELLOW))
             return
 
@@ -370,15 +376,25 @@ class LogsCommand(GenericCommand):
         if container_option:
             cmd_parts.extend(shlex.split(container_option))
 
-        # In test mode (DEBUG=1 or K8SH_MOCK=1), just print the command that would be run
-        if os.environ.get("DEBUG") == "1" or os.environ.get("K8SH_MOCK") == "1":
+        # In test mode (DEBUG=1 or a mock client), just print the command that would be run
+        if os.environ.get("DEBUG") == "1" or uses_mock_client():
             print(f"Would run: {' '.join(cmd_parts)}")
             return
 
         try:
             # Execute the kubectl command
-            subprocess.run(cmd_parts, check=True)
+            self._run_kubectl(cmd_parts, check=True)
         except subprocess.CalledProcessError as e:
-            print(colorize(f"Error: Failed to get logs from resource: {e}", Color.BRIGHT_RED))
+            output.error(f"Error: Failed to get logs from resource: {e}")
         except FileNotFoundError:
-            print(colorize("Error: kubectl command not found", Color.BRIGHT_RED))
+            output.error("Error: kubectl command not found")
+
+    def _run_kubectl(self, cmd: Union[str, List[str]], check: bool = False) -> None:
+        """Run a kubectl command, a string being run through the shell, with its output on stdout"""
+        if not output.is_buffered():
+            subprocess.run(cmd, shell=isinstance(cmd, str), check=check)
+            return
+
+        # The output of kubectl has to go through sys.stdout to end up in the buffer of the command
+        result = subprocess.run(cmd, shell=isinstance(cmd, str), check=check, stdout=subprocess.PIPE, text=True)
+        print(result.stdout, end="")
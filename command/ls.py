@@ -1,8 +1,18 @@
-from typing import List
+from typing import Dict, List, Optional, Tuple
 
 from command.base import GenericCommand
+from k8s_client import get_cluster_index, get_kubernetes_client
 from state.state import State
-from utils.terminal import format_long_listing, Color, colorize
+from state.traversal import TreeWalker
+from utils import output
+from utils.concurrency import map_concurrently
+from utils.status import format_age, get_status_headers, get_status_row, has_status_columns
+from utils.terminal import format_long_listing, format_table, Color, colorize
+
+k8s_client = get_kubernetes_client()
+
+# Resource types left out of the counts of ls -l /, as they mirror other types
+NAMESPACE_COUNTS_HIDDEN = ["replicasets"]
 
 
 class LsCommand(GenericCommand):
@@ -23,6 +33,12 @@ class LsCommand(GenericCommand):
     def has_path_completion(self) -> bool:
         return True
 
+    def has_structured_output(self) -> bool:
+        return True
+
+    def is_read_only(self, args: List[str]) -> bool:
+        return True
+
     def get_usage(self) -> str:
         """Get the extended usage information for the command"""
         cmd = colorize("ls", Color.BRIGHT_YELLOW)
@@ -30,10 +46,16 @@ class LsCommand(GenericCommand):
         dir_cmd = colorize("dir", Color.BRIGHT_YELLOW)
         directory = colorize("[directory]", Color.BRIGHT_CYAN)
 
+        wide = colorize("-l", Color.BRIGHT_MAGENTA)
+        recursive = colorize("-R", Color.BRIGHT_MAGENTA)
+        depth = colorize("--depth N", Color.BRIGHT_MAGENTA)
+
         usage = [
-            f"{colorize('Usage:', Color.BRIGHT_GREEN)} {cmd} {directory}",
-            f"       {list_cmd} {directory}",
-            f"       {dir_cmd} {directory}",
+            f"{colorize('Usage:', Color.BRIGHT_GREEN)} {cmd} [{wide}] {directory}",
+            f"       {cmd} {recursive} [{depth}] {directory}",
+            f"       {list_cmd} [{wide}] {directory}",
+            f"       {dir_cmd} [{wide}] {directory}",
+            f"       {colorize('ll', Color.BRIGHT_YELLOW)} {directory}  {colorize('# Same as ls -l', Color.BRIGHT_BLACK)}",
             "",
             f"{colorize('Examples:', Color.BRIGHT_GREEN)}",
             f"  {colorize('#', Color.BRIGHT_BLACK)} List contents of the current directory",
@@ -45,26 +67,75 @@ class LsCommand(GenericCommand):
             f"  {colorize('#', Color.BRIGHT_BLACK)} List contents of a resource type within a namespace",
             f"  {cmd} {colorize('default', Color.BRIGHT_BLUE)}/{colorize('pods', Color.BRIGHT_GREEN)}",
             "",
+            f"  {colorize('#', Color.BRIGHT_BLACK)} List pods with their status, restarts and age",
+            f"  {cmd} {wide} {colorize('default', Color.BRIGHT_BLUE)}/{colorize('pods', Color.BRIGHT_GREEN)}",
+            "",
+            f"  {colorize('#', Color.BRIGHT_BLACK)} List the deployments of a namespace with their pods and containers",
+            f"  {cmd} {recursive} {colorize('default', Color.BRIGHT_BLUE)}/{colorize('deployments', Color.BRIGHT_GREEN)}",
+            "",
             f"{colorize('Notes:', Color.BRIGHT_GREEN)}",
             f"  - If no directory is specified, lists the contents of the {colorize('current directory', Color.BRIGHT_BLUE)}",
             f"  - Supports both {colorize('absolute paths', Color.BRIGHT_CYAN)} (starting with /) and {colorize('relative paths', Color.BRIGHT_CYAN)}",
             "  - Displays items in a simplified format with type, date, and name",
+            f"  - With {wide}, resource type directories are listed with status columns like 'kubectl get',",
+            "    computed from the same single LIST request that returns the names",
+            f"  - With {wide}, the root lists the namespaces with their number of resources of each type,",
+            "    from one LIST for all namespaces per type",
+            f"  - With {recursive}, directories are listed breadth-first, each level fetched concurrently;",
+            f"    {depth} limits how many levels below the directory are listed",
         ]
         return "\n".join(usage)
 
-    def _parse_args(self, args: List[str]) -> str:
+    def _parse_args(self, args: List[str]) -> Optional[Tuple[str, bool, bool, Optional[int]]]:
         """Parse command arguments
 
         Returns:
-            str: path
+            Optional[Tuple[str, bool, bool, Optional[int]]]: path, whether to use the wide listing,
+            whether to list recursively and the maximum depth, or None on error
         """
+        wide = False
+        recursive = False
+        depth = None
+        paths = []
+
+        i = 0
+        while i < len(args):
+            if args[i] in ["-l", "--wide"]:
+                wide = True
+            elif args[i] == "-R":
+                recursive = True
+            elif args[i] == "--depth":
+                if i + 1 >= len(args) or not args[i + 1].isdigit() or int(args[i + 1]) < 1:
+                    output.error("Error: --depth requires a positive number")
+                    return None
+                depth = int(args[i + 1])
+                i += 1
+            else:
+                paths.append(args[i])
+            i += 1
+
         # If there are arguments, the first one is the path
-        return args[0] if args else ""
+        return (paths[0] if paths else ""), wide, recursive, depth
 
     def execute(self, state: State, args: List[str]) -> None:
         """Execute the ls command"""
         # Parse arguments
-        path = self._parse_args(args)
+        parsed = self._parse_args(args)
+        if parsed is None:
+            return
+
+        path, wide, recursive, depth = parsed
+        wide = wide or state.get_current_command() == "ll"
+
+        if recursive:
+            try:
+                segments = state.resolve_path(path)
+            except Exception as e:
+                output.error(f"Error: {str(e)}")
+                return
+
+            self._print_recursive(segments, depth)
+            return
 
         # If a path is provided, temporarily change to that path to list its contents
         if path:
@@ -75,18 +146,8 @@ class LsCommand(GenericCommand):
                 # Try to set the path to the provided argument
                 state.set_path(path)
 
-                # Get available items at the new path
-                items = state.get_available_items()
-
-                # Print the items
-                if items:
-                    if isinstance(items, list):
-                        # Always use long listing format
-                        print(format_long_listing(items, lambda item: state.is_directory(f"{state.get_current_path()}/{item}")))
-                    else:
-                        print(items)
-                else:
-                    print("No items found")
+                # Print the items at the new path
+                self._print_items(state, wide)
 
                 # Restore original path by directly setting the path manager's internal state
                 # This avoids validation errors when restoring the path
@@ -96,17 +157,114 @@ class LsCommand(GenericCommand):
             except Exception as e:
                 # Restore original path on error by directly setting the path manager's internal state
                 state.path_manager._path = current_path.split("/") if current_path else []
-                print(f"Error: {str(e)}")
+                output.error(f"Error: {str(e)}")
         else:
             # List contents of current directory
-            items = state.get_available_items()
-
-            # Print the items
-            if items:
-                if isinstance(items, list):
-                    # Always use long listing format
-                    print(format_long_listing(items, lambda item: state.is_directory(f"{state.get_current_path()}/{item}")))
-                else:
-                    print(items)
+            self._print_items(state, wide)
+
+    def _print_items(self, state: State, wide: bool) -> None:
+        """Print the items of the current directory"""
+        path_components = state.get_current_path().split("/")
+
+        # Resource type directories get status columns, the root resource counts, everything else the long listing
+        if wide and len(path_components) == 2 and has_status_columns(path_components[1]):
+            self._print_wide_listing(*path_components)
+            return
+
+        if wide and path_components == [""]:
+            self._print_namespace_counts()
+            return
+
+        items = state.get_available_items()
+
+        if output.is_structured():
+            current_path = state.get_current_path()
+            for item in items if isinstance(items, list) else []:
+                path = f"{current_path}/{item}" if current_path else item
+                output.emit({"name": item, "path": f"/{path}", "directory": state.is_directory(path)}, f"/{path}")
+            return
+
+        # Print the items
+        if items:
+            if isinstance(items, list):
+                # Always use long listing format
+                print(format_long_listing(items, lambda item: state.is_directory(f"{state.get_current_path()}/{item}")))
             else:
+                print(items)
+        else:
+            print("No items found")
+
+    def _print_recursive(self, segments: List[str], depth: Optional[int]) -> None:
+        """List a directory and everything below it, level by level as the listings arrive"""
+        first = True
+        for level in TreeWalker(depth).walk([segments]):
+            for path, entries in level:
+                if output.is_structured():
+                    for name, is_directory in entries:
+                        item_path = "/" + "/".join(path + [name])
+                        output.emit({"name": name, "path": item_path, "directory": is_directory}, item_path)
+                    continue
+
+                if not first:
+                    print()
+                first = False
+
+                print(colorize(f"/{'/'.join(path)}:", Color.BRIGHT_BLUE))
+                if entries:
+                    is_dir: Dict[str, bool] = dict(entries)
+                    print(format_long_listing(list(is_dir), lambda item: is_dir[item]))
+
+    def _print_namespace_counts(self) -> None:
+        """Print the namespaces with the number of resources of each type, from one LIST per type"""
+        namespaces = k8s_client.get_namespaces()
+        if not namespaces:
+            if not output.is_structured():
                 print("No items found")
+            return
+
+        resource_types = [resource_type for resource_type in k8s_client.get_resource_types() if resource_type not in NAMESPACE_COUNTS_HIDDEN]
+        cluster_index = get_cluster_index()
+        counts = map_concurrently(cluster_index.get_resources_by_namespace, resource_types)
+
+        if output.is_structured():
+            for namespace in sorted(namespaces):
+                namespace_counts = {resource_type: len(resources.get(namespace, [])) for resource_type, resources in zip(resource_types, counts)}
+                output.emit({"name": namespace, "path": f"/{namespace}", "directory": True, "counts": namespace_counts}, f"/{namespace}")
+            return
+
+        rows = []
+        for namespace in sorted(namespaces):
+            row = [colorize(namespace, Color.BRIGHT_BLUE)]
+            row.extend(str(len(resources.get(namespace, []))) for resources in counts)
+            rows.append(row)
+
+        print(format_table(["NAME"] + [resource_type.upper() for resource_type in resource_types], rows))
+
+    def _print_wide_listing(self, namespace: str, resource_type: str) -> None:
+        """Print the resources of a type with their status columns, from a single LIST"""
+        resources = k8s_client.list_resources(namespace, resource_type)
+        if not resources:
+            if not output.is_structured():
+                print("No items found")
+            return
+
+        is_dir = k8s_client.is_resource_with_children(resource_type)
+        resources = sorted(resources, key=lambda resource: resource["metadata"]["name"])
+
+        if output.is_structured():
+            headers = [header.lower() for header in get_status_headers(resource_type)]
+            for resource in resources:
+                metadata = resource["metadata"]
+                path = f"/{namespace}/{resource_type}/{metadata['name']}"
+                output.emit({"name": metadata["name"], "path": path, "directory": is_dir,
+                             "columns": dict(zip(headers, get_status_row(resource_type, resource))),
+                             "creationTimestamp": metadata.get("creationTimestamp")}, path)
+            return
+
+        rows = []
+        for resource in resources:
+            metadata = resource["metadata"]
+            name = colorize(metadata["name"], Color.BRIGHT_BLUE if is_dir else Color.BRIGHT_WHITE)
+            rows.append([name] + get_status_row(resource_type, resource) + [format_age(metadata.get("creationTimestamp"))])
+
+        print(format_table(["NAME"] + get_status_headers(resource_type) + ["AGE"], rows))
@@ -0,0 +1,184 @@
+import cProfile
+import os
+import pstats
+import time
+from typing import List, Optional, Tuple
+
+from prompt_toolkit.document import Document
+
+from command.base import Command
+from command.registry import CommandRegistry
+from state.state import State
+from utils import output
+from utils.completer import K8shCompleter
+from utils.terminal import Color, colorize, format_table
+
+# Number of functions shown by default
+DEFAULT_COUNT = 20
+
+# Orders of the functions: time spent in them and the functions they call, in them only, or number of calls
+SORT_KEYS = {
+    "cumulative": 3,
+    "tottime": 2,
+    "calls": 1,
+}
+
+
+class ProfileCommand(Command):
+    """Command running another command, or a completion, under cProfile"""
+
+    def __init__(self, command_registry: CommandRegistry) -> None:
+        self._command_registry = command_registry
+
+    def get_name(self) -> str:
+        """Get the name of the command"""
+        return "profile"
+
+    def get_help(self) -> str:
+        """Get the help text for the command"""
+        return "Run a command or a completion under the profiler and show its hot functions"
+
+    def get_usage(self) -> str:
+        """Get the extended usage information for the command"""
+        cmd = colorize("profile", Color.BRIGHT_YELLOW)
+        options = colorize("[-n N] [-s cumulative|tottime|calls] [-o FILE]", Color.BRIGHT_MAGENTA)
+        command = colorize("<command> [arguments]", Color.BRIGHT_CYAN)
+        complete = colorize("--complete", Color.BRIGHT_MAGENTA)
+
+        usage = [
+            f"{colorize('Usage:', Color.BRIGHT_GREEN)} {cmd} {options} {command}",
+            f"       {cmd} {options} {complete} {colorize('<text>', Color.BRIGHT_CYAN)}",
+            "",
+            f"{colorize('Examples:', Color.BRIGHT_GREEN)}",
+            f"  {colorize('#', Color.BRIGHT_BLACK)} Show the functions a long listing spends most time in",
+            f"  {cmd} {colorize('ls', Color.BRIGHT_YELLOW)} -l {colorize('/default/pods', Color.BRIGHT_BLUE)}",
+            "",
+            f"  {colorize('#', Color.BRIGHT_BLACK)} Profile pressing Tab after some text, and keep the profile for a bug report",
+            f"  {cmd} {colorize('-o', Color.BRIGHT_MAGENTA)} tab.prof {complete} {colorize(chr(39) + 'cat /def' + chr(39), Color.BRIGHT_CYAN)}",
+            "",
+            f"{colorize('Notes:', Color.BRIGHT_GREEN)}",
+            f"  - Shows the {DEFAULT_COUNT} functions with the most cumulative time by default",
+            f"  - {colorize('-o FILE', Color.BRIGHT_MAGENTA)} writes the whole profile in the pstats format, for e.g. snakeviz or",
+            "    python -m pstats",
+            "  - Only the thread of the command is profiled; work it hands to other threads, like concurrent",
+            "    API calls, shows up as time spent waiting for them",
+        ]
+        return "\n".join(usage)
+
+    def _parse_args(self, args: List[str]) -> Optional[Tuple[int, str, Optional[str], bool, List[str]]]:
+        """Parse command arguments
+
+        Returns:
+            Optional[Tuple[int, str, Optional[str], bool, List[str]]]: number of functions, sort key, file to write,
+            whether to profile a completion, and the command with its arguments or the text to complete, or None on error
+        """
+        count = DEFAULT_COUNT
+        sort = "cumulative"
+        path = None
+        complete = False
+
+        i = 0
+        while i < len(args) and args[i].startswith("-"):
+            if args[i] == "--complete":
+                complete = True
+                i += 1
+                break
+
+            if args[i] not in ["-n", "-s", "-o"]:
+                output.error(f"Error: Unknown option {args[i]}")
+                return None
+            if i + 1 >= len(args):
+                output.error(f"Error: {args[i]} requires a value")
+                return None
+
+            value = args[i + 1]
+            if args[i] == "-n":
+                if not value.isdigit() or int(value) < 1:
+                    output.error("Error: -n requires a positive number")
+                    return None
+                count = int(value)
+            elif args[i] == "-s":
+                if value not in SORT_KEYS:
+                    output.error(f"Error: -s must be one of {', '.join(SORT_KEYS)}")
+                    return None
+                sort = value
+            else:
+                path = value
+            i += 2
+
+        if i >= len(args):
+            output.error("Error: Nothing to complete" if complete else "Error: No command specified")
+            return None
+
+        return count, sort, path, complete, args[i:]
+
+    def execute(self, state: State, args: List[str]) -> None:
+        """Execute the profile command"""
+        parsed = self._parse_args(args)
+        if parsed is None:
+            return
+
+        count, sort, path, complete, command_args = parsed
+        profiler = cProfile.Profile()
+
+        if complete:
+            # Like pressing Tab after the text
+            text = " ".join(command_args)
+            completer = K8shCompleter(self._command_registry, state)
+            start = time.perf_counter()
+            completions = profiler.runcall(lambda: list(completer.get_completions(Document(text))))
+            description = f"{len(completions)} completions of {text!r}"
+        else:
+            command = self._command_registry.get_command(command_args[0])
+            if command is None:
+                print(f"Command not found: {command_args[0]}")
+                return
+
+            state.set_current_command(command_args[0])
+            start = time.perf_counter()
+            try:
+                profiler.runcall(command.execute, state, command_args[1:])
+            except Exception as e:
+                output.error(f"Error executing command: {str(e)}")
+            finally:
+                state.set_current_command("profile")
+            description = " ".join(command_args)
+
+        elapsed = time.perf_counter() - start
+        print()
+        print(colorize(f"{description}: {elapsed:.3f}s", Color.BRIGHT_GREEN))
+
+        if path:
+            try:
+                profiler.dump_stats(path)
+            except OSError as e:
+                output.error(f"Error: Cannot write {path}: {e.strerror}")
+            else:
+                print(f"Profile written to {colorize(path, Color.BRIGHT_BLUE)}")
+
+        self._show_functions(profiler, sort, count)
+
+    def _show_functions(self, profiler: cProfile.Profile, sort: str, count: int) -> None:
+        """Show the hottest functions of a profile"""
+        # (primitive calls, total calls, own time, cumulative time, callers) by (file, line, function)
+        entries = pstats.Stats(profiler).stats  # type: ignore[attr-defined]
+        ranked = sorted(entries.items(), key=lambda entry: entry[1][SORT_KEYS[sort]], reverse=True)[:count]
+
+        rows = []
+        for (filename, line, function), (_, calls, own_time, cumulative_time, _) in ranked:
+            rows.append([
+                str(calls),
+                f"{own_time:.3f}s",
+                f"{cumulative_time:.3f}s",
+                " ".join(part for part in [self._format_location(filename, line), colorize(function, Color.BRIGHT_YELLOW)] if part),
+            ])
+        print(format_table(["CALLS", "TOTTIME", "CUMTIME", "FUNCTION"], rows))
+
+    def _format_location(self, filename: str, line: int) -> str:
+        """Format where a function is, relative to the current directory if it's below it"""
+        if filename == "~":
+            # Built-in functions have no file
+            return ""
+
+        relative = os.path.relpath(filename)
+        return f"{relative if not relative.startswith('..') else filename}:{line}"
@@ -2,6 +2,7 @@ from typing import List
 
 from command.base import Command
 from state.state import State
+from utils import output
 from utils.terminal import Color, colorize
 
 
@@ -20,6 +21,12 @@ class PwdCommand(Command):
         """Get the help text for the command"""
         return "Print the current working directory"
 
+    def has_structured_output(self) -> bool:
+        return True
+
+    def is_read_only(self, args: List[str]) -> bool:
+        return True
+
     def get_usage(self) -> str:
         """Get the extended usage information for the command"""
         pwd_cmd = colorize("pwd", Color.BRIGHT_YELLOW)
@@ -40,6 +47,10 @@ class PwdCommand(Command):
     def execute(self, state: State, args: List[str]) -> None:
         """Execute the pwd command"""
         path = state.get_current_path()
+        if output.is_structured():
+            output.emit({"path": f"/{path}"}, f"/{path}")
+            return
+
         # If path is empty, print empty string
         if not path:
             print("")
@@ -2,17 +2,30 @@
 """
 Restart command for K8sh
 """
-import os
-import subprocess
-from typing import List, Optional
+import math
+import threading
+import time
+from typing import List, Optional, Tuple
 
 from command.base import FileCommand
-from k8s_client import get_kubernetes_client
+from k8s_client import get_cluster_index, get_kubernetes_client
+from state.path_manager import has_wildcards
 from state.state import State
+from utils import output
+from utils.concurrency import map_concurrently
 from utils.terminal import Color, colorize
 
 k8s_client = get_kubernetes_client()
 
+# Resource types that can be restarted
+VALID_CONTROLLERS = ["deployments", "statefulsets", "daemonsets"]
+
+# Default time in seconds to wait for a rollout with --wait
+DEFAULT_WAIT_TIMEOUT = 300.0
+
+# Maximum number of rollouts watched at the same time
+MAX_WATCHES = 64
+
 
 class RestartCommand(FileCommand):
     """Restart command for K8sh"""
@@ -29,11 +42,15 @@ class RestartCommand(FileCommand):
         """Get the aliases for the command"""
         return ["touch", "rollout-restart"]
 
+    def accepts_several_paths(self, args: List[str]) -> bool:
+        return True
+
     def get_usage(self) -> str:
         """Get the extended usage information for the command"""
         restart_cmd = colorize("restart", Color.BRIGHT_YELLOW)
         rollout_restart_cmd = colorize("rollout-restart", Color.BRIGHT_YELLOW)
-        resource_path = colorize("<resource_path>", Color.BRIGHT_CYAN)
+        resource_path = colorize("<resource_path>...", Color.BRIGHT_CYAN)
+        options = colorize("[--wait] [--timeout <seconds>]", Color.BRIGHT_MAGENTA)
 
         # Colorize resource paths in examples
         def colorize_path(path):
@@ -49,8 +66,8 @@ class RestartCommand(FileCommand):
             return '/'.join(colored_parts)
 
         usage = [
-            f"{colorize('Usage:', Color.BRIGHT_GREEN)} {restart_cmd} {resource_path}",
-            f"       {rollout_restart_cmd} {resource_path}  {colorize('# Alternative command', Color.BRIGHT_BLACK)}",
+            f"{colorize('Usage:', Color.BRIGHT_GREEN)} {restart_cmd} {options} {resource_path}",
+            f"       {rollout_restart_cmd} {options} {resource_path}  {colorize('# Alternative command', Color.BRIGHT_BLACK)}",
             "",
             f"{colorize('Examples:', Color.BRIGHT_GREEN)}",
             f"  {colorize('#', Color.BRIGHT_BLACK)} Restart a deployment",
@@ -62,56 +79,180 @@ class RestartCommand(FileCommand):
             f"  {colorize('#', Color.BRIGHT_BLACK)} Restart a daemonset",
             f"  {restart_cmd} {colorize_path('namespace/daemonsets/my-daemonset')}",
             "",
+            f"  {colorize('#', Color.BRIGHT_BLACK)} Restart all deployments starting with api- and wait for the rollouts to finish",
+            f"  {restart_cmd} {colorize('--wait', Color.BRIGHT_MAGENTA)} {colorize_path('namespace/deployments/api-*')}",
+            "",
             f"{colorize('Notes:', Color.BRIGHT_GREEN)}",
             "  - This command can only be used with deployments, statefulsets, and daemonsets",
             "  - It triggers a rolling restart of the pods managed by the controller",
-            "  - The restart is performed by using 'kubectl rollout restart'",
+            "  - The restart is performed like 'kubectl rollout restart', by setting the restartedAt annotation of the pod template",
+            f"  - Several paths and wildcards ({colorize('*', Color.BRIGHT_MAGENTA)}, {colorize('?', Color.BRIGHT_MAGENTA)}, {colorize('[...]', Color.BRIGHT_MAGENTA)}) can be given, all matching controllers are restarted concurrently",
+            f"  - With {colorize('--wait', Color.BRIGHT_MAGENTA)} the rollouts are followed until they finish or {colorize('--timeout', Color.BRIGHT_MAGENTA)} expires (default: {int(DEFAULT_WAIT_TIMEOUT)}s)",
         ]
         return "\n".join(usage)
 
     def _get_filename(self, args: List[str]) -> Optional[str]:
         """Parse filename from args"""
         if not args:
-            print("Error: No resource specified")
+            output.error("Error: No resource specified")
             return None
 
         return args[0]
 
-    def _do_execute(self, state: State, namespace: str, resource_type: str, resource_name: str) -> None:
+    def _parse_args(self, args: List[str]) -> Optional[Tuple[List[str], bool, float]]:
+        """
+        Parse the arguments to extract flags and resource paths
+        Returns a tuple of (resource_paths, wait, timeout) or None if the arguments are invalid
+        """
+        resource_paths = []
+        wait = False
+        timeout = DEFAULT_WAIT_TIMEOUT
+
+        i = 0
+        while i < len(args):
+            if args[i] == "--wait":
+                wait = True
+                i += 1
+            elif args[i] == "--timeout":
+                if i + 1 >= len(args):
+                    output.error("Error: --timeout requires a number of seconds")
+                    return None
+                try:
+                    timeout = float(args[i + 1])
+                    if not math.isfinite(timeout) or timeout <= 0:
+                        raise ValueError()
+                except ValueError:
+                    output.error(f"Error: Invalid timeout: {args[i + 1]}")
+                    return None
+                i += 2
+            else:
+                resource_paths.append(args[i])
+                i += 1
+
+        return resource_paths, wait, timeout
+
+    def execute(self, state: State, args: List[str]) -> None:
         """Execute the restart command"""
+        parsed = self._parse_args(args)
+        if parsed is None:
+            return
+
+        resource_paths, wait, timeout = parsed
+        if self._get_filename(resource_paths) is None:
+            return
+
+        # Expand wildcards and validate every target before restarting anything
+        targets = []
+        for resource_path in resource_paths:
+            if has_wildcards(resource_path):
+                paths = state.expand_path(resource_path)
+                if not paths:
+                    output.error(f"Error: No resources match {resource_path}")
+            else:
+                paths = [resource_path]
+
+            for path in paths:
+                try:
+                    target = self._parse_path(state, path)
+                except Exception as e:
+                    print(colorize(str(e), Color.BRIGHT_RED))
+                    continue
+
+                if self._validate_target(*target) and target not in targets:
+                    targets.append(target)
+
+        if targets:
+            self._restart_targets(targets, wait, timeout)
+
+    def _do_execute(self, state: State, namespace: str, resource_type: str, resource_name: str) -> None:
+        """Execute the restart command for a single controller"""
+        if self._validate_target(namespace, resource_type, resource_name):
+            self._restart_targets([(namespace, resource_type, resource_name)], False, DEFAULT_WAIT_TIMEOUT)
+
+    def _validate_target(self, namespace: str, resource_type: str, resource_name: str) -> bool:
+        """Check that a path refers to a controller that can be restarted, printing an error otherwise"""
         # Handle special cases for directories
         if resource_type == "" and resource_name == "" and not namespace:
             # This is the root directory
-            print(colorize("Error: Cannot use 'restart' on a directory. Use 'ls' to view directory contents.", Color.BRIGHT_RED))
-            return
+            output.error("Error: Cannot use 'restart' on a directory. Use 'ls' to view directory contents.")
+            return False
 
         # Prevent using restart on resource type directories
         if resource_type and not resource_name:
-            print(colorize("Error: Cannot use 'restart' on a directory. Use 'ls' to view directory contents.", Color.BRIGHT_RED))
-            return
+            output.error("Error: Cannot use 'restart' on a directory. Use 'ls' to view directory contents.")
+            return False
 
         # Check if the resource type is a controller
-        valid_controllers = ["deployments", "statefulsets", "daemonsets"]
-        if resource_type not in valid_controllers:
-            print(colorize(f"Error: The 'restart' command can only be used with {', '.join(valid_controllers)}", Color.BRIGHT_RED))
-            return
+        if resource_type not in VALID_CONTROLLERS:
+            output.error(f"Error: The 'restart' command can only be used with {', '.join(VALID_CONTROLLERS)}")
+            return False
 
-        # Convert plural resource type to singular for kubectl
-        kubectl_resource_type = resource_type[:-1]  # Remove the 's' at the end
+        return True
 
-        # Prepare the kubectl command
-        cmd = ["kubectl", "rollout", "restart", kubectl_resource_type, resource_name, "-n", namespace]
+    def _restart_targets(self, targets: List[Tuple[str, str, str]], wait: bool, timeout: float) -> None:
+        """Restart all targets concurrently and optionally follow their rollouts"""
 
-        # In test mode (DEBUG=1 or K8SH_MOCK=1), just print the command that would be run
-        if os.environ.get("DEBUG") == "1" or os.environ.get("K8SH_MOCK") == "1":
-            print(f"Would run: {' '.join(cmd)}")
-            return
+        def restart(target: Tuple[str, str, str]) -> Optional[str]:
+            try:
+                k8s_client.restart_controller(*target)
+                return None
+            except Exception as e:
+                return str(e)
+
+        errors = map_concurrently(restart, targets)
+
+        restarted = []
+        for (namespace, resource_type, resource_name), error in zip(targets, errors):
+            path = f"{namespace}/{resource_type}/{resource_name}"
+            if error is None:
+                print(f"{path} restarted")
+                restarted.append((namespace, resource_type, resource_name))
+            else:
+                output.error(f"Error: Failed to restart {path}: {error}")
+
+        if wait and restarted:
+            self._wait_for_rollouts(restarted, timeout)
+
+        # Rollouts replace the pods, and those of deployments their replicasets
+        if restarted:
+            for resource_type in {resource_type for _, resource_type, _ in restarted} | {"replicasets", "pods"}:
+                get_cluster_index().invalidate(resource_type)
+
+    def _wait_for_rollouts(self, targets: List[Tuple[str, str, str]], timeout: float) -> None:
+        """Follow the rollouts of all targets concurrently and report the aggregated progress"""
+        print_lock = threading.Lock()
+        finished = [0]
+        started = time.monotonic()
+
+        def wait_for(target: Tuple[str, str, str]) -> bool:
+            namespace, resource_type, resource_name = target
+            path = f"{namespace}/{resource_type}/{resource_name}"
+
+            def on_progress(message: str) -> None:
+                # With many targets only completions are reported to keep the output readable
+                if len(targets) == 1:
+                    with print_lock:
+                        print(f"{colorize(path, Color.BRIGHT_CYAN)}: {message}")
+
+            try:
+                done = k8s_client.wait_for_rollout(namespace, resource_type, resource_name, timeout, on_progress)
+                error = None if done else f"timed out after {timeout:g}s"
+            except Exception as e:
+                done = False
+                error = str(e)
+
+            with print_lock:
+                finished[0] += 1
+                progress = f"[{finished[0]}/{len(targets)}]"
+                if done:
+                    print(f"{progress} {colorize(path, Color.BRIGHT_CYAN)} rolled out in {time.monotonic() - started:.1f}s")
+                else:
+                    output.error(f"{progress} Error: Rollout of {path} did not finish: {error}")
+
+            return done
+
+        results = map_concurrently(wait_for, targets, MAX_WATCHES)
 
-        try:
-            # Execute the kubectl command
-            result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-            print(result.stdout)
-        except subprocess.CalledProcessError as e:
-            print(f"Error: Failed to restart {resource_type}/{resource_name}: {e.stderr}")
-        except FileNotFoundError:
-            print("Error: kubectl command not found. Please ensure kubectl is installed and in your PATH.")
+        completed = len([done for done in results if done])
+        color = Color.BRIGHT_GREEN if completed == len(targets) else Color.BRIGHT_YELLOW
+        print(colorize(f"Rolled out {completed} of {len(targets)} controllers", color))
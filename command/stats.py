@@ -0,0 +1,170 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+from command.base import Command
+from state.state import State
+from utils import output, stats
+from utils.stats import CommandStats, format_bytes
+from utils.terminal import Color, colorize, format_table
+
+# Number of commands shown by default
+DEFAULT_COUNT = 20
+
+
+class StatsCommand(Command):
+    """Command to show the time, API requests and cache hits of the last commands"""
+
+    def get_name(self) -> str:
+        """Get the name of the command"""
+        return "stats"
+
+    def get_help(self) -> str:
+        """Get the help text for the command"""
+        return "Show the time, API requests and cache hits of the last commands"
+
+    def has_structured_output(self) -> bool:
+        return True
+
+    def is_read_only(self, args: List[str]) -> bool:
+        return True
+
+    def get_usage(self) -> str:
+        """Get the extended usage information for the command"""
+        cmd = colorize("stats", Color.BRIGHT_YELLOW)
+        options = colorize("[-v] [-n N] [--clear]", Color.BRIGHT_MAGENTA)
+
+        usage = [
+            f"{colorize('Usage:', Color.BRIGHT_GREEN)} {cmd} {options}",
+            "",
+            f"{colorize('Examples:', Color.BRIGHT_GREEN)}",
+            f"  {colorize('#', Color.BRIGHT_BLACK)} Show what the last {DEFAULT_COUNT} commands and completions cost",
+            f"  {cmd}",
+            "",
+            f"  {colorize('#', Color.BRIGHT_BLACK)} Also show their requests by verb and resource type, caches and rendering",
+            f"  {cmd} {colorize('-v', Color.BRIGHT_MAGENTA)} {colorize('-n', Color.BRIGHT_MAGENTA)} 5",
+            "",
+            f"{colorize('Notes:', Color.BRIGHT_GREEN)}",
+            "  - Every command is measured, also when Tab completes it; completions show up as <tab> lines",
+            "  - Requests are calls to the Kubernetes client, so those answered from its caches are counted too;",
+            "    the CACHE column shows how many lookups hit and missed the caches",
+            "  - RENDER is the time spent dumping and highlighting YAML",
+            "  - Bytes are counted for the real cluster only, from the responses of the API server",
+            f"  - Run k8sh with {colorize('--trace', Color.BRIGHT_MAGENTA)} to print these statistics after every command",
+        ]
+        return "\n".join(usage)
+
+    def _parse_args(self, args: List[str]) -> Optional[Tuple[int, bool, bool]]:
+        """Parse command arguments
+
+        Returns:
+            Optional[Tuple[int, bool, bool]]: number of commands, whether to show the details
+            and whether to clear the statistics, or None on error
+        """
+        count = DEFAULT_COUNT
+        verbose = False
+        clear = False
+
+        i = 0
+        while i < len(args):
+            if args[i] == "-n":
+                if i + 1 >= len(args) or not args[i + 1].isdigit() or int(args[i + 1]) < 1:
+                    output.error("Error: -n requires a positive number")
+                    return None
+                count = int(args[i + 1])
+                i += 1
+            elif args[i] == "-v":
+                verbose = True
+            elif args[i] == "--clear":
+                clear = True
+            else:
+                output.error(f"Error: Unknown argument {args[i]}")
+                return None
+            i += 1
+
+        return count, verbose, clear
+
+    def execute(self, state: State, args: List[str]) -> None:
+        """Execute the stats command"""
+        parsed = self._parse_args(args)
+        if parsed is None:
+            return
+
+        count, verbose, clear = parsed
+        if clear:
+            stats.clear_history()
+            return
+
+        # Asking for the statistics isn't interesting in itself
+        history = [command_stats for command_stats in stats.get_history() if command_stats.command.split(" ")[0] != "stats"]
+        history = history[-count:]
+
+        if output.is_structured():
+            for command_stats in history:
+                output.emit(self._to_record(command_stats), command_stats.command)
+            return
+
+        if not history:
+            print(colorize("No commands measured yet", Color.BRIGHT_YELLOW))
+            return
+
+        rows = [self._to_row(command_stats) for command_stats in history]
+        print(format_table(["COMMAND", "TIME", "REQUESTS", "BYTES", "CACHE", "RENDER"], rows))
+
+        if verbose:
+            self._show_details(history)
+
+    def _to_row(self, command_stats: CommandStats) -> List[str]:
+        """Summarize the statistics of a command as a table row"""
+        hits, misses = command_stats.get_cache_counts()
+        render_time = command_stats.get_render_time()
+        return [
+            colorize(command_stats.command, Color.BRIGHT_BLUE),
+            f"{command_stats.wall_time:.3f}s",
+            str(command_stats.get_request_count()),
+            format_bytes(command_stats.bytes_received) if command_stats.bytes_received else "-",
+            f"{hits}/{hits + misses}" if command_stats.caches else "-",
+            f"{render_time:.3f}s" if command_stats.timings else "-",
+        ]
+
+    def _show_details(self, history: List[CommandStats]) -> None:
+        """Show the requests, cache lookups and rendering of commands, added up"""
+        requests: Dict[Tuple[str, str], Tuple[int, float]] = {}
+        caches: Dict[str, Tuple[int, int]] = {}
+        timings: Dict[str, float] = {}
+        for command_stats in history:
+            for key, (count, seconds) in command_stats.requests.items():
+                total_count, total_seconds = requests.get(key, (0, 0.0))
+                requests[key] = (total_count + count, total_seconds + seconds)
+            for cache, (hits, misses) in command_stats.caches.items():
+                total_hits, total_misses = caches.get(cache, (0, 0))
+                caches[cache] = (total_hits + hits, total_misses + misses)
+            for activity, seconds in command_stats.timings.items():
+                timings[activity] = timings.get(activity, 0.0) + seconds
+
+        if requests:
+            print()
+            # Most expensive requests first
+            rows = [[verb, resource_type, str(count), f"{seconds:.3f}s"]
+                    for (verb, resource_type), (count, seconds) in sorted(requests.items(), key=lambda item: -item[1][1])]
+            print(format_table(["VERB", "RESOURCE", "REQUESTS", "TIME"], rows))
+
+        if caches:
+            print()
+            rows = [[cache, str(hits), str(misses)] for cache, (hits, misses) in sorted(caches.items())]
+            print(format_table(["CACHE", "HITS", "MISSES"], rows))
+
+        if timings:
+            print()
+            rows = [[activity, f"{seconds:.3f}s"] for activity, seconds in sorted(timings.items())]
+            print(format_table(["RENDER", "TIME"], rows))
+
+    def _to_record(self, command_stats: CommandStats) -> Dict[str, Any]:
+        """Convert the statistics of a command to a record"""
+        return {
+            "command": command_stats.command,
+            "wallTime": command_stats.wall_time,
+            "requests": [{"verb": verb, "resource": resource_type, "count": count, "seconds": seconds}
+                         for (verb, resource_type), (count, seconds) in sorted(command_stats.requests.items())],
+            "bytesReceived": command_stats.bytes_received,
+            "caches": {cache: {"hits": hits, "misses": misses} for cache, (hits, misses) in sorted(command_stats.caches.items())},
+            "timings": dict(sorted(command_stats.timings.items())),
+        }
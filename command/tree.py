@@ -0,0 +1,119 @@
+from typing import Dict, List, Optional, Tuple
+
+from command.base import GenericCommand
+from state.state import State
+from state.traversal import Entry, TreeWalker
+from utils import output
+from utils.terminal import Color, colorize
+
+
+class TreeCommand(GenericCommand):
+    """Command to display a directory and everything below it as a tree"""
+
+    def get_name(self) -> str:
+        """Get the name of the command"""
+        return "tree"
+
+    def get_aliases(self) -> List[str]:
+        """Get the aliases for the command"""
+        return []
+
+    def get_help(self) -> str:
+        """Get the help text for the command"""
+        return "Display the contents of a directory as a tree"
+
+    def has_path_completion(self) -> bool:
+        return True
+
+    def is_read_only(self, args: List[str]) -> bool:
+        return True
+
+    def get_usage(self) -> str:
+        """Get the extended usage information for the command"""
+        cmd = colorize("tree", Color.BRIGHT_YELLOW)
+        directory = colorize("[directory]", Color.BRIGHT_CYAN)
+        level = colorize("-L", Color.BRIGHT_MAGENTA)
+
+        usage = [
+            f"{colorize('Usage:', Color.BRIGHT_GREEN)} {cmd} [{level} {colorize('N', Color.BRIGHT_CYAN)}] {directory}",
+            "",
+            f"{colorize('Examples:', Color.BRIGHT_GREEN)}",
+            f"  {colorize('#', Color.BRIGHT_BLACK)} Show the deployments of a namespace with their pods and containers",
+            f"  {cmd} {colorize('default', Color.BRIGHT_BLUE)}/{colorize('deployments', Color.BRIGHT_GREEN)}",
+            "",
+            f"  {colorize('#', Color.BRIGHT_BLACK)} Show the namespaces and resource types only",
+            f"  {cmd} {level} 2 {colorize('/', Color.BRIGHT_BLUE)}",
+            "",
+            f"{colorize('Notes:', Color.BRIGHT_GREEN)}",
+            f"  - If no directory is specified, shows the {colorize('current directory', Color.BRIGHT_BLUE)}",
+            f"  - {level} {colorize('N', Color.BRIGHT_CYAN)} limits the tree to N levels below the directory",
+            "  - Each level is fetched concurrently, and the pods of all controllers in a namespace",
+            "    come from a single LIST of its pods and replicasets",
+        ]
+        return "\n".join(usage)
+
+    def _parse_args(self, args: List[str]) -> Optional[Tuple[str, Optional[int]]]:
+        """Parse command arguments
+
+        Returns:
+            Optional[Tuple[str, Optional[int]]]: path and maximum depth, or None on error
+        """
+        depth = None
+        paths = []
+
+        i = 0
+        while i < len(args):
+            if args[i] == "-L":
+                if i + 1 >= len(args) or not args[i + 1].isdigit() or int(args[i + 1]) < 1:
+                    output.error("Error: -L requires a positive number")
+                    return None
+                depth = int(args[i + 1])
+                i += 1
+            else:
+                paths.append(args[i])
+            i += 1
+
+        return (paths[0] if paths else ""), depth
+
+    def execute(self, state: State, args: List[str]) -> None:
+        """Execute the tree command"""
+        parsed = self._parse_args(args)
+        if parsed is None:
+            return
+
+        path, depth = parsed
+        try:
+            segments = state.resolve_path(path)
+        except Exception as e:
+            output.error(f"Error: {str(e)}")
+            return
+
+        # Collect the whole tree first, as drawing a branch needs to know what comes after it
+        children: Dict[Tuple[str, ...], List[Entry]] = {}
+        for level in TreeWalker(depth).walk([segments]):
+            for directory, entries in level:
+                children[tuple(directory)] = entries
+
+        print(colorize("/" + "/".join(segments), Color.BRIGHT_BLUE))
+        counts = [0, 0]
+        self._print_branch(children, tuple(segments), "", counts)
+
+        directories = "directory" if counts[0] == 1 else "directories"
+        files = "file" if counts[1] == 1 else "files"
+        print(f"\n{counts[0]} {directories}, {counts[1]} {files}")
+
+    def _print_branch(self, children: Dict[Tuple[str, ...], List[Entry]], path: Tuple[str, ...],
+                      prefix: str, counts: List[int]) -> None:
+        """Print the entries below a directory, counting directories and files"""
+        entries = children.get(path, [])
+        for i, (name, is_dir) in enumerate(entries):
+            last = i == len(entries) - 1
+            connector = "└── " if last else "├── "
+
+            if is_dir:
+                counts[0] += 1
+                print(f"{prefix}{connector}{colorize(name, Color.BRIGHT_BLUE)}")
+                self._print_branch(children, path + (name,), prefix + ("    " if last else "│   "), counts)
+            else:
+                counts[1] += 1
+                print(f"{prefix}{connector}{name}")
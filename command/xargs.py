@@ -0,0 +1,179 @@
+import sys
+from typing import List, Optional, Tuple
+
+from command.base import Command
+from command.registry import CommandRegistry
+from state.state import State
+from utils import output
+from utils.concurrency import iter_concurrently
+from utils.output import Record
+from utils.terminal import Color, colorize
+
+
+class XargsCommand(Command):
+    """Command running another command with the paths of the records piped into it"""
+
+    def __init__(self, command_registry: CommandRegistry) -> None:
+        self._command_registry = command_registry
+
+    def get_name(self) -> str:
+        """Get the name of the command"""
+        return "xargs"
+
+    def get_help(self) -> str:
+        """Get the help text for the command"""
+        return "Run a command with the paths piped into it as arguments"
+
+    def has_structured_output(self) -> bool:
+        return True
+
+    def is_read_only(self, args: List[str]) -> bool:
+        parsed = self._parse_args(args, quiet=True)
+        if parsed is None:
+            return False
+
+        _, _, command_name, command_args = parsed
+        command = self._command_registry.get_command(command_name)
+        return command is not None and command.is_read_only(command_args)
+
+    def is_interactive(self, args: List[str]) -> bool:
+        parsed = self._parse_args(args, quiet=True)
+        if parsed is None:
+            return False
+
+        _, _, command_name, command_args = parsed
+        command = self._command_registry.get_command(command_name)
+        return command is not None and command.is_interactive(command_args)
+
+    def get_usage(self) -> str:
+        """Get the extended usage information for the command"""
+        cmd = colorize("xargs", Color.BRIGHT_YELLOW)
+        options = colorize("[-P N] [-n N]", Color.BRIGHT_MAGENTA)
+        command = colorize("<command> [arguments]", Color.BRIGHT_CYAN)
+        pipe = colorize("|", Color.BRIGHT_MAGENTA)
+
+        usage = [
+            f"{colorize('Usage:', Color.BRIGHT_GREEN)} ... {pipe} {cmd} {options} {command}",
+            f"       ... {pipe} {command}",
+            "",
+            f"{colorize('Examples:', Color.BRIGHT_GREEN)}",
+            f"  {colorize('#', Color.BRIGHT_BLACK)} Restart every deployment of a namespace",
+            f"  {colorize('ls', Color.BRIGHT_YELLOW)} {colorize('default', Color.BRIGHT_BLUE)}/{colorize('deployments', Color.BRIGHT_GREEN)} {pipe} {colorize('restart', Color.BRIGHT_YELLOW)}",
+            "",
+            f"  {colorize('#', Color.BRIGHT_BLACK)} Show the failed pods, eight at a time",
+            f"  {colorize('find', Color.BRIGHT_YELLOW)} / -type pods -status Failed {pipe} {cmd} {colorize('-P', Color.BRIGHT_MAGENTA)} 8 {colorize('cat', Color.BRIGHT_YELLOW)}",
+            "",
+            f"{colorize('Notes:', Color.BRIGHT_GREEN)}",
+            f"  - Commands before a {pipe} pass their records, not their text, to the next one;",
+            "    the paths of the records are added to the arguments of the command",
+            f"  - A command after a {pipe} without {cmd} is run like {cmd} without options",
+            f"  - {colorize('-n N', Color.BRIGHT_MAGENTA)} runs the command with at most N paths at a time; by default it gets all of them,",
+            "    or one at a time for commands taking a single path, like edit",
+            f"  - {colorize('-P N', Color.BRIGHT_MAGENTA)} runs up to N commands at a time, one path each unless {colorize('-n', Color.BRIGHT_MAGENTA)} is given;",
+            "    their output is printed in the order of the paths. Only commands which only read can run concurrently",
+        ]
+        return "\n".join(usage)
+
+    def _parse_args(self, args: List[str], quiet: bool = False) -> Optional[Tuple[int, Optional[int], str, List[str]]]:
+        """Parse command arguments
+
+        Returns:
+            Optional[Tuple[int, Optional[int], str, List[str]]]: number of workers, paths per command,
+            and the command with its arguments, or None on error
+        """
+        workers = 1
+        paths_per_command = None
+
+        i = 0
+        while i < len(args) and args[i] in ["-P", "-n"]:
+            if i + 1 >= len(args) or not args[i + 1].isdigit() or int(args[i + 1]) < 1:
+                if not quiet:
+                    output.error(f"Error: {args[i]} requires a positive number")
+                return None
+
+            if args[i] == "-P":
+                workers = int(args[i + 1])
+            else:
+                paths_per_command = int(args[i + 1])
+            i += 2
+
+        if i >= len(args):
+            if not quiet:
+                output.error("Error: No command specified")
+            return None
+
+        return workers, paths_per_command, args[i], args[i + 1:]
+
+    def execute(self, state: State, args: List[str]) -> None:
+        """Execute the xargs command"""
+        records = state.get_input_records()
+        if records is None:
+            output.error("Error: xargs runs a command on the records piped into it, e.g. find / -type pods | xargs cat")
+            return
+
+        parsed = self._parse_args(args)
+        if parsed is None:
+            return
+
+        workers, paths_per_command, command_name, command_args = parsed
+        command = self._command_registry.get_command(command_name)
+        if command is None:
+            print(f"Command not found: {command_name}")
+            return
+
+        # Commands changing resources or using the terminal run one after another
+        if workers > 1 and (not command.is_read_only(command_args) or command.is_interactive(command_args)):
+            output.error(f"Error: -P can only run commands which only read, not {command_name}")
+            return
+
+        if not records:
+            return
+
+        # Commands taking a single path run once per path; others get the paths spread over the workers
+        # one by one, unless told otherwise
+        if not command.accepts_several_paths(command_args):
+            size = 1
+        else:
+            size = paths_per_command or (1 if workers > 1 else len(records))
+        chunks = [records[i:i + size] for i in range(0, len(records), size)]
+
+        if workers == 1:
+            for chunk in chunks:
+                self._run(state, command_name, command_args, chunk)
+            return
+
+        structured = output.is_structured()
+
+        def run_buffered(chunk: List[Record]) -> Tuple[str, List[Record]]:
+            # Keep the text and records of every command apart, to pass them on in order
+            with output.buffer_output() as buffer:
+                if structured:
+                    with output.collect_records() as emitted:
+                        self._run(state, command_name, command_args, chunk)
+                else:
+                    emitted = []
+                    self._run(state, command_name, command_args, chunk)
+            return buffer.getvalue(), emitted
+
+        with output.buffering_stdout():
+            for text, emitted in iter_concurrently(run_buffered, chunks, workers):
+                sys.stdout.write(text)
+                sys.stdout.flush()
+                for record, name in emitted:
+                    output.emit(record, name)
+
+    def _run(self, state: State, command_name: str, command_args: List[str], records: List[Record]) -> None:
+        """Run the command with the paths of some records, from a copy of the state"""
+        command = self._command_registry.get_command(command_name)
+        if command is None:
+            return
+
+        command_state = state.clone()
+        command_state.set_current_command(command_name)
+        try:
+            command.execute(command_state, command_args + [name for _, name in records])
+        except Exception as e:
+            output.error(f"Error executing command: {str(e)}")
+
+        if command_state.get_last_exit_code():
+            state.set_last_exit_code(command_state.get_last_exit_code())
@@ -1,6 +1,11 @@
-from .client import KubernetesClient
-from .factory import get_kubernetes_client
+from .client import KubernetesClient, ResourceConflictError
+from .cluster_index import ClusterIndex, get_cluster_index
+from .coalescing_client import CoalescingKubernetesClient
+from .factory import create_kubernetes_client, get_kubernetes_client, reset_kubernetes_client, uses_mock_client
+from .instrumented_client import InstrumentedKubernetesClient
 from .mock_client import MockKubernetesClient
+from .owner_index import OwnerIndex
 from .real_client import RealKubernetesClient
+from .synthetic_client import SyntheticKubernetesClient, SyntheticSpec
 
-__all__ = ["KubernetesClient", "RealKubernetesClient", "MockKubernetesClient", "get_kubernetes_client"]
+__all__ = ["ClusterIndex", "CoalescingKubernetesClient", "InstrumentedKubernetesClient", "KubernetesClient", "ResourceConflictError", "RealKubernetesClient", "MockKubernetesClient", "OwnerIndex", "SyntheticKubernetesClient", "SyntheticSpec", "create_kubernetes_client", "get_cluster_index", "get_kubernetes_client", "reset_kubernetes_client", "uses_mock_client"]
@@ -1,5 +1,12 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from k8s_client.owner_index import OwnerIndex
+
+
+class ResourceConflictError(Exception):
+    """Raised when a resource was modified since the version an update was based on"""
+    pass
 
 
 class KubernetesClient(ABC):
@@ -20,11 +27,33 @@ class KubernetesClient(ABC):
         """Get resources of a specific type in a namespace"""
         pass
 
+    @abstractmethod
+    def list_resources(self, namespace: str, resource_type: str) -> List[Dict[str, Any]]:
+        """Get the full definitions of all resources of a specific type in a namespace, with a single LIST"""
+        pass
+
+    @abstractmethod
+    def count_resources(self, namespace: str, resource_type: str) -> int:
+        """Count the resources of a type in a namespace without fetching their definitions"""
+        pass
+
+    @abstractmethod
+    def find_resources(self, resource_type: str, namespace: Optional[str] = None, label_selector: Optional[str] = None,
+                       field_selector: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Find the resources of a type matching label and field selectors, in a namespace or in all of them.
+        Resources are yielded page by page as the API server returns them"""
+        pass
+
     @abstractmethod
     def get_pods_for_resource(self, namespace: str, resource_type: str, resource_name: str) -> List[str]:
         """Get pods associated with a specific resource"""
         pass
 
+    @abstractmethod
+    def get_owner_index(self, namespace: str) -> OwnerIndex:
+        """Get the pods of a namespace indexed by their owning controller, to avoid a LIST per controller"""
+        pass
+
     @abstractmethod
     def get_pod_containers(self, namespace: str, pod_name: str) -> List[str]:
         """Get containers in a pod"""
@@ -39,3 +68,40 @@ class KubernetesClient(ABC):
     def get_resource_yaml(self, namespace: str, resource_type: str, resource_name: str) -> Optional[str]:
         """Get YAML definition of a resource"""
         pass
+
+    @abstractmethod
+    def get_resource(self, namespace: str, resource_type: str, resource_name: str,
+                     cached: bool = False) -> Optional[Dict[str, Any]]:
+        """Get the full definition of a resource as a dictionary.
+        With cached=True a previously fetched copy is returned if there is one"""
+        pass
+
+    @abstractmethod
+    def patch_resource(self, namespace: str, resource_type: str, resource_name: str,
+                       patch: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply a JSON merge patch to a resource and return the updated resource.
+        Raise ResourceConflictError if the patch sets a resourceVersion that is no longer current"""
+        pass
+
+    @abstractmethod
+    def exec_interactive(self, namespace: str, pod_name: str, container: Optional[str], command: List[str]) -> int:
+        """Run a command in a pod attached to the local terminal and return its exit code"""
+        pass
+
+    @abstractmethod
+    def exec_command(self, namespace: str, pod_name: str, container: Optional[str], command: List[str],
+                     timeout: Optional[float] = None) -> Tuple[int, str, str]:
+        """Run a command in a pod without a terminal and return its exit code, stdout and stderr.
+        Raise TimeoutError if the command does not finish within timeout seconds"""
+        pass
+
+    @abstractmethod
+    def restart_controller(self, namespace: str, resource_type: str, resource_name: str) -> None:
+        """Trigger a rolling restart of a controller (deployment, statefulset or daemonset)"""
+        pass
+
+    @abstractmethod
+    def wait_for_rollout(self, namespace: str, resource_type: str, resource_name: str, timeout: float,
+                         on_progress: Optional[Callable[[str], None]] = None) -> bool:
+        """Wait until the rollout of a controller finishes. Return False if it didn't finish within timeout seconds"""
+        pass
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Index of the resources of the whole cluster, partitioned by namespace
+"""
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from utils import metrics, output, stats
+
+from .client import KubernetesClient
+from .factory import get_kubernetes_client
+
+# Seconds during which an indexed resource type is reused
+CLUSTER_INDEX_TTL = 30.0
+
+
+class ClusterIndex:
+    """
+    Names of the resources of each type by namespace, built from one LIST for all
+    namespaces per type instead of one LIST per namespace and type
+    """
+
+    def __init__(self, client: KubernetesClient, ttl: float = CLUSTER_INDEX_TTL) -> None:
+        self.client = client
+        self.ttl = ttl
+        # Names by namespace and the time they were fetched, by resource type
+        self._resources: Dict[str, Tuple[float, Dict[str, List[str]]]] = {}
+        self._type_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        metrics.CACHE_ENTRIES.set_function(lambda: len(self._resources), "cluster-index")
+
+    def get_resources_by_namespace(self, resource_type: str) -> Dict[str, List[str]]:
+        """Get the names of the resources of a type in every namespace, fetching them at most once per TTL"""
+        with self._lock:
+            type_lock = self._type_locks.setdefault(resource_type, threading.Lock())
+
+        # Concurrent callers for the same type wait for a single LIST
+        with type_lock:
+            cached = self._resources.get(resource_type)
+            hit = cached is not None and time.monotonic() - cached[0] <= self.ttl
+            stats.record_cache("cluster-index", hit)
+            if cached is not None and hit:
+                return cached[1]
+
+            resources: Dict[str, List[str]] = {}
+            with output.track_errors() as errors:
+                for resource in self.client.find_resources(resource_type):
+                    metadata = resource["metadata"]
+                    resources.setdefault(metadata.get("namespace", ""), []).append(metadata["name"])
+
+            # A failed LIST stops early after printing an error, and its partial result is not kept
+            if not errors:
+                self._resources[resource_type] = (time.monotonic(), resources)
+            return resources
+
+    def get_resources(self, namespace: str, resource_type: str) -> List[str]:
+        """Get the names of the resources of a type in a namespace"""
+        return self.get_resources_by_namespace(resource_type).get(namespace, [])
+
+    def count_resources(self, namespace: str, resource_type: str) -> int:
+        """Count the resources of a type in a namespace"""
+        return len(self.get_resources(namespace, resource_type))
+
+    def invalidate(self, resource_type: Optional[str] = None) -> None:
+        """Forget an indexed resource type after changing its resources, or all of them"""
+        with self._lock:
+            if resource_type is None:
+                self._resources.clear()
+            else:
+                self._resources.pop(resource_type, None)
+
+
+instance: Optional[ClusterIndex] = None
+
+
+def get_cluster_index() -> ClusterIndex:
+    """Get the cluster index shared by all commands"""
+    global instance
+
+    if instance is None:
+        instance = ClusterIndex(get_kubernetes_client())
+
+    return instance
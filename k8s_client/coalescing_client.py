@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Kubernetes client making one call for identical calls in flight at the same time (singleflight)
+"""
+import copy
+import threading
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar, cast
+
+from utils import metrics
+
+from .client import KubernetesClient
+from .owner_index import OwnerIndex
+
+R = TypeVar("R")
+
+
+class _Call:
+    """A call in flight, and its outcome once it is done"""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        # Number of identical calls waiting for this one
+        self.waiters = 0
+
+
+class CoalescingKubernetesClient(KubernetesClient):
+    """
+    KubernetesClient sharing the calls to another client: a read made while an identical one
+    is in flight, e.g. by the fuzzy matches of Tab completion resolving their paths from the
+    same parent, waits for it and gets a copy of its result or its exception instead of making
+    its own request. Nothing is kept once a call is done, so later calls always make a new
+    request. Changes are never shared
+    """
+
+    def __init__(self, client: KubernetesClient) -> None:
+        self.client = client
+        # Calls in flight, by function name and arguments
+        self._calls: Dict[Tuple[Any, ...], _Call] = {}
+        self._lock = threading.Lock()
+
+    def _share(self, func: Callable[..., R], *args: Any) -> R:
+        """Call a function of the wrapped client, or wait for the identical call in flight"""
+        key = (func.__name__,) + args
+        with self._lock:
+            call = self._calls.get(key)
+            in_flight = call is not None
+            if call is None:
+                call = self._calls[key] = _Call()
+            else:
+                call.waiters += 1
+        if in_flight:
+            return cast(R, self._wait(func.__name__, call))
+
+        try:
+            call.result = func(*args)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        # No call can join once this one is removed; the waiters copy the result too, so the caller may change it
+        return cast(R, copy.deepcopy(call.result)) if call.waiters else cast(R, call.result)
+
+    def _wait(self, name: str, call: _Call) -> Any:
+        """Wait for a call in flight and get a copy of its result"""
+        metrics.COALESCED_REQUESTS.inc(name)
+        call.done.wait()
+        if call.error is not None:
+            raise call.error
+        return copy.deepcopy(call.result)
+
+    def get_namespaces(self) -> List[str]:
+        return self._share(self.client.get_namespaces)
+
+    def get_resource_types(self) -> List[str]:
+        # Known without asking the API server
+        return self.client.get_resource_types()
+
+    def get_resources(self, namespace: str, resource_type: str) -> List[str]:
+        return self._share(self.client.get_resources, namespace, resource_type)
+
+    def list_resources(self, namespace: str, resource_type: str) -> List[Dict[str, Any]]:
+        return self._share(self.client.list_resources, namespace, resource_type)
+
+    def count_resources(self, namespace: str, resource_type: str) -> int:
+        return self._share(self.client.count_resources, namespace, resource_type)
+
+    def find_resources(self, resource_type: str, namespace: Optional[str] = None, label_selector: Optional[str] = None,
+                       field_selector: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        # Pages are fetched as the caller consumes them, which can't be shared
+        return self.client.find_resources(resource_type, namespace, label_selector, field_selector)
+
+    def get_pods_for_resource(self, namespace: str, resource_type: str, resource_name: str) -> List[str]:
+        return self._share(self.client.get_pods_for_resource, namespace, resource_type, resource_name)
+
+    def get_owner_index(self, namespace: str) -> OwnerIndex:
+        return self._share(self.client.get_owner_index, namespace)
+
+    def get_pod_containers(self, namespace: str, pod_name: str) -> List[str]:
+        return self._share(self.client.get_pod_containers, namespace, pod_name)
+
+    def is_resource_with_children(self, resource_type: str) -> bool:
+        # Known without asking the API server
+        return self.client.is_resource_with_children(resource_type)
+
+    def get_resource_yaml(self, namespace: str, resource_type: str, resource_name: str) -> Optional[str]:
+        return self._share(self.client.get_resource_yaml, namespace, resource_type, resource_name)
+
+    def get_resource(self, namespace: str, resource_type: str, resource_name: str,
+                     cached: bool = False) -> Optional[Dict[str, Any]]:
+        return self._share(self.client.get_resource, namespace, resource_type, resource_name, cached)
+
+    def patch_resource(self, namespace: str, resource_type: str, resource_name: str,
+                       patch: Dict[str, Any]) -> Dict[str, Any]:
+        return self.client.patch_resource(namespace, resource_type, resource_name, patch)
+
+    def exec_interactive(self, namespace: str, pod_name: str, container: Optional[str], command: List[str]) -> int:
+        return self.client.exec_interactive(namespace, pod_name, container, command)
+
+    def exec_command(self, namespace: str, pod_name: str, container: Optional[str], command: List[str],
+                     timeout: Optional[float] = None) -> Tuple[int, str, str]:
+        return self.client.exec_command(namespace, pod_name, container, command, timeout=timeout)
+
+    def restart_controller(self, namespace: str, resource_type: str, resource_name: str) -> None:
+        self.client.restart_controller(namespace, resource_type, resource_name)
+
+    def wait_for_rollout(self, namespace: str, resource_type: str, resource_name: str, timeout: float,
+                         on_progress: Optional[Callable[[str], None]] = None) -> bool:
+        return self.client.wait_for_rollout(namespace, resource_type, resource_name, timeout, on_progress)
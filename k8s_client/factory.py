@@ -1,11 +1,43 @@
 import os
-from typing import cast, Union, Optional
+import sys
+from typing import Optional
 
 from .client import KubernetesClient
+from .coalescing_client import CoalescingKubernetesClient
+from .instrumented_client import InstrumentedKubernetesClient
 from .mock_client import MockKubernetesClient
 from .real_client import RealKubernetesClient
+from .synthetic_client import SYNTHETIC_PREFIX, SyntheticKubernetesClient, SyntheticSpec
 
-instance: Optional[Union[MockKubernetesClient, RealKubernetesClient]] = None
+instance: Optional[KubernetesClient] = None
+
+
+def uses_mock_client() -> bool:
+    """Check if K8SH_MOCK selects the mock client or a synthetic cluster instead of a real one"""
+    mock = os.environ.get("K8SH_MOCK", "")
+    return mock == "1" or mock.split(":")[0] == SYNTHETIC_PREFIX
+
+
+def create_kubernetes_client() -> KubernetesClient:
+    """
+    Create a new client of the cluster K8SH_MOCK selects, the mock, a synthetic one or the real one
+
+    Returns:
+        A KubernetesClient implementation, without the recording of requests
+    """
+    # Check if mock is forced via environment variable, e.g. K8SH_MOCK=1 or K8SH_MOCK=synthetic:ns=500,pods=50000
+    mock = os.environ.get("K8SH_MOCK", "")
+    if mock == "1":
+        return MockKubernetesClient()
+    elif mock.split(":")[0] == SYNTHETIC_PREFIX:
+        try:
+            spec = SyntheticSpec.parse(mock)
+        except ValueError as e:
+            # Commands create the client while they are imported, before the shell can report errors
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(2)
+        return SyntheticKubernetesClient(spec)
+    return RealKubernetesClient()
 
 
 def get_kubernetes_client() -> KubernetesClient:
@@ -13,17 +45,32 @@ def get_kubernetes_client() -> KubernetesClient:
     Get a Kubernetes client implementation
 
     Returns:
-        A KubernetesClient implementation
+        A KubernetesClient implementation sharing identical concurrent requests, and recording
+        the requests it makes in the statistics of commands
     """
     global instance
 
-    if instance is not None:
-        return instance
+    if instance is None:
+        instance = CoalescingKubernetesClient(InstrumentedKubernetesClient(create_kubernetes_client()))
+    return instance
 
-    # Check if mock is forced via environment variable
-    if os.environ.get("K8SH_MOCK") == "1":
-        instance = MockKubernetesClient()
-    else:
-        instance = RealKubernetesClient()
 
-    return cast(KubernetesClient, instance)
+def reset_kubernetes_client() -> None:
+    """
+    Replace the cluster behind the shared client by a new one, e.g. for tests to start from the
+    resources of the mock again. Commands keep the client they got when imported, so the layers
+    wrapping the cluster are kept and only the client they end with is created again
+    """
+    global instance
+
+    if instance is None:
+        get_kubernetes_client()
+        return
+
+    layer = instance
+    while isinstance(getattr(layer, "client", None), KubernetesClient):
+        wrapper, layer = layer, getattr(layer, "client")
+    if layer is instance:
+        instance = create_kubernetes_client()
+    else:
+        wrapper.client = create_kubernetes_client()  # type: ignore[attr-defined]
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Kubernetes client counting and timing the requests of every command
+"""
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar
+
+from utils import stats
+
+from .client import KubernetesClient
+from .owner_index import OwnerIndex
+
+R = TypeVar("R")
+
+
+class InstrumentedKubernetesClient(KubernetesClient):
+    """
+    KubernetesClient recording every call to another client in the statistics of the running
+    command, as a request with the verb and resource type it amounts to on the API server
+    """
+
+    def __init__(self, client: KubernetesClient) -> None:
+        self.client = client
+
+    def _request(self, verb: str, resource_type: str, func: Callable[..., R], *args: Any, **kwargs: Any) -> R:
+        """Call a function of the wrapped client, recording it as a request"""
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            stats.record_request(verb, resource_type, time.perf_counter() - start)
+
+    def get_namespaces(self) -> List[str]:
+        return self._request("list", "namespaces", self.client.get_namespaces)
+
+    def get_resource_types(self) -> List[str]:
+        # Known without asking the API server
+        return self.client.get_resource_types()
+
+    def get_resources(self, namespace: str, resource_type: str) -> List[str]:
+        return self._request("list", resource_type, self.client.get_resources, namespace, resource_type)
+
+    def list_resources(self, namespace: str, resource_type: str) -> List[Dict[str, Any]]:
+        return self._request("list", resource_type, self.client.list_resources, namespace, resource_type)
+
+    def count_resources(self, namespace: str, resource_type: str) -> int:
+        return self._request("list", resource_type, self.client.count_resources, namespace, resource_type)
+
+    def find_resources(self, resource_type: str, namespace: Optional[str] = None, label_selector: Optional[str] = None,
+                       field_selector: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        # Only the time spent waiting for resources counts, not the time the caller spends on them
+        resources = self.client.find_resources(resource_type, namespace, label_selector, field_selector)
+        seconds = 0.0
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    resource = next(resources)
+                except StopIteration:
+                    return
+                finally:
+                    seconds += time.perf_counter() - start
+                yield resource
+        finally:
+            stats.record_request("list", resource_type, seconds)
+
+    def get_pods_for_resource(self, namespace: str, resource_type: str, resource_name: str) -> List[str]:
+        return self._request("list", "pods", self.client.get_pods_for_resource, namespace, resource_type, resource_name)
+
+    def get_owner_index(self, namespace: str) -> OwnerIndex:
+        return self._request("list", "pods", self.client.get_owner_index, namespace)
+
+    def get_pod_containers(self, namespace: str, pod_name: str) -> List[str]:
+        return self._request("get", "pods", self.client.get_pod_containers, namespace, pod_name)
+
+    def is_resource_with_children(self, resource_type: str) -> bool:
+        # Known without asking the API server
+        return self.client.is_resource_with_children(resource_type)
+
+    def get_resource_yaml(self, namespace: str, resource_type: str, resource_name: str) -> Optional[str]:
+        return self._request("get", resource_type, self.client.get_resource_yaml, namespace, resource_type, resource_name)
+
+    def get_resource(self, namespace: str, resource_type: str, resource_name: str,
+                     cached: bool = False) -> Optional[Dict[str, Any]]:
+        return self._request("get", resource_type, self.client.get_resource, namespace, resource_type, resource_name,
+                             cached=cached)
+
+    def patch_resource(self, namespace: str, resource_type: str, resource_name: str,
+                       patch: Dict[str, Any]) -> Dict[str, Any]:
+        return self._request("patch", resource_type, self.client.patch_resource, namespace, resource_type, resource_name,
+                             patch)
+
+    def exec_interactive(self, namespace: str, pod_name: str, container: Optional[str], command: List[str]) -> int:
+        return self._request("exec", "pods", self.client.exec_interactive, namespace, pod_name, container, command)
+
+    def exec_command(self, namespace: str, pod_name: str, container: Optional[str], command: List[str],
+                     timeout: Optional[float] = None) -> Tuple[int, str, str]:
+        return self._request("exec", "pods", self.client.exec_command, namespace, pod_name, container, command,
+                             timeout=timeout)
+
+    def restart_controller(self, namespace: str, resource_type: str, resource_name: str) -> None:
+        self._request("patch", resource_type, self.client.restart_controller, namespace, resource_type, resource_name)
+
+    def wait_for_rollout(self, namespace: str, resource_type: str, resource_name: str, timeout: float,
+                         on_progress: Optional[Callable[[str], None]] = None) -> bool:
+        return self._request("watch", resource_type, self.client.wait_for_rollout, namespace, resource_type, resource_name,
+                             timeout, on_progress)
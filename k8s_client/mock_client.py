@@ -1,8 +1,18 @@
-from typing import List, Dict, Optional, cast
+import copy
+import sys
+import time
+import uuid
+from typing import Any, Callable, Iterator, List, Dict, Optional, Tuple
 
-import yaml
+from k8s_client.client import KubernetesClient, ResourceConflictError
+from k8s_client.owner_index import OwnerIndex
+from utils.manifest import apply_merge_patch, clean_manifest
+from utils.render import dump_yaml
+from utils.selectors import matches_field_selector, matches_label_selector
 
-from k8s_client.client import KubernetesClient
+
+# Creation time of all mock resources
+MOCK_CREATION_TIMESTAMP = "2024-01-01T00:00:00Z"
 
 
 class MockKubernetesClient(KubernetesClient):
@@ -10,7 +20,7 @@ class MockKubernetesClient(KubernetesClient):
 
     def __init__(self) -> None:
         """Initialize the mock Kubernetes client"""
-        print("Using mock Kubernetes client")
+        print("Using mock Kubernetes client", file=sys.stderr)
 
         # Mock data for resources
         self.mock_resources: Dict[str, Dict[str, List[str]]] = {
@@ -60,6 +70,12 @@ class MockKubernetesClient(KubernetesClient):
             "node-exporter": ["node-exporter-node1", "node-exporter-node2"],
         }
 
+        # Resources modified through patch_resource, keyed by (namespace, resource_type, resource_name)
+        self.mock_objects: Dict[Tuple[str, str, str], Dict[str, Any]] = {}
+
+        # Controllers restarted through restart_controller, as (namespace, resource_type, resource_name)
+        self.restarted_controllers: List[Tuple[str, str, str]] = []
+
     def get_namespaces(self) -> List[str]:
         """Get all namespaces"""
         return list(self.mock_resources.keys())
@@ -93,6 +109,16 @@ class MockKubernetesClient(KubernetesClient):
         pod_name = f"{resource_name}-pod-1"
         return [pod_name]
 
+    def get_owner_index(self, namespace: str) -> OwnerIndex:
+        """Get the pods of a namespace indexed by their owning controller"""
+        pods_by_owner = {}
+        for resource_type in ["deployments", "statefulsets", "daemonsets", "replicasets"]:
+            for resource_name in self.get_resources(namespace, resource_type):
+                pods_by_owner[(resource_type, resource_name)] = self.get_pods_for_resource(namespace, resource_type, resource_name)
+
+        containers_by_pod = {pod_name: self.get_pod_containers(namespace, pod_name) for pod_name in self.get_resources(namespace, "pods")}
+        return OwnerIndex(pods_by_owner, containers_by_pod)
+
     def get_containers_for_pod(self, namespace: str, pod_name: str) -> List[str]:
         """Get containers for a pod"""
         # For simplicity, we'll just return a list with a couple of containers
@@ -112,18 +138,87 @@ class MockKubernetesClient(KubernetesClient):
         # Workload controllers and pods have children
         return resource_type in ["deployments", "statefulsets", "daemonsets", "replicasets", "pods"]
 
+    def list_resources(self, namespace: str, resource_type: str) -> List[Dict[str, Any]]:
+        """Get the full definitions of all resources of a specific type in a namespace"""
+        resources = [self.get_resource(namespace, resource_type, name) for name in self.get_resources(namespace, resource_type)]
+        return [resource for resource in resources if resource is not None]
+
+    def count_resources(self, namespace: str, resource_type: str) -> int:
+        """Count the mock resources of a type in a namespace"""
+        return len(self.get_resources(namespace, resource_type))
+
+    def find_resources(self, resource_type: str, namespace: Optional[str] = None, label_selector: Optional[str] = None,
+                       field_selector: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Find the mock resources of a type matching label and field selectors"""
+        for resource_namespace in [namespace] if namespace else self.get_namespaces():
+            for resource in self.list_resources(resource_namespace, resource_type):
+                if label_selector and not matches_label_selector(resource["metadata"].get("labels"), label_selector):
+                    continue
+                if field_selector and not matches_field_selector(resource, field_selector):
+                    continue
+                yield resource
+
     def get_resource_yaml(self, namespace: str, resource_type: str, resource_name: str) -> Optional[str]:
         """Get YAML definition of a resource"""
+        resource_dict = self.get_resource(namespace, resource_type, resource_name)
+        if resource_dict is None:
+            return None
+
+        return dump_yaml(clean_manifest(resource_dict))
+
+    def get_resource(self, namespace: str, resource_type: str, resource_name: str,
+                     cached: bool = False) -> Optional[Dict[str, Any]]:
+        """Get the full definition of a resource as a dictionary"""
+        key = (namespace, resource_type, resource_name)
+        if key in self.mock_objects:
+            return copy.deepcopy(self.mock_objects[key])
+
+        resource_dict = self._build_resource(namespace, resource_type, resource_name)
+        if resource_dict is None:
+            return None
+
+        # Add the server-managed fields a real API server would return
+        metadata = resource_dict["metadata"]
+        metadata["uid"] = str(uuid.uuid5(uuid.NAMESPACE_URL, "/".join(key)))
+        metadata["resourceVersion"] = "1"
+        metadata["creationTimestamp"] = MOCK_CREATION_TIMESTAMP
+
+        status = self._build_status(resource_type, resource_dict)
+        if status:
+            resource_dict["status"] = status
+
+        return resource_dict
+
+    def patch_resource(self, namespace: str, resource_type: str, resource_name: str,
+                       patch: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply a JSON merge patch to a mock resource"""
+        resource_dict = self.get_resource(namespace, resource_type, resource_name)
+        if resource_dict is None:
+            raise Exception(f"{resource_type} \"{resource_name}\" not found")
+
+        current_version = resource_dict["metadata"]["resourceVersion"]
+        requested_version = (patch.get("metadata") or {}).get("resourceVersion")
+        if requested_version is not None and requested_version != current_version:
+            raise ResourceConflictError("the object has been modified; please apply your changes to the latest version and try again")
+
+        patched = apply_merge_patch(resource_dict, patch)
+        patched["metadata"]["resourceVersion"] = str(int(current_version) + 1)
+        self.mock_objects[(namespace, resource_type, resource_name)] = patched
+
+        return copy.deepcopy(patched)
+
+    def _build_resource(self, namespace: str, resource_type: str, resource_name: str) -> Optional[Dict[str, Any]]:
+        """Build the definition of a mock resource"""
         # Handle namespace resource
         if resource_type == "namespace" and resource_name in self.get_namespaces():
-            resource_dict = {
+            resource_dict: Dict[str, Any] = {
                 "apiVersion": "v1",
                 "kind": "Namespace",
                 "metadata": {
                     "name": resource_name
                 }
             }
-            return cast(str, yaml.dump(resource_dict, default_flow_style=False))
+            return resource_dict
 
         # Special handling for pods with complex names (like those generated by deployments)
         if resource_type == "pods" and resource_name not in self.mock_resources.get(namespace, {}).get("pods", []):
@@ -155,7 +250,7 @@ class MockKubernetesClient(KubernetesClient):
                             }]
                         }
                     }
-                    return cast(str, yaml.dump(resource_dict, default_flow_style=False))
+                    return resource_dict
 
         # Check if resource exists
         if namespace in self.mock_resources and resource_type in self.mock_resources[namespace] and resource_name in self.mock_resources[namespace][resource_type]:
@@ -264,11 +359,63 @@ class MockKubernetesClient(KubernetesClient):
                             "command": ["sh", "-c", "while true; do echo sidecar running; sleep 10; done"]
                         })
 
-            # Return YAML representation
-            return cast(str, yaml.dump(resource_dict, default_flow_style=False))
+            return resource_dict
 
         return None
 
+    def _build_status(self, resource_type: str, resource_dict: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Build the status of a mock resource, with everything running and ready"""
+        spec = resource_dict.get("spec") or {}
+
+        if resource_type == "pods":
+            return {
+                "phase": "Running",
+                "containerStatuses": [
+                    {"name": container["name"], "image": container.get("image", ""), "imageID": "", "ready": True,
+                     "restartCount": 0, "state": {"running": {}}}
+                    for container in spec.get("containers", [])
+                ],
+            }
+        elif resource_type in ["deployments", "statefulsets", "replicasets"]:
+            replicas = spec.get("replicas", 1)
+            return {"replicas": replicas, "readyReplicas": replicas, "updatedReplicas": replicas, "availableReplicas": replicas}
+        elif resource_type == "daemonsets":
+            return {"desiredNumberScheduled": 1, "currentNumberScheduled": 1, "numberReady": 1, "numberMisscheduled": 0}
+
+        return None
+
+    def exec_interactive(self, namespace: str, pod_name: str, container: Optional[str], command: List[str]) -> int:
+        """Pretend to run an interactive command in a pod"""
+        container_info = f" ({container})" if container else ""
+        print(f"Mock exec in {namespace}/{pod_name}{container_info}: {' '.join(command)}")
+        return 0
+
+    def exec_command(self, namespace: str, pod_name: str, container: Optional[str], command: List[str],
+                     timeout: Optional[float] = None) -> Tuple[int, str, str]:
+        """Pretend to run a command in a pod and return canned output"""
+        if command == ["hostname"]:
+            return 0, f"{pod_name}\n", ""
+        if command and command[0] == "false":
+            return 1, "", ""
+        if command and command[0] == "sleep":
+            duration = float(command[1]) if len(command) > 1 else 0.0
+            time.sleep(duration if timeout is None else min(duration, timeout))
+            if timeout is not None and duration > timeout:
+                raise TimeoutError(f"command did not finish within {timeout}s")
+            return 0, "", ""
+        return 0, f"mock output of '{' '.join(command)}' in {namespace}/{pod_name}\n", ""
+
+    def restart_controller(self, namespace: str, resource_type: str, resource_name: str) -> None:
+        """Pretend to restart a controller"""
+        self.restarted_controllers.append((namespace, resource_type, resource_name))
+
+    def wait_for_rollout(self, namespace: str, resource_type: str, resource_name: str, timeout: float,
+                         on_progress: Optional[Callable[[str], None]] = None) -> bool:
+        """Pretend to wait for a rollout, which finishes right away"""
+        if on_progress:
+            on_progress("successfully rolled out")
+        return True
+
     def _get_api_version(self, resource_type: str) -> str:
         """Get API version for a resource type"""
         api_versions = {
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Index of the pods of a namespace by the workload controller owning them
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class OwnerIndex:
+    """Pods of a namespace by owning controller, and containers by pod"""
+
+    def __init__(self, pods_by_owner: Dict[Tuple[str, str], List[str]], containers_by_pod: Dict[str, List[str]]) -> None:
+        # Pod names keyed by (resource_type, resource_name) of their owner
+        self.pods_by_owner = pods_by_owner
+        self.containers_by_pod = containers_by_pod
+
+    def get_pods(self, resource_type: str, resource_name: str) -> List[str]:
+        """Get the pods owned by a controller, directly or through a replicaset for deployments"""
+        return self.pods_by_owner.get((resource_type, resource_name), [])
+
+    def get_containers(self, pod_name: str) -> Optional[List[str]]:
+        """Get the containers of a pod, or None if the pod isn't indexed"""
+        return self.containers_by_pod.get(pod_name)
+
+
+def _get_controllers(resource: Dict[str, Any]) -> List[Tuple[str, str]]:
+    """Get the (resource_type, resource_name) of the owners of a resource"""
+    owners = (resource.get("metadata") or {}).get("ownerReferences") or []
+    return [(f"{owner['kind'].lower()}s", owner["name"]) for owner in owners if owner.get("kind") and owner.get("name")]
+
+
+def build_owner_index(pods: List[Dict[str, Any]], replicasets: List[Dict[str, Any]]) -> OwnerIndex:
+    """Build the owner index of a namespace from the LIST of its pods and replicasets"""
+    # Deployments own their pods through replicasets
+    replicaset_owners: Dict[str, List[Tuple[str, str]]] = {}
+    for replicaset in replicasets:
+        replicaset_owners[replicaset["metadata"]["name"]] = _get_controllers(replicaset)
+
+    pods_by_owner: Dict[Tuple[str, str], List[str]] = {}
+    containers_by_pod: Dict[str, List[str]] = {}
+
+    for pod in pods:
+        pod_name = pod["metadata"]["name"]
+
+        for owner in _get_controllers(pod):
+            owners = [owner]
+            if owner[0] == "replicasets":
+                owners.extend(replicaset_owners.get(owner[1], []))
+
+            for resource_type, resource_name in owners:
+                pods_by_owner.setdefault((resource_type, resource_name), []).append(pod_name)
+
+        # Main containers first, then init containers
+        spec = pod.get("spec") or {}
+        containers_by_pod[pod_name] = [
+            container["name"] for container in (spec.get("containers") or []) + (spec.get("initContainers") or [])
+        ]
+
+    return OwnerIndex(pods_by_owner, containers_by_pod)
@@ -1,23 +1,98 @@
-from typing import List, Optional, cast
-
-import yaml
-from kubernetes import client, config
-
-from k8s_client.client import KubernetesClient
+import copy
+import functools
+import json
+import os
+import select
+import signal
+import sys
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, cast
+
+from kubernetes import client, config, watch
+from kubernetes.client import rest
+from kubernetes.client.rest import ApiException
+from kubernetes.stream import stream
+from kubernetes.stream.ws_client import RESIZE_CHANNEL
+
+from k8s_client.client import KubernetesClient, ResourceConflictError
+from k8s_client.owner_index import OwnerIndex, build_owner_index
+from utils import metrics, output, stats
+from utils.manifest import clean_manifest
+from utils.render import dump_yaml
+from utils.terminal import get_terminal_size, raw_terminal
+
+# API class and function name suffix for each namespaced resource type
+RESOURCE_APIS = {
+    "services": ("CoreV1Api", "service"),
+    "deployments": ("AppsV1Api", "deployment"),
+    "daemonsets": ("AppsV1Api", "daemon_set"),
+    "statefulsets": ("AppsV1Api", "stateful_set"),
+    "replicasets": ("AppsV1Api", "replica_set"),
+    "configmaps": ("CoreV1Api", "config_map"),
+    "secrets": ("CoreV1Api", "secret"),
+    "ingresses": ("NetworkingV1Api", "ingress"),
+    "pods": ("CoreV1Api", "pod"),
+}
+
+# Number of resources requested per page by find
+FIND_PAGE_SIZE = 500
+
+# Ask for a list of object metadata only, falling back to full objects on servers that can't do it
+METADATA_LIST_ACCEPT = "application/json;as=PartialObjectMetadataList;g=meta.k8s.io;v=v1,application/json"
+
+# Number of fetched resources kept for reuse, e.g. by edit after cat
+OBJECT_CACHE_SIZE = 256
+
+
+def _count_received_bytes(request: Callable[..., Any]) -> Callable[..., Any]:
+    """Wrap RESTClientObject.request to add the size of every response to the statistics of the running command"""
+    @functools.wraps(request)
+    def counting_request(*args: Any, **kwargs: Any) -> Any:
+        response = request(*args, **kwargs)
+        if not isinstance(response, rest.RESTResponse):
+            # Streamed response, e.g. of a watch, which can't be read here
+            return response
+
+        # Older clients have read the body already, newer ones only know its length unless it is chunked
+        data = response.data
+        if isinstance(data, (bytes, str)):
+            stats.record_bytes(len(data))
+        else:
+            length = response.getheaders().get("Content-Length")
+            if length and length.isdigit():
+                stats.record_bytes(int(length))
+        return response
+
+    counting_request.counts_bytes = True  # type: ignore[attr-defined]
+    return counting_request
 
 
 class RealKubernetesClient(KubernetesClient):
     """Implementation of KubernetesClient that uses the real Kubernetes API"""
 
-    def __init__(self) -> None:
-        """Initialize the Kubernetes client"""
+    def __init__(self, config_file: Optional[str] = None) -> None:
+        """Initialize the Kubernetes client, from a kubeconfig file if given instead of the default one"""
+        # Recently fetched resources, keyed by (namespace, resource_type, resource_name)
+        self._object_cache: "OrderedDict[Tuple[str, str, str], Dict[str, Any]]" = OrderedDict()
+        self._object_cache_lock = threading.Lock()
+        metrics.CACHE_ENTRIES.set_function(lambda: len(self._object_cache), "objects")
+
+        # Every API object creates its own RESTClientObject, so the class is wrapped, once
+        if not getattr(rest.RESTClientObject.request, "counts_bytes", False):
+            rest.RESTClientObject.request = _count_received_bytes(rest.RESTClientObject.request)  # type: ignore[method-assign]
+
         try:
             # Try to load from kube config file
-            config.load_kube_config()
+            config.load_kube_config(config_file=config_file)
             # Test connection
             v1 = client.CoreV1Api()
             v1.list_namespace()
-        except Exception:
+        except Exception as e:
+            if config_file is not None:
+                raise Exception(f"Could not connect to Kubernetes API: {e}")
             try:
                 # Try in-cluster config (for when running inside a pod)
                 config.load_incluster_config()
@@ -34,7 +109,7 @@ class RealKubernetesClient(KubernetesClient):
             namespaces = v1.list_namespace()
             return [ns.metadata.name for ns in namespaces.items]
         except Exception as e:
-            print(f"Error getting namespaces: {e}")
+            output.error(f"Error getting namespaces: {e}")
             return []
 
     def get_resource_types(self) -> List[str]:
@@ -104,45 +179,105 @@ class RealKubernetesClient(KubernetesClient):
                 return []
 
         except Exception as e:
-            print(f"Error getting {resource_type} in namespace {namespace}: {e}")
+            output.error(f"Error getting {resource_type} in namespace {namespace}: {e}")
+            return []
+
+    def list_resources(self, namespace: str, resource_type: str) -> List[Dict[str, Any]]:
+        """Get the full definitions of all resources of a specific type in a namespace, with a single LIST"""
+        if resource_type not in RESOURCE_APIS:
             return []
 
-    def get_pods_for_resource(self, namespace: str, resource_type: str, resource_name: str) -> List[str]:
-        """Get pods associated with a specific resource"""
         try:
-            v1 = client.CoreV1Api()
+            resource_list = self._get_api_function(resource_type, "list")(namespace)
+            resource_list_dict = client.ApiClient().sanitize_for_serialization(resource_list)
+        except Exception as e:
+            output.error(f"Error getting {resource_type} in namespace {namespace}: {e}")
+            return []
 
-            # Get all pods in the namespace
-            pods = v1.list_namespaced_pod(namespace)
+        return cast(List[Dict[str, Any]], resource_list_dict.get("items") or [])
 
-            # Filter pods based on owner references
-            resource_pods = []
+    def count_resources(self, namespace: str, resource_type: str) -> int:
+        """Count the resources of a type in a namespace from the remainingItemCount of a single-item metadata LIST"""
+        if resource_type not in RESOURCE_APIS:
+            return 0
 
-            for pod in pods.items:
-                if pod.metadata.owner_references:
-                    for owner in pod.metadata.owner_references:
-                        # For deployments, we need to find the ReplicaSet first
-                        if resource_type == "deployments":
-                            apps_v1 = client.AppsV1Api()
-                            replicasets = apps_v1.list_namespaced_replica_set(namespace)
+        list_function = self._get_api_function(resource_type, "list")
+        kwargs: Dict[str, Any] = {"limit": 1, "_preload_content": False, "_headers": {"Accept": METADATA_LIST_ACCEPT}}
+        count = 0
+        while True:
+            try:
+                page = json.loads(list_function(namespace, **kwargs).data)
+            except ApiException as e:
+                output.error(f"Error counting {resource_type} in namespace {namespace}: {self._get_error_message(e)}")
+                return count
+            except Exception as e:
+                output.error(f"Error counting {resource_type} in namespace {namespace}: {e}")
+                return count
+
+            count += len(page.get("items") or [])
+            metadata = page.get("metadata") or {}
+            if metadata.get("remainingItemCount") is not None:
+                return count + int(metadata["remainingItemCount"])
+
+            # Servers that don't report the remaining items are paged through. Those that also reject
+            # the metadata Accept type answer with the application/json fallback, so pages of full objects
+            continue_token = metadata.get("continue")
+            if not continue_token:
+                return count
+            kwargs["limit"] = FIND_PAGE_SIZE
+            kwargs["_continue"] = continue_token
+
+    def find_resources(self, resource_type: str, namespace: Optional[str] = None, label_selector: Optional[str] = None,
+                       field_selector: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Find the resources of a type matching label and field selectors, in a namespace or in all of them"""
+        if resource_type not in RESOURCE_APIS:
+            return
+
+        api_class, suffix = RESOURCE_APIS[resource_type]
+        api = getattr(client, api_class)()
+
+        # A single LIST for all namespaces instead of one per namespace
+        if namespace:
+            list_function = functools.partial(getattr(api, f"list_namespaced_{suffix}"), namespace)
+        else:
+            list_function = getattr(api, f"list_{suffix}_for_all_namespaces")
+
+        kwargs: Dict[str, Any] = {"limit": FIND_PAGE_SIZE}
+        if label_selector:
+            kwargs["label_selector"] = label_selector
+        if field_selector:
+            kwargs["field_selector"] = field_selector
+
+        while True:
+            try:
+                page = client.ApiClient().sanitize_for_serialization(list_function(**kwargs))
+            except ApiException as e:
+                output.error(f"Error finding {resource_type}: {self._get_error_message(e)}")
+                return
+            except Exception as e:
+                output.error(f"Error finding {resource_type}: {e}")
+                return
 
-                            for rs in replicasets.items:
-                                if rs.metadata.owner_references:
-                                    for rs_owner in rs.metadata.owner_references:
-                                        if rs_owner.kind.lower() == "deployment" and rs_owner.name == resource_name:
-                                            # This ReplicaSet belongs to our deployment
-                                            if owner.kind.lower() == "replicaset" and owner.name == rs.metadata.name:
-                                                resource_pods.append(pod.metadata.name)
+            yield from page.get("items") or []
 
-                        # Direct ownership for other resource types
-                        elif owner.kind.lower() == resource_type[:-1] and owner.name == resource_name:
-                            resource_pods.append(pod.metadata.name)
+            # Fetch the next page only when the previous one was consumed
+            continue_token = (page.get("metadata") or {}).get("continue")
+            if not continue_token:
+                return
+            kwargs["_continue"] = continue_token
 
-            return resource_pods
+    def get_pods_for_resource(self, namespace: str, resource_type: str, resource_name: str) -> List[str]:
+        """Get pods associated with a specific resource"""
+        pods = self.list_resources(namespace, "pods")
+        # Only deployments own their pods through replicasets, other controllers are found from the pods alone
+        replicasets = self.list_resources(namespace, "replicasets") if pods and resource_type == "deployments" else []
+        return build_owner_index(pods, replicasets).get_pods(resource_type, resource_name)
 
-        except Exception as e:
-            print(f"Error getting pods for {resource_type}/{resource_name} in namespace {namespace}: {e}")
-            return []
+    def get_owner_index(self, namespace: str) -> OwnerIndex:
+        """Get the pods of a namespace indexed by their owning controller, from one LIST of pods and one of replicasets"""
+        pods = self.list_resources(namespace, "pods")
+        replicasets = self.list_resources(namespace, "replicasets") if pods else []
+        return build_owner_index(pods, replicasets)
 
     def get_pod_containers(self, namespace: str, pod_name: str) -> List[str]:
         """Get containers in a pod"""
@@ -163,7 +298,7 @@ class RealKubernetesClient(KubernetesClient):
             return containers
 
         except Exception as e:
-            print(f"Error getting containers for pod {pod_name} in namespace {namespace}: {e}")
+            output.error(f"Error getting containers for pod {pod_name} in namespace {namespace}: {e}")
             return []
 
     def is_resource_with_children(self, resource_type: str) -> bool:
@@ -173,56 +308,339 @@ class RealKubernetesClient(KubernetesClient):
 
     def get_resource_yaml(self, namespace: str, resource_type: str, resource_name: str) -> Optional[str]:
         """Get YAML definition of a resource"""
+        resource_dict = self.get_resource(namespace, resource_type, resource_name)
+        if resource_dict is None:
+            return None
+
+        # Remove status and other non-user-editable fields
+        return dump_yaml(clean_manifest(resource_dict))
+
+    def get_resource(self, namespace: str, resource_type: str, resource_name: str,
+                     cached: bool = False) -> Optional[Dict[str, Any]]:
+        """Get the full definition of a resource as a dictionary"""
+        key = (namespace, resource_type, resource_name)
+
+        if cached:
+            with self._object_cache_lock:
+                hit = key in self._object_cache
+                stats.record_cache("objects", hit)
+                if hit:
+                    self._object_cache.move_to_end(key)
+                    return copy.deepcopy(self._object_cache[key])
+
         try:
-            if resource_type == "services":
-                v1 = client.CoreV1Api()
-                resource = v1.read_namespaced_service(resource_name, namespace)
-            elif resource_type == "deployments":
-                apps_v1 = client.AppsV1Api()
-                resource = apps_v1.read_namespaced_deployment(resource_name, namespace)
-            elif resource_type == "daemonsets":
-                apps_v1 = client.AppsV1Api()
-                resource = apps_v1.read_namespaced_daemon_set(resource_name, namespace)
-            elif resource_type == "statefulsets":
-                apps_v1 = client.AppsV1Api()
-                resource = apps_v1.read_namespaced_stateful_set(resource_name, namespace)
-            elif resource_type == "replicasets":
-                apps_v1 = client.AppsV1Api()
-                resource = apps_v1.read_namespaced_replica_set(resource_name, namespace)
-            elif resource_type == "configmaps":
-                v1 = client.CoreV1Api()
-                resource = v1.read_namespaced_config_map(resource_name, namespace)
-            elif resource_type == "secrets":
-                v1 = client.CoreV1Api()
-                resource = v1.read_namespaced_secret(resource_name, namespace)
-            elif resource_type == "ingresses":
-                networking_v1 = client.NetworkingV1Api()
-                resource = networking_v1.read_namespaced_ingress(resource_name, namespace)
-            elif resource_type == "pods":
-                v1 = client.CoreV1Api()
-                resource = v1.read_namespaced_pod(resource_name, namespace)
-            elif resource_type == "namespace":
-                v1 = client.CoreV1Api()
-                resource = v1.read_namespace(resource_name)
+            if resource_type == "namespace":
+                resource = client.CoreV1Api().read_namespace(resource_name)
+            elif resource_type in RESOURCE_APIS:
+                resource = self._get_api_function(resource_type, "read")(resource_name, namespace)
             else:
                 return None
 
-            # Convert to dict and then to YAML
+            # Convert to a plain dictionary
             resource_dict = client.ApiClient().sanitize_for_serialization(resource)
+        except Exception as e:
+            output.error(f"Error getting {resource_type}/{resource_name} in namespace {namespace}: {e}")
+            return None
 
-            # Remove status and other non-user-editable fields
-            if "status" in resource_dict:
-                del resource_dict["status"]
-
-            # Remove other system-managed fields
-            if "metadata" in resource_dict:
-                metadata = resource_dict["metadata"]
-                for field in ["creationTimestamp", "resourceVersion", "selfLink", "uid", "generation", "managedFields"]:
-                    if field in metadata:
-                        del metadata[field]
+        self._cache_resource(key, resource_dict)
+        return cast(Dict[str, Any], resource_dict)
 
-            return cast(str, yaml.dump(resource_dict, default_flow_style=False))
+    def patch_resource(self, namespace: str, resource_type: str, resource_name: str,
+                       patch: Dict[str, Any]) -> Dict[str, Any]:
+        """Apply a JSON merge patch to a resource and return the updated resource"""
+        try:
+            if resource_type == "namespace":
+                resource = client.CoreV1Api().patch_namespace(resource_name, patch, _content_type="application/merge-patch+json")
+            elif resource_type in RESOURCE_APIS:
+                patch_function = self._get_api_function(resource_type, "patch")
+                resource = patch_function(resource_name, namespace, patch, _content_type="application/merge-patch+json")
+            else:
+                raise Exception(f"Cannot patch resource type '{resource_type}'")
+        except ApiException as e:
+            if e.status == 409:
+                raise ResourceConflictError(self._get_error_message(e))
+            raise Exception(self._get_error_message(e))
+
+        resource_dict = client.ApiClient().sanitize_for_serialization(resource)
+        self._cache_resource((namespace, resource_type, resource_name), resource_dict)
+        return cast(Dict[str, Any], resource_dict)
+
+    def _get_api_function(self, resource_type: str, verb: str) -> Callable[..., Any]:
+        """Get the API function for a verb (read, list, patch, ...) on a namespaced resource type"""
+        api_class, suffix = RESOURCE_APIS[resource_type]
+        return cast(Callable[..., Any], getattr(getattr(client, api_class)(), f"{verb}_namespaced_{suffix}"))
+
+    def _get_error_message(self, error: ApiException) -> str:
+        """Extract the message of a Status returned by the API server"""
+        try:
+            return cast(str, json.loads(error.body or "")["message"])
+        except Exception:
+            return f"{error.status} {error.reason}"
+
+    def _cache_resource(self, key: Tuple[str, str, str], resource_dict: Dict[str, Any]) -> None:
+        """Remember a fetched resource, evicting the least recently used ones"""
+        with self._object_cache_lock:
+            self._object_cache[key] = copy.deepcopy(resource_dict)
+            self._object_cache.move_to_end(key)
+            while len(self._object_cache) > OBJECT_CACHE_SIZE:
+                self._object_cache.popitem(last=False)
+
+    def exec_interactive(self, namespace: str, pod_name: str, container: Optional[str], command: List[str]) -> int:
+        """Run a command in a pod attached to the local terminal and return its exit code"""
+        v1 = client.CoreV1Api()
+        kwargs = {
+            "command": command,
+            "stdin": True,
+            "stdout": True,
+            "stderr": True,
+            "tty": True,
+            "_preload_content": False,
+        }
+        if container:
+            kwargs["container"] = container
+
+        resp = stream(v1.connect_get_namespaced_pod_exec, pod_name, namespace, **kwargs)
+        try:
+            self._attach_terminal(resp)
+        finally:
+            resp.close()
+
+        return self._get_exit_code(resp)
+
+    def exec_command(self, namespace: str, pod_name: str, container: Optional[str], command: List[str],
+                     timeout: Optional[float] = None) -> Tuple[int, str, str]:
+        """Run a command in a pod without a terminal and return its exit code, stdout and stderr"""
+        v1 = client.CoreV1Api()
+        kwargs = {
+            "command": command,
+            "stdin": False,
+            "stdout": True,
+            "stderr": True,
+            "tty": False,
+            "_preload_content": False,
+        }
+        if container:
+            kwargs["container"] = container
+
+        resp = stream(v1.connect_get_namespaced_pod_exec, pod_name, namespace, **kwargs)
+        try:
+            resp.run_forever(timeout=timeout)
+            if resp.is_open():
+                raise TimeoutError(f"command did not finish within {timeout}s")
+            stdout = resp.read_stdout()
+            stderr = resp.read_stderr()
+        finally:
+            resp.close()
+
+        return self._get_exit_code(resp), stdout, stderr
+
+    def _attach_terminal(self, resp: Any) -> None:
+        """Pump data between the local terminal and an exec websocket until the remote process exits"""
+        stdin_fd = sys.stdin.fileno()
+        resize_pending = [True]
+
+        # SIGWINCH only marks the size as stale, the resize message is sent from the loop below
+        def on_resize(signum, frame):
+            resize_pending[0] = True
+
+        previous_handler = None
+        can_handle_resize = hasattr(signal, "SIGWINCH") and threading.current_thread() is threading.main_thread()
+        if can_handle_resize:
+            previous_handler = signal.signal(signal.SIGWINCH, on_resize)
 
-        except Exception as e:
-            print(f"Error getting YAML for {resource_type}/{resource_name} in namespace {namespace}: {e}")
-            return None
+        try:
+            with raw_terminal(stdin_fd):
+                while resp.is_open():
+                    if resize_pending[0]:
+                        resize_pending[0] = False
+                        columns, rows = get_terminal_size()
+                        resp.write_channel(RESIZE_CHANNEL, json.dumps({"Width": columns, "Height": rows}))
+
+                    resp.update(timeout=0.05)
+
+                    if resp.peek_stdout():
+                        sys.stdout.write(resp.read_stdout())
+                        sys.stdout.flush()
+                    if resp.peek_stderr():
+                        sys.stderr.write(resp.read_stderr())
+                        sys.stderr.flush()
+
+                    readable, _, _ = select.select([stdin_fd], [], [], 0)
+                    if readable:
+                        data = os.read(stdin_fd, 4096)
+                        if not data:
+                            break
+                        resp.write_stdin(data.decode("utf-8", errors="replace"))
+
+                # Flush whatever arrived together with the close frame
+                sys.stdout.write(resp.read_stdout())
+                sys.stdout.flush()
+        finally:
+            if can_handle_resize:
+                signal.signal(signal.SIGWINCH, previous_handler)
+
+    def _get_exit_code(self, resp: Any) -> int:
+        """Get the exit code of a finished exec session from its error channel"""
+        try:
+            return_code = resp.returncode
+        except Exception:
+            # The error channel was empty or malformed, e.g. the connection dropped
+            return 1
+
+        return return_code if return_code is not None else 1
+
+    def restart_controller(self, namespace: str, resource_type: str, resource_name: str) -> None:
+        """Trigger a rolling restart of a controller (deployment, statefulset or daemonset)"""
+        apps_v1 = client.AppsV1Api()
+        patch_functions = {
+            "deployments": apps_v1.patch_namespaced_deployment,
+            "statefulsets": apps_v1.patch_namespaced_stateful_set,
+            "daemonsets": apps_v1.patch_namespaced_daemon_set,
+        }
+        if resource_type not in patch_functions:
+            raise Exception(f"Cannot restart resource type '{resource_type}'")
+
+        # Same annotation as kubectl rollout restart: changing the pod template triggers a new rollout
+        restarted_at = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+        body = {
+            "spec": {
+                "template": {
+                    "metadata": {
+                        "annotations": {
+                            "kubectl.kubernetes.io/restartedAt": restarted_at
+                        }
+                    }
+                }
+            }
+        }
+
+        patch_functions[resource_type](resource_name, namespace, body, _content_type="application/strategic-merge-patch+json")
+
+    def wait_for_rollout(self, namespace: str, resource_type: str, resource_name: str, timeout: float,
+                         on_progress: Optional[Callable[[str], None]] = None) -> bool:
+        """Wait until the rollout of a controller finishes by watching its status"""
+        apps_v1 = client.AppsV1Api()
+        list_functions = {
+            "deployments": apps_v1.list_namespaced_deployment,
+            "statefulsets": apps_v1.list_namespaced_stateful_set,
+            "daemonsets": apps_v1.list_namespaced_daemon_set,
+        }
+        if resource_type not in list_functions:
+            raise Exception(f"Cannot watch the rollout of resource type '{resource_type}'")
+
+        deadline = time.monotonic() + timeout
+        resource_version: Optional[str] = None
+        last_message = None
+        restart_reason: Optional[str] = None
+
+        # The server ends a watch after timeout_seconds, so keep resuming it until the deadline
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+
+            if restart_reason is not None:
+                metrics.WATCH_RESTARTS.inc(resource_type, restart_reason)
+
+            kwargs = {
+                "field_selector": f"metadata.name={resource_name}",
+                "timeout_seconds": max(1, int(remaining)),
+                "allow_watch_bookmarks": True,
+            }
+            if resource_version:
+                kwargs["resource_version"] = resource_version
+
+            w = watch.Watch()
+            try:
+                for event in w.stream(list_functions[resource_type], namespace, **kwargs):
+                    if event["type"] == "BOOKMARK":
+                        # Bookmarks only carry a resource version and are left undeserialized
+                        resource_version = event["raw_object"]["metadata"]["resourceVersion"]
+                        continue
+
+                    controller = event["object"]
+                    resource_version = controller.metadata.resource_version
+
+                    if event["type"] == "DELETED":
+                        raise Exception(f"{resource_type}/{resource_name} was deleted")
+
+                    done, message = self._get_rollout_status(resource_type, controller)
+                    if message != last_message and on_progress:
+                        on_progress(message)
+                        last_message = message
+
+                    if done:
+                        return True
+
+                    if time.monotonic() >= deadline:
+                        return False
+                restart_reason = "closed"
+            except ApiException as e:
+                if e.status != 410:
+                    raise
+                # The resource version we resumed from is gone, start over from the current state
+                resource_version = None
+                restart_reason = "expired"
+            finally:
+                w.stop()
+
+    def _get_rollout_status(self, resource_type: str, controller: Any) -> Tuple[bool, str]:
+        """Check whether a rollout has finished, the same way kubectl rollout status does.
+        Returns a tuple of (done, message)"""
+        status = controller.status
+        generation = controller.metadata.generation or 0
+
+        if generation > (status.observed_generation or 0):
+            return False, "Waiting for the spec update to be observed..."
+
+        if resource_type == "deployments":
+            for condition in status.conditions or []:
+                if condition.type == "Progressing" and condition.reason == "ProgressDeadlineExceeded":
+                    raise Exception("rollout exceeded its progress deadline")
+
+            desired = controller.spec.replicas if controller.spec.replicas is not None else 1
+            updated = status.updated_replicas or 0
+            replicas = status.replicas or 0
+            available = status.available_replicas or 0
+
+            if updated < desired:
+                return False, f"Waiting for rollout to finish: {updated} out of {desired} new replicas have been updated..."
+            if replicas > updated:
+                return False, f"Waiting for rollout to finish: {replicas - updated} old replicas are pending termination..."
+            if available < updated:
+                return False, f"Waiting for rollout to finish: {available} of {updated} updated replicas are available..."
+
+        elif resource_type == "statefulsets":
+            strategy = controller.spec.update_strategy
+            if strategy is not None and strategy.type == "OnDelete":
+                return True, "OnDelete update strategy, pods are only replaced when deleted"
+
+            desired = controller.spec.replicas if controller.spec.replicas is not None else 1
+            ready = status.ready_replicas or 0
+            updated = status.updated_replicas or 0
+
+            partition = 0
+            if strategy is not None and strategy.rolling_update is not None:
+                partition = strategy.rolling_update.partition or 0
+
+            if partition:
+                if updated < desired - partition:
+                    return False, f"Waiting for partitioned roll out to finish: {updated} out of {desired - partition} new pods have been updated..."
+                return True, f"partitioned roll out complete: {updated} new pods have been updated"
+
+            if ready < desired:
+                return False, f"Waiting for {desired - ready} pods to be ready..."
+            if status.update_revision != status.current_revision:
+                return False, f"Waiting for rolling update to complete: {updated} pods at revision {status.update_revision}..."
+
+        elif resource_type == "daemonsets":
+            desired = status.desired_number_scheduled or 0
+            updated = status.updated_number_scheduled or 0
+            available = status.number_available or 0
+
+            if updated < desired:
+                return False, f"Waiting for rollout to finish: {updated} out of {desired} new pods have been updated..."
+            if available < desired:
+                return False, f"Waiting for rollout to finish: {available} of {updated} updated pods are available..."
+
+        return True, "successfully rolled out"
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""
+Mock Kubernetes client generating a cluster of any size, to reproduce slowness
+that only shows up on large clusters without having one
+"""
+import hashlib
+import math
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar, cast
+
+from k8s_client.mock_client import MockKubernetesClient
+from k8s_client.owner_index import OwnerIndex
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Prefix of K8SH_MOCK selecting the synthetic cluster, e.g. K8SH_MOCK=synthetic:ns=500,pods=50000
+SYNTHETIC_PREFIX = "synthetic"
+
+# Number of resources per page of find_resources, each page costing one simulated request
+PAGE_SIZE = 500
+
+# Characters of the generated name suffixes, like those of the controllers of Kubernetes
+SUFFIX_ALPHABET = "bcdfghjklmnpqrstvwxz2456789"
+
+# Depth of the calls in progress per thread, so only the outermost one waits for the simulated latency
+_calls = threading.local()
+
+
+class SyntheticSpec:
+    """Size of a synthetic cluster, with resource counts for the whole cluster spread over its namespaces"""
+
+    def __init__(self, ns: int = 10, deployments: Optional[int] = None, rs: int = 2, pods: Optional[int] = None,
+                 services: Optional[int] = None, configmaps: Optional[int] = None, secrets: Optional[int] = None,
+                 latency: float = 0.0) -> None:
+        self.ns = ns
+        self.deployments = deployments if deployments is not None else ns * 5
+        # Replicasets per deployment: the current one owns the pods, older ones are scaled down
+        self.rs = rs
+        self.pods = pods if pods is not None else self.deployments * 3
+        self.services = services if services is not None else self.deployments
+        self.configmaps = configmaps if configmaps is not None else ns * 2
+        self.secrets = secrets if secrets is not None else ns * 2
+        # Seconds every request waits, like a round trip to an API server
+        self.latency = latency
+
+    @classmethod
+    def parse(cls, text: str) -> "SyntheticSpec":
+        """
+        Parse a spec like synthetic:ns=500,pods=50000,latency=0.02.
+        Raises ValueError for unknown keys or invalid values
+        """
+        _, _, options = text.partition(":")
+        values: Dict[str, Any] = {}
+        for option in filter(None, options.split(",")):
+            key, _, value = option.partition("=")
+            key = key.strip()
+            if key not in ["ns", "deployments", "rs", "pods", "services", "configmaps", "secrets", "latency"]:
+                raise ValueError(f"Unknown synthetic cluster option {key}")
+            try:
+                values[key] = float(value) if key == "latency" else int(value)
+            except ValueError:
+                raise ValueError(f"Invalid value for synthetic cluster option {key}: {value}")
+            if not math.isfinite(values[key]) or values[key] < 0 or (key in ["ns", "rs"] and values[key] < 1):
+                raise ValueError(f"Invalid value for synthetic cluster option {key}: {value}")
+
+        return cls(**values)
+
+    def __str__(self) -> str:
+        return (f"{self.ns} namespaces, {self.deployments} deployments, {self.deployments * self.rs} replicasets, "
+                f"{self.pods} pods, {self.services} services, {self.configmaps} configmaps, {self.secrets} secrets, "
+                f"{self.latency * 1000:g}ms latency")
+
+
+def _suffix(seed: str, length: int) -> str:
+    """Generate a random-looking but stable name suffix"""
+    digest = hashlib.md5(seed.encode("utf-8")).digest()
+    return "".join(SUFFIX_ALPHABET[byte % len(SUFFIX_ALPHABET)] for byte in digest[:length])
+
+
+def _get_uid(namespace: str, resource_type: str, resource_name: str) -> str:
+    """Get the uid of a resource, the same way MockKubernetesClient.get_resource sets it"""
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, "/".join((namespace, resource_type, resource_name))))
+
+
+@contextmanager
+def _nested_call() -> Iterator[bool]:
+    """Track the calls in progress in this thread, telling whether this one is the outermost"""
+    depth = getattr(_calls, "depth", 0)
+    _calls.depth = depth + 1
+    try:
+        yield depth == 0
+    finally:
+        _calls.depth = depth
+
+
+def _simulated_request(method: F) -> F:
+    """Make a method of the client wait for the simulated latency, unless another one called it"""
+    def wrapper(self: "SyntheticKubernetesClient", *args: Any, **kwargs: Any) -> Any:
+        with _nested_call() as outermost:
+            if outermost:
+                self._wait()
+            return method(self, *args, **kwargs)
+
+    wrapper.__name__ = method.__name__
+    wrapper.__doc__ = method.__doc__
+    return cast(F, wrapper)
+
+
+class SyntheticKubernetesClient(MockKubernetesClient):
+    """
+    MockKubernetesClient with a generated cluster: deployments owning replicasets owning
+    pods through owner references, like a real cluster, and an optional latency per request
+    """
+
+    def __init__(self, spec: SyntheticSpec) -> None:
+        super().__init__()
+        self.spec = spec
+        print(f"Synthetic cluster: {spec}", file=sys.stderr)
+
+        # Names by resource type by namespace, as in MockKubernetesClient
+        self.mock_resources = {}
+        # Owning deployment and replicas of every replicaset, and owning replicaset of every pod
+        self._replicaset_owners: Dict[Tuple[str, str], Tuple[str, int]] = {}
+        self._pod_owners: Dict[Tuple[str, str], str] = {}
+        # Pods by (namespace, resource_type, resource_name) of their owners
+        self._pods_by_owner: Dict[Tuple[str, str, str], List[str]] = {}
+
+        width = len(str(spec.ns - 1))
+        namespaces = [f"ns-{i:0{width}d}" for i in range(spec.ns)]
+        for namespace in namespaces:
+            self.mock_resources[namespace] = {resource_type: [] for resource_type in self.get_resource_types()}
+
+        for i in range(spec.deployments):
+            namespace = namespaces[i % spec.ns]
+            deployment = f"app-{i}"
+            replicas = spec.pods // spec.deployments + (1 if i < spec.pods % spec.deployments else 0)
+            self._add_deployment(namespace, deployment, replicas)
+
+        # Without deployments, pods have no owner
+        for i in range(spec.pods if not spec.deployments else 0):
+            self.mock_resources[namespaces[i % spec.ns]]["pods"].append(f"pod-{i}")
+
+        for resource_type, count, prefix in [("services", spec.services, "svc"), ("configmaps", spec.configmaps, "config"),
+                                             ("secrets", spec.secrets, "secret")]:
+            for i in range(count):
+                self.mock_resources[namespaces[i % spec.ns]][resource_type].append(f"{prefix}-{i}")
+
+        self._namespaces = set(namespaces)
+        self._names = {(namespace, resource_type): set(names)
+                       for namespace, resources in self.mock_resources.items() for resource_type, names in resources.items()}
+
+    def _add_deployment(self, namespace: str, deployment: str, replicas: int) -> None:
+        """Add a deployment with its replicasets, the newest owning all of its pods"""
+        self.mock_resources[namespace]["deployments"].append(deployment)
+
+        pods: List[str] = []
+        for revision in range(self.spec.rs):
+            replicaset = f"{deployment}-{_suffix(f'{namespace}/{deployment}/{revision}', 10)}"
+            current = revision == self.spec.rs - 1
+            self.mock_resources[namespace]["replicasets"].append(replicaset)
+            self._replicaset_owners[(namespace, replicaset)] = (deployment, replicas if current else 0)
+
+            if current:
+                for i in range(replicas):
+                    pod = f"{replicaset}-{_suffix(f'{namespace}/{replicaset}/{i}', 5)}"
+                    pods.append(pod)
+                    self._pod_owners[(namespace, pod)] = replicaset
+                self._pods_by_owner[(namespace, "replicasets", replicaset)] = pods
+
+        self.mock_resources[namespace]["pods"].extend(pods)
+        self._pods_by_owner[(namespace, "deployments", deployment)] = pods
+
+    def _wait(self) -> None:
+        """Wait like a request to the API server would"""
+        if self.spec.latency:
+            time.sleep(self.spec.latency)
+
+    def _exists(self, namespace: str, resource_type: str, resource_name: str) -> bool:
+        """Check if a resource exists without going through a list of names"""
+        if resource_type == "namespace":
+            return resource_name in self._namespaces
+        return resource_name in self._names.get((namespace, resource_type), set())
+
+    @_simulated_request
+    def get_pods_for_resource(self, namespace: str, resource_type: str, resource_name: str) -> List[str]:
+        """Get the pods owned by a controller, directly or through a replicaset"""
+        if resource_type == "pods":
+            return [resource_name] if self._exists(namespace, "pods", resource_name) else []
+        return list(self._pods_by_owner.get((namespace, resource_type, resource_name), []))
+
+    @_simulated_request
+    def get_owner_index(self, namespace: str) -> OwnerIndex:
+        """Get the pods of a namespace indexed by their owning controller"""
+        pods_by_owner = {(resource_type, resource_name): list(pods)
+                         for (pod_namespace, resource_type, resource_name), pods in self._pods_by_owner.items()
+                         if pod_namespace == namespace}
+        containers_by_pod = {pod: self.get_pod_containers(namespace, pod) for pod in self.get_resources(namespace, "pods")}
+        return OwnerIndex(pods_by_owner, containers_by_pod)
+
+    @_simulated_request
+    def get_pod_containers(self, namespace: str, pod_name: str) -> List[str]:
+        """Get containers in a pod"""
+        return ["main"] if self._exists(namespace, "pods", pod_name) else []
+
+    def find_resources(self, resource_type: str, namespace: Optional[str] = None, label_selector: Optional[str] = None,
+                       field_selector: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Find the resources of a type matching label and field selectors, a simulated request per page"""
+        with _nested_call():
+            resources = list(super().find_resources(resource_type, namespace, label_selector, field_selector))
+
+        self._wait()
+        for i, resource in enumerate(resources):
+            if i and i % PAGE_SIZE == 0:
+                self._wait()
+            yield resource
+
+    def _build_resource(self, namespace: str, resource_type: str, resource_name: str) -> Optional[Dict[str, Any]]:
+        """Build the definition of a synthetic resource, with owner references and the labels selecting it"""
+        if not self._exists(namespace, resource_type, resource_name):
+            return None
+
+        if resource_type == "namespace":
+            return super()._build_resource(namespace, resource_type, resource_name)
+
+        app = resource_name
+        owner: Optional[Tuple[str, str, str]] = None
+        replicas: Optional[int] = None
+        labels: Dict[str, str] = {}
+
+        if resource_type == "replicasets":
+            app, replicas = self._replicaset_owners[(namespace, resource_name)]
+            owner = ("deployments", "Deployment", app)
+            labels["pod-template-hash"] = resource_name[len(app) + 1:]
+        elif resource_type == "pods" and (namespace, resource_name) in self._pod_owners:
+            replicaset = self._pod_owners[(namespace, resource_name)]
+            app = self._replicaset_owners[(namespace, replicaset)][0]
+            owner = ("replicasets", "ReplicaSet", replicaset)
+            labels["pod-template-hash"] = replicaset[len(app) + 1:]
+        elif resource_type == "deployments":
+            replicas = len(self._pods_by_owner.get((namespace, "deployments", resource_name), []))
+
+        metadata: Dict[str, Any] = {"name": resource_name, "namespace": namespace, "labels": {"app": app, **labels}}
+        if owner is not None:
+            owner_type, kind, owner_name = owner
+            metadata["ownerReferences"] = [{
+                "apiVersion": "apps/v1",
+                "kind": kind,
+                "name": owner_name,
+                "uid": _get_uid(namespace, owner_type, owner_name),
+                "controller": True,
+                "blockOwnerDeletion": True,
+            }]
+
+        resource_dict: Dict[str, Any] = {
+            "apiVersion": self._get_api_version(resource_type),
+            "kind": self._get_kind(resource_type),
+            "metadata": metadata,
+        }
+
+        container = {"name": "main", "image": f"registry.example.com/{app}:1.0", "ports": [{"containerPort": 8080}]}
+        if resource_type in ["deployments", "replicasets"]:
+            resource_dict["spec"] = {
+                "replicas": replicas,
+                "selector": {"matchLabels": {"app": app, **labels}},
+                "template": {"metadata": {"labels": {"app": app, **labels}}, "spec": {"containers": [container]}},
+            }
+        elif resource_type == "pods":
+            resource_dict["spec"] = {"containers": [container], "nodeName": f"node-{_suffix(resource_name, 5)}"}
+        elif resource_type == "services":
+            resource_dict["spec"] = {"selector": {"app": app}, "ports": [{"port": 80, "targetPort": 8080}]}
+        elif resource_type == "configmaps":
+            resource_dict["data"] = {"app.properties": f"name={resource_name}\nreplicas=3\n"}
+        elif resource_type == "secrets":
+            resource_dict["type"] = "Opaque"
+            resource_dict["data"] = {"token": "c2VjcmV0"}
+
+        return resource_dict
+
+    # Every call of the clients stands for a request to the API server
+    get_namespaces = _simulated_request(MockKubernetesClient.get_namespaces)
+    get_resources = _simulated_request(MockKubernetesClient.get_resources)
+    list_resources = _simulated_request(MockKubernetesClient.list_resources)
+    count_resources = _simulated_request(MockKubernetesClient.count_resources)
+    get_resource_yaml = _simulated_request(MockKubernetesClient.get_resource_yaml)
+    get_resource = _simulated_request(MockKubernetesClient.get_resource)
+    patch_resource = _simulated_request(MockKubernetesClient.patch_resource)
+    exec_command = _simulated_request(MockKubernetesClient.exec_command)
+    restart_controller = _simulated_request(MockKubernetesClient.restart_controller)
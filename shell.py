@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+The K8sh shell: registration and execution of commands, scripts, the interactive prompt and k8shd
+"""
+import argparse
+import os.path
+import shlex
+import signal
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stderr, redirect_stdout
+from typing import Any, Dict, List, Optional, TextIO, Tuple
+
+from prompt_toolkit import PromptSession, HTML
+from prompt_toolkit.history import FileHistory
+
+from utils.completer import K8shCompleter
+
+from command.cat import CatCommand
+from command.clear import ClearCommand
+from command.edit import EditCommand
+from command.cd import CdCommand
+from command.du import DuCommand
+from command.exit import ExitCommand
+from command.find import FindCommand
+from command.grep import GrepCommand
+from command.help import HelpCommand
+from command.history import HistoryCommand
+from command.logs import LogsCommand
+from command.ls import LsCommand
+from command.profile import ProfileCommand
+from command.pwd import PwdCommand
+from command.exec import ExecCommand
+from command.restart import RestartCommand
+from command.stats import StatsCommand
+from command.tree import TreeCommand
+from command.xargs import XargsCommand
+from command.registry import CommandRegistry
+from state.state import State
+from utils import daemon, metrics, output, stats
+from utils.concurrency import DEFAULT_WORKERS
+from utils.terminal import Color, colorize, disable_colors, enable_colors
+
+
+# Separates the commands of a pipeline
+PIPE = "|"
+
+# Lines opening and closing a block of script lines which run concurrently
+PARALLEL_BLOCK_START = "parallel {"
+PARALLEL_BLOCK_END = "}"
+
+
+def register_commands(registry: CommandRegistry) -> None:
+    """Register all available commands"""
+    # Navigation commands
+    registry.register_command(LsCommand())
+    registry.register_command(CdCommand())
+    registry.register_command(PwdCommand())
+    registry.register_command(CatCommand())
+    registry.register_command(EditCommand())
+    registry.register_command(ExecCommand())
+    registry.register_command(LogsCommand())
+    registry.register_command(ClearCommand())
+    registry.register_command(HistoryCommand())
+    registry.register_command(RestartCommand())
+    registry.register_command(TreeCommand())
+    registry.register_command(FindCommand())
+    registry.register_command(GrepCommand())
+    registry.register_command(DuCommand())
+    registry.register_command(StatsCommand())
+
+    # Commands needing a registry reference
+    registry.register_command(HelpCommand(registry))
+    registry.register_command(XargsCommand(registry))
+    registry.register_command(ProfileCommand(registry))
+
+    # Exit command
+    registry.register_command(ExitCommand())
+
+
+def parse_input(input_text: str) -> List[Tuple[str, List[str]]]:
+    """
+    Parse input text into the commands of a pipeline and their arguments. Commands
+    after a pipe are run through xargs. Raises ValueError for an invalid pipeline.
+    """
+    # Split like a shell: quotes keep arguments such as wildcards as they are, and unquoted | separate commands
+    lexer = shlex.shlex(input_text.strip(), posix=True, punctuation_chars=PIPE)
+    lexer.whitespace_split = True
+    lexer.commenters = ""
+    try:
+        parts = list(lexer)
+    except ValueError:
+        # Unbalanced quotes
+        parts = input_text.strip().split()
+
+    stages: List[List[str]] = [[]]
+    for part in parts:
+        if part == PIPE:
+            stages.append([])
+        elif set(part) == {PIPE}:
+            raise ValueError(f"Invalid pipe {part}")
+        else:
+            stages[-1].append(part)
+
+    if len(stages) == 1:
+        return [(stages[0][0], stages[0][1:])] if stages[0] else [("", [])]
+
+    if not all(stages):
+        raise ValueError("Missing command in pipeline")
+
+    commands = [(stages[0][0], stages[0][1:])]
+    for stage in stages[1:]:
+        commands.append((stage[0], stage[1:]) if stage[0] == "xargs" else ("xargs", stage))
+    return commands
+
+
+def is_read_only_input(registry: CommandRegistry, input_text: str) -> bool:
+    """Check if every command of a command line only reads"""
+    try:
+        commands = parse_input(input_text)
+    except ValueError:
+        return False
+
+    for command_name, args in commands:
+        command = registry.get_command(command_name)
+        if command is None or not command.is_read_only(args):
+            return False
+    return True
+
+
+def is_interactive_input(registry: CommandRegistry, input_text: str) -> bool:
+    """Check if a command of a command line needs the terminal"""
+    try:
+        commands = parse_input(input_text)
+    except ValueError:
+        return False
+
+    for command_name, args in commands:
+        command = registry.get_command(command_name)
+        if command is not None and command.is_interactive(args):
+            return True
+    return False
+
+
+def run_input(registry: CommandRegistry, state: State, input_text: str) -> bool:
+    """
+    Run a command line, passing the records of every command of a pipeline to the next one.
+    Returns True if execution should continue, False otherwise
+    """
+    try:
+        commands = parse_input(input_text)
+    except ValueError as e:
+        output.error(f"Error: {str(e)}")
+        state.set_last_exit_code(2)
+        return True
+
+    # A pipeline fails if any of its commands fails
+    exit_code = 0
+    try:
+        for i, (command_name, args) in enumerate(commands):
+            if i == len(commands) - 1:
+                running = run_command(registry, state, command_name, args)
+                if exit_code and not state.get_last_exit_code():
+                    state.set_last_exit_code(exit_code)
+                return running
+
+            command = registry.get_command(command_name)
+            if command is not None and not command.has_structured_output():
+                output.error(f"Error: {command_name} can't pass records to a pipe")
+                state.set_last_exit_code(2)
+                return True
+
+            with output.collect_records() as records:
+                if not run_command(registry, state, command_name, args):
+                    return False
+            exit_code = exit_code or state.get_last_exit_code()
+            state.set_input_records(records)
+    finally:
+        state.set_input_records(None)
+        metrics.export()
+
+    return True
+
+
+def run_command(registry: CommandRegistry, state: State, command_name: str, args: List[str]) -> bool:
+    """
+    Run a command and return True if execution should continue, False otherwise.
+    The command fails with exit code 1 if it prints an error, unless it sets an exit code itself
+    """
+    if not command_name:
+        return True
+
+    state.set_last_exit_code(0)
+    command = registry.get_command(command_name)
+    if command:
+        structured = output.is_structured() and command.has_structured_output()
+        with stats.measure_command(" ".join([command_name] + args)), output.track_errors() as errors:
+            try:
+                state.set_current_command(command_name)
+                if structured:
+                    output.begin_records()
+                command.execute(state, args)
+                state.set_current_command(None)
+            except SystemExit:
+                state.set_current_command(None)
+                return False
+            except Exception as e:
+                output.error(f"Error executing command: {str(e)}")
+                state.set_current_command(None)
+            finally:
+                if structured:
+                    output.end_records()
+
+        if errors and not state.get_last_exit_code():
+            state.set_last_exit_code(1)
+    else:
+        output.error(f"Command not found: {command_name}")
+        state.set_last_exit_code(127)
+
+    return True
+
+
+def run_script(script_path: str, registry: CommandRegistry, state: State, jobs: int = 1) -> None:
+    """
+    Run a script of commands from a file. Consecutive read-only commands inside
+    'parallel {' ... '}' blocks, or anywhere when jobs is more than 1, run concurrently
+    """
+    workers = jobs if jobs > 1 else DEFAULT_WORKERS
+    batch: List[str] = []
+    in_block = False
+
+    try:
+        with open(script_path, 'r') as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+
+                # Skip empty lines and comments
+                if not line or line.startswith('#'):
+                    continue
+
+                if line == PARALLEL_BLOCK_START or (line == PARALLEL_BLOCK_END and in_block):
+                    run_parallel(registry, state, batch, workers)
+                    batch = []
+                    in_block = line == PARALLEL_BLOCK_START
+                    continue
+
+                if (in_block or jobs > 1) and is_read_only_input(registry, line):
+                    batch.append(line)
+                    continue
+
+                # Other commands wait for the lines before them, and the lines after them wait for them
+                run_parallel(registry, state, batch, workers)
+                batch = []
+
+                print(f"$ {line}")
+                if not run_input(registry, state, line):
+                    print(f"Script execution stopped at line {line_number}")
+                    return
+
+        run_parallel(registry, state, batch, workers)
+    except FileNotFoundError:
+        print(f"Script file not found: {script_path}")
+    except Exception as e:
+        print(f"Error running script: {str(e)}")
+
+
+def run_parallel(registry: CommandRegistry, state: State, lines: List[str], workers: int) -> None:
+    """Run read-only script lines concurrently, each with a copy of the state, printing their output in script order"""
+    if not lines:
+        return
+
+    def run_line(line: str) -> str:
+        with output.buffer_output() as buffer:
+            print(f"$ {line}")
+            run_input(registry, state.clone(), line)
+        return buffer.getvalue()
+
+    with output.buffering_stdout(), ThreadPoolExecutor(max_workers=min(workers, len(lines))) as executor:
+        # The output of a line is printed as soon as it and all the lines before it are done
+        for text in executor.map(run_line, lines):
+            sys.stdout.write(text)
+            sys.stdout.flush()
+
+
+def run(args: argparse.Namespace) -> None:
+    """Run the shell for parsed command line arguments"""
+    # Disable colors if requested, or when scripts read the output
+    if args.no_color or args.output != 'text':
+        disable_colors()
+    output.set_output_format(args.output)
+    stats.set_trace(args.trace)
+    metrics.set_file(args.metrics_file)
+    if args.metrics_port:
+        metrics.serve(args.metrics_port)
+
+    # Initialize state and command registry
+    state = State()
+    registry = CommandRegistry()
+    register_commands(registry)
+
+    if args.daemon:
+        run_daemon(registry, args.socket)
+        return
+
+    # Run a single command, exiting with its exit code
+    if args.command is not None:
+        run_input(registry, state, args.command)
+        sys.exit(state.get_last_exit_code())
+
+    # Run script if provided
+    if args.script:
+        run_script(args.script, registry, state, args.jobs)
+        return
+
+    run_interactive(registry, state, args.no_color)
+
+
+def run_daemon(registry: CommandRegistry, socket_path: str) -> None:
+    """Run the commands forwarded by k8sh -c, keeping the client and its caches warm between them"""
+    def handle(request: Dict[str, Any], stdout: TextIO, stderr: TextIO) -> Optional[int]:
+        # The daemon has no terminal, so k8sh -c runs commands such as edit itself
+        if is_interactive_input(registry, request["command"]):
+            return None
+
+        output.set_output_format(request.get("output", "text"))
+        stats.set_trace(bool(request.get("trace")))
+        if request.get("no_color") or output.is_structured():
+            disable_colors()
+        else:
+            enable_colors()
+
+        # Every command starts from the root, like k8sh -c without a daemon
+        state = State()
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            run_input(registry, state, request["command"])
+        return state.get_last_exit_code()
+
+    # Stop on SIGTERM the same way as on Ctrl+C, removing the socket
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+
+    print(f"k8shd listening on {socket_path}")
+    try:
+        daemon.serve(socket_path, handle)
+    except KeyboardInterrupt:
+        pass
+
+
+def run_interactive(registry: CommandRegistry, state: State, no_color: bool) -> None:
+    """Read and run commands from the prompt until exit"""
+    # Create prompt session with history
+    try:
+        session: PromptSession = PromptSession(
+            history=FileHistory(os.path.expanduser('~/.k8sh_history')),
+            completer=K8shCompleter(registry, state)
+        )
+    except Exception:
+        # Fallback if history file can't be created
+        session = PromptSession(
+            completer=K8shCompleter(registry, state)
+        )
+
+    # Store the session in the state for access by commands
+    state.set_prompt_session(session)
+
+    # Print welcome message
+    print(colorize("Welcome to K8sh - Kubernetes Shell", Color.BRIGHT_GREEN))
+    print(f"Type {colorize('help', Color.BRIGHT_YELLOW)} for a list of commands or {colorize('exit', Color.BRIGHT_YELLOW)} to quit")
+
+    # Main loop
+    while True:
+        try:
+            current_path = state.get_current_path()
+            if current_path == "":
+                current_path = "/"
+
+            if no_color:
+                promt = HTML(f"{current_path} $ ")
+            else:
+                promt = HTML(f"<ansigreen><b>{current_path}</b></ansigreen> <ansired>$</ansired> ")
+
+            user_input: str = session.prompt(promt)
+            if not run_input(registry, state, user_input):
+                break
+
+        except KeyboardInterrupt:
+            print("^C")
+        except EOFError:
+            print("^D")
+            break
+        except Exception as e:
+            print(f"Error: {str(e)}")
+
+    print("Goodbye!")
@@ -1,8 +1,10 @@
+import fnmatch
 import os
 import sys
 from typing import List, Dict, Callable, Optional, Union
 
-from k8s_client import get_kubernetes_client
+from k8s_client import get_cluster_index, get_kubernetes_client
+from utils.concurrency import map_concurrently
 
 # Add the project root to the Python path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
@@ -52,6 +54,11 @@ available_segments: List[Dict[str, Callable[..., Optional[Union[List[str], str]]
 file_levels = [4]  # Container level is always files
 
 
+def has_wildcards(path: str) -> bool:
+    """Check if a path contains shell-style wildcards"""
+    return any(char in path for char in "*?[")
+
+
 class Manager:
     """Manages the virtual filesystem path"""
 
@@ -164,3 +171,63 @@ class Manager:
 
         # Set the path to the temp_path (which contains all valid segments)
         self._path = temp_path
+
+    def resolve(self, path: str) -> List[str]:
+        """Validate a path relative to the current one and return its segments, without changing the current path"""
+        original_path = self._path.copy()
+        try:
+            self.set_path(path)
+            return self._path.copy()
+        finally:
+            self._path = original_path
+
+    def expand(self, pattern: str) -> List[str]:
+        """
+        Expand a path with shell-style wildcards (*, ?, [...]) into the matching absolute paths.
+        Segments without wildcards are taken as they are, so the results still need to be validated.
+        The children of all prefixes at a level are fetched concurrently and the results are sorted.
+        """
+        # Resolve the pattern against the current path
+        if pattern.startswith("/"):
+            segments: List[str] = []
+        else:
+            segments = self._path.copy()
+
+        for segment in pattern.split("/"):
+            if segment == "..":
+                if segments:
+                    segments.pop()
+            elif segment and segment != ".":
+                segments.append(segment)
+
+        prefixes: List[List[str]] = [[]]
+        for segment in segments:
+            if not has_wildcards(segment):
+                prefixes = [prefix + [segment] for prefix in prefixes]
+                continue
+
+            # Only prefixes that still have a level below them can be expanded
+            expandable = [prefix for prefix in prefixes if len(prefix) < len(available_segments)]
+
+            # Resources in several namespaces come from one LIST for all namespaces per type
+            use_cluster_index = len({prefix[0] for prefix in expandable if len(prefix) == 2}) > 1
+
+            def list_children(prefix: List[str]) -> List[str]:
+                try:
+                    if use_cluster_index and len(prefix) == 2:
+                        return get_cluster_index().get_resources(prefix[0], prefix[1])
+                    children = available_segments[len(prefix)]["children"](*prefix)
+                except Exception:
+                    return []
+                return children if isinstance(children, list) else []
+
+            children_lists = map_concurrently(list_children, expandable)
+
+            prefixes = [
+                prefix + [child]
+                for prefix, children in zip(expandable, children_lists)
+                for child in sorted(children)
+                if fnmatch.fnmatchcase(child, segment)
+            ]
+
+        return ["/" + "/".join(prefix) for prefix in prefixes if prefix]
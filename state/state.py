@@ -1,6 +1,7 @@
 from typing import List, Optional, Union, Any
 
 from state.path_manager import Manager
+from utils.output import Record
 
 
 class State:
@@ -12,6 +13,17 @@ class State:
         self.prompt_session: Optional[Any] = None
         # Initialize previous_path to root ("/") so we can navigate back to root from first directory
         self.previous_path: str = "/"
+        # Exit code of the last command that ran something remotely
+        self.last_exit_code: int = 0
+        # Records of the previous command of a pipeline, for the running command
+        self.input_records: Optional[List[Record]] = None
+
+    def clone(self) -> "State":
+        """Copy the current and previous paths into a new state, e.g. for a command running concurrently"""
+        state = State()
+        state.path_manager._path = list(self.path_manager._path)
+        state.previous_path = self.previous_path
+        return state
 
     def get_current_path(self) -> str:
         """Get the current path"""
@@ -31,6 +43,14 @@ class State:
         """Check if a path segment is a directory"""
         return self.path_manager.is_directory(path_segment)
 
+    def expand_path(self, pattern: str) -> List[str]:
+        """Expand a path with wildcards into the matching absolute paths"""
+        return self.path_manager.expand(pattern)
+
+    def resolve_path(self, path: str) -> List[str]:
+        """Validate a path and return its segments, without changing the current path"""
+        return self.path_manager.resolve(path)
+
     def get_available_items(self) -> Optional[Union[List[str], str]]:
         """Get available items at the current path"""
         return self.path_manager.get_available_values()
@@ -58,3 +78,19 @@ class State:
     def set_previous_path(self, path: str) -> None:
         """Set the previous path"""
         self.previous_path = path
+
+    def get_last_exit_code(self) -> int:
+        """Get the exit code of the last remote command"""
+        return self.last_exit_code
+
+    def set_last_exit_code(self, code: int) -> None:
+        """Set the exit code of the last remote command"""
+        self.last_exit_code = code
+
+    def get_input_records(self) -> Optional[List[Record]]:
+        """Get the records piped into the running command, or None outside of a pipeline"""
+        return self.input_records
+
+    def set_input_records(self, records: Optional[List[Record]]) -> None:
+        """Set the records piped into the next command"""
+        self.input_records = records
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Breadth-first traversal of the virtual filesystem, used by ls -R and tree
+"""
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from k8s_client import OwnerIndex, get_cluster_index, get_kubernetes_client
+from utils.concurrency import DEFAULT_WORKERS, map_concurrently
+
+k8s_client = get_kubernetes_client()
+
+# A directory entry, as (name, is_directory)
+Entry = Tuple[str, bool]
+
+# A listed directory, as (path segments, sorted entries)
+Listing = Tuple[List[str], List[Entry]]
+
+
+class TreeWalker:
+    """
+    Walk the virtual filesystem level by level. The directories of a level are listed
+    concurrently, and the pods of controllers come from one owner index per namespace
+    shared by the whole traversal instead of a LIST per controller.
+    """
+
+    def __init__(self, max_depth: Optional[int] = None, max_workers: int = DEFAULT_WORKERS) -> None:
+        self.max_depth = max_depth
+        self.max_workers = max_workers
+        # Set when the traversal spans several namespaces
+        self.use_cluster_index = False
+        self._owner_indexes: Dict[str, OwnerIndex] = {}
+        self._namespace_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def walk(self, roots: List[List[str]]) -> Iterator[List[Listing]]:
+        """Yield the listings of every level below the roots, the roots themselves first"""
+        self.use_cluster_index = any(len(root) == 0 for root in roots) or len({root[0] for root in roots}) > 1
+        frontier = roots
+        depth = 1
+
+        while frontier and (self.max_depth is None or depth <= self.max_depth):
+            entries = map_concurrently(self.list_directory, frontier, self.max_workers)
+            level = list(zip(frontier, entries))
+            yield level
+
+            frontier = [path + [name] for path, children in level for name, is_dir in children if is_dir]
+            depth += 1
+
+    def list_directory(self, path: List[str]) -> List[Entry]:
+        """List a directory of the virtual filesystem"""
+        level = len(path)
+
+        if level == 0:
+            return [(namespace, True) for namespace in sorted(k8s_client.get_namespaces())]
+
+        if level == 1:
+            return [(resource_type, True) for resource_type in k8s_client.get_resource_types()]
+
+        namespace, resource_type = path[0], path[1]
+
+        if level == 2:
+            is_dir = k8s_client.is_resource_with_children(resource_type)
+            if self.use_cluster_index:
+                # One LIST for all namespaces per type instead of one per namespace and type
+                names = get_cluster_index().get_resources(namespace, resource_type)
+            else:
+                names = k8s_client.get_resources(namespace, resource_type)
+            return [(name, is_dir) for name in sorted(names)]
+
+        if level == 3 and resource_type == "pods":
+            return [(container, False) for container in self._get_containers(namespace, path[2])]
+
+        if level == 3 and k8s_client.is_resource_with_children(resource_type):
+            pods = self._get_owner_index(namespace).get_pods(resource_type, path[2])
+            return [(pod, True) for pod in sorted(pods)]
+
+        if level == 4 and resource_type != "pods":
+            return [(container, False) for container in self._get_containers(namespace, path[3])]
+
+        return []
+
+    def _get_containers(self, namespace: str, pod_name: str) -> List[str]:
+        """Get the containers of a pod from the owner index, falling back to reading the pod"""
+        containers = self._get_owner_index(namespace).get_containers(pod_name)
+        if containers is None:
+            containers = k8s_client.get_pod_containers(namespace, pod_name)
+        return containers
+
+    def _get_owner_index(self, namespace: str) -> OwnerIndex:
+        """Get the owner index of a namespace, building it only once even when called concurrently"""
+        with self._lock:
+            namespace_lock = self._namespace_locks.setdefault(namespace, threading.Lock())
+
+        with namespace_lock:
+            if namespace not in self._owner_indexes:
+                self._owner_indexes[namespace] = k8s_client.get_owner_index(namespace)
+            return self._owner_indexes[namespace]
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test for the cat command with several paths and wildcards
+"""
+
+
+def test_cat_wildcard(framework):
+    """Test that a wildcard shows every matching resource as a multi-document stream"""
+    framework.env["NO_COLOR"] = "1"
+    framework.run_test_commands([
+        "cat /default/configmaps/*"
+    ])
+
+    framework.assert_output_contains([
+        "---\napiVersion: v1",
+        "name: app-config",
+        "name: system-config"
+    ])
+    # Documents are in a stable, sorted order
+    assert framework.output.index("name: app-config") < framework.output.index("name: system-config")
+
+
+def test_cat_wildcard_namespace(framework):
+    """Test that wildcards work in the namespace segment"""
+    framework.env["NO_COLOR"] = "1"
+    framework.run_test_commands([
+        "cat /*/configmaps/kube-*"
+    ])
+
+    framework.assert_output_contains([
+        "name: kube-proxy",
+        "name: kube-dns",
+        "namespace: kube-system"
+    ])
+    framework.assert_output_not_contains([
+        "name: cluster-info",
+        "Error:"
+    ])
+
+
+def test_cat_multiple_paths(framework):
+    """Test that several paths can be shown at once"""
+    framework.env["NO_COLOR"] = "1"
+    framework.run_test_commands([
+        "cd /default",
+        "cat services/kubernetes pods/nginx-pod-1 services/missing"
+    ])
+
+    framework.assert_output_contains([
+        "kind: Service",
+        "kind: Pod",
+        "Error: Could not get YAML definition for services/missing"
+    ])
+
+
+def test_cat_wildcard_no_match(framework):
+    """Test the error for a wildcard matching nothing"""
+    framework.run_test_commands([
+        "cat /default/configmaps/nothing-*"
+    ])
+
+    framework.assert_output_contains([
+        "Error: No resources match /default/configmaps/nothing-*"
+    ])
+
+
+def test_cat_wildcard_literal_name(framework):
+    """Test that matches of a wildcard which don't exist are left out without errors"""
+    framework.env["NO_COLOR"] = "1"
+    framework.run_test_commands([
+        "cat '*/deployments/web-app'"
+    ])
+
+    framework.assert_output_contains([
+        "name: web-app",
+        "namespace: default"
+    ])
+    framework.assert_output_not_contains([
+        "Error:"
+    ])
+
+
+def test_cat_argument_order(framework):
+    """Test that resources are shown in the order of the arguments"""
+    framework.env["NO_COLOR"] = "1"
+    framework.run_test_commands([
+        "cat /default/configmaps/system-config '/default/configmaps/app-*'"
+    ])
+
+    assert framework.output.index("name: system-config") < framework.output.index("name: app-config")
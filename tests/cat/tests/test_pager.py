@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Tests for the pager used by the cat command
+"""
+import io
+
+from utils import pager
+from utils.pager import BuiltinPager, get_pager_command, page
+from utils.terminal import disable_colors, enable_colors
+
+
+def make_pager(keys, rows=4):
+    """Create a built-in pager reading the given key presses"""
+    output = io.StringIO()
+    key_presses = iter(keys)
+    return BuiltinPager(output, lambda: next(key_presses), rows), output
+
+
+def test_builtin_pager_pauses_on_full_screen():
+    """Test that the built-in pager waits for a key after each screen"""
+    disable_colors()
+    try:
+        builtin_pager, output = make_pager([" "])
+        assert builtin_pager.write("1\n2\n3\n4\n5\n")
+    finally:
+        enable_colors()
+
+    lines = output.getvalue().split("\n")
+    assert lines[:3] == ["1", "2", "3"]
+    assert "--More--" in lines[3]
+    assert lines[3].endswith("4")
+
+
+def test_builtin_pager_quit():
+    """Test that q stops the output"""
+    builtin_pager, output = make_pager(["q"])
+
+    assert not builtin_pager.write("1\n2\n3\n4\n5\n")
+    assert "4" not in output.getvalue()
+
+
+def test_builtin_pager_joins_partial_lines():
+    """Test that chunks which don't end with a newline are joined"""
+    builtin_pager, output = make_pager([], rows=10)
+
+    builtin_pager.write("key: ")
+    builtin_pager.write("value\nother")
+    builtin_pager.close()
+
+    assert output.getvalue() == "key: value\nother"
+
+
+def test_page_streams_without_terminal(capsys):
+    """Test that output is written directly when stdout isn't a terminal"""
+    page(iter(["a\n", "b\n"]))
+
+    assert capsys.readouterr().out == "a\nb\n"
+
+
+def test_pager_command(monkeypatch):
+    """Test the choice of the external pager"""
+    monkeypatch.setenv("PAGER", "cat -v")
+    assert get_pager_command() == ["cat", "-v"]
+
+    monkeypatch.setenv("PAGER", "no-such-pager")
+    assert get_pager_command() is None
+
+    monkeypatch.delenv("PAGER")
+    monkeypatch.setattr(pager.shutil, "which", lambda name: None)
+    assert get_pager_command() is None
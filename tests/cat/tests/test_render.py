@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Tests for the YAML rendering used by the cat command
+"""
+import pytest
+
+from utils import render
+from utils.render import clear_render_cache, dump_yaml, highlight_yaml, iter_yaml, render_resource
+from utils.terminal import disable_colors, enable_colors
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    """Start every test with an empty render cache"""
+    clear_render_cache()
+    yield
+    clear_render_cache()
+
+
+@pytest.fixture
+def tty(monkeypatch):
+    """Pretend the output is a terminal with colors enabled"""
+    enable_colors()
+    monkeypatch.setattr(render.sys.stdout, "isatty", lambda: True)
+
+
+def make_resource(version: str = "1", data: str = "value"):
+    """Build a ConfigMap as returned by the API server"""
+    return {
+        "apiVersion": "v1",
+        "kind": "ConfigMap",
+        "metadata": {"name": "config", "uid": "abc", "resourceVersion": version},
+        "data": {"key": data},
+    }
+
+
+def test_dump_yaml_is_block_style():
+    """Test that YAML is dumped in block style with sorted keys"""
+    assert dump_yaml({"b": {"c": [1]}, "a": 1}) == "a: 1\nb:\n  c:\n  - 1\n"
+
+
+def test_render_removes_system_fields():
+    """Test that server-managed fields are not rendered"""
+    disable_colors()
+    try:
+        output = render_resource(make_resource())
+    finally:
+        enable_colors()
+
+    assert "kind: ConfigMap" in output
+    assert "uid" not in output
+    assert "resourceVersion" not in output
+
+
+def test_highlighting_only_on_terminals(tty, monkeypatch):
+    """Test that highlighting is skipped when output isn't a terminal"""
+    assert "\033[" in highlight_yaml("key: value\n")
+
+    monkeypatch.setattr(render.sys.stdout, "isatty", lambda: False)
+    assert highlight_yaml("key: value\n") == "key: value\n"
+
+
+def test_highlighting_skipped_for_big_documents(tty, monkeypatch):
+    """Test that highlighting is skipped above the size threshold"""
+    monkeypatch.setattr(render, "HIGHLIGHT_MAX_SIZE", 10)
+
+    assert highlight_yaml("key: a long value\n") == "key: a long value\n"
+
+
+def test_render_is_cached_per_resource_version(tty, monkeypatch):
+    """Test that a resource is rendered once per resource version"""
+    calls = []
+    original_highlight = render.highlight
+
+    def counting_highlight(*args):
+        calls.append(args[0])
+        return original_highlight(*args)
+
+    monkeypatch.setattr(render, "highlight", counting_highlight)
+
+    first = render_resource(make_resource("1"))
+    rendered_calls = len(calls)
+    assert render_resource(make_resource("1")) == first
+    assert len(calls) == rendered_calls
+
+    # A new resource version is rendered again
+    assert "changed" in render_resource(make_resource("2", "changed"))
+    assert len(calls) == 2 * rendered_calls
+
+
+def test_iter_yaml_matches_dump():
+    """Test that the chunks of a streamed document add up to the whole document"""
+    data = {
+        "apiVersion": "v1",
+        "data": {
+            "long": "word " * 100,
+            "multiline": "first line\nsecond line\n\n  indented",
+            "list": [1, {"nested": 2}],
+            "empty": {},
+        },
+        "metadata": {"name": "config", "labels": {}},
+        "spec": None,
+    }
+
+    chunks = list(iter_yaml(data))
+
+    assert len(chunks) > len(data)
+    assert "".join(chunks) == dump_yaml(data)
+
+
+def test_streamed_highlighting_stops_at_document_size(tty, monkeypatch):
+    """Test that a document made of many small chunks is not highlighted past the size threshold, nor cached"""
+    monkeypatch.setattr(render, "HIGHLIGHT_MAX_SIZE", 100)
+    resource = make_resource()
+    resource["data"] = {"key%02d" % i: "value" for i in range(20)}
+
+    chunks = list(render.stream_resource(resource))
+
+    assert "\033[" in chunks[0]
+    assert "  key19: value\n" in chunks
+    assert render._render_cache == {}
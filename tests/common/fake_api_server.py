@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+Fake Kubernetes API server for tests of the real client
+
+It serves LIST, WATCH, GET and PATCH of the resources K8sh supports, and pod logs, from
+fixtures over plain HTTP, so RealKubernetesClient can be tested and benchmarked without
+a cluster through a generated kubeconfig. Like a real API server it pages lists with
+continue tokens, sends watch bookmarks and answers 410 Gone to resource versions that
+are too old. This module only uses the standard library.
+"""
+import base64
+import copy
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from k8s_client.client import KubernetesClient
+from utils.manifest import apply_merge_patch
+from utils.selectors import matches_field_selector, matches_label_selector
+
+# API version and kind of each resource type
+RESOURCES = {
+    "namespaces": ("v1", "Namespace"),
+    "services": ("v1", "Service"),
+    "configmaps": ("v1", "ConfigMap"),
+    "secrets": ("v1", "Secret"),
+    "pods": ("v1", "Pod"),
+    "deployments": ("apps/v1", "Deployment"),
+    "daemonsets": ("apps/v1", "DaemonSet"),
+    "statefulsets": ("apps/v1", "StatefulSet"),
+    "replicasets": ("apps/v1", "ReplicaSet"),
+    "ingresses": ("networking.k8s.io/v1", "Ingress"),
+}
+
+# /api/v1/namespaces/default/pods/web-1/log, /apis/apps/v1/deployments, /api/v1/namespaces/default, ...
+PATH_PATTERN = re.compile(
+    r"^/(?:api/v1|apis/(?:apps|networking\.k8s\.io)/v1)"
+    r"(?:/namespaces/(?P<namespace>[^/]+))?/(?P<plural>[a-z]+)(?:/(?P<name>[^/]+))?(?P<log>/log)?$"
+)
+
+# Media type of the metadata-only lists asked for in the Accept header
+PARTIAL_OBJECT_METADATA_LIST = "as=PartialObjectMetadataList"
+
+# Seconds between watch bookmarks, when the client allows them
+BOOKMARK_INTERVAL = 1.0
+
+# Seconds between checks for a shutdown of the server
+SHUTDOWN_POLL_INTERVAL = 0.05
+
+
+def _status(code: int, reason: str, message: str) -> Dict[str, Any]:
+    """Build a Status object, the body of API errors"""
+    return {"kind": "Status", "apiVersion": "v1", "metadata": {}, "status": "Failure",
+            "message": message, "reason": reason, "code": code}
+
+
+class FakeApiServer:
+    """In-process HTTP server with the API of a Kubernetes cluster, holding resources in memory"""
+
+    def __init__(self, latency: float = 0.0, watch_timeout: Optional[float] = None,
+                 remaining_item_count: bool = True) -> None:
+        """Create an empty cluster
+
+        Args:
+            latency: seconds every request waits before it is answered
+            watch_timeout: seconds after which watches are closed, whatever timeoutSeconds the client asked for
+            remaining_item_count: whether paged lists report how many items are left, like current servers
+        """
+        self.latency = latency
+        self.watch_timeout = watch_timeout
+        self.remaining_item_count = remaining_item_count
+        self.bookmark_interval = BOOKMARK_INTERVAL
+
+        # Objects by resource type and (namespace, name), namespaces in the "" namespace
+        self._objects: Dict[str, Dict[Tuple[str, str], Dict[str, Any]]] = {plural: {} for plural in RESOURCES}
+        # Changes watches are served from, as (resource version, resource type, event type, object)
+        self._events: List[Tuple[int, str, str, Dict[str, Any]]] = []
+        self._revision = 1
+        # Resource versions below this one are too old to watch or continue lists from
+        self._compacted = 0
+        self._logs: Dict[Tuple[str, str], str] = {}
+        self._changed = threading.Condition()
+        self._stopped = False
+
+        # Watches opened or rejected and bookmarks sent so far, for tests to act at a known point of a watch
+        self.watches = 0
+        self.bookmarks = 0
+        # Requests received, as (method, path, query)
+        self.requests: List[Tuple[str, str, Dict[str, str]]] = []
+        # Path of the last kubeconfig written
+        self.kubeconfig: Optional[str] = None
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def from_client(cls, k8s_client: KubernetesClient, **kwargs: Any) -> "FakeApiServer":
+        """Create a server holding every resource of a client, e.g. a synthetic cluster"""
+        server = cls(**kwargs)
+        for namespace in k8s_client.get_namespaces():
+            namespace_dict = k8s_client.get_resource(namespace, "namespace", namespace)
+            server.put(namespace_dict or {"apiVersion": "v1", "kind": "Namespace", "metadata": {"name": namespace}})
+            for plural in k8s_client.get_resource_types():
+                for resource in k8s_client.list_resources(namespace, plural):
+                    server.put(resource, plural)
+        return server
+
+    @property
+    def url(self) -> str:
+        """Get the address of the server"""
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def start(self) -> "FakeApiServer":
+        """Serve requests from a background thread"""
+        self._thread = threading.Thread(target=self._server.serve_forever, args=(SHUTDOWN_POLL_INTERVAL,),
+                                        name="fake-api-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop serving, ending open watches"""
+        with self._changed:
+            self._stopped = True
+            self._changed.notify_all()
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakeApiServer":
+        return self.start()
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+    def write_kubeconfig(self, path: str) -> str:
+        """Write a kubeconfig pointing at the server and return its path"""
+        kubeconfig = {
+            "apiVersion": "v1",
+            "kind": "Config",
+            "clusters": [{"name": "fake", "cluster": {"server": self.url}}],
+            "users": [{"name": "fake", "user": {"token": "fake"}}],
+            "contexts": [{"name": "fake", "context": {"cluster": "fake", "user": "fake"}}],
+            "current-context": "fake",
+        }
+        # JSON is YAML too
+        with open(path, "w") as f:
+            json.dump(kubeconfig, f)
+        self.kubeconfig = path
+        return path
+
+    def put(self, resource: Dict[str, Any], plural: Optional[str] = None) -> Dict[str, Any]:
+        """Create or replace a resource, with a new resource version, and return it"""
+        if plural is None:
+            plural = next(name for name, (_, kind) in RESOURCES.items() if kind == resource["kind"])
+        api_version, kind = RESOURCES[plural]
+
+        with self._changed:
+            resource = copy.deepcopy(resource)
+            resource.update({"apiVersion": api_version, "kind": kind})
+            metadata = resource["metadata"]
+            key = (metadata.get("namespace", "") if plural != "namespaces" else "", metadata["name"])
+
+            event_type = "MODIFIED" if key in self._objects[plural] else "ADDED"
+            self._store(plural, key, resource, event_type)
+            return copy.deepcopy(resource)
+
+    def delete(self, plural: str, namespace: str, name: str) -> None:
+        """Delete a resource"""
+        with self._changed:
+            resource = self._objects[plural].pop((namespace, name))
+            self._revision += 1
+            resource["metadata"]["resourceVersion"] = str(self._revision)
+            self._events.append((self._revision, plural, "DELETED", copy.deepcopy(resource)))
+            self._changed.notify_all()
+
+    def get(self, plural: str, namespace: str, name: str) -> Optional[Dict[str, Any]]:
+        """Get a resource as it is stored"""
+        with self._changed:
+            return copy.deepcopy(self._objects[plural].get((namespace, name)))
+
+    def set_log(self, namespace: str, pod_name: str, text: str) -> None:
+        """Set the log of a pod"""
+        self._logs[(namespace, pod_name)] = text
+
+    def expire(self) -> None:
+        """Forget the history of changes, so every resource version known so far is too old, like after a compaction"""
+        with self._changed:
+            self._revision += 1
+            self._compacted = self._revision
+            self._events = []
+
+    def wait_for_watches(self, count: int, bookmarks: int = 0, timeout: float = 5.0) -> None:
+        """Wait until a number of watches were opened or rejected, and of bookmarks sent"""
+        with self._changed:
+            if not self._changed.wait_for(lambda: self.watches >= count and self.bookmarks >= bookmarks, timeout):
+                raise TimeoutError(f"{self.watches} watches and {self.bookmarks} bookmarks after {timeout}s")
+
+    def count_requests(self, method: str = "GET", path: Optional[str] = None) -> int:
+        """Count the requests received with a method, to a path if given"""
+        return sum(1 for request_method, request_path, _ in list(self.requests)
+                   if request_method == method and (path is None or request_path == path))
+
+    def _notify_watch(self) -> None:
+        """Count a watch opened or rejected, waking up the tests waiting for it"""
+        with self._changed:
+            self.watches += 1
+            self._changed.notify_all()
+
+    def _store(self, plural: str, key: Tuple[str, str], resource: Dict[str, Any], event_type: str) -> None:
+        """Store a resource with the next resource version and notify watches, with the lock held"""
+        self._revision += 1
+        resource["metadata"]["resourceVersion"] = str(self._revision)
+        self._objects[plural][key] = resource
+        self._events.append((self._revision, plural, event_type, copy.deepcopy(resource)))
+        self._changed.notify_all()
+
+    def _list(self, plural: str, namespace: Optional[str], query: Dict[str, str]) -> List[Dict[str, Any]]:
+        """Get the resources of a type matching the selectors of a request, in a stable order"""
+        with self._changed:
+            resources = [copy.deepcopy(resource) for (resource_namespace, _), resource in sorted(self._objects[plural].items())
+                         if namespace is None or resource_namespace == namespace]
+        return [resource for resource in resources if self._matches(resource, query)]
+
+    def _matches(self, resource: Dict[str, Any], query: Dict[str, str]) -> bool:
+        """Check whether a resource matches the label and field selectors of a request"""
+        if "labelSelector" in query and not matches_label_selector(resource["metadata"].get("labels"), query["labelSelector"]):
+            return False
+        if "fieldSelector" in query and not matches_field_selector(resource, query["fieldSelector"]):
+            return False
+        return True
+
+    def _make_handler(self) -> type:
+        """Create the request handler class, bound to this server"""
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self) -> None:
+                self._handle("GET")
+
+            def do_PATCH(self) -> None:
+                self._handle("PATCH")
+
+            def log_message(self, format: str, *args: object) -> None:
+                # Requests are in server.requests
+                pass
+
+            def _handle(self, method: str) -> None:
+                url = urlsplit(self.path)
+                query = {name: values[-1] for name, values in parse_qs(url.query).items()}
+                server.requests.append((method, url.path, query))
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                if server.latency:
+                    time.sleep(server.latency)
+
+                match = PATH_PATTERN.match(url.path)
+                if not match or match["plural"] not in RESOURCES:
+                    self._send_json(404, _status(404, "NotFound", "the server could not find the requested resource"))
+                    return
+
+                plural, namespace, name = match["plural"], match["namespace"], match["name"]
+                if method == "PATCH" and name:
+                    self._patch(plural, namespace or "", name, body)
+                elif match["log"]:
+                    self._send_log(namespace or "", name)
+                elif name:
+                    self._get(plural, namespace or "", name)
+                elif query.get("watch") in ["true", "1"]:
+                    self._watch(plural, namespace, query)
+                else:
+                    self._send_list(plural, namespace, query)
+
+            def _get(self, plural: str, namespace: str, name: str) -> None:
+                resource = server.get(plural, namespace, name)
+                if resource is None:
+                    self._send_json(404, _status(404, "NotFound", f"{plural} \"{name}\" not found"))
+                    return
+                self._send_json(200, resource)
+
+            def _patch(self, plural: str, namespace: str, name: str, body: bytes) -> None:
+                # Strategic merge patches are applied as merge patches, which is enough for maps
+                patch = json.loads(body or b"{}")
+                with server._changed:
+                    resource = server._objects[plural].get((namespace, name))
+                    if resource is None:
+                        self._send_json(404, _status(404, "NotFound", f"{plural} \"{name}\" not found"))
+                        return
+
+                    requested_version = (patch.get("metadata") or {}).get("resourceVersion")
+                    if requested_version is not None and requested_version != resource["metadata"]["resourceVersion"]:
+                        message = (f"Operation cannot be fulfilled on {plural} \"{name}\": the object has been modified; "
+                                   "please apply your changes to the latest version and try again")
+                        self._send_json(409, _status(409, "Conflict", message))
+                        return
+
+                    patched = apply_merge_patch(resource, patch)
+                    server._store(plural, (namespace, name), patched, "MODIFIED")
+                    patched = copy.deepcopy(patched)
+                self._send_json(200, patched)
+
+            def _send_log(self, namespace: str, name: str) -> None:
+                if server.get("pods", namespace, name) is None:
+                    self._send_json(404, _status(404, "NotFound", f"pods \"{name}\" not found"))
+                    return
+                self._send(200, "text/plain", server._logs.get((namespace, name), "").encode("utf-8"))
+
+            def _send_list(self, plural: str, namespace: Optional[str], query: Dict[str, str]) -> None:
+                start = 0
+                if query.get("continue"):
+                    token = json.loads(base64.urlsafe_b64decode(query["continue"]))
+                    if token["rv"] < server._compacted:
+                        message = "The provided continue parameter is too old to display a consistent list result."
+                        self._send_json(410, _status(410, "Expired", message))
+                        return
+                    start = token["start"]
+
+                resources = server._list(plural, namespace, query)
+                metadata: Dict[str, Any] = {"resourceVersion": str(server._revision)}
+                limit = int(query.get("limit") or 0)
+                items = resources[start:start + limit] if limit else resources[start:]
+
+                remaining = len(resources) - start - len(items)
+                if remaining > 0:
+                    token = {"rv": server._revision, "start": start + len(items)}
+                    metadata["continue"] = base64.urlsafe_b64encode(json.dumps(token).encode()).decode()
+                    # Like real servers, only lists without selectors know the number of items left
+                    if server.remaining_item_count and "labelSelector" not in query and "fieldSelector" not in query:
+                        metadata["remainingItemCount"] = remaining
+
+                api_version, kind = RESOURCES[plural]
+                if PARTIAL_OBJECT_METADATA_LIST in (self.headers.get("Accept") or ""):
+                    api_version, kind = "meta.k8s.io/v1", "PartialObjectMetadata"
+                    items = [{"apiVersion": api_version, "kind": kind, "metadata": item["metadata"]}
+                             for item in items]
+
+                self._send_json(200, {"apiVersion": api_version, "kind": f"{kind}List", "metadata": metadata, "items": items})
+
+            def _watch(self, plural: str, namespace: Optional[str], query: Dict[str, str]) -> None:
+                # Chunked like a real API server, so clients get every event as soon as it is sent
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.send_header("Connection", "close")
+                self.end_headers()
+                self.close_connection = True
+
+                try:
+                    for event in self._get_events(plural, namespace, query):
+                        data = json.dumps(event).encode("utf-8") + b"\n"
+                        self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+                        self.wfile.flush()
+                    self.wfile.write(b"0\r\n\r\n")
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client stopped watching
+                    pass
+
+            def _get_events(self, plural: str, namespace: Optional[str], query: Dict[str, str]) -> Iterator[Dict[str, Any]]:
+                """Get the events of a watch until it times out"""
+                timeout = float(query.get("timeoutSeconds") or 1800)
+                if server.watch_timeout is not None:
+                    timeout = min(timeout, server.watch_timeout)
+                deadline = time.monotonic() + timeout
+                bookmarks = query.get("allowWatchBookmarks") in ["true", "1"]
+                api_version, kind = RESOURCES[plural]
+
+                resource_version = int(query.get("resourceVersion") or 0)
+                if resource_version and resource_version < server._compacted:
+                    message = f"too old resource version: {resource_version} ({server._compacted})"
+                    server._notify_watch()
+                    yield {"type": "ERROR", "object": _status(410, "Expired", message)}
+                    return
+
+                if not resource_version:
+                    # Without a resource version, a watch starts with the current state
+                    with server._changed:
+                        resource_version = server._revision
+                        resources = server._list(plural, namespace, query)
+                    server._notify_watch()
+                    for resource in resources:
+                        yield {"type": "ADDED", "object": resource}
+                else:
+                    server._notify_watch()
+
+                next_bookmark = time.monotonic() + server.bookmark_interval
+                while True:
+                    with server._changed:
+                        events = [(revision, event_type, resource) for revision, event_plural, event_type, resource in server._events
+                                  if revision > resource_version and event_plural == plural]
+                        if not events:
+                            remaining = min(deadline, next_bookmark) - time.monotonic()
+                            if remaining > 0 and not server._stopped:
+                                server._changed.wait(remaining)
+                                continue
+                        current_revision = server._revision
+
+                    if server._stopped or time.monotonic() >= deadline:
+                        return
+
+                    for revision, event_type, resource in events:
+                        resource_version = revision
+                        metadata = resource["metadata"]
+                        if namespace is not None and metadata.get("namespace") != namespace:
+                            continue
+                        if server._matches(resource, query):
+                            yield {"type": event_type, "object": copy.deepcopy(resource)}
+
+                    if bookmarks and time.monotonic() >= next_bookmark:
+                        resource_version = max(resource_version, current_revision)
+                        next_bookmark = time.monotonic() + server.bookmark_interval
+                        with server._changed:
+                            server.bookmarks += 1
+                            server._changed.notify_all()
+                        yield {"type": "BOOKMARK", "object": {"apiVersion": api_version, "kind": kind,
+                                                              "metadata": {"resourceVersion": str(resource_version)}}}
+
+            def _send_json(self, code: int, body: Dict[str, Any]) -> None:
+                self._send(code, "application/json", json.dumps(body).encode("utf-8"))
+
+            def _send(self, code: int, content_type: str, data: bytes) -> None:
+                self.send_response(code)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+        return Handler
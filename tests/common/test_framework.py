@@ -2,10 +2,14 @@
 """
 Common test framework for K8sh tests
 """
+import io
 import os
 import subprocess
+import sys
 import time
-from typing import List, Optional, Callable
+from contextlib import contextmanager, redirect_stderr, redirect_stdout
+from typing import Any, Iterator, List, Optional, Callable
+from unittest.mock import patch
 
 
 class K8shTestFramework:
@@ -57,6 +61,12 @@ class K8shTestFramework:
         # Wait for the command to execute - reduced from 0.5 to 0.1
         time.sleep(wait_time)
 
+    def stop_shell(self) -> None:
+        """Stop the shell if it is still running, without waiting for its output"""
+        if self.process is not None:
+            self.process.terminate()
+            self.process = None
+
     def exit_shell(self) -> str:
         """Exit the shell and return the output"""
         if self.process is None:
@@ -114,6 +124,120 @@ class K8shTestFramework:
         assert re.search(pattern, self.output, re.MULTILINE) is not None, f"Pattern '{pattern}' not found in output"
 
 
+class InProcessK8shTestFramework(K8shTestFramework):
+    """
+    Test framework running the shell in the test process: commands go straight to run_input
+    with stdout and stderr captured, instead of through the stdin of a new python3 main.py
+    and a fixed wait. The modules are imported once for all tests, and every shell starts
+    with the environment of the framework, a fresh mock cluster and empty caches.
+    """
+
+    def __init__(self, use_mock: bool = True):
+        """Initialize the test framework"""
+        super().__init__(use_mock)
+        self._buffer: Optional[io.StringIO] = None
+        self._environ: Optional[Any] = None
+        self._colors_enabled = True
+        self._registry: Any = None
+        self._state: Any = None
+        self._running = False
+
+    def start_shell(self) -> None:  # type: ignore[override]
+        """Start the shell, from the root of a fresh cluster"""
+        self.stop_shell()
+
+        self._environ = patch.dict(os.environ, self.env, clear=True)
+        self._environ.start()
+
+        # Imported only now, as loading the commands sets up the Kubernetes client for K8SH_MOCK
+        import shell
+        from command.grep import content_index
+        from command.registry import CommandRegistry
+        from k8s_client import get_cluster_index, reset_kubernetes_client
+        from state.state import State
+        from utils import output, stats, terminal
+        from utils.render import clear_render_cache
+
+        self._colors_enabled = terminal.COLORS_ENABLED
+        if "NO_COLOR" in self.env:
+            terminal.disable_colors()
+        else:
+            terminal.enable_colors()
+        output.set_output_format("text")
+
+        self._buffer = io.StringIO()
+        with self._capture():
+            # Changes to the cluster and cached results of earlier tests are gone
+            reset_kubernetes_client()
+            get_cluster_index().invalidate()
+            content_index.clear()
+            clear_render_cache()
+            stats.clear_history()
+
+            self._registry = CommandRegistry()
+            shell.register_commands(self._registry)
+            self._state = State()
+            print(terminal.colorize("Welcome to K8sh - Kubernetes Shell", terminal.Color.BRIGHT_GREEN))
+        self._running = True
+
+    def send_command(self, command: str, wait_time: float = 0.1) -> None:
+        """Run a command in the shell, waiting for it to finish instead of for wait_time"""
+        if self._buffer is None:
+            raise RuntimeError("Shell not started")
+        if not self._running:
+            # The shell has exited, like a process reading no more input
+            return
+
+        import shell
+
+        with self._capture():
+            # Echo the command after the prompt, like a terminal
+            print(f"{self._state.get_current_path() or '/'} $ {command}")
+            try:
+                self._running = shell.run_input(self._registry, self._state, command)
+            except KeyboardInterrupt:
+                print("^C")
+            except Exception as e:
+                print(f"Error: {str(e)}")
+
+            if not self._running:
+                print("Goodbye!")
+
+    def stop_shell(self) -> None:
+        """Stop the shell if it is still running, restoring the environment of the test process"""
+        from utils import terminal
+
+        self._running = False
+        if self._environ is not None:
+            self._environ.stop()
+            self._environ = None
+            if self._colors_enabled:
+                terminal.enable_colors()
+            else:
+                terminal.disable_colors()
+
+    def exit_shell(self) -> str:
+        """Exit the shell and return the output"""
+        if self._buffer is None:
+            raise RuntimeError("Shell not started")
+
+        self.send_command("exit")
+        self.stop_shell()
+        self.output = self._buffer.getvalue()
+        return self.output
+
+    @contextmanager
+    def _capture(self) -> Iterator[None]:
+        """Capture stdout and stderr together, with an empty stdin that is not a terminal"""
+        stdin = sys.stdin
+        sys.stdin = io.StringIO()
+        try:
+            with redirect_stdout(self._buffer), redirect_stderr(self._buffer):
+                yield
+        finally:
+            sys.stdin = stdin
+
+
 def run_test(
         test_func: Callable[[K8shTestFramework], None],
         test_name: str,
@@ -2,28 +2,56 @@
 """
 Pytest configuration file for K8sh tests
 """
+import os
+
 import pytest
-from tests.common.test_framework import K8shTestFramework, run_test
+from kubernetes import client
+
+from k8s_client.synthetic_client import SyntheticKubernetesClient, SyntheticSpec
+from tests.common.fake_api_server import FakeApiServer
+from tests.common.test_framework import InProcessK8shTestFramework, K8shTestFramework, run_test
 
-# Re-export K8shTestFramework to make it available via tests.conftest
-__all__ = ['K8shTestFramework', 'run_test']
+# Re-export the test frameworks to make them available via tests.conftest
+__all__ = ['InProcessK8shTestFramework', 'K8shTestFramework', 'run_test']
 
 
 @pytest.fixture
 def framework():
     """
-    Create and return a K8shTestFramework instance.
+    Create and return a test framework instance.
     This fixture can be used by all test files.
+
+    The shell runs in the test process, sharing the imported modules between tests;
+    K8SH_TEST_SUBPROCESS=1 runs python3 main.py for every test instead.
     """
     # Initialize the framework with mock enabled by default
-    framework = K8shTestFramework(use_mock=True)
+    if os.environ.get("K8SH_TEST_SUBPROCESS") == "1":
+        framework = K8shTestFramework(use_mock=True)
+    else:
+        framework = InProcessK8shTestFramework(use_mock=True)
 
-    # Start the shell process
+    # Start the shell
     framework.start_shell()
 
     # Return the framework instance to the test
     yield framework
 
     # Cleanup after the test is done
-    if framework.process is not None:
-        framework.process.terminate()
+    framework.stop_shell()
+
+
+@pytest.fixture
+def fake_api_server(tmp_path):
+    """
+    Start a fake API server holding a small synthetic cluster, with its kubeconfig in
+    fake_api_server.kubeconfig. The real client changes the default configuration of
+    the kubernetes package, which is restored afterwards.
+    """
+    configuration = client.Configuration.get_default_copy()
+    server = FakeApiServer.from_client(SyntheticKubernetesClient(SyntheticSpec(ns=2, deployments=4, pods=12)))
+    server.write_kubeconfig(str(tmp_path / "kubeconfig"))
+
+    with server:
+        yield server
+
+    client.Configuration.set_default(configuration)
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test for the du command
+"""
+
+
+def test_du_namespace(framework):
+    """Test that du counts each resource type of a namespace and totals them"""
+    framework.env["NO_COLOR"] = "1"
+    framework.run_test_commands([
+        "du /default"
+    ])
+
+    framework.assert_output_contains([
+        "2\t/default/replicasets\n",
+        "3\t/default/pods\n",
+        "16\t/default\n"
+    ])
+
+
+def test_du_root_summary(framework):
+    """Test that -s only shows the total of the directory"""
+    framework.env["NO_COLOR"] = "1"
+    framework.run_test_commands([
+        "du -s /"
+    ])
+
+    framework.assert_output_contains([
+        "26\t/\n"
+    ])
+    framework.assert_output_not_contains([
+        "\t/default"
+    ])
+
+
+def test_du_root_from_cluster_index(framework, monkeypatch):
+    """Test that the root is counted from one LIST per type instead of a count per namespace and type"""
+    counted = []
+    monkeypatch.setattr("command.du.DuCommand._count", lambda self, pair: counted.append(pair) or 0)
+    framework.env["NO_COLOR"] = "1"
+    framework.run_test_commands([
+        "du /"
+    ])
+
+    framework.assert_output_contains([
+        "3\t/default/pods\n",
+        "9\t/kube-system\n",
+        "26\t/\n"
+    ])
+    assert counted == []
+
+
+def test_count_alias(framework):
+    """Test that count is an alias counting a resource type directory"""
+    framework.env["NO_COLOR"] = "1"
+    framework.run_test_commands([
+        "cd /kube-system",
+        "count pods"
+    ])
+
+    framework.assert_output_contains([
+        "2\t/kube-system/pods\n"
+    ])
+
+
+def test_du_resource(framework):
+    """Test the error for a path below a resource type directory"""
+    framework.run_test_commands([
+        "du /default/pods/nginx-pod-1"
+    ])
+
+    framework.assert_output_contains([
+        "Error: du works on the root, a namespace or a resource type directory"
+    ])
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Tests for counting resources from single-item metadata LISTs
+"""
+import json
+from unittest.mock import MagicMock
+
+from k8s_client.real_client import FIND_PAGE_SIZE, METADATA_LIST_ACCEPT, RealKubernetesClient
+
+
+def make_client(pages):
+    """Create a real client whose LIST calls return the given pages, without connecting to a cluster"""
+    k8s_client = RealKubernetesClient.__new__(RealKubernetesClient)
+    list_function = MagicMock(side_effect=[MagicMock(data=json.dumps(page)) for page in pages])
+    k8s_client._get_api_function = MagicMock(return_value=list_function)
+    return k8s_client, list_function
+
+
+def test_count_from_remaining_item_count():
+    """Test that one item and the remaining item count make up the count"""
+    k8s_client, list_function = make_client([
+        {"items": [{"metadata": {"name": "web-rs-1"}}], "metadata": {"continue": "abc", "remainingItemCount": 39999}}
+    ])
+
+    assert k8s_client.count_resources("default", "replicasets") == 40000
+    list_function.assert_called_once_with("default", limit=1, _preload_content=False,
+                                          _headers={"Accept": METADATA_LIST_ACCEPT})
+
+
+def test_count_without_continue():
+    """Test that an empty or single-item list needs no remaining item count"""
+    k8s_client, _ = make_client([{"items": [], "metadata": {}}])
+    assert k8s_client.count_resources("default", "pods") == 0
+
+
+def test_count_pages_without_remaining_item_count():
+    """Test that the metadata is paged through when the server doesn't report the remaining items"""
+    k8s_client, list_function = make_client([
+        {"items": [{"metadata": {"name": "a"}}], "metadata": {"continue": "first"}},
+        {"items": [{"metadata": {"name": "b"}}, {"metadata": {"name": "c"}}], "metadata": {}},
+    ])
+
+    assert k8s_client.count_resources("default", "pods") == 3
+    assert list_function.call_args.kwargs["limit"] == FIND_PAGE_SIZE
+    assert list_function.call_args.kwargs["_continue"] == "first"
+
+
+def test_count_unknown_type():
+    """Test that types without a LIST endpoint count as empty"""
+    k8s_client, list_function = make_client([])
+    assert k8s_client.count_resources("default", "widgets") == 0
+    list_function.assert_not_called()
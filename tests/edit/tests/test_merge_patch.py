@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Tests for the merge patch helpers used by the edit command
+"""
+from utils.manifest import apply_merge_patch, clean_manifest, create_merge_patch, patches_overlap
+
+
+def test_clean_manifest_removes_system_fields():
+    """Test that status and server-managed metadata are removed"""
+    resource = {
+        "metadata": {"name": "web", "uid": "1234", "resourceVersion": "42", "labels": {"app": "web"}},
+        "spec": {"replicas": 1},
+        "status": {"readyReplicas": 1},
+    }
+
+    cleaned = clean_manifest(resource)
+
+    assert cleaned == {"metadata": {"name": "web", "labels": {"app": "web"}}, "spec": {"replicas": 1}}
+    # The original is left untouched
+    assert resource["metadata"]["uid"] == "1234"
+
+
+def test_create_merge_patch_only_contains_changes():
+    """Test that unchanged fields are not part of the patch"""
+    original = {"data": {"big": "x" * 1000, "small": "1"}, "metadata": {"name": "config"}}
+    modified = {"data": {"big": "x" * 1000, "small": "2"}, "metadata": {"name": "config"}}
+
+    assert create_merge_patch(original, modified) == {"data": {"small": "2"}}
+
+
+def test_create_merge_patch_removed_keys_are_null():
+    """Test that removed keys are set to None"""
+    original = {"metadata": {"labels": {"app": "web", "tier": "frontend"}}}
+    modified = {"metadata": {"labels": {"app": "web"}}}
+
+    assert create_merge_patch(original, modified) == {"metadata": {"labels": {"tier": None}}}
+
+
+def test_create_merge_patch_replaces_lists():
+    """Test that changed lists are replaced as a whole"""
+    original = {"spec": {"ports": [{"port": 80}]}}
+    modified = {"spec": {"ports": [{"port": 80}, {"port": 443}]}}
+
+    assert create_merge_patch(original, modified) == {"spec": {"ports": [{"port": 80}, {"port": 443}]}}
+
+
+def test_apply_merge_patch_round_trip():
+    """Test that applying a created patch gives the modified document"""
+    original = {"a": {"b": 1, "c": [1, 2]}, "d": "x"}
+    modified = {"a": {"b": 2, "c": [3]}, "e": {"f": None}}
+
+    patch = create_merge_patch(original, modified)
+
+    assert apply_merge_patch(original, patch) == {"a": {"b": 2, "c": [3]}, "e": {}}
+
+
+def test_patches_overlap():
+    """Test detection of patches changing the same fields"""
+    assert patches_overlap({"data": {"a": "1"}}, {"data": {"a": "2"}})
+    assert patches_overlap({"data": None}, {"data": {"a": "2"}})
+    assert not patches_overlap({"data": {"a": "1"}}, {"data": {"b": "2"}})
+    assert not patches_overlap({"data": {"a": "1"}}, {})
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Tests for the native edit flow, which patches resources without kubectl
+"""
+import sys
+from typing import List
+
+import pytest
+
+import command.edit
+from command.edit import EditCommand
+from k8s_client.mock_client import MockKubernetesClient
+from state.state import State
+from utils.terminal import disable_colors, enable_colors
+
+
+@pytest.fixture(autouse=True)
+def no_color():
+    """Disable colors for all tests"""
+    disable_colors()
+    yield
+    enable_colors()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Use a fresh mock client and disable the test mode of the edit command"""
+    mock_client = MockKubernetesClient()
+    monkeypatch.setattr(command.edit, "k8s_client", mock_client)
+    monkeypatch.delenv("DEBUG", raising=False)
+    monkeypatch.delenv("K8SH_MOCK", raising=False)
+    return mock_client
+
+
+def use_editor(monkeypatch, tmp_path, old: str, new: str) -> None:
+    """Use an editor which replaces old with new in the edited file"""
+    script = tmp_path / "editor.py"
+    script.write_text(
+        "import sys\n"
+        "content = open(sys.argv[1]).read()\n"
+        f"open(sys.argv[1], 'w').write(content.replace({old!r}, {new!r}))\n"
+    )
+    monkeypatch.setenv("EDITOR", f"{sys.executable} {script}")
+
+
+def run_edit(args: List[str]) -> None:
+    """Run the edit command"""
+    state = State()
+    state.set_current_command("edit")
+    EditCommand().execute(state, args)
+
+
+def test_edit_sends_only_changes(client, monkeypatch, tmp_path, capsys):
+    """Test that the edit is sent as a minimal merge patch"""
+    use_editor(monkeypatch, tmp_path, "nginx:latest", "nginx:1.27")
+    patches = []
+    original_patch = client.patch_resource
+    monkeypatch.setattr(client, "patch_resource",
+                        lambda *args: patches.append(args[3]) or original_patch(*args))
+
+    run_edit(["/default/deployments/nginx-deployment"])
+
+    output = capsys.readouterr().out
+    assert "+      - image: nginx:1.27" in output
+    assert "default/deployments/nginx-deployment edited" in output
+
+    # Only the changed list and the resource version precondition are sent
+    assert len(patches) == 1
+    assert set(patches[0]) == {"spec", "metadata"}
+    assert patches[0]["metadata"] == {"resourceVersion": "1"}
+    resource = client.get_resource("default", "deployments", "nginx-deployment")
+    assert "nginx:1.27" in str(resource["spec"])
+
+
+def test_edit_without_changes(client, monkeypatch, tmp_path, capsys):
+    """Test that nothing is sent when the resource wasn't changed"""
+    use_editor(monkeypatch, tmp_path, "no-such-text", "")
+
+    run_edit(["/default/deployments/nginx-deployment"])
+
+    assert "Edit cancelled, no changes made." in capsys.readouterr().out
+    assert client.get_resource("default", "deployments", "nginx-deployment")["metadata"]["resourceVersion"] == "1"
+
+
+def test_edit_dry_run(client, monkeypatch, tmp_path, capsys):
+    """Test that --dry-run shows the diff without applying it"""
+    use_editor(monkeypatch, tmp_path, "nginx:latest", "nginx:1.27")
+
+    run_edit(["--dry-run", "/default/deployments/nginx-deployment"])
+
+    output = capsys.readouterr().out
+    assert "+      - image: nginx:1.27" in output
+    assert "not edited (dry run)" in output
+    assert "nginx:latest" in str(client.get_resource("default", "deployments", "nginx-deployment")["spec"])
+
+
+def test_edit_retries_non_overlapping_conflict(client, monkeypatch, tmp_path, capsys):
+    """Test that a concurrent change to other fields doesn't prevent the edit"""
+    use_editor(monkeypatch, tmp_path, "nginx:latest", "nginx:1.27")
+    original_get = client.get_resource
+
+    def get_then_modify(*args, **kwargs):
+        resource = original_get(*args, **kwargs)
+        if kwargs.get("cached"):
+            # Someone else adds a label after the resource was fetched
+            client.patch_resource("default", "deployments", "nginx-deployment", {"metadata": {"labels": {"team": "web"}}})
+        return resource
+
+    monkeypatch.setattr(client, "get_resource", get_then_modify)
+
+    run_edit(["/default/deployments/nginx-deployment"])
+
+    assert "default/deployments/nginx-deployment edited" in capsys.readouterr().out
+    resource = original_get("default", "deployments", "nginx-deployment")
+    assert resource["metadata"]["labels"]["team"] == "web"
+    assert "nginx:1.27" in str(resource["spec"])
+
+
+def test_edit_aborts_overlapping_conflict(client, monkeypatch, tmp_path, capsys):
+    """Test that a concurrent change to the same fields aborts the edit"""
+    use_editor(monkeypatch, tmp_path, "nginx:latest", "nginx:1.27")
+    original_get = client.get_resource
+
+    def get_then_modify(*args, **kwargs):
+        resource = original_get(*args, **kwargs)
+        if kwargs.get("cached"):
+            # Someone else changes the containers after the resource was fetched
+            containers = [{"name": "main", "image": "nginx:1.26"}]
+            client.patch_resource("default", "deployments", "nginx-deployment",
+                                  {"spec": {"template": {"spec": {"containers": containers}}}})
+        return resource
+
+    monkeypatch.setattr(client, "get_resource", get_then_modify)
+
+    run_edit(["/default/deployments/nginx-deployment"])
+
+    output = capsys.readouterr().out
+    assert "changes conflict with yours" in output
+    assert "Your version was saved to" in output
+    assert "nginx:1.26" in str(original_get("default", "deployments", "nginx-deployment")["spec"])
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test cases for running a command in all pods of a controller
+"""
+import os
+
+
+def test_exec_all_summary(framework, tmp_path):
+    """Test that exec --all prints a summary table and saves the output of every pod"""
+    # Plain output keeps the table columns easy to match
+    framework.env["NO_COLOR"] = "1"
+    framework.run_test_commands([
+        f"exec --all /default/daemonsets/node-exporter -P 4 --timeout 5 --output-dir {tmp_path} -- hostname"
+    ])
+
+    framework.assert_output_contains_pattern(r"POD\s+EXIT\s+DURATION\s+OUTPUT")
+    framework.assert_output_contains_pattern(r"node-exporter-pod-1\s+0\s+[0-9.]+s\s+node-exporter-pod-1")
+    framework.assert_output_contains([
+        f"Full output of every pod saved to {tmp_path}"
+    ])
+
+    with open(os.path.join(tmp_path, "node-exporter-pod-1.log")) as f:
+        assert f.read() == "node-exporter-pod-1\n"
+
+
+def test_exec_all_timeout(framework, tmp_path):
+    """Test that pods exceeding the timeout are reported"""
+    framework.env["NO_COLOR"] = "1"
+    framework.run_test_commands([
+        f"exec --all /default/deployments/web-app --timeout 0.2 --output-dir {tmp_path} -- sleep 100"
+    ])
+
+    framework.assert_output_contains_pattern(r"web-app-pod-1\s+timeout\s+")
+    framework.assert_output_contains([
+        "Command failed in 1 of 1 pods"
+    ])
+
+
+def test_exec_all_within_timeout(framework, tmp_path):
+    """Test that commands finishing within the timeout of every pod succeed"""
+    framework.env["NO_COLOR"] = "1"
+    framework.run_test_commands([
+        f"exec --all /default/daemonsets/node-exporter --timeout 5 --output-dir {tmp_path} -- sleep 0.1"
+    ])
+
+    framework.assert_output_contains_pattern(r"node-exporter-pod-1\s+0\s+0\.[1-9][0-9]*s")
+    assert "Command failed" not in framework.output
+
+
+def test_exec_all_requires_controller(framework):
+    """Test that exec --all rejects pods"""
+    framework.run_test_commands([
+        "exec --all /default/pods/nginx-pod-1 -- hostname"
+    ])
+
+    framework.assert_output_contains([
+        "Error: --all can only be used with deployments, daemonsets, statefulsets, replicasets"
+    ])
+
+
+def test_exec_all_invalid_workers(framework):
+    """Test that an invalid worker count is rejected"""
+    framework.run_test_commands([
+        "exec --all /default/deployments/web-app -P zero -- hostname"
+    ])
+
+    framework.assert_output_contains([
+        "Error: Invalid value for -P: zero"
+    ])
+
+
+def test_exec_all_invalid_timeout(framework):
+    """Test that a timeout which is not a positive, finite number is rejected"""
+    framework.run_test_commands([
+        "exec --all /default/deployments/web-app --timeout nan -- hostname",
+        "exec --all /default/deployments/web-app --timeout inf -- hostname"
+    ])
+
+    framework.assert_output_contains([
+        "Error: Invalid value for --timeout: nan",
+        "Error: Invalid value for --timeout: inf"
+    ])
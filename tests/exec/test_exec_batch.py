@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Test cases for the exec command in batch mode
+"""
+
+
+def test_exec_batch_pods(framework):
+    """Test running a command in several pods at once"""
+    framework.run_test_commands([
+        "exec --batch /default/pods/nginx-pod-1 /default/pods/web-app-pod-1 -- hostname"
+    ])
+
+    # Output is grouped per pod in the order the paths were given
+    framework.assert_output_contains_pattern(r"==> default/nginx-pod-1 <==.*\nnginx-pod-1\n")
+    framework.assert_output_contains_pattern(r"==> default/web-app-pod-1 <==.*\nweb-app-pod-1\n")
+
+    framework.assert_output_not_contains([
+        "Error:",
+        "Would run:"
+    ])
+
+
+def test_exec_batch_controller(framework):
+    """Test that a controller path expands to all of its pods"""
+    framework.run_test_commands([
+        "exec --batch /default/deployments/web-app -- ls /"
+    ])
+
+    framework.assert_output_contains([
+        "==> default/web-app-pod-1 <==",
+        "mock output of 'ls /' in default/web-app-pod-1"
+    ])
+
+
+def test_exec_batch_exit_code(framework):
+    """Test that failing pods are reported"""
+    framework.run_test_commands([
+        "exec --batch /default/pods/nginx-pod-1 -- false"
+    ])
+
+    framework.assert_output_contains([
+        "Command exited with code 1",
+        "Command failed in 1 of 1 pods"
+    ])
+
+
+def test_exec_batch_invalid_type(framework):
+    """Test that batch mode rejects resources without pods"""
+    framework.run_test_commands([
+        "exec --batch /default/configmaps/app-config -- ls"
+    ])
+
+    framework.assert_output_contains([
+        "Error: Cannot exec into resource type 'configmaps'"
+    ])
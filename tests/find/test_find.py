@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Test for the find command
+"""
+
+
+def test_find_by_name(framework):
+    """Test finding pods by name pattern in all namespaces"""
+    framework.run_test_commands([
+        "find / -type pods -name 'web-*'"
+    ])
+
+    framework.assert_output_contains([
+        "/default/pods/web-app-pod-1",
+        "/default/pods/web-app-pod-2"
+    ])
+    framework.assert_output_not_contains([
+        "nginx-pod-1"
+    ])
+
+
+def test_find_by_label_all_types(framework):
+    """Test finding resources of every type by label"""
+    framework.run_test_commands([
+        "find / -label app=kube-dns"
+    ])
+
+    framework.assert_output_contains([
+        "/kube-system/services/kube-dns",
+        "/kube-system/configmaps/kube-dns"
+    ])
+
+
+def test_find_in_current_namespace(framework):
+    """Test that find searches the current directory by default"""
+    framework.run_test_commands([
+        "cd /kube-system",
+        "find -type pods -status Running"
+    ])
+
+    framework.assert_output_contains([
+        "/kube-system/pods/coredns-123456",
+        "/kube-system/pods/metrics-server-789012"
+    ])
+    framework.assert_output_not_contains([
+        "/default/"
+    ])
+
+
+def test_find_errors(framework):
+    """Test the errors for invalid options"""
+    framework.run_test_commands([
+        "find / -type nothing",
+        "find / -type services -status Running",
+        "find / -label"
+    ])
+
+    framework.assert_output_contains([
+        "Error: Unknown resource type nothing",
+        "Error: -status only applies to pods",
+        "Error: -label requires a value"
+    ])
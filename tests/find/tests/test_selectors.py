@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests for label and field selector matching, and their push-down by find
+"""
+from unittest.mock import MagicMock
+
+import command.find
+from command.find import FindCommand
+from state.state import State
+from utils.selectors import matches_field_selector, matches_label_selector, parse_label_selector
+
+
+def test_parse_label_selector():
+    """Test parsing every kind of requirement"""
+    assert parse_label_selector("app=web, tier!=db,env in (prod, staging),!legacy,team") == [
+        ("app", "=", ["web"]),
+        ("tier", "!=", ["db"]),
+        ("env", "in", ["prod", "staging"]),
+        ("legacy", "!", []),
+        ("team", "exists", []),
+    ]
+
+
+def test_matches_label_selector():
+    """Test matching labels against selectors"""
+    labels = {"app": "web", "env": "prod"}
+
+    assert matches_label_selector(labels, "app=web")
+    assert matches_label_selector(labels, "app==web,env in (prod,staging)")
+    assert matches_label_selector(labels, "tier!=db,!legacy")
+    assert not matches_label_selector(labels, "app=api")
+    assert not matches_label_selector(labels, "env notin (prod)")
+    assert not matches_label_selector(None, "app")
+
+
+def test_matches_field_selector():
+    """Test matching fields against selectors"""
+    pod = {"metadata": {"name": "web", "namespace": "default"}, "status": {"phase": "Running"}}
+
+    assert matches_field_selector(pod, "metadata.name=web,status.phase=Running")
+    assert matches_field_selector(pod, "spec.nodeName!=node-1")
+    assert not matches_field_selector(pod, "status.phase!=Running")
+
+
+def test_find_pushes_selectors_down(monkeypatch, capsys):
+    """Test that labels, exact names and pod phases are sent to the API server"""
+    client = MagicMock()
+    client.get_resource_types.return_value = ["pods", "services"]
+    client.find_resources.return_value = iter([{"metadata": {"name": "api-1", "namespace": "prod"}}])
+    monkeypatch.setattr(command.find, "k8s_client", client)
+
+    FindCommand().execute(State(), ["/", "-type", "pods", "-name", "api-1", "-label", "tier=web", "-status", "Running"])
+
+    client.find_resources.assert_called_once_with("pods", None, "tier=web", "metadata.name=api-1,status.phase=Running")
+    assert capsys.readouterr().out == "/prod/pods/api-1\n"
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Tests for sharing identical concurrent calls to the Kubernetes client
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from prompt_toolkit.document import Document
+
+from command.registry import CommandRegistry
+from k8s_client.coalescing_client import CoalescingKubernetesClient
+from k8s_client.mock_client import MockKubernetesClient
+from shell import register_commands
+from state.state import State
+from utils import metrics
+from utils.completer import K8shCompleter
+
+# Longest time a test waits for the calls it starts, so a broken client fails the test instead of hanging it
+TIMEOUT = 5
+
+
+class SlowClient(MockKubernetesClient):
+    """Mock client counting its calls, whose blocked call waits for release like a slow request to an API server"""
+
+    def __init__(self, error: bool = False, blocked_call: int = 1) -> None:
+        super().__init__()
+        self.calls = 0
+        self.namespace_calls = 0
+        self.error = error
+        self.blocked_call = blocked_call
+        self.release = threading.Event()
+        self._lock = threading.Lock()
+
+    def _wait(self, call: int) -> None:
+        """Wait for release if this is the blocked call"""
+        if call == self.blocked_call:
+            assert self.release.wait(TIMEOUT)
+
+    def get_namespaces(self):
+        with self._lock:
+            self.namespace_calls += 1
+            call = self.namespace_calls
+        self._wait(call)
+        return super().get_namespaces()
+
+    def get_resources(self, namespace, resource_type):
+        with self._lock:
+            self.calls += 1
+            call = self.calls
+        self._wait(call)
+        if self.error:
+            raise Exception("connection refused")
+        return super().get_resources(namespace, resource_type)
+
+
+def wait_until(condition) -> None:
+    """Wait until a condition on the calls in flight holds"""
+    deadline = time.monotonic() + TIMEOUT
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def wait_for_waiters(k8s_client: CoalescingKubernetesClient, count: int) -> None:
+    """Wait until count identical calls wait for the one in flight"""
+    def has_waiters():
+        with k8s_client._lock:
+            return any(call.waiters == count for call in k8s_client._calls.values())
+
+    wait_until(has_waiters)
+
+
+def call_concurrently(slow_client: SlowClient, func, count: int, ready) -> list:
+    """Make count calls at the same time, releasing the blocked call once ready() holds, and return their results"""
+    with ThreadPoolExecutor(max_workers=count) as executor:
+        futures = [executor.submit(func, i) for i in range(count)]
+        ready()
+        slow_client.release.set()
+        return [future.result(TIMEOUT) for future in futures]
+
+
+def test_identical_calls_share_one():
+    """Test that identical calls in flight at the same time make one call and get copies of its result"""
+    slow_client = SlowClient()
+    k8s_client = CoalescingKubernetesClient(slow_client)
+    coalesced = metrics.COALESCED_REQUESTS.get("get_resources")
+
+    results = call_concurrently(slow_client, lambda _: k8s_client.get_resources("default", "pods"), 8,
+                                lambda: wait_for_waiters(k8s_client, 7))
+
+    assert slow_client.calls == 1
+    assert all(result == ["nginx-pod-1", "web-app-pod-1", "web-app-pod-2"] for result in results)
+    assert len({id(result) for result in results}) == 8
+    assert metrics.COALESCED_REQUESTS.get("get_resources") == coalesced + 7
+
+
+def test_different_calls_are_not_shared():
+    """Test that calls with different arguments make their own calls"""
+    slow_client = SlowClient()
+    k8s_client = CoalescingKubernetesClient(slow_client)
+    namespaces = ["default", "kube-system"]
+
+    # The second call is made while the first one is still in flight
+    results = call_concurrently(slow_client, lambda i: k8s_client.get_resources(namespaces[i], "pods"), 2,
+                                lambda: wait_until(lambda: slow_client.calls == 2))
+
+    assert slow_client.calls == 2
+    assert results[1] == ["coredns-123456", "metrics-server-789012"]
+
+
+def test_results_are_not_kept():
+    """Test that a call made after the identical one is done makes a new call"""
+    slow_client = SlowClient(blocked_call=0)
+    k8s_client = CoalescingKubernetesClient(slow_client)
+
+    k8s_client.get_resources("default", "pods")
+    k8s_client.get_resources("default", "pods")
+
+    assert slow_client.calls == 2
+
+
+def test_errors_are_shared():
+    """Test that every caller of a shared call gets its exception"""
+    slow_client = SlowClient(error=True)
+    k8s_client = CoalescingKubernetesClient(slow_client)
+
+    def get_resources(_):
+        with pytest.raises(Exception, match="connection refused"):
+            k8s_client.get_resources("default", "pods")
+        return True
+
+    assert all(call_concurrently(slow_client, get_resources, 4, lambda: wait_for_waiters(k8s_client, 3)))
+    assert slow_client.calls == 1
+
+
+def test_completion_shares_the_parent_directory(monkeypatch):
+    """Test that the fuzzy matches of a completion, resolved concurrently, share the listing of their parent"""
+    # The LIST for the fuzzy matching goes through, the first one to resolve a match waits for the other
+    slow_client = SlowClient(blocked_call=2)
+    k8s_client = CoalescingKubernetesClient(slow_client)
+    monkeypatch.setattr("state.path_manager.k8s_client", k8s_client)
+    coalesced = metrics.COALESCED_REQUESTS.get("get_namespaces")
+    registry = CommandRegistry()
+    register_commands(registry)
+    completer = K8shCompleter(registry, State())
+
+    def complete(_):
+        return [completion.text for completion in completer.get_completions(Document("cd k/dep"))]
+
+    completions, = call_concurrently(slow_client, complete, 1, lambda: wait_for_waiters(k8s_client, 1))
+
+    assert sorted(completions) == ["kube-public/deployments", "kube-system/deployments"]
+    # One LIST of the namespaces for the fuzzy matching, one shared by both matches to resolve their paths
+    assert slow_client.namespace_calls == 2
+    assert metrics.COALESCED_REQUESTS.get("get_namespaces") == coalesced + 1
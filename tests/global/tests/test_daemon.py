@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Test k8shd and the forwarding of k8sh -c to it
+"""
+import os
+import signal
+import socket
+import subprocess
+import tempfile
+import time
+
+from utils.daemon import forward_command, get_socket_path
+
+
+def run_k8sh(*args):
+    """Run k8sh -c without the mock client and return its exit code, standard output and standard error"""
+    env = {name: value for name, value in os.environ.items() if name != "K8SH_MOCK"}
+    process = subprocess.run(["python3", "main.py", *args], stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                             env=env, universal_newlines=True, timeout=10)
+    return process.returncode, process.stdout, process.stderr
+
+
+def test_forward_without_daemon(tmp_path):
+    """Test that nothing is forwarded when no daemon is listening"""
+    assert forward_command(str(tmp_path / "k8sh.sock"), {"command": "ls"}) is None
+
+
+def test_default_socket_in_private_directory(monkeypatch):
+    """Test that without a runtime directory the socket goes in a directory of its own, not in the temporary one"""
+    monkeypatch.delenv("K8SH_SOCKET", raising=False)
+    monkeypatch.delenv("XDG_RUNTIME_DIR", raising=False)
+
+    assert get_socket_path() == os.path.join(tempfile.gettempdir(), f"k8sh-{os.getuid()}", "k8shd.sock")
+
+
+def test_untrusted_socket_not_used(tmp_path):
+    """Test that nothing is forwarded to a socket other users could have created or replaced"""
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    shared.chmod(0o777)
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(str(shared / "k8sh.sock"))
+    listener.listen(1)
+    (tmp_path / "file.sock").write_text("")
+
+    with listener:
+        assert forward_command(str(shared / "k8sh.sock"), {"command": "ls"}) is None
+    assert forward_command(str(tmp_path / "file.sock"), {"command": "ls"}) is None
+
+
+def test_daemon_runs_forwarded_commands(tmp_path):
+    """Test that k8sh -c runs its command in k8shd, which removes its socket when terminated"""
+    socket_path = str(tmp_path / "k8sh.sock")
+    env = os.environ.copy()
+    env["K8SH_MOCK"] = "1"
+    daemon = subprocess.Popen(["python3", "main.py", "--daemon", "--socket", socket_path], env=env,
+                              stdout=subprocess.PIPE, stderr=subprocess.STDOUT, universal_newlines=True)
+    try:
+        for _ in range(100):
+            if os.path.exists(socket_path):
+                break
+            time.sleep(0.05)
+
+        # The mock resources can only come from the daemon
+        code, stdout, _ = run_k8sh("--socket", socket_path, "-o", "names", "-c", "ls /default/deployments")
+        assert code == 0
+        assert stdout.splitlines() == ["/default/deployments/nginx-deployment", "/default/deployments/web-app"]
+
+        code, stdout, _ = run_k8sh("--socket", socket_path, "--no-color", "-c", "du -s /kube-public")
+        assert stdout == "1\t/kube-public\n"
+
+        # The trace of the command in the daemon goes to the standard error of k8sh -c
+        code, stdout, stderr = run_k8sh("--socket", socket_path, "--trace", "-c", "ls /default/pods")
+        assert "nginx-pod-1" in stdout
+        assert "[trace] ls /default/pods: " in stderr
+
+        # Commands needing a terminal are left to k8sh -c
+        assert forward_command(socket_path, {"command": "edit /default/configmaps/app-config"}) is None
+        assert forward_command(socket_path, {"command": "ls /default/pods | exec"}) is None
+    finally:
+        daemon.send_signal(signal.SIGTERM)
+        daemon.communicate(timeout=5)
+
+    assert not os.path.exists(socket_path)
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Tests for the test framework running the shell in the test process
+"""
+import os
+
+from k8s_client import get_kubernetes_client, reset_kubernetes_client
+from tests.common.test_framework import InProcessK8shTestFramework
+from utils import terminal
+
+
+def test_transcript():
+    """Test that the output reads like a session in a terminal"""
+    framework = InProcessK8shTestFramework()
+    framework.env["NO_COLOR"] = "1"
+
+    output = framework.run_test_commands(["cd /default", "pwd", "exit", "ls"])
+
+    assert output.startswith("Using mock Kubernetes client\nWelcome to K8sh - Kubernetes Shell\n")
+    assert "/ $ cd /default\ndefault $ pwd\ndefault\ndefault $ exit\n" in output
+    assert output.endswith("Goodbye!\n")
+    # Nothing runs after exit
+    assert "$ ls" not in output
+
+
+def test_fresh_cluster():
+    """Test that every shell starts with the resources of the mock, whatever earlier shells changed"""
+    framework = InProcessK8shTestFramework()
+    framework.env["NO_COLOR"] = "1"
+    framework.start_shell()
+    get_kubernetes_client().patch_resource("default", "configmaps", "app-config", {"data": {"key1": "changed"}})
+    framework.send_command("cat /default/configmaps/app-config")
+    assert "key1: changed" in framework.exit_shell()
+
+    output = framework.run_test_commands(["cat /default/configmaps/app-config"])
+    assert "key1: value1" in output
+
+
+def test_reset_keeps_shared_client():
+    """Test that resetting the cluster keeps the client the commands imported, whatever wraps it"""
+    k8s_client = get_kubernetes_client()
+    k8s_client.patch_resource("default", "configmaps", "app-config", {"data": {"key1": "changed"}})
+
+    reset_kubernetes_client()
+
+    assert get_kubernetes_client() is k8s_client
+    assert k8s_client.get_resource("default", "configmaps", "app-config")["data"]["key1"] == "value1"
+
+
+def test_environment_restored():
+    """Test that the environment and colors of the test process are back once the shell exits"""
+    colors_enabled = terminal.COLORS_ENABLED
+    framework = InProcessK8shTestFramework()
+    framework.env["NO_COLOR"] = "1"
+    framework.env["K8SH_TEST_VARIABLE"] = "1"
+
+    framework.start_shell()
+    assert os.environ["K8SH_TEST_VARIABLE"] == "1"
+    assert not terminal.COLORS_ENABLED
+
+    framework.exit_shell()
+    assert "K8SH_TEST_VARIABLE" not in os.environ
+    assert terminal.COLORS_ENABLED == colors_enabled
@@ -0,0 +1,29 @@
+#!/usr/bin/env python3
+"""
+Test the --metrics-file flag
+"""
+import os
+import subprocess
+
+
+def test_metrics_file(tmp_path):
+    """Test that the client metrics of a command are written to the metrics file"""
+    path = tmp_path / "k8sh.prom"
+    env = os.environ.copy()
+    env["K8SH_MOCK"] = "1"
+    process = subprocess.run(
+        ["python3", "main.py", "--no-daemon", "--metrics-file", str(path), "-c", "cat /default/deployments/web-app"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        env=env,
+        universal_newlines=True,
+        timeout=10,
+    )
+
+    assert process.returncode == 0
+    # Readable by collectors running as another user
+    assert path.stat().st_mode & 0o777 == 0o644
+    text = path.read_text()
+    assert "k8sh_client_requests_total{verb=\"get\",resource=\"deployments\"} 1\n" in text
+    assert "k8sh_commands_total{command=\"cat\"} 1\n" in text
+    assert "k8sh_client_request_duration_seconds_count{verb=\"get\",resource=\"deployments\"} 1\n" in text
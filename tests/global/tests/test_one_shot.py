@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Test the -c flag and the --output formats
+"""
+import json
+import os
+import subprocess
+
+
+def run_k8sh(*args):
+    """Run k8sh with arguments and return its exit code, standard output and standard error"""
+    env = os.environ.copy()
+    env["K8SH_MOCK"] = "1"
+    process = subprocess.run(
+        ["python3", "main.py", "--no-daemon", *args],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        env=env,
+        universal_newlines=True,
+        timeout=10,
+    )
+    return process.returncode, process.stdout, process.stderr
+
+
+def test_one_shot_command():
+    """Test that -c runs a single command without the prompt"""
+    code, stdout, _ = run_k8sh("--no-color", "-c", "ls /default/deployments")
+
+    assert code == 0
+    assert "nginx-deployment" in stdout
+    assert "Welcome" not in stdout
+    assert "$" not in stdout
+
+
+def test_one_shot_failures():
+    """Test that -c exits with a non-zero code when the command is unknown, invalid or fails"""
+    code, stdout, _ = run_k8sh("--no-color", "-c", "bogus")
+    assert code == 127
+    assert "Command not found: bogus" in stdout
+
+    code, _, _ = run_k8sh("--no-color", "-c", "ls | | cat")
+    assert code == 2
+
+    code, stdout, _ = run_k8sh("--no-color", "-c", "cat /default/deployments/nope")
+    assert code == 1
+    assert "Error" in stdout
+
+
+def test_output_json():
+    """Test that json prints the records of a command as one array"""
+    _, stdout, _ = run_k8sh("-o", "json", "-c", "ls /default/deployments")
+
+    assert json.loads(stdout) == [
+        {"name": "nginx-deployment", "path": "/default/deployments/nginx-deployment", "directory": True},
+        {"name": "web-app", "path": "/default/deployments/web-app", "directory": True},
+    ]
+
+
+def test_output_ndjson():
+    """Test that ndjson prints one record per line, with the status columns of ls -l"""
+    _, stdout, _ = run_k8sh("--output", "ndjson", "-c", "ls -l /default/pods")
+
+    records = [json.loads(line) for line in stdout.splitlines()]
+    assert [record["name"] for record in records] == ["nginx-pod-1", "web-app-pod-1", "web-app-pod-2"]
+    assert records[0]["columns"]["status"] == "Running"
+    assert "\033[" not in stdout
+
+
+def test_output_names():
+    """Test that names prints the paths of the records"""
+    _, stdout, _ = run_k8sh("-o", "names", "-c", "find / -type deployments")
+
+    assert stdout.splitlines() == [
+        "/default/deployments/nginx-deployment",
+        "/default/deployments/web-app",
+        "/kube-system/deployments/coredns",
+        "/kube-system/deployments/metrics-server",
+    ]
+
+
+def test_output_cat():
+    """Test that cat emits the resources as objects"""
+    _, stdout, _ = run_k8sh("-o", "json", "-c", "cat /default/configmaps/app-config")
+
+    records = json.loads(stdout)
+    assert records[0]["path"] == "/default/configmaps/app-config"
+    assert records[0]["resource"]["kind"] == "ConfigMap"
+
+
+def test_output_json_errors():
+    """Test that errors go to the standard error, leaving the records parseable"""
+    code, stdout, stderr = run_k8sh("-o", "json", "-c", "cat /default/deployments/nope")
+
+    assert code == 1
+    assert json.loads(stdout) == []
+    assert "nope" in stderr
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test running script lines concurrently
+"""
+import os
+import subprocess
+import threading
+
+from command.base import Command
+from command.cd import CdCommand
+from command.registry import CommandRegistry
+from shell import run_parallel, run_script
+from state.state import State
+from utils import output
+from utils.concurrency import map_concurrently
+
+
+class SleepCommand(Command):
+    """Read-only command printing its arguments, after waiting for the lines running with it if given a barrier"""
+
+    def __init__(self, barrier=None):
+        self.barrier = barrier
+
+    def get_name(self) -> str:
+        return "sleep"
+
+    def get_help(self) -> str:
+        return "Sleep"
+
+    def is_read_only(self, args):
+        return True
+
+    def execute(self, state, args):
+        if self.barrier is not None:
+            self.barrier.wait(5)
+        print(f"{state.get_current_path()} {' '.join(args)}")
+
+
+def make_registry(barrier=None):
+    """Create a registry with the sleep command and cd"""
+    registry = CommandRegistry()
+    registry.register_command(SleepCommand(barrier))
+    registry.register_command(CdCommand())
+    return registry
+
+
+def test_run_parallel_keeps_order(capsys):
+    """Test that concurrent lines print their output in script order"""
+    # Every line waits until all of them run at the same time
+    run_parallel(make_registry(threading.Barrier(5)), State(), [f"sleep {i}" for i in range(5)], 5)
+
+    assert capsys.readouterr().out == "".join(f"$ sleep {i}\n {i}\n" for i in range(5))
+
+
+def test_jobs_wait_for_other_commands(tmp_path, capsys):
+    """Test that a command changing the state runs between the concurrent lines before and after it"""
+    script = tmp_path / "script.k8sh"
+    script.write_text("sleep 1\nsleep 2\ncd /default\nsleep 3\nsleep 4\n")
+
+    run_script(str(script), make_registry(), State(), jobs=4)
+
+    assert capsys.readouterr().out == "$ sleep 1\n 1\n$ sleep 2\n 2\n$ cd /default\n$ sleep 3\ndefault 3\n$ sleep 4\ndefault 4\n"
+
+
+def test_buffer_output_follows_threads(capsys):
+    """Test that output printed by the threads of a command goes to the buffer of that command"""
+    with output.buffering_stdout():
+        with output.buffer_output() as buffer:
+            map_concurrently(print, ["a", "b"])
+        print("after")
+
+    assert sorted(buffer.getvalue().split()) == ["a", "b"]
+    assert capsys.readouterr().out == "after\n"
+
+
+def test_parallel_block(tmp_path):
+    """Test a script with a parallel block of read-only commands"""
+    script = tmp_path / "script.k8sh"
+    script.write_text("cd /default\nparallel {\nls deployments\ncat configmaps/app-config\n}\npwd\n")
+
+    env = os.environ.copy()
+    env["K8SH_MOCK"] = "1"
+    process = subprocess.run(["python3", "main.py", "--no-color", str(script)], stdout=subprocess.PIPE,
+                             stderr=subprocess.PIPE, env=env, universal_newlines=True, timeout=10)
+
+    lines = process.stdout.splitlines()
+    assert [line for line in lines if line.startswith("$")] == ["$ cd /default", "$ ls deployments", "$ cat configmaps/app-config", "$ pwd"]
+    assert lines.index("$ cat configmaps/app-config") > next(i for i, line in enumerate(lines) if "web-app" in line)
+    assert "name: app-config" in process.stdout
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Tests for the real client against the fake API server
+"""
+import os
+import subprocess
+import threading
+
+import pytest
+
+from k8s_client.client import ResourceConflictError
+from k8s_client.real_client import RealKubernetesClient
+from utils import metrics, stats
+
+
+@pytest.fixture
+def k8s_client(fake_api_server):
+    """Create a real client connected to the fake API server"""
+    return RealKubernetesClient(fake_api_server.kubeconfig)
+
+
+def set_rollout(server, namespace, name, updated_replicas):
+    """Set how many replicas of a deployment are updated and available, out of 3"""
+    deployment = server.get("deployments", namespace, name)
+    deployment["spec"]["replicas"] = 3
+    deployment["status"] = {"replicas": 3, "updatedReplicas": updated_replicas, "availableReplicas": updated_replicas}
+    server.put(deployment)
+
+
+def test_list_resources(k8s_client):
+    """Test that namespaces and resources are listed from the server"""
+    assert k8s_client.get_namespaces() == ["ns-0", "ns-1"]
+    assert k8s_client.get_resources("ns-0", "deployments") == ["app-0", "app-2"]
+    assert len(k8s_client.get_pods_for_resource("ns-0", "deployments", "app-0")) == 3
+    assert k8s_client.get_pod_containers("ns-0", k8s_client.get_resources("ns-0", "pods")[0]) == ["main"]
+
+
+def test_pods_of_other_controllers_from_pods_alone(fake_api_server, k8s_client):
+    """Test that only the pods of deployments take a LIST of replicasets"""
+    pod = fake_api_server.get("pods", "ns-0", k8s_client.get_resources("ns-0", "pods")[0])
+    replicaset = pod["metadata"]["ownerReferences"][0]["name"]
+
+    assert len(k8s_client.get_pods_for_resource("ns-0", "replicasets", replicaset)) == 3
+    assert fake_api_server.count_requests(path="/api/v1/namespaces/ns-0/pods") == 2
+    assert fake_api_server.count_requests(path="/apis/apps/v1/namespaces/ns-0/replicasets") == 0
+
+    k8s_client.get_pods_for_resource("ns-0", "deployments", "app-0")
+    assert fake_api_server.count_requests(path="/apis/apps/v1/namespaces/ns-0/replicasets") == 1
+
+
+def test_find_pages_through_resources(fake_api_server, k8s_client, monkeypatch):
+    """Test that find follows continue tokens, one page at a time"""
+    monkeypatch.setattr("k8s_client.real_client.FIND_PAGE_SIZE", 5)
+
+    pods = list(k8s_client.find_resources("pods"))
+
+    assert len(pods) == 12
+    pages = [query for method, path, query in fake_api_server.requests if path == "/api/v1/pods"]
+    assert [query["limit"] for query in pages] == ["5", "5", "5"]
+    assert "continue" not in pages[0] and "continue" in pages[2]
+
+
+def test_find_with_label_selector(k8s_client):
+    """Test that label selectors are sent to the server"""
+    pods = list(k8s_client.find_resources("pods", label_selector="app=app-1"))
+
+    assert len(pods) == 3
+    assert {pod["metadata"]["namespace"] for pod in pods} == {"ns-1"}
+
+
+def test_expired_continue_token(fake_api_server, k8s_client, monkeypatch, capsys):
+    """Test that find stops with the message of the server when a continue token expires between pages"""
+    monkeypatch.setattr("k8s_client.real_client.FIND_PAGE_SIZE", 5)
+    found = 0
+    for _ in k8s_client.find_resources("pods"):
+        found += 1
+        fake_api_server.expire()
+
+    assert found == 5
+    assert "Error finding pods: The provided continue parameter is too old" in capsys.readouterr().out
+
+
+def test_count_from_remaining_item_count(fake_api_server, k8s_client):
+    """Test that counting takes a single metadata LIST when the server reports the remaining items"""
+    assert k8s_client.count_resources("ns-0", "pods") == 6
+    assert fake_api_server.count_requests(path="/api/v1/namespaces/ns-0/pods") == 1
+
+
+def test_count_without_remaining_item_count(fake_api_server, k8s_client, monkeypatch):
+    """Test that counting pages through the metadata when the server doesn't report the remaining items"""
+    monkeypatch.setattr("k8s_client.real_client.FIND_PAGE_SIZE", 2)
+    fake_api_server.remaining_item_count = False
+
+    assert k8s_client.count_resources("ns-0", "pods") == 6
+    assert fake_api_server.count_requests(path="/api/v1/namespaces/ns-0/pods") == 4
+
+
+def test_get_and_patch_resource(fake_api_server, k8s_client):
+    """Test that a patch is applied by the server and its result cached"""
+    configmap = k8s_client.get_resource("ns-0", "configmaps", "config-0")
+    version = configmap["metadata"]["resourceVersion"]
+
+    patched = k8s_client.patch_resource("ns-0", "configmaps", "config-0",
+                                        {"metadata": {"resourceVersion": version}, "data": {"key": "value"}})
+
+    assert patched["data"]["key"] == "value"
+    assert fake_api_server.get("configmaps", "ns-0", "config-0")["data"]["key"] == "value"
+    assert k8s_client.get_resource("ns-0", "configmaps", "config-0", cached=True) == patched
+    assert fake_api_server.count_requests("PATCH") == 1
+
+    with pytest.raises(ResourceConflictError, match="the object has been modified"):
+        k8s_client.patch_resource("ns-0", "configmaps", "config-0", {"metadata": {"resourceVersion": version}})
+
+
+def test_get_missing_resource(k8s_client):
+    """Test that a resource the server doesn't have is None"""
+    assert k8s_client.get_resource("ns-0", "configmaps", "missing") is None
+
+
+def test_received_bytes(k8s_client):
+    """Test that the bytes of responses count for the running command"""
+    with stats.measure_command("ls", trace=False) as command_stats:
+        k8s_client.list_resources("ns-0", "pods")
+
+    assert command_stats.bytes_received > 1000
+
+
+def test_wait_for_rollout_with_bookmarks(fake_api_server, k8s_client):
+    """Test that a rollout is followed through bookmarks, which only carry a resource version"""
+    fake_api_server.bookmark_interval = 0.05
+    set_rollout(fake_api_server, "ns-0", "app-0", 1)
+
+    def roll_out():
+        fake_api_server.wait_for_watches(1, bookmarks=1)
+        set_rollout(fake_api_server, "ns-0", "app-0", 3)
+
+    threading.Thread(target=roll_out).start()
+    progress = []
+
+    assert k8s_client.wait_for_rollout("ns-0", "deployments", "app-0", 5, progress.append)
+    assert progress == ["Waiting for rollout to finish: 1 out of 3 new replicas have been updated...",
+                        "successfully rolled out"]
+
+
+def test_wait_for_rollout_after_expiry(fake_api_server, k8s_client):
+    """Test that a watch resuming from an expired resource version starts over from the current state"""
+    fake_api_server.watch_timeout = 0.2
+    set_rollout(fake_api_server, "ns-0", "app-0", 1)
+    expired = metrics.WATCH_RESTARTS.get("deployments", "expired")
+
+    def roll_out():
+        # The second watch resumes from the version of the first one and is rejected, the third one starts over
+        fake_api_server.wait_for_watches(1)
+        fake_api_server.expire()
+        fake_api_server.wait_for_watches(3)
+        set_rollout(fake_api_server, "ns-0", "app-0", 3)
+
+    threading.Thread(target=roll_out).start()
+
+    assert k8s_client.wait_for_rollout("ns-0", "deployments", "app-0", 5)
+    assert metrics.WATCH_RESTARTS.get("deployments", "expired") > expired
+
+
+def test_shell(fake_api_server):
+    """Test that the shell uses the cluster of KUBECONFIG without the mock"""
+    env = os.environ.copy()
+    env.pop("K8SH_MOCK", None)
+    env["KUBECONFIG"] = fake_api_server.kubeconfig
+    process = subprocess.run(
+        ["python3", "main.py", "--no-daemon", "--no-color", "-c", "ls /ns-1/deployments"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        env=env,
+        universal_newlines=True,
+        timeout=20,
+    )
+
+    assert process.returncode == 0, process.stderr
+    assert "app-1" in process.stdout and "app-3" in process.stdout
+    assert "app-0" not in process.stdout
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Tests for the synthetic cluster of K8SH_MOCK=synthetic:...
+"""
+import time
+
+import pytest
+
+from k8s_client.factory import create_kubernetes_client, uses_mock_client
+from k8s_client.owner_index import build_owner_index
+from k8s_client.synthetic_client import SyntheticKubernetesClient, SyntheticSpec
+
+
+def test_parse_spec():
+    """Test that counts are parsed from the spec and the others derived from them"""
+    spec = SyntheticSpec.parse("synthetic:ns=4,pods=100,latency=0.02")
+
+    assert (spec.ns, spec.deployments, spec.rs, spec.pods, spec.latency) == (4, 20, 2, 100, 0.02)
+    assert SyntheticSpec.parse("synthetic").ns == 10
+
+
+@pytest.mark.parametrize("text", ["synthetic:nodes=3", "synthetic:ns=0", "synthetic:pods=many",
+                                  "synthetic:latency=nan", "synthetic:latency=inf"])
+def test_parse_invalid_spec(text):
+    """Test that unknown options and invalid values are rejected"""
+    with pytest.raises(ValueError):
+        SyntheticSpec.parse(text)
+
+
+def test_invalid_spec_in_environment(monkeypatch, capsys):
+    """Test that an invalid K8SH_MOCK stops the shell with an error instead of a traceback"""
+    monkeypatch.setenv("K8SH_MOCK", "synthetic:ns=0")
+
+    with pytest.raises(SystemExit) as exit_info:
+        create_kubernetes_client()
+
+    assert exit_info.value.code == 2
+    assert capsys.readouterr().err == "Error: Invalid value for synthetic cluster option ns: 0\n"
+
+
+def test_uses_mock_client(monkeypatch):
+    """Test that a synthetic cluster counts as a mock client"""
+    monkeypatch.setenv("K8SH_MOCK", "synthetic:ns=2")
+    assert uses_mock_client()
+
+    monkeypatch.delenv("K8SH_MOCK")
+    assert not uses_mock_client()
+
+
+def test_cluster_size():
+    """Test that resources are spread over the namespaces and add up to the spec"""
+    k8s_client = SyntheticKubernetesClient(SyntheticSpec(ns=5, deployments=7, rs=3, pods=30))
+    namespaces = k8s_client.get_namespaces()
+
+    assert namespaces == ["ns-0", "ns-1", "ns-2", "ns-3", "ns-4"]
+    assert sum(k8s_client.count_resources(namespace, "pods") for namespace in namespaces) == 30
+    assert sum(k8s_client.count_resources(namespace, "replicasets") for namespace in namespaces) == 21
+    assert len(list(k8s_client.find_resources("deployments"))) == 7
+
+
+def test_owner_references():
+    """Test that pods belong to the current replicaset of their deployment, like in a real cluster"""
+    k8s_client = SyntheticKubernetesClient(SyntheticSpec(ns=2, deployments=2, pods=6))
+    pods = k8s_client.get_pods_for_resource("ns-0", "deployments", "app-0")
+    assert len(pods) == 3
+
+    pod = k8s_client.get_resource("ns-0", "pods", pods[0])
+    owner = pod["metadata"]["ownerReferences"][0]
+    replicaset = k8s_client.get_resource("ns-0", "replicasets", owner["name"])
+    assert owner["kind"] == "ReplicaSet"
+    assert owner["uid"] == replicaset["metadata"]["uid"]
+    assert replicaset["metadata"]["ownerReferences"][0]["name"] == "app-0"
+    assert replicaset["spec"]["replicas"] == 3
+    assert pod["metadata"]["labels"]["pod-template-hash"] == replicaset["metadata"]["labels"]["pod-template-hash"]
+
+    # The same index as the real client builds from the owner references
+    index = build_owner_index(k8s_client.list_resources("ns-0", "pods"), k8s_client.list_resources("ns-0", "replicasets"))
+    assert sorted(index.get_pods("deployments", "app-0")) == sorted(k8s_client.get_owner_index("ns-0").get_pods("deployments", "app-0"))
+
+
+def test_latency_per_request():
+    """Test that every call waits for the latency once, also when it builds many resources"""
+    k8s_client = SyntheticKubernetesClient(SyntheticSpec(ns=1, deployments=1, pods=50, latency=0.05))
+
+    start = time.monotonic()
+    resources = k8s_client.list_resources("ns-0", "pods")
+    elapsed = time.monotonic() - start
+
+    assert len(resources) == 50
+    assert 0.05 <= elapsed < 0.5
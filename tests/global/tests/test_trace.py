@@ -0,0 +1,26 @@
+#!/usr/bin/env python3
+"""
+Test the --trace flag
+"""
+import os
+import subprocess
+
+
+def test_trace_prints_command_stats():
+    """Test that --trace prints the time and requests of every command to stderr"""
+    env = os.environ.copy()
+    env["K8SH_MOCK"] = "1"
+    process = subprocess.run(
+        ["python3", "main.py", "--trace", "--no-daemon", "-c", "ls /default/pods"],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        env=env,
+        universal_newlines=True,
+        timeout=10,
+    )
+
+    assert process.returncode == 0
+    assert "nginx-pod-1" in process.stdout
+    assert "[trace]" not in process.stdout
+    assert "[trace] ls /default/pods: " in process.stderr
+    assert "list pods 1" in process.stderr
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Test for the grep command
+"""
+
+
+def test_grep_image_across_namespaces(framework):
+    """Test listing the deployments which use an image"""
+    framework.run_test_commands([
+        "grep -l nginx:latest /*/deployments"
+    ])
+
+    framework.assert_output_contains([
+        "/default/deployments/web-app\n",
+        "/kube-system/deployments/coredns\n"
+    ])
+
+
+def test_grep_matching_lines(framework):
+    """Test that matching fields are printed with their path"""
+    framework.env["NO_COLOR"] = "1"
+    framework.run_test_commands([
+        "cd /default",
+        "grep -i KEY1 configmaps/*"
+    ])
+
+    framework.assert_output_contains([
+        "/default/configmaps/app-config: data.key1: value1",
+        "/default/configmaps/system-config: data.key1: value1"
+    ])
+    framework.assert_output_not_contains([
+        "key2"
+    ])
+
+
+def test_grep_with_index(framework):
+    """Test that searches with --index give the same results"""
+    framework.env["NO_COLOR"] = "1"
+    framework.run_test_commands([
+        "grep --index -F value2 /",
+        "grep --index cluster-info /kube-public"
+    ])
+
+    framework.assert_output_contains([
+        "/kube-public/configmaps/cluster-info: data.key2: value2",
+        "/kube-public/configmaps/cluster-info: metadata.name: cluster-info"
+    ])
+
+
+def test_grep_errors(framework):
+    """Test the errors for invalid patterns and paths"""
+    framework.run_test_commands([
+        "grep '[' /",
+        "grep",
+        "grep x /nothing"
+    ])
+
+    framework.assert_output_contains([
+        "Error: Invalid pattern",
+        "Error: No pattern specified",
+        "Error: Invalid segment nothing"
+    ])
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Tests for the content index used by grep --index
+"""
+from unittest.mock import MagicMock
+
+import pytest
+
+import command.grep
+from command.grep import GrepCommand
+from state.state import State
+from utils.content_index import ContentIndex, get_required_tokens, tokenize
+from utils.terminal import disable_colors, enable_colors
+
+
+def test_tokenize():
+    """Test that text is split into lowercase alphanumeric tokens"""
+    assert tokenize("image: Nginx:1.25") == {"image", "nginx", "1", "25"}
+
+
+def test_required_tokens_skip_partial_ends():
+    """Test that tokens touching the ends of a literal aren't required"""
+    assert get_required_tokens("nginx:1.25") == {"1"}
+    assert get_required_tokens(" nginx:1.25\n") == {"nginx", "1", "25"}
+    assert get_required_tokens("nginx") == set()
+
+
+def test_find_candidates():
+    """Test that only documents with the required tokens are candidates"""
+    index = ContentIndex()
+    index.put(("default", "deployments"), {
+        "/default/deployments/web": ({}, "spec.image: registry/web:1.2"),
+        "/default/deployments/api": ({}, "spec.image: registry/api:2.0"),
+    })
+
+    assert index.find_candidates(("default", "deployments"), "/web:1.2 ") == ["/default/deployments/web"]
+    assert index.find_candidates(("default", "deployments"), "registry") == ["/default/deployments/api", "/default/deployments/web"]
+    assert index.find_candidates(("default", "pods"), "registry") == []
+
+
+def test_index_expires():
+    """Test that directories are fetched again after the TTL"""
+    index = ContentIndex(ttl=-1)
+    index.put(("default", "deployments"), {})
+
+    assert index.get(("default", "deployments")) is None
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Replace the Kubernetes client used by grep, with an empty index"""
+    mock_client = MagicMock()
+    mock_client.get_resource_types.return_value = ["deployments"]
+    mock_client.find_resources.side_effect = lambda resource_type, namespace=None: iter([
+        {"metadata": {"name": "web", "namespace": "prod", "uid": "1"}, "spec": {"image": "web:1.2"}},
+    ])
+    monkeypatch.setattr(command.grep, "k8s_client", mock_client)
+    monkeypatch.setattr(command.grep, "content_index", ContentIndex())
+    disable_colors()
+    yield mock_client
+    enable_colors()
+
+
+def test_grep_index_avoids_refetching(client, capsys):
+    """Test that repeated searches with --index use one LIST for all namespaces"""
+    state = State()
+    GrepCommand().execute(state, ["--index", "web:1.2", "/"])
+    GrepCommand().execute(state, ["--index", "-l", "image", "/"])
+
+    assert capsys.readouterr().out == "/prod/deployments/web: spec.image: web:1.2\n/prod/deployments/web\n"
+    client.find_resources.assert_called_once_with("deployments", None)
+
+
+def test_grep_ignores_server_managed_fields(client, capsys):
+    """Test that fields removed by cat aren't searched"""
+    GrepCommand().execute(State(), ["uid", "/"])
+
+    assert capsys.readouterr().out == ""
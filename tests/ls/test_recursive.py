@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""
+Test for the recursive listing of the ls command
+"""
+
+
+def test_ls_recursive(framework):
+    """Test that ls -R lists every directory below the path, level by level"""
+    framework.env["NO_COLOR"] = "1"
+    framework.run_test_commands([
+        "ls -R /default/deployments"
+    ])
+
+    framework.assert_output_contains([
+        "/default/deployments:",
+        "/default/deployments/web-app:",
+        "/default/deployments/web-app/web-app-pod-1:",
+        "logging-agent"
+    ])
+    # Breadth-first: all controllers come before their pods
+    output = framework.output
+    assert output.index("/default/deployments/nginx-deployment:") < output.index("/default/deployments/web-app/web-app-pod-1:")
+
+
+def test_ls_recursive_depth(framework):
+    """Test that --depth limits the number of levels"""
+    framework.env["NO_COLOR"] = "1"
+    framework.run_test_commands([
+        "cd /default",
+        "ls -R --depth 1 deployments"
+    ])
+
+    framework.assert_output_contains([
+        "/default/deployments:"
+    ])
+    framework.assert_output_not_contains([
+        "/default/deployments/web-app:"
+    ])
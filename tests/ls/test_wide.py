@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Test for the wide listing of the ls command
+"""
+
+
+def test_ls_wide_pods(framework):
+    """Test that ls -l shows the status columns of pods"""
+    framework.env["NO_COLOR"] = "1"
+    framework.run_test_commands([
+        "ls -l /default/pods"
+    ])
+
+    framework.assert_output_contains([
+        "NAME            READY   STATUS    RESTARTS   AGE"
+    ])
+    framework.assert_output_contains_pattern(r"nginx-pod-1\s+2/2\s+Running\s+0\s+\d+[smhdy]")
+
+
+def test_ll_services(framework):
+    """Test that ll is the wide listing and shows service types and cluster IPs"""
+    framework.env["NO_COLOR"] = "1"
+    framework.run_test_commands([
+        "cd /default/services",
+        "ll"
+    ])
+
+    framework.assert_output_contains_pattern(r"NAME\s+TYPE\s+CLUSTER-IP\s+PORT\(S\)\s+AGE")
+    framework.assert_output_contains_pattern(r"kubernetes\s+ClusterIP\s+10\.96\.0\.1\s+443/TCP")
+
+
+def test_ls_wide_deployments(framework):
+    """Test the ready and desired replicas of deployments"""
+    framework.env["NO_COLOR"] = "1"
+    framework.run_test_commands([
+        "ls -l default/deployments"
+    ])
+
+    framework.assert_output_contains_pattern(r"NAME\s+READY\s+UP-TO-DATE\s+AVAILABLE\s+AGE")
+    framework.assert_output_contains_pattern(r"web-app\s+1/1\s+1\s+1")
+
+
+def test_ls_wide_other_directories(framework):
+    """Test that directories without status columns use the long listing"""
+    framework.env["NO_COLOR"] = "1"
+    framework.run_test_commands([
+        "ls -l /default"
+    ])
+
+    framework.assert_output_contains_pattern(r"^d .*  services$")
+    framework.assert_output_not_contains([
+        "Error:"
+    ])
+
+
+def test_ls_wide_root_counts(framework):
+    """Test that ls -l at the root shows the number of resources of each type per namespace"""
+    framework.env["NO_COLOR"] = "1"
+    framework.run_test_commands([
+        "ls -l /"
+    ])
+
+    framework.assert_output_contains_pattern(r"NAME\s+SERVICES\s+DEPLOYMENTS\s+.*PODS")
+    framework.assert_output_contains_pattern(r"kube-public\s+0\s+0\s+0\s+0\s+1\s+0\s+0\s+0")
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Tests for the cluster-wide index of resources by namespace
+"""
+import time
+from unittest.mock import MagicMock
+
+from k8s_client.cluster_index import ClusterIndex
+from utils import output
+from utils.concurrency import map_concurrently
+
+
+def make_client():
+    """Create a client returning resources of two namespaces, slowly"""
+    client = MagicMock()
+
+    def find_resources(resource_type, namespace=None, label_selector=None, field_selector=None):
+        time.sleep(0.05)
+        for namespace, name in [("default", "web"), ("prod", "api"), ("prod", "worker")]:
+            yield {"metadata": {"namespace": namespace, "name": f"{name}-{resource_type}"}}
+
+    client.find_resources.side_effect = find_resources
+    return client
+
+
+def test_partitioned_by_namespace():
+    """Test that one LIST for all namespaces is partitioned by namespace"""
+    client = make_client()
+    index = ClusterIndex(client)
+
+    assert index.get_resources("prod", "pods") == ["api-pods", "worker-pods"]
+    assert index.get_resources("default", "pods") == ["web-pods"]
+    assert index.count_resources("staging", "pods") == 0
+    client.find_resources.assert_called_once_with("pods")
+
+
+def test_one_list_per_type_for_concurrent_callers():
+    """Test that concurrent lookups in many namespaces share a single LIST per type"""
+    client = make_client()
+    index = ClusterIndex(client)
+
+    lookups = [(namespace, resource_type) for namespace in ["default", "prod"] * 10 for resource_type in ["pods", "services"]]
+    results = map_concurrently(lambda lookup: index.get_resources(*lookup), lookups)
+
+    assert results[0] == ["web-pods"]
+    assert client.find_resources.call_count == 2
+
+
+def test_expired_types_are_fetched_again():
+    """Test that the index is refreshed after its TTL, or when invalidated"""
+    client = make_client()
+    index = ClusterIndex(client, ttl=-1)
+
+    index.get_resources("prod", "pods")
+    index.get_resources("prod", "pods")
+    assert client.find_resources.call_count == 2
+
+    index = ClusterIndex(client)
+    index.get_resources("prod", "pods")
+    index.invalidate()
+    index.get_resources("prod", "pods")
+    assert client.find_resources.call_count == 4
+
+
+def test_invalidate_one_type():
+    """Test that invalidating a type after changing it keeps the other types"""
+    client = make_client()
+    index = ClusterIndex(client)
+
+    index.get_resources("prod", "pods")
+    index.get_resources("prod", "services")
+    index.invalidate("pods")
+    index.get_resources("prod", "pods")
+    index.get_resources("prod", "services")
+    assert client.find_resources.call_count == 3
+
+
+def test_failed_list_is_not_kept(capsys):
+    """Test that a LIST stopping with an error is not indexed, and the error still counts for the command"""
+    client = MagicMock()
+
+    def find_resources(resource_type, namespace=None, label_selector=None, field_selector=None):
+        yield {"metadata": {"namespace": "default", "name": "web"}}
+        output.error(f"Error finding {resource_type}: 503 Service Unavailable")
+
+    client.find_resources.side_effect = find_resources
+    index = ClusterIndex(client)
+
+    with output.track_errors() as errors:
+        assert index.get_resources("default", "pods") == ["web"]
+    index.get_resources("default", "pods")
+
+    assert errors == ["Error finding pods: 503 Service Unavailable"]
+    assert client.find_resources.call_count == 2
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Tests for the status columns of the wide listing
+"""
+from datetime import datetime, timezone
+
+from utils.status import format_age, get_status_headers, get_status_row
+
+
+NOW = datetime(2024, 1, 10, 12, 0, 0, tzinfo=timezone.utc)
+
+
+def test_format_age():
+    """Test the kubectl-like age format"""
+    assert format_age("2024-01-10T11:59:15Z", NOW) == "45s"
+    assert format_age("2024-01-10T11:48:00Z", NOW) == "12m"
+    assert format_age("2024-01-10T09:00:00Z", NOW) == "3h"
+    assert format_age("2024-01-01T12:00:00Z", NOW) == "9d"
+    assert format_age(None, NOW) == "<unknown>"
+    assert format_age("yesterday", NOW) == "<unknown>"
+
+
+def test_pod_status_uses_container_reason():
+    """Test that a waiting container's reason is shown instead of the phase"""
+    pod = {
+        "metadata": {"name": "web"},
+        "spec": {"containers": [{"name": "app"}, {"name": "sidecar"}]},
+        "status": {
+            "phase": "Running",
+            "containerStatuses": [
+                {"name": "app", "ready": False, "restartCount": 7, "state": {"waiting": {"reason": "CrashLoopBackOff"}}},
+                {"name": "sidecar", "ready": True, "restartCount": 1, "state": {"running": {}}},
+            ],
+        },
+    }
+
+    assert get_status_headers("pods") == ["READY", "STATUS", "RESTARTS"]
+    assert get_status_row("pods", pod) == ["1/2", "CrashLoopBackOff", "8"]
+
+
+def test_service_status():
+    """Test the type, cluster IP and ports of a service"""
+    service = {"spec": {"type": "NodePort", "clusterIP": "10.0.0.5", "ports": [{"port": 80, "nodePort": 30080}]}}
+
+    assert get_status_row("services", service) == ["NodePort", "10.0.0.5", "80:30080/TCP"]
+
+
+def test_status_of_incomplete_resource():
+    """Test that resources without a status don't break the listing"""
+    assert get_status_row("deployments", {"spec": {"replicas": 3}}) == ["0/3", "0", "0"]
+    assert get_status_row("configmaps", {}) == ["0"]
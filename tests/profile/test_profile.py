@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Test for the profile command
+"""
+import pstats
+
+
+def test_profile_command(framework):
+    """Test that profile runs the command and shows the functions it spent time in"""
+    framework.env["NO_COLOR"] = "1"
+    framework.run_test_commands([
+        "profile -n 5 ls /default/deployments"
+    ])
+
+    framework.assert_output_contains([
+        "nginx-deployment",
+        "ls /default/deployments: ",
+        "CALLS   TOTTIME   CUMTIME   FUNCTION",
+        "command/ls.py:"
+    ])
+
+
+def test_profile_completion(framework, tmp_path):
+    """Test that --complete profiles a completion and -o writes the profile"""
+    path = tmp_path / "tab.prof"
+    framework.run_test_commands([
+        f"profile -o {path} --complete 'cat /def'"
+    ])
+
+    framework.assert_output_contains([
+        "1 completions of 'cat /def': ",
+        "Profile written to"
+    ])
+    assert pstats.Stats(str(path)).total_calls > 0
+
+
+def test_profile_errors(framework):
+    """Test that profile reports missing commands and invalid options"""
+    framework.run_test_commands([
+        "profile",
+        "profile -s slowest ls",
+        "profile nonexistent"
+    ])
+
+    framework.assert_output_contains([
+        "Error: No command specified",
+        "Error: -s must be one of cumulative, tottime, calls",
+        "Command not found: nonexistent"
+    ])
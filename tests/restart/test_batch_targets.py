@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test for the restart command with several targets, wildcards and --wait
+"""
+import pytest
+
+
+def test_restart_wildcard(framework):
+    """Test that a wildcard restarts every matching controller"""
+    framework.run_test_commands([
+        "restart /default/deployments/*"
+    ])
+
+    framework.assert_output_contains([
+        "default/deployments/nginx-deployment restarted",
+        "default/deployments/web-app restarted"
+    ])
+
+
+def test_restart_wildcard_namespace(framework):
+    """Test that wildcards work in any segment of the path"""
+    framework.run_test_commands([
+        "restart /*/deployments/*-*"
+    ])
+
+    framework.assert_output_contains([
+        "kube-system/deployments/metrics-server restarted",
+        "default/deployments/nginx-deployment restarted"
+    ])
+    framework.assert_output_not_contains([
+        "coredns restarted"
+    ])
+
+
+def test_restart_multiple_paths(framework):
+    """Test that several paths can be restarted at once"""
+    framework.run_test_commands([
+        "restart /default/deployments/web-app /default/statefulsets/database"
+    ])
+
+    framework.assert_output_contains([
+        "default/deployments/web-app restarted",
+        "default/statefulsets/database restarted"
+    ])
+
+
+def test_restart_no_match(framework):
+    """Test that a wildcard without matches produces an error message"""
+    framework.run_test_commands([
+        "restart /default/deployments/api-*"
+    ])
+
+    framework.assert_output_contains([
+        "Error: No resources match /default/deployments/api-*"
+    ])
+
+
+def test_restart_wait(framework):
+    """Test that --wait follows the rollouts until they finish"""
+    framework.run_test_commands([
+        "restart --wait /default/deployments/*"
+    ])
+
+    framework.assert_output_contains([
+        "[1/2]",
+        "[2/2]",
+        "Rolled out 2 of 2 controllers"
+    ])
+
+
+@pytest.mark.parametrize("timeout", ["0", "-5", "nan", "inf", "soon"])
+def test_restart_wait_invalid_timeout(framework, timeout):
+    """Test that --timeout only accepts a positive number of seconds"""
+    framework.run_test_commands([
+        f"restart --wait --timeout {timeout} /default/deployments/*"
+    ])
+
+    framework.assert_output_contains([
+        f"Error: Invalid timeout: {timeout}"
+    ])
+    assert "Rolled out" not in framework.output
+
+
+def test_restart_refreshes_cluster_index(framework, monkeypatch):
+    """Test that the indexed pods and replicasets, which a rollout replaces, are fetched again"""
+    invalidated = []
+    monkeypatch.setattr("k8s_client.cluster_index.ClusterIndex.invalidate",
+                        lambda self, resource_type=None: invalidated.append(resource_type))
+    framework.run_test_commands([
+        "restart /default/deployments/web-app"
+    ])
+
+    assert {"deployments", "replicasets", "pods"} <= set(invalidated)
@@ -30,5 +30,5 @@ def test_help_restart(framework):
         "Notes:",
         "This command can only be used with deployments, statefulsets, and daemonsets",
         "It triggers a rolling restart of the pods managed by the controller",
-        "The restart is performed by using 'kubectl rollout restart'"
+        "The restart is performed like 'kubectl rollout restart', by setting the restartedAt annotation of the pod template"
     ])
@@ -34,7 +34,7 @@ def test_restart_relative_path(framework):
 
     # Check if the output contains the expected command
     framework.assert_output_contains([
-        "Would run: kubectl rollout restart deployment nginx -n default"
+        "default/deployments/nginx restarted"
     ])
 
 
@@ -47,5 +47,5 @@ def test_restart_with_alias(framework):
 
     # Check if the output contains the expected command
     framework.assert_output_contains([
-        "Would run: kubectl rollout restart deployment nginx -n default"
+        "default/deployments/nginx restarted"
     ])
@@ -20,7 +20,7 @@ def test_restart_deployment(framework):
 
     # Check if the output contains the expected command
     framework.assert_output_contains([
-        "Would run: kubectl rollout restart deployment nginx -n default"
+        "default/deployments/nginx restarted"
     ])
 
 
@@ -33,7 +33,7 @@ def test_restart_statefulset(framework):
 
     # Check if the output contains the expected command
     framework.assert_output_contains([
-        "Would run: kubectl rollout restart statefulset web -n default"
+        "default/statefulsets/web restarted"
     ])
 
 
@@ -46,5 +46,5 @@ def test_restart_daemonset(framework):
 
     # Check if the output contains the expected command
     framework.assert_output_contains([
-        "Would run: kubectl rollout restart daemonset fluentd -n default"
+        "default/daemonsets/fluentd restarted"
     ])
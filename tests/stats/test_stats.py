@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Test for the stats command
+"""
+
+
+def test_stats_lists_commands(framework):
+    """Test that stats shows the commands run before it"""
+    framework.env["NO_COLOR"] = "1"
+    framework.run_test_commands([
+        "ls /default/pods",
+        "cat /default/deployments/web-app",
+        "stats"
+    ])
+
+    framework.assert_output_contains([
+        "COMMAND",
+        "REQUESTS",
+        "ls /default/pods",
+        "cat /default/deployments/web-app"
+    ])
+
+
+def test_stats_verbose(framework):
+    """Test that -v breaks the requests down by verb and resource type"""
+    framework.env["NO_COLOR"] = "1"
+    framework.run_test_commands([
+        "cat /default/deployments/web-app",
+        "stats -v"
+    ])
+
+    framework.assert_output_contains([
+        "VERB",
+        "get    deployments",
+        "render   0      1",
+        "yaml"
+    ])
+
+
+def test_stats_clear(framework):
+    """Test that --clear forgets the measured commands"""
+    framework.run_test_commands([
+        "ls /",
+        "stats --clear",
+        "stats"
+    ])
+
+    framework.assert_output_contains([
+        "No commands measured yet"
+    ])
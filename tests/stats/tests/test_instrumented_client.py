@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Tests for the statistics recorded by the instrumented client and the caches
+"""
+from k8s_client.instrumented_client import InstrumentedKubernetesClient
+from k8s_client.mock_client import MockKubernetesClient
+from utils import stats
+from utils.render import clear_render_cache, stream_resource
+
+
+def make_client():
+    """Create an instrumented mock client"""
+    return InstrumentedKubernetesClient(MockKubernetesClient())
+
+
+def test_requests_by_verb_and_resource_type():
+    """Test that client calls are counted as requests by verb and resource type"""
+    k8s_client = make_client()
+
+    with stats.measure_command("test") as command_stats:
+        k8s_client.get_resources("default", "pods")
+        k8s_client.get_resources("kube-system", "pods")
+        k8s_client.get_resource("default", "deployments", "web-app")
+        k8s_client.get_resource_types()
+
+    assert {key: count for key, (count, _) in command_stats.requests.items()} == {
+        ("list", "pods"): 2,
+        ("get", "deployments"): 1,
+    }
+    assert command_stats.get_request_count() == 3
+    assert command_stats.wall_time > 0
+
+
+def test_find_counts_one_request():
+    """Test that find_resources counts as one request once its resources are consumed"""
+    k8s_client = make_client()
+
+    with stats.measure_command("test") as command_stats:
+        resources = list(k8s_client.find_resources("pods"))
+
+    assert len(resources) == 5
+    assert command_stats.requests[("list", "pods")][0] == 1
+
+
+def test_nested_commands_count_for_their_parent():
+    """Test that what a command measured inside another one does counts for both"""
+    k8s_client = make_client()
+
+    with stats.measure_command("outer") as outer:
+        with stats.measure_command("<tab> inner") as inner:
+            k8s_client.get_namespaces()
+        k8s_client.get_namespaces()
+
+    assert inner.get_request_count() == 1
+    assert outer.get_request_count() == 2
+
+
+def test_requests_outside_commands_are_ignored():
+    """Test that calls made outside of a command are not recorded anywhere"""
+    stats.clear_history()
+    make_client().get_namespaces()
+
+    assert stats.get_history() == []
+
+
+def test_history_keeps_finished_commands():
+    """Test that finished commands are kept, oldest first"""
+    stats.clear_history()
+    with stats.measure_command("first"):
+        pass
+    with stats.measure_command("second"):
+        pass
+
+    assert [command_stats.command for command_stats in stats.get_history()] == ["first", "second"]
+
+
+def test_render_cache_hits_and_yaml_time():
+    """Test that rendering counts render cache lookups and the time spent dumping YAML"""
+    resource = MockKubernetesClient().get_resource("default", "deployments", "web-app")
+    clear_render_cache()
+
+    with stats.measure_command("test") as command_stats:
+        "".join(stream_resource(resource))
+        "".join(stream_resource(resource))
+
+    assert command_stats.caches["render"] == (1, 1)
+    assert command_stats.timings["yaml"] > 0
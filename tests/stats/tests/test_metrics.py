@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Tests for the metrics of the process and their export in the Prometheus text format
+"""
+import urllib.request
+
+from utils import metrics, stats
+
+
+def test_counter_and_histogram_exposition():
+    """Test that counters and histograms are exposed with their labels, buckets, sum and count"""
+    counter = metrics.Counter("test_requests_total", "Test requests", ("verb",))
+    counter.inc("get")
+    counter.inc("get")
+    histogram = metrics.Histogram("test_duration_seconds", "Test durations", ("verb",), buckets=(0.1, 1.0))
+    histogram.observe(0.5, "get")
+
+    text = metrics.generate()
+
+    assert "# TYPE test_requests_total counter\ntest_requests_total{verb=\"get\"} 2\n" in text
+    assert "test_duration_seconds_bucket{verb=\"get\",le=\"0.1\"} 0\n" in text
+    assert "test_duration_seconds_bucket{verb=\"get\",le=\"1\"} 1\n" in text
+    assert "test_duration_seconds_bucket{verb=\"get\",le=\"+Inf\"} 1\n" in text
+    assert "test_duration_seconds_sum{verb=\"get\"} 0.5\n" in text
+    assert "test_duration_seconds_count{verb=\"get\"} 1\n" in text
+
+
+def test_label_values_are_escaped():
+    """Test that quotes and backslashes in label values are escaped"""
+    counter = metrics.Counter("test_escaped_total", "Test escaping", ("command",))
+    counter.inc("grep \"a\\b\"")
+
+    assert "test_escaped_total{command=\"grep \\\"a\\\\b\\\"\"} 1\n" in metrics.generate()
+
+
+def test_stats_feed_the_metrics():
+    """Test that requests, cache lookups and commands recorded for stats are counted in the metrics too"""
+    requests = metrics.REQUESTS.get("list", "test-type")
+    lookups = metrics.CACHE_LOOKUPS.get("test-cache", "hit")
+    commands = metrics.COMMANDS.get("test-command")
+
+    # Outside of a command too
+    stats.record_request("list", "test-type", 0.01)
+    with stats.measure_command("test-command --flag"):
+        stats.record_request("list", "test-type", 0.01)
+        stats.record_cache("test-cache", True)
+
+    assert metrics.REQUESTS.get("list", "test-type") == requests + 2
+    assert metrics.CACHE_LOOKUPS.get("test-cache", "hit") == lookups + 1
+    assert metrics.COMMANDS.get("test-command") == commands + 1
+
+
+def test_gauge_reads_its_function():
+    """Test that gauges are read when the metrics are exported"""
+    entries = []
+    metrics.CACHE_ENTRIES.set_function(lambda: len(entries), "test-cache")
+    entries.extend(["a", "b"])
+
+    assert "k8sh_cache_entries{cache=\"test-cache\"} 2\n" in metrics.generate()
+
+
+def test_write_file(tmp_path):
+    """Test that the metrics are written to a file, without leaving temporary files behind"""
+    path = tmp_path / "k8sh.prom"
+    metrics.write_file(str(path))
+
+    assert "# TYPE k8sh_client_requests_total counter" in path.read_text()
+    assert [entry.name for entry in tmp_path.iterdir()] == ["k8sh.prom"]
+
+
+def test_serve():
+    """Test that the metrics are served at /metrics"""
+    server = metrics.serve(0)
+    try:
+        port = server.server_address[1]
+        with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+            assert response.headers["Content-Type"] == metrics.CONTENT_TYPE
+            assert "k8sh_commands_total" in response.read().decode("utf-8")
+    finally:
+        server.shutdown()
+        server.server_close()
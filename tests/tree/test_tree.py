@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Test for the tree command
+"""
+
+
+def test_tree_deployments(framework):
+    """Test that tree shows controllers with their pods and containers"""
+    framework.env["NO_COLOR"] = "1"
+    framework.run_test_commands([
+        "tree /default/deployments"
+    ])
+
+    framework.assert_output_contains([
+        "/default/deployments\n",
+        "├── nginx-deployment\n",
+        "└── web-app\n",
+        "    └── web-app-pod-1\n",
+        "        ├── web-app\n",
+        "        └── logging-agent\n",
+        "4 directories, 2 files"
+    ])
+
+
+def test_tree_depth_limit(framework):
+    """Test that -L limits the number of levels"""
+    framework.env["NO_COLOR"] = "1"
+    framework.run_test_commands([
+        "cd /",
+        "tree -L 1"
+    ])
+
+    framework.assert_output_contains([
+        "├── default\n",
+        "└── kube-system\n",
+        "3 directories, 0 files"
+    ])
+    framework.assert_output_not_contains([
+        "services"
+    ])
+
+
+def test_tree_invalid_path(framework):
+    """Test the error for a path that doesn't exist"""
+    framework.run_test_commands([
+        "tree /default/nothing"
+    ])
+
+    framework.assert_output_contains([
+        "Error: Invalid segment nothing"
+    ])
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Tests for the owner index and the traversal of the virtual filesystem
+"""
+from unittest.mock import MagicMock
+
+import pytest
+
+import state.traversal
+from k8s_client.owner_index import OwnerIndex, build_owner_index
+from state.traversal import TreeWalker
+
+
+def make_object(name, owner_kind=None, owner_name=None, containers=()):
+    """Build a resource as returned by a LIST"""
+    metadata = {"name": name}
+    if owner_kind:
+        metadata["ownerReferences"] = [{"kind": owner_kind, "name": owner_name}]
+    return {"metadata": metadata, "spec": {"containers": [{"name": container} for container in containers]}}
+
+
+def test_build_owner_index():
+    """Test that pods are indexed by their controller, deployments through their replicasets"""
+    replicasets = [make_object("web-7f55", "Deployment", "web")]
+    pods = [
+        make_object("web-7f55-abc", "ReplicaSet", "web-7f55", ["app", "proxy"]),
+        make_object("db-0", "StatefulSet", "db", ["postgres"]),
+        make_object("standalone", containers=["main"]),
+    ]
+
+    index = build_owner_index(pods, replicasets)
+
+    assert index.get_pods("deployments", "web") == ["web-7f55-abc"]
+    assert index.get_pods("replicasets", "web-7f55") == ["web-7f55-abc"]
+    assert index.get_pods("statefulsets", "db") == ["db-0"]
+    assert index.get_pods("deployments", "other") == []
+    assert index.get_containers("web-7f55-abc") == ["app", "proxy"]
+    assert index.get_containers("missing") is None
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """Replace the Kubernetes client used by the traversal"""
+    mock_client = MagicMock()
+    mock_client.get_namespaces.return_value = ["default"]
+    mock_client.get_resource_types.return_value = ["deployments"]
+    mock_client.get_resources.return_value = ["api", "web", "worker"]
+    mock_client.is_resource_with_children.return_value = True
+    mock_client.get_owner_index.return_value = OwnerIndex(
+        {("deployments", name): [f"{name}-pod"] for name in ["api", "web", "worker"]},
+        {f"{name}-pod": ["main"] for name in ["api", "web", "worker"]},
+    )
+    monkeypatch.setattr(state.traversal, "k8s_client", mock_client)
+    return mock_client
+
+
+def test_walk_shares_owner_index(client):
+    """Test that the owner index of a namespace is fetched once for all controllers"""
+    levels = list(TreeWalker().walk([["default", "deployments"]]))
+
+    assert [len(level) for level in levels] == [1, 3, 3]
+    assert levels[1][0] == (["default", "deployments", "api"], [("api-pod", True)])
+    assert levels[2][2] == (["default", "deployments", "worker", "worker-pod"], [("main", False)])
+    client.get_owner_index.assert_called_once_with("default")
+    client.get_pods_for_resource.assert_not_called()
+    client.get_pod_containers.assert_not_called()
+
+
+def test_walk_depth_limit(client):
+    """Test that the walk stops at the maximum depth"""
+    levels = list(TreeWalker(max_depth=2).walk([[]]))
+
+    assert len(levels) == 2
+    assert levels[0] == [([], [("default", True)])]
+    assert levels[1] == [(["default"], [("deployments", True)])]
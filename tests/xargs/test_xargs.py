@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Test for pipelines and the xargs command
+"""
+
+
+def test_pipe_into_command(framework):
+    """Test that a command after a pipe gets the paths of the records"""
+    framework.run_test_commands([
+        "ls /default/deployments | restart"
+    ])
+
+    framework.assert_output_contains([
+        "default/deployments/nginx-deployment restarted",
+        "default/deployments/web-app restarted"
+    ])
+
+
+def test_xargs_workers_keep_order(framework):
+    """Test that -P runs a command per path, printing their output in the order of the paths"""
+    framework.env["NO_COLOR"] = "1"
+    framework.run_test_commands([
+        "ls / | xargs -P 3 du -s"
+    ])
+
+    framework.assert_output_contains([
+        "16\t/default\n9\t/kube-system\n1\t/kube-public\n"
+    ])
+
+
+def test_pipe_quoted(framework):
+    """Test that a quoted | is an argument, not a pipe"""
+    framework.run_test_commands([
+        "grep -l 'kube-dns|web-service' /*/services | cat"
+    ])
+
+    framework.assert_output_contains([
+        "name: web-service",
+        "name: kube-dns"
+    ])
+    framework.assert_output_not_contains([
+        "name: metrics-server"
+    ])
+
+
+def test_pipe_without_records(framework):
+    """Test the error for a command which can't pass records"""
+    framework.run_test_commands([
+        "tree /default | cat"
+    ])
+
+    framework.assert_output_contains([
+        "Error: tree can't pass records to a pipe"
+    ])
+
+
+def test_xargs_without_pipe(framework):
+    """Test the error for xargs outside of a pipeline"""
+    framework.run_test_commands([
+        "xargs cat"
+    ])
+
+    framework.assert_output_contains([
+        "Error: xargs runs a command on the records piped into it"
+    ])
+
+
+def test_pipe_into_single_path_command(framework, monkeypatch):
+    """Test that a command taking a single path runs once for every path piped into it"""
+    monkeypatch.setattr("command.edit.EditCommand._do_execute", lambda self, state, namespace, resource_type, resource_name:
+                        print(f"Would edit {resource_type} {resource_name}"))
+    framework.run_test_commands([
+        "ls /default/configmaps | edit"
+    ])
+
+    framework.assert_output_contains([
+        "Would edit configmaps app-config",
+        "Would edit configmaps system-config"
+    ])
+
+
+def test_pipe_into_single_directory_command(framework):
+    """Test that a command taking a single directory, like du, gets every path piped into it"""
+    framework.env["NO_COLOR"] = "1"
+    framework.run_test_commands([
+        "ls / | du -s"
+    ])
+
+    framework.assert_output_contains([
+        "16\t/default\n9\t/kube-system\n1\t/kube-public\n"
+    ])
+
+
+def test_xargs_workers_only_for_read_only_commands(framework):
+    """Test that -P refuses to run commands changing resources or using the terminal concurrently"""
+    framework.run_test_commands([
+        "ls /default/configmaps | xargs -P 2 edit",
+        "ls /default/deployments | xargs -P 2 restart"
+    ])
+
+    framework.assert_output_contains([
+        "Error: -P can only run commands which only read, not edit",
+        "Error: -P can only run commands which only read, not restart"
+    ])
+    framework.assert_output_not_contains([
+        "restarted"
+    ])
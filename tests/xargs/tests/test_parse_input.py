@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Tests for parsing command lines into pipelines
+"""
+import pytest
+
+from shell import parse_input
+
+
+def test_single_command():
+    """Test that a command without pipes is a single stage"""
+    assert parse_input("find / -name 'web-*'") == [("find", ["/", "-name", "web-*"])]
+    assert parse_input("   ") == [("", [])]
+
+
+def test_pipeline_through_xargs():
+    """Test that commands after a pipe run through xargs, with or without spaces around the pipe"""
+    assert parse_input("ls default/pods|cat") == [("ls", ["default/pods"]), ("xargs", ["cat"])]
+    assert parse_input("find / | xargs -P 8 cat | restart") == [
+        ("find", ["/"]),
+        ("xargs", ["-P", "8", "cat"]),
+        ("xargs", ["restart"]),
+    ]
+
+
+def test_quoted_pipe():
+    """Test that a quoted | is part of an argument"""
+    assert parse_input("grep 'a|b' default") == [("grep", ["a|b", "default"])]
+
+
+@pytest.mark.parametrize("input_text", ["ls |", "| cat", "ls || cat"])
+def test_invalid_pipeline(input_text):
+    """Test that empty commands and || are rejected"""
+    with pytest.raises(ValueError):
+        parse_input(input_text)
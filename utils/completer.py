@@ -3,14 +3,17 @@
 Autocomplete functionality for K8sh with fuzzy matching
 """
 import os
-from typing import Iterable
+from typing import Iterable, List, Tuple
 
 from fuzzyfinder import fuzzyfinder
 from prompt_toolkit.completion import Completer, Completion
 from prompt_toolkit.document import Document
 
 from command.registry import CommandRegistry
+from k8s_client import get_cluster_index
 from state.state import State
+from utils import stats
+from utils.concurrency import map_concurrently
 
 
 class K8shCompleter(Completer):
@@ -57,93 +60,61 @@ class K8shCompleter(Completer):
 
         # Special handling for nested fuzzy path completion
         # This handles cases like "cd dflt/dploy" -> "/default/deployments/"
-        if len(segments) > 1:
+        if len(segments) in [2, 3]:
+            completed = False
             try:
-                # For two-segment paths (namespace/resource_type)
-                if len(segments) == 2:
-                    # Get all available namespaces
-                    temp_state = State()
-                    namespaces = temp_state.get_available_items()
-
-                    # Find fuzzy matches for the first segment
-                    namespace_matches = list(fuzzyfinder(segments[0], namespaces))
-
-                    for namespace in namespace_matches:
-                        # Navigate to the namespace
-                        temp_state.set_path(namespace)
+                # Get all available namespaces
+                namespaces = State().get_available_items()
 
-                        # Get available items in the namespace
-                        resource_types = temp_state.get_available_items()
+                # Find fuzzy matches for the first segment
+                namespace_matches = list(fuzzyfinder(segments[0], namespaces))
 
+                # The directories of all matches are listed concurrently, so the identical requests
+                # made to resolve them, e.g. the namespaces every path is validated against, are shared
+                if len(segments) == 2:
+                    for namespace, (temp_state, resource_types) in zip(
+                            namespace_matches, map_concurrently(self._list_directory, namespace_matches)):
                         # Find fuzzy matches for the second segment
-                        resource_matches = list(fuzzyfinder(segments[1], resource_types))
-
-                        for resource_type in resource_matches:
-                            # Build the full path without leading slash
-                            full_path = namespace + "/" + resource_type
-
-                            # Don't add trailing slashes
-                            # if temp_state.is_directory(resource_type):
-                            #     full_path += "/"
-
+                        for resource_type in fuzzyfinder(segments[1], resource_types):
+                            completed = True
                             yield Completion(
-                                full_path,
+                                namespace + "/" + resource_type,
                                 start_position=-len(typed_path),
                                 display_meta="Directory" if temp_state.is_directory(resource_type) else "File"
                             )
 
                 # For three-segment paths (namespace/resource_type/resource)
-                elif len(segments) == 3:
-                    # Get all available namespaces
-                    temp_state = State()
-                    namespaces = temp_state.get_available_items()
-
-                    # Find fuzzy matches for the first segment
-                    namespace_matches = list(fuzzyfinder(segments[0], namespaces))
-
-                    for namespace in namespace_matches:
-                        # Navigate to the namespace
-                        temp_state.set_path(namespace)
-
-                        # Get available items in the namespace
-                        resource_types = temp_state.get_available_items()
-
-                        # Find fuzzy matches for the second segment
-                        resource_type_matches = list(fuzzyfinder(segments[1], resource_types))
-
-                        for resource_type in resource_type_matches:
-                            # Navigate to the resource type
-                            resource_type_path = namespace + "/" + resource_type
-                            temp_state.set_path(resource_type_path)
-
-                            # Get available resources
-                            resources = temp_state.get_available_items()
-
-                            # Find fuzzy matches for the third segment
-                            resource_matches = list(fuzzyfinder(segments[2], resources))
-
-                            for resource in resource_matches:
-                                # Build the full path - ensure no double slashes
-                                if resource_type_path.endswith('/'):
-                                    full_path = resource_type_path + resource
-                                else:
-                                    full_path = resource_type_path + "/" + resource
-
-                                # Don't add trailing slashes
-                                # if temp_state.is_directory(resource):
-                                #     full_path += "/"
-
-                                yield Completion(
-                                    full_path,
-                                    start_position=-len(typed_path),
-                                    display_meta="Directory" if temp_state.is_directory(resource) else "File"
-                                )
+                else:
+                    # Find fuzzy matches for the second segment in every matching namespace
+                    resource_type_paths = [
+                        namespace + "/" + resource_type
+                        for namespace, (_, resource_types) in zip(
+                            namespace_matches, map_concurrently(self._list_directory, namespace_matches))
+                        for resource_type in fuzzyfinder(segments[1], resource_types)
+                    ]
+
+                    # Get available resources, with one LIST for all namespaces when several match
+                    use_cluster_index = len(namespace_matches) > 1
+                    listings = map_concurrently(lambda path: self._list_directory(path, use_cluster_index),
+                                                resource_type_paths)
+
+                    for resource_type_path, (temp_state, resources) in zip(resource_type_paths, listings):
+                        # Find fuzzy matches for the third segment
+                        for resource in fuzzyfinder(segments[2], resources):
+                            completed = True
+                            yield Completion(
+                                resource_type_path + "/" + resource,
+                                start_position=-len(typed_path),
+                                display_meta="Directory" if temp_state.is_directory(resource) else "File"
+                            )
             except Exception:
                 # If there's an error, don't provide completions
                 pass
 
             # If we've yielded any completions, return
             # Otherwise, fall through to the standard approach
+            if completed:
+                return
 
         # Standard approach for single segment or fallback
         try:
@@ -217,10 +188,32 @@ class K8shCompleter(Completer):
             # If there's an error, don't provide completions
             pass
 
+    def _list_directory(self, path: str, use_cluster_index: bool = False) -> Tuple[State, List[str]]:
+        """
+        List a directory fuzzy matches resolved to, in a state of its own so that directories can be
+        listed concurrently. Resources come from the cluster index if use_cluster_index is set
+        """
+        temp_state = State()
+        try:
+            temp_state.set_path("/" + path)
+            if use_cluster_index:
+                namespace, resource_type = path.split("/")
+                return temp_state, get_cluster_index().get_resources(namespace, resource_type)
+            items = temp_state.get_available_items()
+        except Exception:
+            return temp_state, []
+        return temp_state, items if isinstance(items, list) else []
+
     def get_completions(self, document: Document, complete_event=None) -> Iterable[Completion]:
         """
-        Get completions for the current document
+        Get completions for the current document, measured like a command so that slow completions show up in stats
         """
+        with stats.measure_command(f"<tab> {document.text_before_cursor}", trace=False):
+            completions = list(self._get_completions(document))
+        yield from completions
+
+    def _get_completions(self, document: Document) -> Iterable[Completion]:
+        """Get completions for the current document"""
         text = document.text_before_cursor
 
         # If the text is empty, return all commands
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Concurrency helpers for K8sh
+"""
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, List, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+# Default upper bound for the number of concurrent API calls
+DEFAULT_WORKERS = 16
+
+
+def map_concurrently(func: Callable[[T], R], items: Iterable[T], max_workers: int = DEFAULT_WORKERS) -> List[R]:
+    """Apply func to every item using a bounded thread pool, preserving the input order"""
+    return list(iter_concurrently(func, items, max_workers))
+
+
+def iter_concurrently(func: Callable[[T], R], items: Iterable[T], max_workers: int = DEFAULT_WORKERS) -> Iterator[R]:
+    """Like map_concurrently, but yield every result as soon as it and the ones before it are ready"""
+    items = list(items)
+    if not items:
+        return
+
+    # No need for a pool when there is only one item
+    if len(items) == 1 or max_workers <= 1:
+        yield from (func(item) for item in items)
+        return
+
+    # Every item runs in a copy of the caller's context, so e.g. buffered output stays with its command
+    context = contextvars.copy_context()
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        yield from executor.map(lambda item: context.copy().run(func, item), items)
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+In-memory inverted index of the content of resources, so repeated searches don't fetch them again
+"""
+import re
+import threading
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from utils import metrics, stats
+
+# Seconds after which the resources of an indexed directory are fetched again
+INDEX_TTL = 300.0
+
+_TOKEN = re.compile(r"[A-Za-z0-9]+")
+
+# An indexed directory: None for all namespaces, and a resource type
+DirectoryKey = Tuple[Optional[str], str]
+
+# An indexed resource, as (manifest, text searched)
+Document = Tuple[Dict[str, Any], str]
+
+
+def tokenize(text: str) -> Set[str]:
+    """Split text into lowercase alphanumeric tokens"""
+    return {token.lower() for token in _TOKEN.findall(text)}
+
+
+def get_required_tokens(literal: str) -> Set[str]:
+    """
+    Get the tokens any text containing literal must contain. The first and last
+    tokens are left out when they touch the ends of the literal, as they may be
+    part of longer tokens in the text.
+    """
+    matches = list(_TOKEN.finditer(literal))
+    if matches and matches[0].start() == 0:
+        matches = matches[1:]
+    if matches and matches[-1].end() == len(literal):
+        matches = matches[:-1]
+    return {match.group().lower() for match in matches}
+
+
+class _Directory:
+    """The indexed resources of a directory"""
+
+    def __init__(self, documents: Dict[str, Document]) -> None:
+        self.created = time.monotonic()
+        self.documents = documents
+        self.postings: Dict[str, Set[str]] = {}
+        for path, (_, text) in documents.items():
+            for token in tokenize(text):
+                self.postings.setdefault(token, set()).add(path)
+
+
+class ContentIndex:
+    """Resources of directories by path, with an inverted index from tokens to paths"""
+
+    def __init__(self, ttl: float = INDEX_TTL) -> None:
+        self.ttl = ttl
+        self._directories: Dict[DirectoryKey, _Directory] = {}
+        self._lock = threading.Lock()
+        metrics.CACHE_ENTRIES.set_function(lambda: len(self._directories), "content-index")
+
+    def get(self, key: DirectoryKey) -> Optional[Dict[str, Document]]:
+        """Get the documents of a directory, or None if it isn't indexed or is too old"""
+        with self._lock:
+            directory = self._directories.get(key)
+            hit = directory is not None and time.monotonic() - directory.created <= self.ttl
+            stats.record_cache("content-index", hit)
+            if directory is None or not hit:
+                return None
+            return directory.documents
+
+    def put(self, key: DirectoryKey, documents: Dict[str, Document]) -> None:
+        """Index the documents of a directory, replacing the previous ones"""
+        directory = _Directory(documents)
+        with self._lock:
+            self._directories[key] = directory
+
+    def find_candidates(self, key: DirectoryKey, literal: Optional[str]) -> List[str]:
+        """Get the paths of the documents of a directory which may contain a literal, all of them without one"""
+        with self._lock:
+            directory = self._directories.get(key)
+        if directory is None:
+            return []
+
+        tokens = get_required_tokens(literal) if literal else set()
+        if not tokens:
+            return sorted(directory.documents)
+
+        paths: Optional[Set[str]] = None
+        for token in tokens:
+            postings = directory.postings.get(token, set())
+            paths = postings if paths is None else paths & postings
+        return sorted(paths or set())
+
+    def clear(self) -> None:
+        """Forget all indexed directories"""
+        with self._lock:
+            self._directories.clear()
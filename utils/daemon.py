@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Client and server sides of k8shd, a long-lived K8sh process running the commands
+of k8sh -c, so repeated invocations skip loading the shell and the Kubernetes client.
+
+Messages are JSON objects, one per line. The client sends a request with the command
+line and output settings; the daemon answers with its output as it is printed,
+as {"stdout": text} and {"stderr": text} messages, followed by {"exit": code}. Commands needing
+a terminal, which the daemon doesn't have, are answered with {"local": true} instead, and the
+client runs them itself. This module only uses the standard library, to keep forwarding a command cheap.
+"""
+import io
+import json
+import os
+import socket
+import socketserver
+import stat
+import sys
+import tempfile
+from typing import Any, Callable, Dict, Optional, TextIO, cast
+
+# Runs the command of a request, printing to the given stdout and stderr streams, and returns its exit code,
+# or None without running it if it needs the terminal of the client
+RequestHandler = Callable[[Dict[str, Any], TextIO, TextIO], Optional[int]]
+
+
+def get_socket_path() -> str:
+    """
+    Get the path of the daemon socket: $K8SH_SOCKET, k8sh-<uid>.sock in the runtime directory,
+    or k8shd.sock in a private k8sh-<uid> directory of the temporary directory
+    """
+    path = os.environ.get("K8SH_SOCKET")
+    if path:
+        return path
+
+    runtime_directory = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_directory:
+        return os.path.join(runtime_directory, f"k8sh-{os.getuid()}.sock")
+    return os.path.join(tempfile.gettempdir(), f"k8sh-{os.getuid()}", "k8shd.sock")
+
+
+def _is_private_directory(directory: str) -> bool:
+    """Check if a directory belongs to the current user and other users can't add or replace files in it"""
+    try:
+        info = os.lstat(directory)
+    except OSError:
+        return False
+    return stat.S_ISDIR(info.st_mode) and info.st_uid == os.getuid() and not info.st_mode & 0o022
+
+
+def _is_trusted(socket_path: str) -> bool:
+    """
+    Check if a socket was created by the current user in a private directory, so the commands
+    sent to it and the output received from it can't belong to another user
+    """
+    try:
+        info = os.lstat(socket_path)
+    except OSError:
+        return False
+    if not stat.S_ISSOCK(info.st_mode) or info.st_uid != os.getuid():
+        return False
+    return _is_private_directory(os.path.dirname(os.path.abspath(socket_path)))
+
+
+def _send(connection: socket.socket, message: Dict[str, Any]) -> None:
+    """Send a message as a line of JSON"""
+    connection.sendall((json.dumps(message) + "\n").encode("utf-8"))
+
+
+def _connect(socket_path: str) -> Optional[socket.socket]:
+    """Connect to a daemon, or return None if none is listening at a socket of the current user"""
+    if not _is_trusted(socket_path):
+        return None
+
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(socket_path)
+    except OSError:
+        connection.close()
+        return None
+    return connection
+
+
+class _ResponseWriter(io.TextIOBase):
+    """Text stream sending everything written to it to the client right away, as stdout or stderr"""
+
+    def __init__(self, connection: socket.socket, stream: str = "stdout") -> None:
+        self.connection = connection
+        self.stream = stream
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        if text:
+            _send(self.connection, {self.stream: text})
+        return len(text)
+
+
+def forward_command(socket_path: str, request: Dict[str, Any]) -> Optional[int]:
+    """
+    Run a command in the daemon, printing its output as it arrives.
+    Returns its exit code, or None if no daemon of the current user is listening or if
+    the command needs a terminal, so it has to run in the calling process.
+    """
+    connection = _connect(socket_path)
+    if connection is None:
+        return None
+
+    with connection:
+        _send(connection, request)
+        for line in connection.makefile("r", encoding="utf-8"):
+            message = json.loads(line)
+            if "exit" in message:
+                return int(message["exit"])
+            if message.get("local"):
+                return None
+            stream = sys.stderr if "stderr" in message else sys.stdout
+            stream.write(message.get("stderr", message.get("stdout", "")))
+            stream.flush()
+
+    print("Error: k8shd closed the connection before the command finished", file=sys.stderr)
+    return 1
+
+
+def serve(socket_path: str, handler: RequestHandler) -> None:
+    """Run the requests received on a Unix socket one at a time, until interrupted"""
+    # The default directory in the temporary directory is created private, clients don't trust any other
+    directory = os.path.dirname(os.path.abspath(socket_path))
+    os.makedirs(directory, mode=0o700, exist_ok=True)
+    if not _is_private_directory(directory):
+        raise RuntimeError(f"{directory} must belong to the current user and be writable only by them")
+
+    if os.path.lexists(socket_path):
+        connection = _connect(socket_path)
+        if connection is not None:
+            connection.close()
+            raise RuntimeError(f"k8shd is already listening on {socket_path}")
+        # Left over by a daemon that didn't shut down cleanly
+        os.unlink(socket_path)
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            request = json.loads(self.rfile.readline())
+            try:
+                exit_code = handler(request, cast(TextIO, _ResponseWriter(self.request)),
+                                    cast(TextIO, _ResponseWriter(self.request, "stderr")))
+                _send(self.request, {"local": True} if exit_code is None else {"exit": exit_code})
+            except OSError:
+                # The client went away, e.g. on Ctrl+C
+                pass
+
+    # Only the current user may send commands
+    umask = os.umask(0o077)
+    try:
+        server = socketserver.UnixStreamServer(socket_path, Handler)
+    finally:
+        os.umask(umask)
+
+    try:
+        with server:
+            server.serve_forever()
+    finally:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Helpers for working with Kubernetes manifests as plain dictionaries
+"""
+import copy
+from typing import Any, Dict, List, Tuple
+
+# Metadata fields managed by the API server that users can't edit
+SYSTEM_METADATA_FIELDS = ["creationTimestamp", "resourceVersion", "selfLink", "uid", "generation", "managedFields"]
+
+
+def clean_manifest(resource: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a copy of a resource without its status and other non-user-editable fields"""
+    resource = copy.deepcopy(resource)
+
+    if "status" in resource:
+        del resource["status"]
+
+    metadata = resource.get("metadata")
+    if isinstance(metadata, dict):
+        for field in SYSTEM_METADATA_FIELDS:
+            if field in metadata:
+                del metadata[field]
+
+    return resource
+
+
+def create_merge_patch(original: Any, modified: Any) -> Any:
+    """
+    Create a JSON merge patch (RFC 7386) that turns original into modified.
+    Removed keys are set to None and lists are replaced as a whole.
+    """
+    if not isinstance(original, dict) or not isinstance(modified, dict):
+        return copy.deepcopy(modified)
+
+    patch: Dict[str, Any] = {}
+    for key in original:
+        if key not in modified:
+            patch[key] = None
+
+    for key, value in modified.items():
+        if key not in original:
+            patch[key] = copy.deepcopy(value)
+        elif original[key] != value:
+            if isinstance(original[key], dict) and isinstance(value, dict):
+                patch[key] = create_merge_patch(original[key], value)
+            else:
+                patch[key] = copy.deepcopy(value)
+
+    return patch
+
+
+def apply_merge_patch(target: Any, patch: Any) -> Any:
+    """Apply a JSON merge patch (RFC 7386) and return the patched copy of target"""
+    if not isinstance(patch, dict):
+        return copy.deepcopy(patch)
+
+    result = copy.deepcopy(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = apply_merge_patch(result.get(key), value)
+
+    return result
+
+
+def get_patch_paths(patch: Any, prefix: Tuple[str, ...] = ()) -> List[Tuple[str, ...]]:
+    """Get the paths of all values a merge patch sets or removes"""
+    if not isinstance(patch, dict) or not patch:
+        return [prefix]
+
+    paths = []
+    for key, value in patch.items():
+        paths.extend(get_patch_paths(value, prefix + (key,)))
+    return paths
+
+
+def patches_overlap(first: Any, second: Any) -> bool:
+    """Check if two merge patches change any of the same values"""
+    if not first or not second:
+        return False
+
+    first_paths = get_patch_paths(first)
+    second_paths = get_patch_paths(second)
+
+    for first_path in first_paths:
+        for second_path in second_paths:
+            # One path being a prefix of the other means both touch the same subtree
+            length = min(len(first_path), len(second_path))
+            if first_path[:length] == second_path[:length]:
+                return True
+
+    return False
+
+
+def flatten_manifest(resource: Any, prefix: str = "") -> List[str]:
+    """
+    Flatten a resource into 'field.path: value' lines, e.g.
+    'spec.template.spec.containers[0].image: nginx:1.25'. Multi-line strings
+    give one line per line of text.
+    """
+    if isinstance(resource, dict):
+        lines = []
+        for key, value in resource.items():
+            lines.extend(flatten_manifest(value, f"{prefix}.{key}" if prefix else str(key)))
+        return lines
+
+    if isinstance(resource, list):
+        lines = []
+        for i, value in enumerate(resource):
+            lines.extend(flatten_manifest(value, f"{prefix}[{i}]"))
+        return lines
+
+    if isinstance(resource, bool):
+        text = "true" if resource else "false"
+    elif resource is None:
+        text = "null"
+    else:
+        text = str(resource)
+
+    return [f"{prefix}: {line}" for line in text.split("\n")]
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Metrics of the whole process, to see the load K8sh puts on the API server: requests and
+their latency, bytes received, commands, caches and watches. They are exported in the
+Prometheus text format to a file, e.g. for the textfile collector of node_exporter, or
+from an HTTP endpoint. This module only uses the standard library.
+"""
+import atexit
+import math
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Upper bounds of the latency buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Content type of the Prometheus text format
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# File the metrics are written to after every command line, if any
+METRICS_FILE: Optional[str] = None
+
+_lock = threading.Lock()
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...]) -> str:
+    """Format label names and values as {name="value",...}"""
+    if not names:
+        return ""
+    escaped = [value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n") for value in values]
+    return "{" + ",".join(f"{name}=\"{value}\"" for name, value in zip(names, escaped)) + "}"
+
+
+def _format_value(value: float) -> str:
+    """Format a sample value"""
+    if math.isinf(value):
+        return "+Inf"
+    return str(int(value)) if value == int(value) else repr(value)
+
+
+class Metric:
+    """Metric with a value per combination of label values"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        _registry.append(self)
+
+    def collect(self) -> List[str]:
+        """Get the sample lines of the metric"""
+        return []
+
+    def expose(self) -> List[str]:
+        """Get the metric in the Prometheus text format"""
+        return [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"] + self.collect()
+
+
+class Counter(Metric):
+    """Value that only goes up"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = ()) -> None:
+        super().__init__(name, help_text, labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        """Add to the value for some label values"""
+        with _lock:
+            self._values[label_values] = self._values.get(label_values, 0.0) + amount
+
+    def get(self, *label_values: str) -> float:
+        """Get the value for some label values"""
+        with _lock:
+            return self._values.get(label_values, 0.0)
+
+    def collect(self) -> List[str]:
+        with _lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}" for key, value in values]
+
+
+class Histogram(Metric):
+    """Distribution of observed values, counted in cumulative buckets"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        super().__init__(name, help_text, labels)
+        self.buckets = buckets + (math.inf,)
+        # Count per bucket, sum and count, by label values
+        self._values: Dict[Tuple[str, ...], Tuple[List[int], float, int]] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        """Observe a value for some label values"""
+        with _lock:
+            counts, total, count = self._values.get(label_values, ([0] * len(self.buckets), 0.0, 0))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[i] += 1
+            self._values[label_values] = (counts, total + value, count + 1)
+
+    def get_count(self, *label_values: str) -> int:
+        """Get the number of observed values for some label values"""
+        with _lock:
+            return self._values.get(label_values, ([], 0.0, 0))[2]
+
+    def collect(self) -> List[str]:
+        with _lock:
+            values = sorted((key, (list(counts), total, count)) for key, (counts, total, count) in self._values.items())
+
+        lines = []
+        for key, (counts, total, count) in values:
+            for bound, bucket_count in zip(self.buckets, counts):
+                labels = _format_labels(self.labels + ("le",), key + (_format_value(bound),))
+                lines.append(f"{self.name}_bucket{labels} {bucket_count}")
+            labels = _format_labels(self.labels, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+
+class Gauge(Metric):
+    """Value read from a function whenever the metrics are exported, e.g. the size of a cache"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help_text: str, labels: Tuple[str, ...] = ()) -> None:
+        super().__init__(name, help_text, labels)
+        self._functions: Dict[Tuple[str, ...], Callable[[], float]] = {}
+
+    def set_function(self, function: Callable[[], float], *label_values: str) -> None:
+        """Read the value for some label values from a function"""
+        with _lock:
+            self._functions[label_values] = function
+
+    def collect(self) -> List[str]:
+        with _lock:
+            functions = sorted(self._functions.items())
+        return [f"{self.name}{_format_labels(self.labels, key)} {_format_value(function())}" for key, function in functions]
+
+
+_registry: List[Metric] = []
+
+REQUESTS = Counter("k8sh_client_requests_total", "Requests to the Kubernetes client", ("verb", "resource"))
+COALESCED_REQUESTS = Counter("k8sh_client_coalesced_requests_total",
+                             "Calls to the Kubernetes client that shared the request of an identical call in flight",
+                             ("method",))
+REQUEST_DURATION = Histogram("k8sh_client_request_duration_seconds", "Latency of requests to the Kubernetes client",
+                             ("verb", "resource"))
+RECEIVED_BYTES = Counter("k8sh_client_received_bytes_total", "Bytes received from the API server")
+WATCH_RESTARTS = Counter("k8sh_client_watch_restarts_total",
+                         "Watches started again after the API server closed them or their resource version expired",
+                         ("resource", "reason"))
+CACHE_LOOKUPS = Counter("k8sh_cache_lookups_total", "Lookups in the caches of K8sh", ("cache", "result"))
+CACHE_ENTRIES = Gauge("k8sh_cache_entries", "Entries in the caches of K8sh", ("cache",))
+COMMANDS = Counter("k8sh_commands_total", "Commands run, Tab completions included", ("command",))
+COMMAND_DURATION = Histogram("k8sh_command_duration_seconds", "Wall time of commands", ("command",))
+RENDER_SECONDS = Counter("k8sh_render_seconds_total", "Time spent dumping and highlighting YAML", ("activity",))
+
+
+def generate() -> str:
+    """Get all metrics in the Prometheus text format"""
+    lines: List[str] = []
+    for metric in _registry:
+        lines.extend(metric.expose())
+    return "\n".join(lines) + "\n"
+
+
+def write_file(path: str) -> None:
+    """Write all metrics to a file, replacing it at once so readers never see a partial file"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temporary_path = tempfile.mkstemp(dir=directory, prefix=".k8sh-metrics-")
+    try:
+        # mkstemp creates the file readable only by the current user, unlike the collectors reading it
+        os.fchmod(fd, 0o644)
+        with os.fdopen(fd, "w") as f:
+            f.write(generate())
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.unlink(temporary_path)
+        raise
+
+
+def set_file(path: Optional[str]) -> None:
+    """Write the metrics to a file after every command line and when K8sh exits"""
+    global METRICS_FILE
+    if path and METRICS_FILE is None:
+        atexit.register(export)
+    METRICS_FILE = path
+
+
+def export() -> None:
+    """Write the metrics to the file set with set_file, if any"""
+    if METRICS_FILE:
+        try:
+            write_file(METRICS_FILE)
+        except OSError:
+            # Monitoring must not get in the way of commands
+            pass
+
+
+def serve(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serve the metrics at http://host:port/metrics from a background thread"""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+
+            body = generate().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format: str, *args: object) -> None:
+            # Scrapes would mix with the output of commands
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="k8sh-metrics", daemon=True).start()
+    return server
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Output of commands: records for scripts calling K8sh instead of a person, and
+buffers keeping apart the output of commands running concurrently
+"""
+import io
+import json
+import sys
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple, cast
+
+from utils.terminal import Color, colorize
+
+# Colorized text for people, or records for scripts
+OUTPUT_FORMATS = ["text", "json", "ndjson", "names"]
+
+# Global output format, set once from the command line
+OUTPUT_FORMAT = "text"
+
+# A record and its name, usually its path
+Record = Tuple[Dict[str, Any], str]
+
+# Records of the running command, printed as one JSON array when it ends
+_records: "ContextVar[Optional[List[Dict[str, Any]]]]" = ContextVar("records", default=None)
+_lock = threading.Lock()
+
+# Records of the running command, passed to the next command of a pipeline instead of being printed
+_pipe: "ContextVar[Optional[List[Record]]]" = ContextVar("pipe", default=None)
+
+# Buffer of the running command, when its output is printed once it is done
+_buffer: "ContextVar[Optional[io.StringIO]]" = ContextVar("buffer", default=None)
+
+# Errors of the running command, which make it fail
+_errors: "ContextVar[Optional[List[str]]]" = ContextVar("errors", default=None)
+
+
+def set_output_format(output_format: str) -> None:
+    """Set the output format of all commands"""
+    global OUTPUT_FORMAT
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format {output_format}")
+    OUTPUT_FORMAT = output_format
+
+
+def is_structured() -> bool:
+    """Check if commands should emit records instead of text"""
+    return OUTPUT_FORMAT != "text" or _pipe.get() is not None
+
+
+def begin_records() -> None:
+    """Start collecting the records of a command"""
+    _records.set([])
+
+
+def end_records() -> None:
+    """Print the records collected since begin_records, in json format"""
+    records = _records.get()
+    _records.set(None)
+
+    if OUTPUT_FORMAT == "json" and records is not None and _pipe.get() is None:
+        print(json.dumps(records, indent=2))
+
+
+def emit(record: Dict[str, Any], name: str) -> None:
+    """
+    Emit a record: ndjson prints it on a line of its own right away, names prints
+    only its name (usually its path) and json collects it until end_records.
+    Inside collect_records, the record is collected for the next command of a pipeline instead.
+    """
+    pipe = _pipe.get()
+    if pipe is not None:
+        with _lock:
+            pipe.append((record, name))
+        return
+
+    records = _records.get()
+    if OUTPUT_FORMAT == "json" and records is not None:
+        with _lock:
+            records.append(record)
+        return
+
+    if OUTPUT_FORMAT == "names":
+        print(name)
+    else:
+        print(json.dumps(record, separators=(",", ":")))
+    sys.stdout.flush()
+
+
+def error(message: str) -> None:
+    """
+    Print an error of the running command, which then fails. Errors go to stderr when commands
+    emit records, so that scripts can still parse stdout
+    """
+    errors = _errors.get()
+    if errors is not None:
+        with _lock:
+            errors.append(message)
+    print(colorize(message, Color.BRIGHT_RED), file=sys.stderr if is_structured() else sys.stdout)
+
+
+@contextmanager
+def track_errors() -> Iterator[List[str]]:
+    """
+    Collect the errors the running command prints with error, also from the threads it starts.
+    They still count for the enclosing track_errors, if any
+    """
+    outer = _errors.get()
+    errors: List[str] = []
+    token = _errors.set(errors)
+    try:
+        yield errors
+    finally:
+        _errors.reset(token)
+        if outer is not None:
+            with _lock:
+                outer.extend(errors)
+
+
+class _BufferingStdout(io.TextIOBase):
+    """Stdout writing to the buffer of the running command if it has one, and to the real stdout otherwise"""
+
+    def __init__(self, stream: TextIO) -> None:
+        self.stream = stream
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        buffer = _buffer.get()
+        if buffer is None:
+            return self.stream.write(text)
+        return buffer.write(text)
+
+    def flush(self) -> None:
+        if _buffer.get() is None:
+            self.stream.flush()
+
+    def isatty(self) -> bool:
+        return _buffer.get() is None and self.stream.isatty()
+
+
+@contextmanager
+def buffering_stdout() -> Iterator[None]:
+    """Let commands running concurrently buffer their output with buffer_output"""
+    if isinstance(sys.stdout, _BufferingStdout):
+        yield
+        return
+
+    stdout = sys.stdout
+    sys.stdout = cast(TextIO, _BufferingStdout(stdout))
+    try:
+        yield
+    finally:
+        sys.stdout = stdout
+
+
+@contextmanager
+def buffer_output() -> Iterator[io.StringIO]:
+    """Keep what the running command prints, also from the threads it starts, in a buffer"""
+    buffer = io.StringIO()
+    token = _buffer.set(buffer)
+    try:
+        yield buffer
+    finally:
+        _buffer.reset(token)
+
+
+def is_buffered() -> bool:
+    """Check if the output of the running command goes to a buffer"""
+    return _buffer.get() is not None
+
+
+@contextmanager
+def collect_records() -> Iterator[List[Record]]:
+    """Collect the records the running command emits, also from the threads it starts, instead of printing them"""
+    records: List[Record] = []
+    token = _pipe.set(records)
+    try:
+        yield records
+    finally:
+        _pipe.reset(token)
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Incremental pager for long command output
+"""
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+from typing import Callable, Iterable, List, Optional, TextIO
+
+from utils.terminal import Color, colorize, get_terminal_size, raw_terminal
+
+# Pager used when PAGER isn't set: quit if the output fits on one screen,
+# keep colors and don't clear the screen on exit
+DEFAULT_PAGER = "less -FRX"
+
+# Prompt of the built-in pager
+MORE_PROMPT = "--More--"
+
+
+def get_pager_command() -> Optional[List[str]]:
+    """Get the external pager command to use, or None to use the built-in pager"""
+    pager = os.environ.get("PAGER")
+    if pager is None:
+        pager = DEFAULT_PAGER
+
+    command = shlex.split(pager)
+    if not command or shutil.which(command[0]) is None:
+        return None
+
+    return command
+
+
+def page(chunks: Iterable[str]) -> None:
+    """Write chunks of text to stdout as they are produced, through a pager if stdout is a terminal"""
+    if not sys.stdout.isatty():
+        for chunk in chunks:
+            sys.stdout.write(chunk)
+        sys.stdout.flush()
+        return
+
+    command = get_pager_command()
+    if command is not None:
+        _run_external_pager(command, chunks)
+    else:
+        pager = BuiltinPager(sys.stdout, _read_key, get_terminal_size()[1])
+        for chunk in chunks:
+            if not pager.write(chunk):
+                return
+        pager.close()
+
+
+def _run_external_pager(command: List[str], chunks: Iterable[str]) -> None:
+    """Feed chunks of text to an external pager, stopping when it exits"""
+    process = subprocess.Popen(command, stdin=subprocess.PIPE, encoding="utf-8", errors="replace")
+    assert process.stdin is not None
+
+    try:
+        for chunk in chunks:
+            process.stdin.write(chunk)
+        process.stdin.close()
+    except (BrokenPipeError, KeyboardInterrupt):
+        # The user quit the pager before reading everything
+        pass
+
+    try:
+        process.wait()
+    except KeyboardInterrupt:
+        process.wait()
+
+
+def _read_key() -> str:
+    """Read a single key press from the terminal"""
+    fd = sys.stdin.fileno()
+    with raw_terminal(fd):
+        return os.read(fd, 1).decode(errors="replace")
+
+
+class BuiltinPager:
+    """Minimal 'more'-like pager used when no external pager is available"""
+
+    def __init__(self, output: TextIO, read_key: Callable[[], str], rows: int) -> None:
+        self.output = output
+        self.read_key = read_key
+        # Keep the last row for the prompt
+        self.page_size = max(rows - 1, 1)
+        self.remaining = self.page_size
+        self.pending = ""
+
+    def write(self, chunk: str) -> bool:
+        """Write a chunk of text, pausing on full screens. Return False if the user quit"""
+        lines = (self.pending + chunk).split("\n")
+        # The last element is an incomplete line, kept until it's finished
+        self.pending = lines.pop()
+
+        for line in lines:
+            if self.remaining == 0 and not self._prompt():
+                return False
+            self.output.write(line + "\n")
+            self.remaining -= 1
+
+        self.output.flush()
+        return True
+
+    def close(self) -> None:
+        """Write the last incomplete line"""
+        if self.pending:
+            self.output.write(self.pending)
+            self.pending = ""
+        self.output.flush()
+
+    def _prompt(self) -> bool:
+        """Wait for the user: space shows a page, enter a line and q quits"""
+        self.output.write(colorize(MORE_PROMPT, Color.BOLD))
+        self.output.flush()
+        key = self.read_key()
+        # Erase the prompt
+        self.output.write("\r" + " " * len(MORE_PROMPT) + "\r")
+
+        if key in ("q", "Q", "\x03", ""):
+            return False
+        self.remaining = 1 if key in ("\r", "\n") else self.page_size
+        return True
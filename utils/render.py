@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Rendering of Kubernetes resources as (highlighted) YAML
+"""
+import sys
+import textwrap
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Optional, Tuple, cast
+
+import yaml
+from pygments import highlight
+from pygments.formatters import TerminalFormatter
+from pygments.lexers import YamlLexer
+
+from utils import metrics, stats, terminal
+from utils.manifest import clean_manifest
+
+# Use the C implementation of the dumper when libyaml is available
+YamlDumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+# Highlighting is skipped above this size (in characters), as it gets slow
+HIGHLIGHT_MAX_SIZE = 1024 * 1024
+
+# Number of rendered resources kept, keyed by (uid, resourceVersion)
+RENDER_CACHE_SIZE = 64
+
+# Lexer and formatter are stateless, so they are created only once
+_lexer = YamlLexer()
+_formatter = TerminalFormatter()
+
+_render_cache: "OrderedDict[Tuple[str, str, bool], str]" = OrderedDict()
+_render_cache_lock = threading.Lock()
+metrics.CACHE_ENTRIES.set_function(lambda: len(_render_cache), "render")
+
+
+# Line width used by the YAML emitter
+YAML_WIDTH = 80
+
+
+def dump_yaml(data: Any, width: int = YAML_WIDTH) -> str:
+    """Dump data as block style YAML"""
+    with stats.timed("yaml"):
+        return cast(str, yaml.dump(data, Dumper=YamlDumper, default_flow_style=False, width=width))
+
+
+def should_highlight(text: str) -> bool:
+    """Check if YAML should be highlighted: colors are enabled, output is a terminal and the text isn't too big"""
+    return terminal.COLORS_ENABLED and sys.stdout.isatty() and len(text) <= HIGHLIGHT_MAX_SIZE
+
+
+def highlight_yaml(text: str) -> str:
+    """Highlight YAML for the terminal if appropriate"""
+    if not should_highlight(text):
+        return text
+
+    with stats.timed("highlight"):
+        return cast(str, highlight(text, _lexer, _formatter))
+
+
+def iter_yaml(data: Any) -> Iterator[str]:
+    """
+    Dump data as block style YAML in chunks, one per top-level key and one per
+    key of top-level mappings (e.g. the data of a ConfigMap), so the output can
+    be shown before the whole document is dumped
+    """
+    if not isinstance(data, dict) or not data:
+        yield dump_yaml(data)
+        return
+
+    for key in sorted(data):
+        value = data[key]
+        if isinstance(value, dict) and value:
+            # "key: {}" without the empty mapping
+            yield dump_yaml({key: {}})[:-len(" {}\n")] + "\n"
+            for subkey in sorted(value):
+                # Nested values are indented, so they have less room before wrapping
+                yield textwrap.indent(dump_yaml({subkey: value[subkey]}, YAML_WIDTH - 2), "  ")
+        else:
+            yield dump_yaml({key: value})
+
+
+def render_resource(resource: Dict[str, Any]) -> str:
+    """Render a resource as YAML without its non-user-editable fields, highlighted if appropriate"""
+    return "".join(stream_resource(resource))
+
+
+def stream_resource(resource: Dict[str, Any]) -> Iterator[str]:
+    """Render a resource like render_resource, in chunks of highlighted YAML"""
+    metadata = resource.get("metadata") or {}
+    uid: Optional[str] = metadata.get("uid")
+    resource_version: Optional[str] = metadata.get("resourceVersion")
+    highlighted = terminal.COLORS_ENABLED and sys.stdout.isatty()
+
+    # The rendering only changes with the resource version, or whether it can be highlighted
+    key = None
+    if uid and resource_version:
+        key = (uid, resource_version, highlighted)
+        with _render_cache_lock:
+            hit = key in _render_cache
+            if hit:
+                _render_cache.move_to_end(key)
+                rendered = _render_cache[key]
+        stats.record_cache("render", hit)
+        if hit:
+            yield rendered
+            return
+
+    # Rendered chunks are only kept for the cache while the document is small, and highlighted
+    # until the YAML dumped so far passes the size threshold, like a whole document would be
+    chunks: Optional[List[str]] = [] if key is not None else None
+    size = 0
+    for chunk in iter_yaml(clean_manifest(resource)):
+        size += len(chunk)
+        if size > HIGHLIGHT_MAX_SIZE:
+            highlighted = False
+            chunks = None
+        if highlighted:
+            with stats.timed("highlight"):
+                chunk = cast(str, highlight(chunk, _lexer, _formatter))
+
+        if chunks is not None:
+            chunks.append(chunk)
+        yield chunk
+
+    if key is not None and chunks is not None:
+        with _render_cache_lock:
+            _render_cache[key] = "".join(chunks)
+            while len(_render_cache) > RENDER_CACHE_SIZE:
+                _render_cache.popitem(last=False)
+
+
+def clear_render_cache() -> None:
+    """Forget all rendered resources"""
+    with _render_cache_lock:
+        _render_cache.clear()
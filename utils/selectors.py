@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Matching of Kubernetes label and field selectors on resources, for when they can't be sent to the API server
+"""
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+# A requirement of a label selector, as (key, operator, values)
+Requirement = Tuple[str, str, List[str]]
+
+_SET_REQUIREMENT = re.compile(r"^\s*([^\s!=]+)\s+(in|notin)\s+\(([^)]*)\)\s*$")
+
+
+def _split_selector(selector: str) -> List[str]:
+    """Split a selector on the commas which aren't inside parentheses"""
+    parts = []
+    depth = 0
+    current = ""
+    for char in selector:
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        if char == "," and depth == 0:
+            parts.append(current)
+            current = ""
+        else:
+            current += char
+    parts.append(current)
+    return [part.strip() for part in parts if part.strip()]
+
+
+def parse_label_selector(selector: str) -> List[Requirement]:
+    """Parse a label selector like 'app=web,tier!=db,env in (prod,staging),!legacy'"""
+    requirements = []
+    for part in _split_selector(selector):
+        match = _SET_REQUIREMENT.match(part)
+        if match:
+            values = [value.strip() for value in match.group(3).split(",") if value.strip()]
+            requirements.append((match.group(1), match.group(2), values))
+        elif "!=" in part:
+            key, value = part.split("!=", 1)
+            requirements.append((key.strip(), "!=", [value.strip()]))
+        elif "=" in part:
+            key, value = part.replace("==", "=", 1).split("=", 1)
+            requirements.append((key.strip(), "=", [value.strip()]))
+        elif part.startswith("!"):
+            requirements.append((part[1:].strip(), "!", []))
+        else:
+            requirements.append((part, "exists", []))
+    return requirements
+
+
+def matches_label_selector(labels: Optional[Dict[str, str]], selector: str) -> bool:
+    """Check if labels match a label selector"""
+    labels = labels or {}
+    for key, operator, values in parse_label_selector(selector):
+        value = labels.get(key)
+        if operator == "=" and value != values[0]:
+            return False
+        if operator == "!=" and value == values[0]:
+            return False
+        if operator == "in" and value not in values:
+            return False
+        if operator == "notin" and value in values:
+            return False
+        if operator == "exists" and key not in labels:
+            return False
+        if operator == "!" and key in labels:
+            return False
+    return True
+
+
+def get_field(resource: Dict[str, Any], field: str) -> Optional[str]:
+    """Get a field of a resource by its dotted path, e.g. status.phase, as a string"""
+    value: Any = resource
+    for key in field.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return None if value is None else str(value)
+
+
+def matches_field_selector(resource: Dict[str, Any], selector: str) -> bool:
+    """Check if a resource matches a field selector like 'metadata.name=web,status.phase!=Running'"""
+    for part in _split_selector(selector):
+        if "!=" in part:
+            field, value = part.split("!=", 1)
+            if (get_field(resource, field.strip()) or "") == value.strip():
+                return False
+        else:
+            field, value = part.replace("==", "=", 1).split("=", 1)
+            if (get_field(resource, field.strip()) or "") != value.strip():
+                return False
+    return True
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Statistics of commands: wall time, requests to the Kubernetes client by verb and
+resource type, bytes received, cache hits and misses and time spent rendering YAML.
+They are added to the metrics of the whole process as well
+"""
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+
+from utils import metrics
+
+# Number of finished commands whose statistics are kept
+HISTORY_SIZE = 100
+
+# Print the statistics of every command to stderr when it finishes, set once from the command line
+TRACE = False
+
+
+class CommandStats:
+    """What a command line cost"""
+
+    def __init__(self, command: str, parent: Optional["CommandStats"] = None) -> None:
+        self.command = command
+        # Statistics of the command this one runs in, which count everything this one does too
+        self.parent = parent
+        self.wall_time = 0.0
+        # Number of requests and seconds spent in them, by (verb, resource type)
+        self.requests: Dict[Tuple[str, str], Tuple[int, float]] = {}
+        self.bytes_received = 0
+        # Hits and misses, by cache
+        self.caches: Dict[str, Tuple[int, int]] = {}
+        # Seconds spent in e.g. YAML dumping and highlighting, by activity
+        self.timings: Dict[str, float] = {}
+
+    def get_request_count(self) -> int:
+        """Get the number of requests of all verbs and resource types"""
+        return sum(count for count, _ in self.requests.values())
+
+    def get_cache_counts(self) -> Tuple[int, int]:
+        """Get the hits and misses of all caches"""
+        return sum(hits for hits, _ in self.caches.values()), sum(misses for _, misses in self.caches.values())
+
+    def get_render_time(self) -> float:
+        """Get the seconds spent in all timed activities"""
+        return sum(self.timings.values())
+
+    def summary(self) -> str:
+        """Describe the statistics on one line"""
+        parts = [f"{self.wall_time:.3f}s"]
+
+        requests = ", ".join(f"{verb} {resource_type} {count}"
+                             for (verb, resource_type), (count, _) in sorted(self.requests.items()))
+        parts.append(f"{self.get_request_count()} requests" + (f" ({requests})" if requests else ""))
+
+        if self.bytes_received:
+            parts.append(format_bytes(self.bytes_received))
+        if self.caches:
+            hits, misses = self.get_cache_counts()
+            parts.append(f"cache {hits} hits {misses} misses")
+        for activity, seconds in sorted(self.timings.items()):
+            parts.append(f"{activity} {seconds:.3f}s")
+
+        return f"{self.command}: " + ", ".join(parts)
+
+
+# Statistics of the running command, shared with the threads it starts
+_current: "ContextVar[Optional[CommandStats]]" = ContextVar("stats", default=None)
+_lock = threading.Lock()
+
+_history: Deque[CommandStats] = deque(maxlen=HISTORY_SIZE)
+
+
+def set_trace(trace: bool) -> None:
+    """Print the statistics of every command to stderr when it finishes, or stop doing it"""
+    global TRACE
+    TRACE = trace
+
+
+def format_bytes(size: int) -> str:
+    """Format a number of bytes for people"""
+    value = float(size)
+    for unit in ["B", "KiB", "MiB"]:
+        if value < 1024:
+            return f"{value:.0f} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
+    return f"{value:.1f} GiB"
+
+
+@contextmanager
+def measure_command(command: str, trace: bool = True) -> Iterator[CommandStats]:
+    """Collect the statistics of a command line while it runs, keeping them once it is done"""
+    command_stats = CommandStats(command, _current.get())
+    token = _current.set(command_stats)
+    start = time.perf_counter()
+    try:
+        yield command_stats
+    finally:
+        command_stats.wall_time = time.perf_counter() - start
+        _current.reset(token)
+
+        command_name = command.split(" ")[0]
+        metrics.COMMANDS.inc(command_name)
+        metrics.COMMAND_DURATION.observe(command_stats.wall_time, command_name)
+        with _lock:
+            _history.append(command_stats)
+        if TRACE and trace:
+            print(f"[trace] {command_stats.summary()}", file=sys.stderr)
+            sys.stderr.flush()
+
+
+def _get_running() -> Iterator[CommandStats]:
+    """Get the statistics of the running command and of the commands it runs in"""
+    command_stats = _current.get()
+    while command_stats is not None:
+        yield command_stats
+        command_stats = command_stats.parent
+
+
+def record_request(verb: str, resource_type: str, seconds: float) -> None:
+    """Count a request of the running command"""
+    metrics.REQUESTS.inc(verb, resource_type)
+    metrics.REQUEST_DURATION.observe(seconds, verb, resource_type)
+
+    key = (verb, resource_type)
+    with _lock:
+        for command_stats in _get_running():
+            count, total = command_stats.requests.get(key, (0, 0.0))
+            command_stats.requests[key] = (count + 1, total + seconds)
+
+
+def record_bytes(size: int) -> None:
+    """Count bytes received by the running command"""
+    metrics.RECEIVED_BYTES.inc(amount=size)
+
+    with _lock:
+        for command_stats in _get_running():
+            command_stats.bytes_received += size
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Count a hit or a miss of a cache by the running command"""
+    metrics.CACHE_LOOKUPS.inc(cache, "hit" if hit else "miss")
+
+    with _lock:
+        for command_stats in _get_running():
+            hits, misses = command_stats.caches.get(cache, (0, 0))
+            command_stats.caches[cache] = (hits + 1, misses) if hit else (hits, misses + 1)
+
+
+@contextmanager
+def timed(activity: str) -> Iterator[None]:
+    """Add the time spent in the block to an activity of the running command"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        metrics.RENDER_SECONDS.inc(activity, amount=seconds)
+
+        with _lock:
+            for command_stats in _get_running():
+                command_stats.timings[activity] = command_stats.timings.get(activity, 0.0) + seconds
+
+
+def get_history() -> List[CommandStats]:
+    """Get the statistics of the last finished commands, oldest first"""
+    with _lock:
+        return list(_history)
+
+
+def clear_history() -> None:
+    """Forget the statistics of all finished commands"""
+    with _lock:
+        _history.clear()
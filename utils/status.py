@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Status columns of resources, computed from the objects returned by a LIST, like kubectl get
+"""
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+Resource = Dict[str, Any]
+
+
+def format_age(timestamp: Optional[str], now: Optional[datetime] = None) -> str:
+    """Format the time since an RFC 3339 timestamp like kubectl, e.g. 45s, 12m, 3h or 20d"""
+    if not timestamp:
+        return "<unknown>"
+
+    try:
+        created = datetime.strptime(timestamp, "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+    except ValueError:
+        return "<unknown>"
+
+    seconds = int(((now or datetime.now(timezone.utc)) - created).total_seconds())
+    if seconds < 0:
+        seconds = 0
+
+    if seconds < 120:
+        return f"{seconds}s"
+    if seconds < 2 * 3600:
+        return f"{seconds // 60}m"
+    if seconds < 2 * 86400:
+        return f"{seconds // 3600}h"
+    if seconds < 365 * 86400:
+        return f"{seconds // 86400}d"
+    return f"{seconds // (365 * 86400)}y"
+
+
+def _pod_status(pod: Resource) -> List[str]:
+    """READY, STATUS and RESTARTS of a pod"""
+    spec = pod.get("spec") or {}
+    status = pod.get("status") or {}
+    container_statuses = status.get("containerStatuses") or []
+
+    ready = sum(1 for container in container_statuses if container.get("ready"))
+    restarts = sum(container.get("restartCount", 0) for container in container_statuses)
+
+    # Like kubectl, a waiting or terminated container explains the pod state better than its phase
+    reason = status.get("reason") or status.get("phase") or "Unknown"
+    for container in container_statuses:
+        state = container.get("state") or {}
+        for key in ("waiting", "terminated"):
+            if (state.get(key) or {}).get("reason"):
+                reason = state[key]["reason"]
+    if (pod.get("metadata") or {}).get("deletionTimestamp"):
+        reason = "Terminating"
+
+    return [f"{ready}/{len(spec.get('containers') or [])}", reason, str(restarts)]
+
+
+def _deployment_status(deployment: Resource) -> List[str]:
+    """READY, UP-TO-DATE and AVAILABLE of a deployment"""
+    replicas = (deployment.get("spec") or {}).get("replicas", 0)
+    status = deployment.get("status") or {}
+    return [
+        f"{status.get('readyReplicas', 0)}/{replicas}",
+        str(status.get("updatedReplicas", 0)),
+        str(status.get("availableReplicas", 0)),
+    ]
+
+
+def _statefulset_status(statefulset: Resource) -> List[str]:
+    """READY of a statefulset"""
+    replicas = (statefulset.get("spec") or {}).get("replicas", 0)
+    return [f"{(statefulset.get('status') or {}).get('readyReplicas', 0)}/{replicas}"]
+
+
+def _daemonset_status(daemonset: Resource) -> List[str]:
+    """DESIRED, CURRENT and READY of a daemonset"""
+    status = daemonset.get("status") or {}
+    return [
+        str(status.get("desiredNumberScheduled", 0)),
+        str(status.get("currentNumberScheduled", 0)),
+        str(status.get("numberReady", 0)),
+    ]
+
+
+def _replicaset_status(replicaset: Resource) -> List[str]:
+    """DESIRED, CURRENT and READY of a replicaset"""
+    status = replicaset.get("status") or {}
+    return [
+        str((replicaset.get("spec") or {}).get("replicas", 0)),
+        str(status.get("replicas", 0)),
+        str(status.get("readyReplicas", 0)),
+    ]
+
+
+def _service_status(service: Resource) -> List[str]:
+    """TYPE, CLUSTER-IP and PORT(S) of a service"""
+    spec = service.get("spec") or {}
+    ports = []
+    for port in spec.get("ports") or []:
+        text = str(port.get("port", ""))
+        if port.get("nodePort"):
+            text += f":{port['nodePort']}"
+        ports.append(f"{text}/{port.get('protocol', 'TCP')}")
+
+    return [spec.get("type", "ClusterIP"), spec.get("clusterIP") or "<none>", ",".join(ports) or "<none>"]
+
+
+def _configmap_status(configmap: Resource) -> List[str]:
+    """DATA of a configmap"""
+    return [str(len(configmap.get("data") or {}) + len(configmap.get("binaryData") or {}))]
+
+
+def _secret_status(secret: Resource) -> List[str]:
+    """TYPE and DATA of a secret"""
+    return [secret.get("type", "Opaque"), str(len(secret.get("data") or {}))]
+
+
+def _ingress_status(ingress: Resource) -> List[str]:
+    """HOSTS of an ingress"""
+    hosts = [rule["host"] for rule in (ingress.get("spec") or {}).get("rules") or [] if rule.get("host")]
+    return [",".join(hosts) or "*"]
+
+
+# Status column headers and the function computing them, for each resource type
+STATUS_COLUMNS: Dict[str, Tuple[List[str], Callable[[Resource], List[str]]]] = {
+    "pods": (["READY", "STATUS", "RESTARTS"], _pod_status),
+    "deployments": (["READY", "UP-TO-DATE", "AVAILABLE"], _deployment_status),
+    "statefulsets": (["READY"], _statefulset_status),
+    "daemonsets": (["DESIRED", "CURRENT", "READY"], _daemonset_status),
+    "replicasets": (["DESIRED", "CURRENT", "READY"], _replicaset_status),
+    "services": (["TYPE", "CLUSTER-IP", "PORT(S)"], _service_status),
+    "configmaps": (["DATA"], _configmap_status),
+    "secrets": (["TYPE", "DATA"], _secret_status),
+    "ingresses": (["HOSTS"], _ingress_status),
+}
+
+
+def has_status_columns(resource_type: str) -> bool:
+    """Check if status columns are known for a resource type"""
+    return resource_type in STATUS_COLUMNS
+
+
+def get_status_headers(resource_type: str) -> List[str]:
+    """Get the headers of the status columns of a resource type, without NAME and AGE"""
+    return STATUS_COLUMNS[resource_type][0]
+
+
+def get_status_row(resource_type: str, resource: Resource) -> List[str]:
+    """Get the status columns of a resource, without NAME and AGE"""
+    try:
+        return STATUS_COLUMNS[resource_type][1](resource)
+    except (AttributeError, KeyError, TypeError, ValueError):
+        # Don't fail the whole listing on an unexpected object
+        return ["?"] * len(get_status_headers(resource_type))
@@ -3,9 +3,14 @@
 Terminal utilities for K8sh
 """
 import os
+import re
 import shutil
+from contextlib import contextmanager
 from enum import Enum
-from typing import List
+from typing import Iterator, List, Tuple
+
+# Matches the ANSI color sequences produced by colorize
+ANSI_ESCAPE = re.compile(r"\033\[[0-9;]*m")
 
 # Global flag to disable colors
 # Check for NO_COLOR environment variable (https://no-color.org/)
@@ -24,6 +29,31 @@ def enable_colors():
     COLORS_ENABLED = True
 
 
+def get_terminal_size() -> Tuple[int, int]:
+    """Get the terminal size as (columns, rows)"""
+    size = shutil.get_terminal_size()
+    return size.columns, size.lines
+
+
+@contextmanager
+def raw_terminal(fd: int) -> Iterator[None]:
+    """Put the terminal behind fd into raw mode for the duration of the block"""
+    # termios is only available on Unix-like systems
+    import termios
+    import tty
+
+    if not os.isatty(fd):
+        yield
+        return
+
+    old_settings = termios.tcgetattr(fd)
+    try:
+        tty.setraw(fd)
+        yield
+    finally:
+        termios.tcsetattr(fd, termios.TCSADRAIN, old_settings)
+
+
 class Color(Enum):
     """Terminal colors"""
     RESET = "\033[0m"
@@ -146,3 +176,28 @@ def format_long_listing(items: List[str], is_dir_func=None) -> str:
         formatted_items.append(line)
 
     return "\n".join(formatted_items)
+
+
+def visible_length(text: str) -> int:
+    """Get the length of text as displayed, ignoring color codes"""
+    return len(ANSI_ESCAPE.sub("", text))
+
+
+def format_table(headers: List[str], rows: List[List[str]]) -> str:
+    """Format rows as left-aligned columns under a header line, like kubectl get"""
+    widths = [visible_length(header) for header in headers]
+    for row in rows:
+        for i, cell in enumerate(row):
+            widths[i] = max(widths[i], visible_length(cell))
+
+    lines = []
+    for row in [[colorize(header, Color.BOLD) for header in headers]] + rows:
+        cells = []
+        for i, cell in enumerate(row):
+            # Don't pad the last column to avoid trailing whitespace
+            if i < len(row) - 1:
+                cell += " " * (widths[i] - visible_length(cell) + 3)
+            cells.append(cell)
+        lines.append("".join(cells))
+
+    return "\n".join(lines)